@@ -6,7 +6,7 @@ import argparse
 import logging
 import os.path
 import sys
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterator, List, Optional, Any, Callable
 
 from redvox.api1000.wrapped_redvox_packet.sensors.image import Image, ImageCodec
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
@@ -18,6 +18,7 @@ import redvox.cloud.data_api as data_api
 import redvox.cli.conversions as conversions
 import redvox.cli.data_req as data_req
 import redvox.common.io as io
+import redvox.common.parquet_export as parquet_export
 from redvox.common.gui import cloud_data_retrieval
 
 # pylint: disable=C0103
@@ -48,15 +49,22 @@ def check_path(
         return os.path.isdir(path)
 
 
-def check_files(paths: List[str], file_ext: Optional[str] = None) -> bool:
+def check_files(
+    paths: List[str], file_ext: Optional[str] = None, allow_dirs: bool = False
+) -> bool:
     """
     Checks this given files to determine if they exist.
     :param paths: The paths to check.
     :param file_ext: An optional file extension to filter against.
+    :param allow_dirs: When True, paths to existing directories are valid as well.
     :return: True if all paths exist, False otherwise
     """
     invalid_paths: List[str] = list(
-        filter(lambda path: not check_path(path, file_ext=file_ext), paths)
+        filter(
+            lambda path: not check_path(path, file_ext=file_ext)
+            and not (allow_dirs and check_path(path, path_is_file=False)),
+            paths,
+        )
     )
     if len(invalid_paths) > 0:
         log.error("%d invalid paths found", len(invalid_paths))
@@ -78,6 +86,21 @@ def check_out_dir(out_dir: Optional[str] = None) -> bool:
     return True
 
 
+def input_paths(paths: List[str], file_ext: str, recursive: bool) -> Iterator[str]:
+    """
+    Checks the given files and directories and streams the paths of the files in them.
+    Exits the CLI if any path is invalid.
+    :param paths: Paths to files or directories.
+    :param file_ext: The extension of the files.
+    :param recursive: When True, the files in sub-directories are processed as well.
+    :return: An iterator over the paths of the files.
+    """
+    if not check_files(paths, file_ext, allow_dirs=True):
+        determine_exit(False)
+
+    return conversions.iter_paths(paths, file_ext, recursive)
+
+
 def determine_exit(status: bool) -> None:
     """
     Determine the exit status and exit the CLI.
@@ -96,13 +119,16 @@ def rdvxz_to_rdvxm(args) -> None:
     Convert rdvxz to rdvxm
     :param args: Args from argparse.
     """
-    if not check_files(args.rdvxz_paths, ".rdvxz"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.rdvxz_paths, ".rdvxz", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.rdvxz_to_rdvxm(args.rdvxz_paths, args.out_dir))
+    determine_exit(
+        conversions.rdvxz_to_rdvxm(
+            paths, args.out_dir, args.compression_level, jobs=args.jobs
+        )
+    )
 
 
 def rdvxm_to_rdvxz(args) -> None:
@@ -110,13 +136,14 @@ def rdvxm_to_rdvxz(args) -> None:
     Convert rdvxm to rdvxz
     :param args: Args from argparse.
     """
-    if not check_files(args.rdvxm_paths, ".rdvxm"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.rdvxm_paths, ".rdvxm", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.rdvxm_to_rdvxz(args.rdvxm_paths, args.out_dir))
+    determine_exit(
+        conversions.rdvxm_to_rdvxz(paths, args.out_dir, jobs=args.jobs)
+    )
 
 
 def rdvxz_to_json_args(args) -> None:
@@ -124,13 +151,14 @@ def rdvxz_to_json_args(args) -> None:
     Wrapper function that calls the to_json conversion.
     :param args: Args from argparse.
     """
-    if not check_files(args.rdvxz_paths, ".rdvxz"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.rdvxz_paths, ".rdvxz", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.rdvxz_to_json(args.rdvxz_paths, args.out_dir))
+    determine_exit(
+        conversions.rdvxz_to_json(paths, args.out_dir, jobs=args.jobs)
+    )
 
 
 def rdvxm_to_json_args(args) -> None:
@@ -138,13 +166,14 @@ def rdvxm_to_json_args(args) -> None:
     Wrapper function that calls the to_json conversion.
     :param args: Args from argparse.
     """
-    if not check_files(args.rdvxm_paths, ".rdvxm"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.rdvxm_paths, ".rdvxm", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.rdvxm_to_json(args.rdvxm_paths, args.out_dir))
+    determine_exit(
+        conversions.rdvxm_to_json(paths, args.out_dir, jobs=args.jobs)
+    )
 
 
 def json_to_rdvxz_args(args) -> None:
@@ -152,13 +181,14 @@ def json_to_rdvxz_args(args) -> None:
     Wrapper function that calls the to_rdvxz conversion.
     :param args: Args from argparse.
     """
-    if not check_files(args.json_paths, ".json"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.json_paths, ".json", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.json_to_rdvxz(args.json_paths, args.out_dir))
+    determine_exit(
+        conversions.json_to_rdvxz(paths, args.out_dir, jobs=args.jobs)
+    )
 
 
 def json_to_rdvxm_args(args) -> None:
@@ -166,13 +196,16 @@ def json_to_rdvxm_args(args) -> None:
     Wrapper function that calls the to_rdvxm conversion.
     :param args: Args from argparse.
     """
-    if not check_files(args.json_paths, ".json"):
-        determine_exit(False)
+    paths: Iterator[str] = input_paths(args.json_paths, ".json", args.recursive)
 
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(conversions.json_to_rdvxm(args.json_paths, args.out_dir))
+    determine_exit(
+        conversions.json_to_rdvxm(
+            paths, args.out_dir, args.compression_level, jobs=args.jobs
+        )
+    )
 
 
 def rdvxz_print_stdout_args(args) -> None:
@@ -202,10 +235,8 @@ def validate_rdvxm_args(args) -> None:
     Validates the args
     :param args: Args from argparse
     """
-    if not check_files(args.rdvxm_paths, ".rdvxm"):
-        determine_exit(False)
-
-    determine_exit(conversions.validate_rdvxm(args.rdvxm_paths))
+    paths: Iterator[str] = input_paths(args.rdvxm_paths, ".rdvxm", args.recursive)
+    determine_exit(conversions.validate_rdvxm(paths, jobs=args.jobs))
 
 
 def data_req_args(args) -> None:
@@ -364,10 +395,24 @@ def gallery_args(args) -> None:
 
 
 def sort_unstructured(
-    input_dir: str, out_dir: Optional[str] = None, copy: bool = True
+    input_dir: str,
+    out_dir: Optional[str] = None,
+    copy: bool = True,
+    link: bool = False,
+    workers: int = io.DEFAULT_SORT_WORKERS,
 ) -> bool:
     out_dir = out_dir if out_dir is not None else "."
-    io.sort_unstructured_redvox_data(input_dir, out_dir, copy=copy)
+    summaries: List[io.SortSummary] = []
+    if not io.sort_unstructured_redvox_data(
+        input_dir,
+        out_dir,
+        copy=copy,
+        link=link,
+        workers=workers,
+        summary_out=summaries,
+    ):
+        return False
+    print(summaries[0])
     return True
 
 
@@ -378,7 +423,93 @@ def sort_unstructured_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    determine_exit(sort_unstructured(args.input_dir, args.out_dir, not args.mv))
+    determine_exit(
+        sort_unstructured(
+            args.input_dir, args.out_dir, not args.mv, args.link, args.workers
+        )
+    )
+
+
+def to_parquet(
+    input_dir: str,
+    out_dir: str,
+    structured: bool = False,
+    jobs: int = 1,
+    force: bool = False,
+) -> bool:
+    """
+    Exports the sensor data of RedVox files to a Parquet dataset.
+    :param input_dir: Directory containing the RedVox files.
+    :param out_dir: Base directory of the dataset.
+    :param structured: When True, input_dir uses the structured layout.
+    :param jobs: Number of processes exporting files.
+    :param force: When True, files that were already exported are exported again.
+    :return: True if this succeeds, False otherwise
+    """
+    base_dir: str = os.path.abspath(input_dir)
+    index: io.Index = (
+        io.index_structured(base_dir)
+        if structured
+        else io.index_unstructured(base_dir)
+    )
+    if len(index.entries) < 1:
+        log.error("No RedVox files found in %s", input_dir)
+        return False
+
+    summaries: List[parquet_export.ParquetExportSummary] = []
+    success: bool = parquet_export.export_parquet(
+        index, out_dir, jobs=jobs, force=force, summary_out=summaries
+    )
+    print(summaries[0])
+    return success
+
+
+def to_parquet_args(args) -> None:
+    """
+    Wrapper function that calls the Parquet export.
+    :param args: Args from argparse.
+    """
+    if not check_out_dir(args.input_dir):
+        determine_exit(False)
+
+    determine_exit(
+        to_parquet(
+            args.input_dir, args.out_dir, args.structured, args.jobs, args.force
+        )
+    )
+
+
+def add_batch_arguments(
+    parser: argparse.ArgumentParser, compression_level: bool = False
+) -> None:
+    """
+    Adds the arguments shared by the subcommands that process many files.
+    :param parser: The parser of the subcommand.
+    :param compression_level: When True, adds the compression level of rdvxm files.
+    """
+    parser.add_argument(
+        "--recursive",
+        "-r",
+        help="When set, files in sub-directories of the given directories are processed "
+        "as well.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes working on files in parallel (default=1)",
+    )
+    if compression_level:
+        parser.add_argument(
+            "--compression-level",
+            "-c",
+            type=int,
+            default=conversions.DEFAULT_COMPRESSION_LEVEL,
+            help="LZ4 compression level of the rdvxm files, from 0 (fastest) to 16 "
+            f"(smallest) (default={conversions.DEFAULT_COMPRESSION_LEVEL})",
+        )
 
 
 def main():
@@ -417,7 +548,7 @@ def main():
     )
     rdvxz_to_rdvxm_parser.add_argument(
         "rdvxz_paths",
-        help="One or more rdvxz files to convert to json files",
+        help="One or more rdvxz files or directories to convert to rdvxm files",
         nargs="+",
     )
     rdvxz_to_rdvxm_parser.add_argument(
@@ -426,6 +557,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(rdvxz_to_rdvxm_parser, compression_level=True)
     rdvxz_to_rdvxm_parser.set_defaults(func=rdvxz_to_rdvxm)
 
     # rdvxm -> rdvxz
@@ -434,7 +566,7 @@ def main():
     )
     rdvxm_to_rdvxz_parser.add_argument(
         "rdvxm_paths",
-        help="One or more rdvxm files to convert to json files",
+        help="One or more rdvxm files or directories to convert to rdvxz files",
         nargs="+",
     )
     rdvxm_to_rdvxz_parser.add_argument(
@@ -443,6 +575,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(rdvxm_to_rdvxz_parser)
     rdvxm_to_rdvxz_parser.set_defaults(func=rdvxm_to_rdvxz)
 
     # rdvxz -> json
@@ -451,7 +584,7 @@ def main():
     )
     rdvxz_to_json_parser.add_argument(
         "rdvxz_paths",
-        help="One or more rdvxz files to convert to json files",
+        help="One or more rdvxz files or directories to convert to json files",
         nargs="+",
     )
     rdvxz_to_json_parser.add_argument(
@@ -460,6 +593,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(rdvxz_to_json_parser)
     rdvxz_to_json_parser.set_defaults(func=rdvxz_to_json_args)
 
     # rdvxm -> json
@@ -468,7 +602,7 @@ def main():
     )
     rdvxm_to_json_parser.add_argument(
         "rdvxm_paths",
-        help="One or more rdvxm files to convert to json files",
+        help="One or more rdvxm files or directories to convert to json files",
         nargs="+",
     )
     rdvxm_to_json_parser.add_argument(
@@ -477,6 +611,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(rdvxm_to_json_parser)
     rdvxm_to_json_parser.set_defaults(func=rdvxm_to_json_args)
 
     # json -> rdvxz
@@ -484,7 +619,9 @@ def main():
         "json-to-rdvxz", help="Convert json files to rdvxz files"
     )
     json_to_rdvxz_parser.add_argument(
-        "json_paths", help="One or more json files to convert to rdvxz files", nargs="+"
+        "json_paths",
+        help="One or more json files or directories to convert to rdvxz files",
+        nargs="+",
     )
     json_to_rdvxz_parser.add_argument(
         "--out-dir",
@@ -492,6 +629,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(json_to_rdvxz_parser)
     json_to_rdvxz_parser.set_defaults(func=json_to_rdvxz_args)
 
     # json -> rdvxm
@@ -499,7 +637,9 @@ def main():
         "json-to-rdvxm", help="Convert json files to rdvxm files"
     )
     json_to_rdvxm_parser.add_argument(
-        "json_paths", help="One or more json files to convert to rdvxm files", nargs="+"
+        "json_paths",
+        help="One or more json files or directories to convert to rdvxm files",
+        nargs="+",
     )
     json_to_rdvxm_parser.add_argument(
         "--out-dir",
@@ -507,6 +647,7 @@ def main():
         help="Optional output directory (will use same directory as source files by "
         "default)",
     )
+    add_batch_arguments(json_to_rdvxm_parser, compression_level=True)
     json_to_rdvxm_parser.set_defaults(func=json_to_rdvxm_args)
 
     # sort unstructured data into structured data
@@ -528,8 +669,56 @@ def main():
         help="When set, file contents will be moved to the structured layout rather than copied.",
         action="store_true",
     )
+    sort_unstructured_parser.add_argument(
+        "--link",
+        help="When set, files on the same file system as the output directory are "
+        "hardlinked into the structured layout rather than copied.",
+        action="store_true",
+    )
+    sort_unstructured_parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=io.DEFAULT_SORT_WORKERS,
+        help=f"Number of threads copying or moving files (default={io.DEFAULT_SORT_WORKERS})",
+    )
     sort_unstructured_parser.set_defaults(func=sort_unstructured_args)
 
+    # export to parquet
+    to_parquet_parser = sub_parser.add_parser(
+        "to-parquet",
+        help="Export the sensor data of RedVox files to a Parquet dataset partitioned by "
+        "station, sensor and date",
+    )
+    to_parquet_parser.add_argument(
+        "input_dir",
+        help="Directory containing RedVox files to export",
+    )
+    to_parquet_parser.add_argument(
+        "out_dir",
+        help="Base directory of the Parquet dataset (created if it does not exist)",
+    )
+    to_parquet_parser.add_argument(
+        "--structured",
+        "-s",
+        help="When set, the input directory uses the structured layout.",
+        action="store_true",
+    )
+    to_parquet_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes exporting files in parallel (default=1)",
+    )
+    to_parquet_parser.add_argument(
+        "--force",
+        "-f",
+        help="When set, files that were already exported are exported again.",
+        action="store_true",
+    )
+    to_parquet_parser.set_defaults(func=to_parquet_args)
+
     # print rdvxz
     rdvxz_print_parser = sub_parser.add_parser(
         "print-z", help="Print contents of rdvxz files to stdout"
@@ -553,8 +742,11 @@ def main():
         "validate-m", help="Validate the structure of API M files"
     )
     rdvxm_validation_parser.add_argument(
-        "rdvxm_paths", help="One or more rdvxm files to print", nargs="+"
+        "rdvxm_paths",
+        help="One or more rdvxm files or directories to validate",
+        nargs="+",
     )
+    add_batch_arguments(rdvxm_validation_parser)
     rdvxm_validation_parser.set_defaults(func=validate_rdvxm_args)
 
     # data_req
@@ -2,36 +2,97 @@
 This module contains functions for performing RedVox data conversions and displaying the contents of rdvxz files.
 """
 
+from functools import partial
 import logging
 import os.path
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import redvox.api900.reader as reader
 import redvox.api900.reader_utils as reader_utils
 import redvox.common.api_conversions as api_conversions
 import redvox.api900.lib.api900_pb2 as api_900
 import redvox.api1000.proto.redvox_api_m_pb2 as api_1000
-
-import lz4.frame
-
+from redvox.api1000.common.lz4 import compress
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
+from redvox.common.parallel_utils import PoolManager
 
 # pylint: disable=C0103
 log = logging.getLogger(__name__)
 
+# LZ4 compression level of written rdvxm files
+DEFAULT_COMPRESSION_LEVEL: int = 12
+
+# Number of paths sent to a worker process at a time when converting with several jobs
+JOB_CHUNK_SIZE: int = 4
+
+R = TypeVar("R")
+
+
+def iter_paths(
+    paths: Iterable[str], extension: str, recursive: bool = False
+) -> Iterator[str]:
+    """
+    Streams the paths of the files to convert.  Paths of files are passed through and
+    directories are replaced by the files they contain that end with the extension,
+    one directory at a time.
+    :param paths: Paths to files or directories.
+    :param extension: Extension of the files to take from directories.
+    :param recursive: When True, the files in sub-directories are taken as well.
+    :return: An iterator over the paths of the files.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for dir_path, dir_names, file_names in os.walk(path):
+            for file_name in sorted(file_names):
+                if file_name.endswith(extension):
+                    yield os.path.join(dir_path, file_name)
+            if not recursive:
+                break
+            dir_names.sort()
+
+
+def map_paths(
+    convert: Callable[[str], R], paths: Iterable[str], jobs: int = 1
+) -> Iterator[R]:
+    """
+    Maps a conversion over paths, in this process or on a pool of processes.
+    The pool is managed by a PoolManager and shut down once the paths are converted.
+    :param convert: A picklable function that converts the file at a path.
+    :param paths: Paths of the files to convert.
+    :param jobs: Number of processes converting files; 1 converts them in this process.
+    :return: The results of the conversions, in the same order as the paths.
+    """
+    if jobs <= 1:
+        yield from map(convert, paths)
+        return
+
+    with PoolManager(jobs) as pool_manager:
+        yield from pool_manager.get().imap(convert, paths, chunksize=JOB_CHUNK_SIZE)
+
+
+def _validate_rdvxm_file(path: str) -> Tuple[str, List[str]]:
+    """
+    Validates a single rdvxm file.
+    :param path: Path to the file.
+    :return: The path and the validation issues found.
+    """
+    wrapped_packet: WrappedRedvoxPacketM = WrappedRedvoxPacketM.from_compressed_path(
+        path
+    )
+    return path, wrapped_packet.validate()
+
 
-def validate_rdvxm(paths: List[str]) -> bool:
+def validate_rdvxm(paths: Iterable[str], jobs: int = 1) -> bool:
     """
     Validates the correctness of rdvxm files.
     :param paths: Paths to the files.
+    :param jobs: Number of processes validating files (default 1).
     :return: True if all valid, False otherwise
     """
-    for path in paths:
-        wrapped_packet: WrappedRedvoxPacketM = (
-            WrappedRedvoxPacketM.from_compressed_path(path)
-        )
-        validation_results: List[str] = wrapped_packet.validate()
-
+    for path, validation_results in map_paths(_validate_rdvxm_file, paths, jobs):
         if len(validation_results) > 0:
             print(
                 f"{len(validation_results)} validation issues found for file at path {path}"
@@ -42,128 +103,237 @@ def validate_rdvxm(paths: List[str]) -> bool:
     return True
 
 
-def rdvxz_to_json(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def _rdvxz_to_json_file(path: str, out_dir: Optional[str]) -> Tuple[str, str]:
     """
-    Converts .rdvxz files to .json files.
-    :param paths: Paths of .rdvxz files to convert.
+    Converts a single .rdvxz file to a .json file.
+    :param path: Path of the .rdvxz file.
     :param out_dir: An optional output directory (will use input directory by default)
-    :return: True if this succeeds, False otherwise
+    :return: The paths of the original and the new file.
     """
-    for path in paths:
-        pb_packet = reader.read_file(path)
+    pb_packet = reader.read_file(path)
+
+    if out_dir is not None:
+        file_name: str = os.path.basename(path).replace(".rdvxz", ".json")
+        new_path = f"{out_dir}/{file_name}"
+    else:
+        new_path = path.replace(".rdvxz", ".json")
+
+    with open(new_path, "w") as fout:
+        fout.write(reader_utils.to_json(pb_packet))
 
-        if out_dir is not None:
-            file_name: str = os.path.basename(path).replace(".rdvxz", ".json")
-            new_path = f"{out_dir}/{file_name}"
-        else:
-            new_path = path.replace(".rdvxz", ".json")
+    return path, new_path
 
-        with open(new_path, "w") as fout:
-            fout.write(reader_utils.to_json(pb_packet))
 
+def rdvxz_to_json(
+    paths: Iterable[str], out_dir: Optional[str] = None, jobs: int = 1
+) -> bool:
+    """
+    Converts .rdvxz files to .json files.
+    :param paths: Paths of .rdvxz files to convert.
+    :param out_dir: An optional output directory (will use input directory by default)
+    :param jobs: Number of processes converting files (default 1).
+    :return: True if this succeeds, False otherwise
+    """
+    for path, new_path in map_paths(
+        partial(_rdvxz_to_json_file, out_dir=out_dir), paths, jobs
+    ):
         log.info("Converted %s to %s", path, new_path)
 
     return True
 
 
-def rdvxm_to_json(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def _rdvxm_to_json_file(path: str, out_dir: str) -> Tuple[str, str]:
+    """
+    Converts a single .rdvxm file to a .json file.
+    :param path: Path of the .rdvxm file.
+    :param out_dir: The output directory.
+    :return: The paths of the original and the new file.
+    """
+    wrapped_packet: WrappedRedvoxPacketM = WrappedRedvoxPacketM.from_compressed_path(
+        path
+    )
+    return path, wrapped_packet.write_json_to_file(out_dir)
+
+
+def rdvxm_to_json(
+    paths: Iterable[str], out_dir: Optional[str] = None, jobs: int = 1
+) -> bool:
     """
     Converts .rdvxm files to .json files.
     :param paths: Paths of .rdvxm files to convert.
     :param out_dir: An optional output directory (will use input directory by default)
+    :param jobs: Number of processes converting files (default 1).
     :return: True if this succeeds, False otherwise
     """
     out_dir = out_dir if out_dir is not None else "."
-    for path in paths:
-        wrapped_packet: WrappedRedvoxPacketM = (
-            WrappedRedvoxPacketM.from_compressed_path(path)
-        )
-
-        wrapped_packet.write_json_to_file(out_dir)
-        log.info("Converted %s to json", path)
+    for path, new_path in map_paths(
+        partial(_rdvxm_to_json_file, out_dir=out_dir), paths, jobs
+    ):
+        log.info("Converted %s to %s", path, new_path)
 
     return True
 
 
-def json_to_rdvxz(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def _json_to_rdvxz_file(path: str, out_dir: Optional[str]) -> Tuple[str, str]:
+    """
+    Converts a single .json file to a .rdvxz file.
+    :param path: Path of the .json file.
+    :param out_dir: An optional output directory (will use input directory by default)
+    :return: The paths of the original and the new file.
+    """
+    with open(path, "r") as fin:
+        json: str = fin.read()
+
+    if out_dir is not None:
+        file_name: str = os.path.basename(path).replace(".json", ".rdvxz")
+        new_path = f"{out_dir}/{file_name}"
+    else:
+        new_path = path.replace(".json", ".rdvxz")
+
+    reader_utils.write_file(new_path, reader_utils.from_json(json))
+
+    return path, new_path
+
+
+def json_to_rdvxz(
+    paths: Iterable[str], out_dir: Optional[str] = None, jobs: int = 1
+) -> bool:
     """
     Converts .json files to .rdvxz files.
     :param paths: Paths of .json files to convert.
     :param out_dir: An optional output directory (will use input directory by default)
+    :param jobs: Number of processes converting files (default 1).
     :return: True if this succeeds, False otherwise
     """
-    for path in paths:
-        with open(path, "r") as fin:
-            json: str = fin.read()
+    for path, new_path in map_paths(
+        partial(_json_to_rdvxz_file, out_dir=out_dir), paths, jobs
+    ):
+        log.info("Converted %s to %s", path, new_path)
 
-            if out_dir is not None:
-                file_name: str = os.path.basename(path).replace(".json", ".rdvxz")
-                new_path = f"{out_dir}/{file_name}"
-            else:
-                new_path = path.replace(".json", ".rdvxz")
+    return True
 
-            reader_utils.write_file(new_path, reader_utils.from_json(json))
 
-            log.info("Converted %s to %s", path, new_path)
+def _json_to_rdvxm_file(
+    path: str, out_dir: str, compression_level: int
+) -> Tuple[str, str]:
+    """
+    Converts a single .json file to a .rdvxm file.
+    :param path: Path of the .json file.
+    :param out_dir: The output directory.
+    :param compression_level: LZ4 compression level of the new file.
+    :return: The paths of the original and the new file.
+    """
+    wrapped_packet: WrappedRedvoxPacketM = WrappedRedvoxPacketM.from_json_path(path)
+    new_path: str = os.path.join(out_dir, wrapped_packet.default_filename("rdvxm"))
+    with open(new_path, "wb") as fout:
+        fout.write(compress(wrapped_packet.as_bytes(), compression_level))
 
-    return True
+    return path, new_path
 
 
-def json_to_rdvxm(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def json_to_rdvxm(
+    paths: Iterable[str],
+    out_dir: Optional[str] = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    jobs: int = 1,
+) -> bool:
     """
     Converts .json files to .rdvxm files.
     :param paths: Paths of .json files to convert.
     :param out_dir: An optional output directory (will use input directory by default)
+    :param compression_level: LZ4 compression level of the .rdvxm files (default 12).
+    :param jobs: Number of processes converting files (default 1).
     :return: True if this succeeds, False otherwise
     """
     out_dir = out_dir if out_dir is not None else "."
-    for path in paths:
-        wrapped_packet: WrappedRedvoxPacketM = WrappedRedvoxPacketM.from_json_path(path)
-        wrapped_packet.write_compressed_to_file(out_dir)
-        log.info("Converted %s to .rdvxm", path)
+    convert = partial(
+        _json_to_rdvxm_file, out_dir=out_dir, compression_level=compression_level
+    )
+    for path, new_path in map_paths(convert, paths, jobs):
+        log.info("Converted %s to %s", path, new_path)
 
     return True
 
 
-def rdvxz_to_rdvxm(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def _rdvxz_to_rdvxm_file(
+    path: str, out_dir: str, compression_level: int
+) -> Tuple[str, str]:
+    """
+    Converts a single rdvxz file to a rdvxm file.
+    :param path: Path of the rdvxz file.
+    :param out_dir: The output directory.
+    :param compression_level: LZ4 compression level of the new file.
+    :return: The paths of the original and the new file.
+    """
+    packet_900: api_900.RedvoxPacket = reader.read_file(path, True)
+    packet_1000: api_1000.RedvoxPacketM = (
+        api_conversions.convert_api_900_to_1000_raw(packet_900)
+    )
+    file_name: str = f"{packet_1000.station_information.id}_{int(packet_1000.timing_information.packet_start_mach_timestamp)}.rdvxm"
+    new_path: str = os.path.join(out_dir, file_name)
+    with open(new_path, "wb") as fout:
+        fout.write(compress(packet_1000.SerializeToString(), compression_level))
+
+    return path, new_path
+
+
+def rdvxz_to_rdvxm(
+    paths: Iterable[str],
+    out_dir: Optional[str] = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    jobs: int = 1,
+) -> bool:
     """
     Convert rdvxz files to rdvxm files
     :param paths: Paths of original files to convert
     :param out_dir: Optional output directory of converted files (default "./")
+    :param compression_level: LZ4 compression level of the rdvxm files (default 12).
+    :param jobs: Number of processes converting files (default 1).
     :return: True if completed successfully
     """
     out_dir = out_dir if out_dir is not None else "."
-    for path in paths:
-        packet_900: api_900.RedvoxPacket = reader.read_file(path, True)
-        packet_1000: api_1000.RedvoxPacketM = (
-            api_conversions.convert_api_900_to_1000_raw(packet_900)
-        )
-        file_name: str = f"{packet_1000.station_information.id}_{int(packet_1000.timing_information.packet_start_mach_timestamp)}.rdvxm"
-        with lz4.frame.open(os.path.join(out_dir, file_name), "wb", compression_level=12) as fout:
-            fout.write(packet_1000.SerializeToString())
-        # wrapped_packet_900: reader.WrappedRedvoxPacket = reader.read_rdvxz_file(path)
-        # wrapped_packet_1000: WrappedRedvoxPacketM = api_conversions.convert_api_900_to_1000(wrapped_packet_900)
-        # wrapped_packet_1000.write_compressed_to_file(out_dir)
+    convert = partial(
+        _rdvxz_to_rdvxm_file, out_dir=out_dir, compression_level=compression_level
+    )
+    for path, new_path in map_paths(convert, paths, jobs):
+        log.info("Converted %s to %s", path, new_path)
 
     return True
 
 
-def rdvxm_to_rdvxz(paths: List[str], out_dir: Optional[str] = None) -> bool:
+def _rdvxm_to_rdvxz_file(path: str, out_dir: str) -> Tuple[str, str]:
+    """
+    Converts a single rdvxm file to a rdvxz file.
+    :param path: Path of the rdvxm file.
+    :param out_dir: The output directory.
+    :return: The paths of the original and the new file.
+    """
+    wrapped_packet_1000: WrappedRedvoxPacketM = (
+        WrappedRedvoxPacketM.from_compressed_path(path)
+    )
+    wrapped_packet_900: reader.WrappedRedvoxPacket = (
+        api_conversions.convert_api_1000_to_900(wrapped_packet_1000)
+    )
+    wrapped_packet_900.write_rdvxz(out_dir)
+
+    return path, os.path.join(out_dir, wrapped_packet_900.default_filename())
+
+
+def rdvxm_to_rdvxz(
+    paths: Iterable[str], out_dir: Optional[str] = None, jobs: int = 1
+) -> bool:
     """
     Convert rdvxm files to rdvxz files
     :param paths: Paths of original files to convert
     :param out_dir: Optional output directory of converted files (default "./")
+    :param jobs: Number of processes converting files (default 1).
     :return: True if completed successfully
     """
     out_dir = out_dir if out_dir is not None else "."
-    for path in paths:
-        wrapped_packet_1000: WrappedRedvoxPacketM = (
-            WrappedRedvoxPacketM.from_compressed_path(path)
-        )
-        wrapped_packet_900: reader.WrappedRedvoxPacket = (
-            api_conversions.convert_api_1000_to_900(wrapped_packet_1000)
-        )
-        wrapped_packet_900.write_rdvxz(out_dir)
+    for path, new_path in map_paths(
+        partial(_rdvxm_to_rdvxz_file, out_dir=out_dir), paths, jobs
+    ):
+        log.info("Converted %s to %s", path, new_path)
 
     return True
 
@@ -8,9 +8,10 @@ an up-to-date authentication token for making authenticated API requests.
 import contextlib
 import threading
 from multiprocessing import Queue
-from typing import List, Optional, Tuple, TYPE_CHECKING, Iterator
+from typing import Callable, List, Optional, Tuple, TYPE_CHECKING, Iterable, Iterator, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import redvox.cloud.api as api
 import redvox.cloud.auth_api as auth_api
@@ -24,10 +25,17 @@ import redvox.cloud.data_api as data_api
 import redvox.cloud.metadata_api as metadata_api
 import redvox.cloud.station_stats as station_stats_api
 import redvox.cloud.session_model_api as session_model_api
+from redvox.common.parallel_utils import prefetch_map
 
 if TYPE_CHECKING:
     from redvox.cloud.query_timing_correction import CorrectedQuery
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# default number of chunked requests a client sends at the same time
+DEFAULT_MAX_CONCURRENT_REQUESTS: int = 8
+
 
 def chunk_time_range(
     start_ts: int, end_ts: int, max_chunk: int
@@ -70,12 +78,15 @@ class CloudClient:
         redvox_config: Optional[RedVoxConfig] = RedVoxConfig.find(),
         refresh_token_interval: float = 600.0,
         timeout: Optional[float] = 10.0,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
     ):
         """
         Instantiates this client.
         :param redvox_config: The Redvox endpoint configuration.
         :param refresh_token_interval: An optional interval in seconds that the auth token should be refreshed.
         :param timeout: An optional timeout
+        :param max_concurrent_requests: The maximum number of chunked requests sent at the same time.  1 sends the
+                                        requests one after another.  Default DEFAULT_MAX_CONCURRENT_REQUESTS
         """
 
         if redvox_config is None:
@@ -91,13 +102,23 @@ class CloudClient:
         if timeout is not None and (timeout <= 0):
             raise cloud_errors.CloudApiError("timeout must be strictly > 0")
 
+        if max_concurrent_requests <= 0:
+            raise cloud_errors.CloudApiError("max_concurrent_requests must be strictly > 0")
+
         self.redvox_config: RedVoxConfig = redvox_config
         self.refresh_token_interval: float = refresh_token_interval
         self.timeout: Optional[float] = timeout
+        self.max_concurrent_requests: int = max_concurrent_requests
 
         self.__session = (
             requests.Session()
         )  # This must be initialized before the auth req!
+        # Keep a connection open for every request that may be in flight
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=max_concurrent_requests, pool_maxsize=max_concurrent_requests
+        )
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
 
         self.__refresh_timer = None
         self.__authenticate()
@@ -165,6 +186,17 @@ class CloudClient:
         except:
             pass
 
+    def __map_requests(self, req_fn: Callable[[T], R], reqs: Iterable[T]) -> Iterator[R]:
+        """
+        Sends up to max_concurrent_requests requests at the same time.
+        :param req_fn: A function that sends a single request.
+        :param reqs: The arguments of each request.
+        :return: An iterator over the responses, in the same order as reqs.
+        """
+        if self.max_concurrent_requests == 1:
+            return map(req_fn, reqs)
+        return prefetch_map(req_fn, reqs, self.max_concurrent_requests, self.max_concurrent_requests)
+
     def health_check(self) -> bool:
         """
         An API call that returns True if the API Cloud server is up and running or False otherwise.
@@ -279,25 +311,25 @@ class CloudClient:
         )
         metadata_resp: metadata_api.MetadataResp = metadata_api.MetadataResp([])
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(time_chunk: Tuple[int, int]) -> Optional[metadata_api.MetadataResp]:
             metadata_req: metadata_api.MetadataReq = metadata_api.MetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 metadata_to_include,
                 self.redvox_config.secret_token,
             )
 
-            chunked_resp: Optional[
-                metadata_api.MetadataResp
-            ] = metadata_api.request_metadata(
+            return metadata_api.request_metadata(
                 self.redvox_config,
                 metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
+        chunked_resp: Optional[metadata_api.MetadataResp]
+        for chunked_resp in self.__map_requests(_make_req, time_chunks):
             if chunked_resp:
                 metadata_resp.metadata.extend(chunked_resp.metadata)
 
@@ -364,26 +396,25 @@ class CloudClient:
             start_ts_s, end_ts_s, chunk_by_seconds
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(time_chunk: Tuple[int, int]) -> Optional[metadata_api.MetadataRespM]:
             metadata_req: metadata_api.MetadataReq = metadata_api.MetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 metadata_to_include,
                 self.redvox_config.secret_token,
             )
 
-            chunked_resp: Optional[
-                metadata_api.MetadataRespM
-            ] = metadata_api.request_metadata_m(
+            return metadata_api.request_metadata_m(
                 self.redvox_config,
                 metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
-            yield chunked_resp
+        # Chunks are requested concurrently, but yielded in time order
+        yield from self.__map_requests(_make_req, time_chunks)
 
     def request_geo_metadata_stream(
         self,
@@ -429,26 +460,25 @@ class CloudClient:
             start_ts_s, end_ts_s, chunk_by_seconds
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(time_chunk: Tuple[int, int]) -> Optional[metadata_api.GeoMetadataResp]:
             geo_metadata_req: metadata_api.GeoMetadataReq = metadata_api.GeoMetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 bounding_box,
                 bounding_circle,
                 metadata_to_include,
             )
 
-            chunked_resp: Optional[
-                metadata_api.GeoMetadataResp
-            ] = metadata_api.request_geo_metadata(
+            return metadata_api.request_geo_metadata(
                 self.redvox_config,
                 geo_metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
-            yield chunked_resp
+        # Chunks are requested concurrently, but yielded in time order
+        yield from self.__map_requests(_make_req, time_chunks)
 
     def request_timing_metadata(
         self,
@@ -481,23 +511,23 @@ class CloudClient:
             metadata_api.TimingMetaResponse([])
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(time_chunk: Tuple[int, int]) -> metadata_api.TimingMetaResponse:
             timing_req: metadata_api.TimingMetaRequest = metadata_api.TimingMetaRequest(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 self.redvox_config.secret_token,
             )
-            chunked_resp: metadata_api.TimingMetaResponse = (
-                metadata_api.request_timing_metadata(
-                    self.redvox_config,
-                    timing_req,
-                    session=self.__session,
-                    timeout=self.timeout,
-                )
+            return metadata_api.request_timing_metadata(
+                self.redvox_config,
+                timing_req,
+                session=self.__session,
+                timeout=self.timeout,
             )
 
+        chunked_resp: metadata_api.TimingMetaResponse
+        for chunked_resp in self.__map_requests(_make_req, time_chunks):
             if chunked_resp:
                 metadata_resp.items.extend(chunked_resp.items)
 
@@ -622,7 +652,6 @@ class CloudClient:
                 return _make_req(start_ts_s, end_ts_s, station_ids)
 
             # Make a request for each corrected query, aggregating the results of each request
-            resp: data_api.DataRangeResp = data_api.DataRangeResp([])
             corrected_query: "CorrectedQuery"
             for corrected_query in corrected_queries:
                 correction_msg: str = (
@@ -636,13 +665,17 @@ class CloudClient:
                 else:
                     out_queue.put(correction_msg, block=False)
 
-                resp.append(
-                    _make_req(
-                        round(corrected_query.corrected_start_ts),
-                        round(corrected_query.corrected_end_ts),
-                        [corrected_query.station_id],
-                    )
-                )
+            # The queries are sent concurrently; the responses are merged in the order of the queries
+            resp: data_api.DataRangeResp = data_api.DataRangeResp([])
+            for query_resp in self.__map_requests(
+                lambda query: _make_req(
+                    round(query.corrected_start_ts),
+                    round(query.corrected_end_ts),
+                    [query.station_id],
+                ),
+                corrected_queries,
+            ):
+                resp.append(query_resp)
             return resp
         else:
             # No timing correction requested, go ahead just make the original uncorrected request
@@ -748,6 +781,7 @@ def cloud_client(
     redvox_config: Optional[RedVoxConfig] = RedVoxConfig.find(),
     refresh_token_interval: float = 600.0,
     timeout: float = 10.0,
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
 ):
     """
     Function that can be used within a "with" block to automatically handle the closing of open resources.
@@ -759,6 +793,7 @@ def cloud_client(
     :param redvox_config: The Redvox endpoint configuration.
     :param refresh_token_interval: An optional token refresh interval
     :param timeout: An optional timeout.
+    :param max_concurrent_requests: The maximum number of chunked requests sent at the same time.
     :return: A CloudClient.
     """
     if redvox_config is None:
@@ -766,7 +801,9 @@ def cloud_client(
             "A RedVoxConfig was not found in the environment and one wasn't provided"
         )
 
-    client: CloudClient = CloudClient(redvox_config, refresh_token_interval, timeout)
+    client: CloudClient = CloudClient(
+        redvox_config, refresh_token_interval, timeout, max_concurrent_requests
+    )
     try:
         yield client
     finally:
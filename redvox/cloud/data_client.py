@@ -1,119 +1,149 @@
 """
-This module provides a custom work-stealing thread pool for downloading API M data in parallel.
+This module provides a thread pool for downloading API M data in parallel.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 import time
 from typing import List, Optional
-from multiprocessing import cpu_count, Manager, Process, Queue
-import queue
+import warnings
+from multiprocessing import Queue
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from redvox.cloud.data_io import download_file
+from redvox.cloud.data_io import DEFAULT_BACKOFF_S, data_key_from_url, download_file_resumable
+
+# default number of files downloaded at the same time
+DEFAULT_NUM_WORKERS: int = 16
 
 
 @dataclass
 class DownloadResult:
     """
     The result of downloading a file.
+
+    Properties:
+        data_key: str, the key of the file in the RedVox data bucket
+
+        resp_len: int, number of bytes downloaded
+
+        skipped: bool, True if the file already existed and wasn't downloaded, default False
+
+        failed: bool, True if the file couldn't be downloaded, default False
     """
 
     data_key: str
     resp_len: int
     skipped: bool = False
+    failed: bool = False
 
 
-def download_process(
-    input_queue: Queue, result_queue: Queue, out_dir: str, retries: int
-) -> None:
+def pooled_session(num_workers: int) -> requests.Session:
     """
-    A function that runs in a separate process for downloading RedVox data.
-    :param input_queue: A shared queue containing the list of items to be downloaded.
-    :param result_queue: A queue used to send results from the process to the caller.
-    :param out_dir: The directory downloaded data should be stored to.
-    :param retries: Number of times to retry a failed download.
+    :param num_workers: number of threads that will share the session
+    :return: a session that keeps up to num_workers connections per host open
     """
     session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(pool_connections=num_workers, pool_maxsize=num_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_url(
+    url: str,
+    session: requests.Session,
+    out_dir: str,
+    retries: int,
+    backoff_s: float = DEFAULT_BACKOFF_S,
+    structured: bool = True,
+) -> DownloadResult:
+    """
+    Downloads a single file, see data_io.download_file_resumable.
+    :param url: The URL to retrieve.
+    :param session: The HTTP session.
+    :param out_dir: The base output directory where files should be stored.
+    :param retries: The number of times to retry a failed download.
+    :param backoff_s: Time to wait before the first retry.
+    :param structured: If True, store RedVox files in the structured api900/api1000 layout.
+    :return: The result of the download.
+    """
     try:
-        # While there is still data in the queue, retrieve it.
-        while True:
-            url: str = input_queue.get_nowait()
-            data_key: str
-            resp_len: int
-            try:
-                data_key, resp_len = download_file(url, session, out_dir, retries)
-                result_queue.put(DownloadResult(data_key, resp_len), True, None)
-            except FileExistsError:
-                print(f"File already exists, skipping...")
-                result_queue.put(DownloadResult("", 0, skipped=True), True, None)
-                continue
-    # Thrown when the queue is empty
-    except queue.Empty:
-        session.close()
+        data_key, resp_len = download_file_resumable(url, session, out_dir, retries, backoff_s, structured)
+        if data_key == "":
+            return DownloadResult(data_key_from_url(url), resp_len, failed=True)
+        return DownloadResult(data_key, resp_len)
+    except FileExistsError:
+        print(f"File already exists, skipping...")
+        return DownloadResult(data_key_from_url(url), 0, skipped=True)
 
 
 def download_files(
     urls: List[str],
     out_dir: str,
     retries: int,
-    num_processes: int = cpu_count(),
+    num_workers: int = DEFAULT_NUM_WORKERS,
     out_queue: Optional[Queue] = None,
-) -> None:
+    backoff_s: float = DEFAULT_BACKOFF_S,
+    structured: bool = True,
+    num_processes: Optional[int] = None,
+) -> List[DownloadResult]:
     """
     Downloads files in parallel from the provided URLs.
+
+    The files are downloaded by a pool of threads that share one connection-pooled session.  Files are streamed to
+    partial files that are resumed if a download is interrupted, and failed downloads are retried with an
+    exponentially increasing delay.  Files that already exist in out_dir are skipped.
+
     :param out_queue: If provided, send results to this queue instead of printing them
     :param urls: URLs to files to retrieve.
     :param out_dir: The base output directory where files should be stored.
     :param retries: The number of times to retry a failed download.
-    :param num_processes: Number of processes to create for downloading data.
+    :param num_workers: Number of files to download at the same time.  Default DEFAULT_NUM_WORKERS
+    :param backoff_s: Time to wait before the first retry.  Default DEFAULT_BACKOFF_S
+    :param structured: If True, store RedVox files in the structured api900/api1000 layout.  Default True
+    :param num_processes: Deprecated, use num_workers.  If provided, overrides num_workers.  Default None
+    :return: The result of every download, in the order they completed.  Failed downloads have failed set to True.
     """
-    manager: Manager = Manager()
-    url_queue: Queue = manager.Queue(len(urls))
-    result_queue: Queue = manager.Queue(len(urls))
-    processes: List[Process] = []
-
-    # Add all URLs to shared queue
-    for url in urls:
-        url_queue.put(url)
-
-    # Create the process pool
-    for _ in range(num_processes):
-        process: Process = Process(
-            target=download_process, args=(url_queue, result_queue, out_dir, retries)
-        )
-        processes.append(process)
-        process.start()
-
-    # Display download status
+    if num_processes is not None:
+        warnings.warn("num_processes is deprecated, use num_workers instead", DeprecationWarning, stacklevel=2)
+        num_workers = num_processes
+    num_workers = max(1, min(num_workers, len(urls)))
+    results: List[DownloadResult] = []
     i: int = 0
     total_bytes: int = 0
     start_time = time.monotonic_ns()
-    while i < len(urls):
-        res: DownloadResult = result_queue.get(True, None)
-
-        if res.skipped:
-            i += 1
-            continue
+    with pooled_session(num_workers) as session, ThreadPoolExecutor(num_workers) as executor:
+        futures = [
+            executor.submit(download_url, url, session, out_dir, retries, backoff_s, structured) for url in urls
+        ]
+        # Display download status
+        for future in as_completed(futures):
+            res: DownloadResult = future.result()
+            results.append(res)
+
+            if res.skipped:
+                i += 1
+                continue
 
-        timestamp = time.monotonic_ns()
-        time_range = (timestamp - start_time) / 1_000_000_000.0
-        percentage: float = (float(i + 1) / float(len(urls))) * 100.0
-        remaining: float = ((100.0 / percentage) * time_range) - time_range
+            timestamp = time.monotonic_ns()
+            time_range = (timestamp - start_time) / 1_000_000_000.0
+            percentage: float = (float(i + 1) / float(len(urls))) * 100.0
+            remaining: float = ((100.0 / percentage) * time_range) - time_range
 
-        total_bytes += res.resp_len
+            total_bytes += res.resp_len
 
-        out_str: str = f"\r[{(i + 1):5} / {len(urls):5}] [{percentage:04.1f}%] [{total_bytes:10} bytes] " \
-                       f"[est time remaining {remaining:06.1f}s] {res.data_key:>55}"
-        if out_queue is None:
-            print(out_str)
-        else:
-            out_queue.put(out_str, False)
-        i += 1
+            status: str = "FAILED " if res.failed else ""
+            out_str: str = f"\r[{(i + 1):5} / {len(urls):5}] [{percentage:04.1f}%] [{total_bytes:10} bytes] " \
+                           f"[est time remaining {remaining:06.1f}s] {status}{res.data_key:>55}"
+            if out_queue is None:
+                print(out_str)
+            else:
+                out_queue.put(out_str, False)
+            i += 1
 
     if out_queue is not None:
         out_queue.put("done", False)
 
-    # Wait for all processes in pool to finish
-    for process in processes:
-        process.join()
+    return results
@@ -4,10 +4,25 @@ This module contains functions for downloading data from AWS S3 via signed URLs.
 
 import logging
 import os
+import time
 from typing import Tuple, Optional
 
 import requests
 
+from redvox.common.date_time_utils import (
+    datetime_from_epoch_microseconds_utc as us2dt,
+    datetime_from_epoch_milliseconds_utc as ms2dt,
+)
+
+# initial time to wait before retrying a failed download; doubled after every failure
+DEFAULT_BACKOFF_S: float = 0.5
+# longest time to wait before retrying a failed download
+MAX_BACKOFF_S: float = 30.0
+# suffix of files that are still being downloaded
+PARTIAL_SUFFIX: str = ".part"
+# size of the pieces a download is streamed to disk in
+DOWNLOAD_CHUNK_BYTES: int = 1024 * 1024
+
 # pylint: disable=C0103
 log = logging.getLogger(__name__)
 
@@ -25,42 +40,168 @@ def find_between(start: str, end: str, contents: str) -> str:
     return contents[s_idx + len(start) : e_idx]
 
 
+def backoff_delay_s(attempt: int, backoff_s: float = DEFAULT_BACKOFF_S) -> float:
+    """
+    :param attempt: number of failed attempts so far, starting at 1
+    :param backoff_s: time to wait after the first failed attempt
+    :return: the time to wait before the next attempt, doubled after every failure up to MAX_BACKOFF_S
+    """
+    return min(MAX_BACKOFF_S, backoff_s * 2 ** (attempt - 1))
+
+
+def _is_retryable(status_code: int) -> bool:
+    """
+    :param status_code: HTTP status code of a failed request
+    :return: True if the request may succeed if it is retried
+    """
+    return status_code in (408, 429) or status_code >= 500
+
+
 def get_file(
-    url: str, retries: int, session: requests.Session = requests.Session()
+    url: str,
+    retries: int,
+    session: Optional[requests.Session] = None,
+    backoff_s: float = DEFAULT_BACKOFF_S,
 ) -> Optional[bytes]:
     """
-    Attempts to download a file with a configurable amount of retries.
+    Attempts to download a file with a configurable amount of retries.  Failed attempts caused by connection errors,
+    timeouts or server errors are retried after an exponentially increasing delay.
     :param url: The url to download.
     :param retries: Number of retries.
-    :param session: An instance of a session.
+    :param session: An optional instance of a session.
+    :param backoff_s: Time to wait before the first retry.
     :return: The bytes of the file.
     """
-    # pylint: disable=W0702
-    # noinspection PyBroadException
-    try:
-        resp: requests.Response = session.get(url)
-        if resp.status_code == 200:
-            return resp.content
-        else:
+    _session: requests.Session = requests.Session() if session is None else session
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            log.info("Retrying with %d retries", retries - attempt + 1)
+            time.sleep(backoff_delay_s(attempt, backoff_s))
+        # pylint: disable=W0702
+        # noinspection PyBroadException
+        try:
+            resp: requests.Response = _session.get(url)
+            if resp.status_code == 200:
+                return resp.content
             log.error(
                 "Received error response when requesting data for url=%s: %d %s",
                 url,
                 resp.status_code,
                 resp.text,
             )
-            if retries > 0:
-                log.info("Retrying with %d retries", retries)
-                return get_file(url, retries - 1, session)
+            if not _is_retryable(resp.status_code):
+                break
+        except Exception as e:
+            log.error("Encountered an error while getting data for %s: %s", url, str(e))
+    log.error("All retries exhausted, could not get %s", url)
+    return None
+
+
+def data_key_from_url(url: str) -> str:
+    """
+    :param url: a signed URL of a RedVox file
+    :return: the key of the file in the RedVox data bucket
+    """
+    if "/rdvxdata/" in url:
+        return find_between("/rdvxdata/", "?X-Amz-Algorithm=", url)
+    return find_between("/rdvxdata.s3.amazonaws.com/", "?AWSAccessKeyId=", url)
+
+
+def structured_data_key(data_key: str) -> str:
+    """
+    Keys that already start with api900 or api1000, or whose file name isn't a RedVox file name, are returned
+    unchanged.
+
+    :param data_key: the key of a RedVox file
+    :return: the path of the file relative to the base of a structured api900/api1000 directory
+    """
+    if data_key.split("/")[0] in ("api900", "api1000"):
+        return data_key
+    file_name: str = os.path.basename(data_key)
+    stem, ext = os.path.splitext(file_name)
+    parts = stem.split("_")
+    if len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit():
+        return data_key
+    if ext == ".rdvxz":
+        dt = ms2dt(int(parts[1]))
+        return f"api900/{dt.year:04}/{dt.month:02}/{dt.day:02}/{file_name}"
+    if ext == ".rdvxm":
+        dt = us2dt(int(parts[1]))
+        return f"api1000/{dt.year:04}/{dt.month:02}/{dt.day:02}/{dt.hour:02}/{file_name}"
+    return data_key
+
+
+def download_file_resumable(
+    url: str,
+    session: requests.Session,
+    out_dir: str,
+    retries: int,
+    backoff_s: float = DEFAULT_BACKOFF_S,
+    structured: bool = True,
+) -> Tuple[str, int]:
+    """
+    Downloads a file from S3 into out_dir, streaming it to disk.
+
+    The file is written to a partial file that is renamed once the download completes.  If a partial file is left
+    over from an earlier attempt, only the missing bytes are requested.  Failed attempts caused by connection errors,
+    timeouts or server errors are retried after an exponentially increasing delay.
 
-            log.error("All retries exhausted, could not get %s", url)
-            return None
-    except Exception as e:
-        log.error("Encountered an error while getting data for %s: %s", url, str(e))
-        if retries > 0:
-            log.info("Retrying with %d retries", retries)
-            return get_file(url, retries - 1, session)
-        log.error("All retries exhausted, could not get %s", url)
-        return None
+    Raises FileExistsError if the file was already downloaded.
+
+    :param url: The URL to retrieve.
+    :param session: The HTTP session.
+    :param out_dir: The output directory where files will be stored.
+    :param retries: The number of times to retry failed file downloads.
+    :param backoff_s: Time to wait before the first retry.  Default DEFAULT_BACKOFF_S
+    :param structured: If True, store RedVox files in the structured api900/api1000 layout.  Default True
+    :return: A tuple containing the data_key and the number of bytes downloaded, or ("", 0) if the download failed.
+    """
+    data_key: str = data_key_from_url(url)
+    full_path: str = os.path.join(out_dir, structured_data_key(data_key) if structured else data_key)
+    if os.path.exists(full_path):
+        raise FileExistsError(full_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    part_path: str = full_path + PARTIAL_SUFFIX
+
+    num_bytes: int = 0
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            log.info("Retrying %s with %d retries", url, retries - attempt + 1)
+            time.sleep(backoff_delay_s(attempt, backoff_s))
+        offset: int = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # pylint: disable=W0702
+        # noinspection PyBroadException
+        try:
+            headers = {"Range": f"bytes={offset}-"} if offset > 0 else None
+            with session.get(url, headers=headers, stream=True) as resp:
+                if resp.status_code == 416 and offset > 0:
+                    # the partial file already holds every byte
+                    os.replace(part_path, full_path)
+                    return data_key, num_bytes
+                if resp.status_code not in (200, 206):
+                    log.error(
+                        "Received error response when requesting data for url=%s: %d", url, resp.status_code
+                    )
+                    if not _is_retryable(resp.status_code):
+                        break
+                    continue
+                # a server that ignores the range sends the whole file again
+                expected_bytes: Optional[str] = resp.headers.get("Content-Length")
+                received_bytes: int = 0
+                with open(part_path, "ab" if resp.status_code == 206 else "wb") as fout:
+                    for chunk in resp.iter_content(DOWNLOAD_CHUNK_BYTES):
+                        written: int = fout.write(chunk)
+                        received_bytes += written
+                        num_bytes += written
+                if expected_bytes is not None and received_bytes < int(expected_bytes):
+                    raise IOError(f"Connection closed after {received_bytes} of {expected_bytes} bytes")
+            os.replace(part_path, full_path)
+            log.debug("Wrote %s", full_path)
+            return data_key, num_bytes
+        except Exception as e:
+            log.error("Encountered an error while getting data for %s: %s", url, str(e))
+    log.error("All retries exhausted, could not get %s", url)
+    return "", num_bytes
 
 
 def download_file(
@@ -77,12 +218,7 @@ def download_file(
     buf: Optional[bytes] = get_file(url, retries, session)
 
     if buf:
-        if "/rdvxdata/" in url:
-            data_key = find_between("/rdvxdata/", "?X-Amz-Algorithm=", url)
-        else:
-            data_key = find_between(
-                "/rdvxdata.s3.amazonaws.com/", "?AWSAccessKeyId=", url
-            )
+        data_key = data_key_from_url(url)
 
         directory = os.path.dirname(data_key)
         full_dir = f"{out_dir}/{directory}"
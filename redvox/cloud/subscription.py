@@ -1,21 +1,29 @@
 """
 A simple WebSocket API for subscribing to live RedVox data.
+
+Messages received from the websocket are put on a bounded queue and decoded by a pool of worker threads.  When the
+consumer falls behind, the queue either blocks the websocket threads (backpressure) or drops the oldest messages, so
+memory use stays bounded.  Messages that can't be decoded are counted, logged and skipped, or passed to an optional
+error callback.
 """
 
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import logging
 import threading
 import time
-from typing import Optional, List, Iterator, TypeVar, Generic
-from queue import Empty, Queue
+from typing import Optional, List, Iterator, TypeVar, Generic, Callable, Dict, Union
+from queue import Empty, Full, Queue
 
 import lz4.frame  # type: ignore
+import pyarrow as pa
 from dataclasses_json import dataclass_json
 from websocket import WebSocketApp  # type: ignore
 
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
 from redvox.cloud.client import CloudClient
+from redvox.common.metadata_scan import metadata_table, strip_packet_payloads
 
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -31,8 +39,13 @@ class PubHeader:
     file_path: str
 
 
-T = TypeVar("T", bytes, RedvoxPacketM, WrappedRedvoxPacketM)
-R = TypeVar("R", RedvoxPacketM, WrappedRedvoxPacketM)
+T = TypeVar("T", bytes, RedvoxPacketM, WrappedRedvoxPacketM, pa.RecordBatch)
+R = TypeVar("R", RedvoxPacketM, WrappedRedvoxPacketM, pa.RecordBatch)
+
+# default maximum number of received messages waiting to be decoded
+DEFAULT_MAX_QUEUE_SIZE: int = 1024
+# default number of threads decoding messages
+DEFAULT_NUM_DECODE_WORKERS: int = 4
 
 
 @dataclass
@@ -71,6 +84,228 @@ class PubMsg(Generic[T]):
             return PubMsg(None, msg)
 
 
+def decode_proto(pub_msg: PubMsg[bytes]) -> PubMsg[RedvoxPacketM]:
+    """
+    :param pub_msg: a message containing a compressed RedVox packet
+    :return: the message with the decompressed and parsed packet
+    """
+    proto: RedvoxPacketM = RedvoxPacketM()
+    proto.ParseFromString(lz4.frame.decompress(pub_msg.msg, False))
+    return pub_msg.map(proto)
+
+
+def decode_packet(pub_msg: PubMsg[bytes]) -> PubMsg[WrappedRedvoxPacketM]:
+    """
+    :param pub_msg: a message containing a compressed RedVox packet
+    :return: the message with the wrapped packet
+    """
+    proto_msg: PubMsg[RedvoxPacketM] = decode_proto(pub_msg)
+    return proto_msg.map(WrappedRedvoxPacketM(proto_msg.msg))
+
+
+def decode_metadata_batch(pub_msg: PubMsg[bytes]) -> PubMsg[pa.RecordBatch]:
+    """
+    decodes the station and timing information of a packet without parsing its sensors
+
+    :param pub_msg: a message containing a compressed RedVox packet
+    :return: the message with a record batch of one row following metadata_scan.METADATA_SCHEMA
+    """
+    proto: RedvoxPacketM = RedvoxPacketM()
+    proto.ParseFromString(strip_packet_payloads(lz4.frame.decompress(pub_msg.msg, False), keep_sensors=False))
+    return pub_msg.map(metadata_table([proto]).to_batches()[0])
+
+
+@dataclass
+class SubscriptionStats:
+    """
+    Counters of a subscription pipeline.  Lag is the time between receiving a message and handing it to the consumer.
+
+    Properties:
+        received: number of messages received from the websocket
+
+        received_bytes: number of bytes received from the websocket
+
+        dropped: number of received messages dropped because the queue was full
+
+        decoded: number of messages decoded
+
+        decode_errors: number of messages that could not be decoded
+
+        delivered: number of messages handed to the consumer
+
+        max_queue_depth: the largest number of messages waiting to be decoded
+
+        last_lag_s: lag of the last delivered message in seconds
+
+        max_lag_s: largest lag of a delivered message in seconds
+
+        total_lag_s: sum of the lags of the delivered messages in seconds
+
+        start_time_s: monotonic time the pipeline started at in seconds
+    """
+
+    received: int = 0
+    received_bytes: int = 0
+    dropped: int = 0
+    decoded: int = 0
+    decode_errors: int = 0
+    delivered: int = 0
+    max_queue_depth: int = 0
+    last_lag_s: float = 0.0
+    max_lag_s: float = 0.0
+    total_lag_s: float = 0.0
+    start_time_s: float = field(default_factory=time.monotonic)
+
+    def mean_lag_s(self) -> float:
+        """
+        :return: the mean lag of the delivered messages in seconds
+        """
+        return self.total_lag_s / self.delivered if self.delivered > 0 else 0.0
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        :return: the number of messages per second received, decoded and delivered since the pipeline started
+        """
+        elapsed_s: float = max(time.monotonic() - self.start_time_s, 1e-9)
+        return {
+            "received": self.received / elapsed_s,
+            "decoded": self.decoded / elapsed_s,
+            "delivered": self.delivered / elapsed_s,
+        }
+
+
+class SubscriptionPipeline(Generic[R]):
+    """
+    Decodes received messages on a pool of threads and hands them to the consumer in the order they were received.
+
+    At most max_queue_size messages wait to be decoded and at most 2 * num_decode_workers decoded messages wait for the
+    consumer.  When the queue is full, receive either blocks until the consumer catches up, or drops the oldest waiting
+    message if drop_when_full is set.
+
+    Messages that can't be decoded are counted in stats.decode_errors and skipped.  They are logged, or passed to
+    on_error in the consumer's thread if it is set.
+    """
+
+    def __init__(
+        self,
+        decode_fn: Callable[[PubMsg[bytes]], PubMsg[R]] = decode_proto,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        num_decode_workers: int = DEFAULT_NUM_DECODE_WORKERS,
+        drop_when_full: bool = False,
+        on_error: Optional[Callable[[bytes, Exception], None]] = None,
+    ):
+        """
+        :param decode_fn: converts a received message, default decode_proto
+        :param max_queue_size: maximum number of received messages waiting to be decoded, default DEFAULT_MAX_QUEUE_SIZE
+        :param num_decode_workers: number of threads decoding messages, default DEFAULT_NUM_DECODE_WORKERS
+        :param drop_when_full: if True, drop the oldest waiting message when the queue is full instead of blocking
+                                the receiver, default False
+        :param on_error: optional function called with a message that couldn't be decoded and the error, in the order
+                            the message was received, instead of logging the error.  Default None
+        """
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be > 0")
+        if num_decode_workers <= 0:
+            raise ValueError("num_decode_workers must be > 0")
+        self.decode_fn: Callable[[PubMsg[bytes]], PubMsg[R]] = decode_fn
+        self.drop_when_full: bool = drop_when_full
+        self.on_error: Optional[Callable[[bytes, Exception], None]] = on_error
+        self.stats: SubscriptionStats = SubscriptionStats()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__received: "Queue[Optional[tuple]]" = Queue(max_queue_size)
+        self.__decoded: "Queue[Optional[tuple]]" = Queue(2 * num_decode_workers)
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(num_decode_workers)
+        self.__dispatcher: threading.Thread = threading.Thread(target=self.__dispatch, daemon=True)
+        self.__dispatcher.start()
+
+    def receive(self, msg: bytes) -> None:
+        """
+        adds a message received from the websocket to the pipeline
+
+        :param msg: the received message
+        """
+        item: tuple = (time.monotonic(), msg)
+        if self.drop_when_full:
+            while True:
+                try:
+                    self.__received.put_nowait(item)
+                    break
+                except Full:
+                    try:
+                        self.__received.get_nowait()
+                        with self.__lock:
+                            self.stats.dropped += 1
+                    except Empty:
+                        pass
+        else:
+            self.__received.put(item)
+        with self.__lock:
+            self.stats.received += 1
+            self.stats.received_bytes += len(msg)
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.__received.qsize())
+
+    def close(self) -> None:
+        """
+        stops the pipeline once the messages already received are delivered
+        """
+        self.__received.put(None)
+
+    def __decode(self, msg: bytes) -> Union[PubMsg[R], Exception]:
+        """
+        :param msg: a received message
+        :return: the decoded message, or the error raised if it couldn't be decoded
+        """
+        # pylint: disable=W0703
+        # noinspection PyBroadException
+        try:
+            decoded: PubMsg[R] = self.decode_fn(PubMsg.parse(msg))
+            with self.__lock:
+                self.stats.decoded += 1
+            return decoded
+        except Exception as ex:
+            with self.__lock:
+                self.stats.decode_errors += 1
+            return ex
+
+    def __dispatch(self) -> None:
+        """
+        submits received messages to the decode workers, keeping their futures in order
+        """
+        while True:
+            item: Optional[tuple] = self.__received.get()
+            if item is None:
+                self.__decoded.put(None)
+                self.__executor.shutdown(wait=False)
+                return
+            received_time, msg = item
+            future: Future = self.__executor.submit(self.__decode, msg)
+            self.__decoded.put((received_time, msg, future))
+
+    def __iter__(self) -> Iterator[PubMsg[R]]:
+        """
+        :return: an iterator over the decoded messages, in the order they were received
+        """
+        while True:
+            item: Optional[tuple] = self.__decoded.get()
+            if item is None:
+                return
+            received_time, msg, future = item
+            decoded: Union[PubMsg[R], Exception] = future.result()
+            if isinstance(decoded, Exception):
+                if self.on_error is None:
+                    logger.error(f"Could not decode subscription message: {decoded}")
+                else:
+                    self.on_error(msg, decoded)
+                continue
+            lag_s: float = time.monotonic() - received_time
+            with self.__lock:
+                self.stats.delivered += 1
+                self.stats.last_lag_s = lag_s
+                self.stats.max_lag_s = max(self.stats.max_lag_s, lag_s)
+                self.stats.total_lag_s += lag_s
+            yield decoded
+
+
 def fmt_uri(
     base: str,
     auth_token: str,
@@ -104,7 +339,7 @@ def fmt_uri(
 
 def subscribe_bytes_queue(
     base_uri: str,
-    queue: Queue[PubMsg[bytes]],
+    queue: Union["Queue[PubMsg[bytes]]", SubscriptionPipeline],
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_id: Optional[str] = None,
@@ -112,11 +347,16 @@ def subscribe_bytes_queue(
     """
     Create a subscription on the raw compressed bytes.
     :param base_uri: The base URI to the acquisition subscription service.
-    :param queue: A queue for transferring when received by the subscriber.
+    :param queue: A queue or a pipeline for transferring when received by the subscriber.
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_id: An optional server ID for working with distributed acquisition servers.
     """
+    on_message: Callable[[bytes], None]
+    if isinstance(queue, SubscriptionPipeline):
+        on_message = queue.receive
+    else:
+        on_message = lambda msg: queue.put(PubMsg.parse(msg))
 
     while True:
         uri: str = fmt_uri(base_uri, client.auth_token, station_ids, server_id)
@@ -124,7 +364,7 @@ def subscribe_bytes_queue(
         # noinspection PyTypeChecker
         ws_app: WebSocketApp = WebSocketApp(
             uri,
-            on_message=lambda ws, msg: queue.put(PubMsg.parse(msg)),
+            on_message=lambda ws, msg: on_message(msg),
             on_open=lambda ws: logger.info(f"Connection established for {uri}"),
             on_error=lambda ws, ex: logger.info(f"Connection error for {uri}: {ex}"),
             on_close=lambda ws, code, reason: logger.info(
@@ -153,8 +393,31 @@ def subscribe_bytes(
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
     :return: An iterator over RedVox compressed bytes instances.
     """
-    queue: Queue[PubMsg[bytes]] = Queue()
+    queue: Queue[PubMsg[bytes]] = Queue(DEFAULT_MAX_QUEUE_SIZE)
+    _start_subscriptions(base_uri, queue, client, station_ids, server_ids)
+
+    while True:
+        try:
+            yield queue.get(True)
+        except Empty:
+            break
+
 
+def _start_subscriptions(
+    base_uri: str,
+    queue: Union["Queue[PubMsg[bytes]]", SubscriptionPipeline],
+    client: CloudClient,
+    station_ids: Optional[List[str]],
+    server_ids: Optional[List[str]],
+) -> None:
+    """
+    Starts a subscription thread for every server.
+    :param base_uri: The base URI to the acquisition subscription service.
+    :param queue: A queue or a pipeline for transferring when received by the subscriber.
+    :param client: An instance of the RedVox CloudClient.
+    :param station_ids: An optional list of station IDs to subscribe to.
+    :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    """
     if server_ids is None:
         subscription_thread: threading.Thread = threading.Thread(
             target=subscribe_bytes_queue, args=(base_uri, queue, client, station_ids)
@@ -169,11 +432,27 @@ def subscribe_bytes(
             )
             subscription_thread.start()
 
-    while True:
-        try:
-            yield queue.get(True)
-        except Empty:
-            break
+
+# noinspection PyDefaultArgument
+def subscribe_pipeline(
+    base_uri: str,
+    client: CloudClient,
+    pipeline: SubscriptionPipeline[R],
+    station_ids: Optional[List[str]] = None,
+    server_ids: Optional[List[str]] = ["0", "1"],
+) -> Iterator[PubMsg[R]]:
+    """
+    Create a subscription that is decoded by the provided pipeline.  The pipeline's stats can be inspected while the
+    subscription runs.
+    :param base_uri: The base URI to the acquisition subscription service.
+    :param client: An instance of the RedVox CloudClient.
+    :param pipeline: The pipeline decoding received messages.
+    :param station_ids: An optional list of station IDs to subscribe to.
+    :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :return: An iterator over the decoded messages.
+    """
+    _start_subscriptions(base_uri, pipeline, client, station_ids, server_ids)
+    yield from pipeline
 
 
 # noinspection PyDefaultArgument
@@ -182,21 +461,30 @@ def subscribe_proto(
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_ids: Optional[List[str]] = ["0", "1"],
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    num_decode_workers: int = DEFAULT_NUM_DECODE_WORKERS,
+    drop_when_full: bool = False,
+    on_error: Optional[Callable[[bytes, Exception], None]] = None,
 ) -> Iterator[PubMsg[RedvoxPacketM]]:
     """
     Create a subscription on the RedVox packet protobuf objects (RedvoxPacketM).
+    The subscription starts when the returned iterator is first advanced.
     :param base_uri: The base URI to the acquisition subscription service.
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :param max_queue_size: The maximum number of received messages waiting to be decoded.
+    :param num_decode_workers: The number of threads decoding messages.
+    :param drop_when_full: If True, drop the oldest waiting message instead of blocking when the queue is full.
+    :param on_error: An optional function called with each message that can't be decoded and the error.  Such
+                     messages are skipped, and logged if this isn't provided.
     :return: An iterator over RedvoxPacketM instances.
     """
-    pub_msg: PubMsg[bytes]
-    for pub_msg in subscribe_bytes(base_uri, client, station_ids, server_ids):
-        decompressed_bytes: bytes = lz4.frame.decompress(pub_msg.msg, False)
-        proto: RedvoxPacketM = RedvoxPacketM()
-        proto.ParseFromString(decompressed_bytes)
-        yield pub_msg.map(proto)
+    # built once iteration starts, so no threads run until the subscription is consumed
+    pipeline: SubscriptionPipeline[RedvoxPacketM] = SubscriptionPipeline(
+        decode_proto, max_queue_size, num_decode_workers, drop_when_full, on_error
+    )
+    yield from subscribe_pipeline(base_uri, client, pipeline, station_ids, server_ids)
 
 
 # noinspection PyDefaultArgument
@@ -205,15 +493,27 @@ def subscribe_packet(
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_ids: Optional[List[str]] = ["0", "1"],
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    num_decode_workers: int = DEFAULT_NUM_DECODE_WORKERS,
+    drop_when_full: bool = False,
+    on_error: Optional[Callable[[bytes, Exception], None]] = None,
 ) -> Iterator[PubMsg[WrappedRedvoxPacketM]]:
     """
     Create a subscription on the RedVox wrapped packet objects (WrappedRedvoxPacketM).
+    The subscription starts when the returned iterator is first advanced.
     :param base_uri: The base URI to the acquisition subscription service.
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :param max_queue_size: The maximum number of received messages waiting to be decoded.
+    :param num_decode_workers: The number of threads decoding messages.
+    :param drop_when_full: If True, drop the oldest waiting message instead of blocking when the queue is full.
+    :param on_error: An optional function called with each message that can't be decoded and the error.  Such
+                     messages are skipped, and logged if this isn't provided.
     :return: An iterator over WrappedRedvoxPacketM instances.
     """
-    pub_msg: PubMsg[RedvoxPacketM]
-    for pub_msg in subscribe_proto(base_uri, client, station_ids, server_ids):
-        yield pub_msg.map(WrappedRedvoxPacketM(pub_msg.msg))
+    # built once iteration starts, so no threads run until the subscription is consumed
+    pipeline: SubscriptionPipeline[WrappedRedvoxPacketM] = SubscriptionPipeline(
+        decode_packet, max_queue_size, num_decode_workers, drop_when_full, on_error
+    )
+    yield from subscribe_pipeline(base_uri, client, pipeline, station_ids, server_ids)
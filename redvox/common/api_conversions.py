@@ -10,7 +10,7 @@ Provides functionality for converting between API versions.
 # TODO: Rework location sensor conversions
 # TODO: Add functions for converting compressed audio... in fact, this might make the most sent from converting API 900
 # TODO:   into API M data since FLAC requires integers
-from typing import List, Optional, Dict, Union
+from typing import List, Optional, Dict, Tuple, Union
 
 import numpy as np
 
@@ -225,13 +225,57 @@ def compute_stats_raw(
     stats_container.standard_deviation = values.std()
 
 
+def _location_flags_900_raw(
+    packet: api_900.RedvoxPacket, loc_900: api_900.UnevenlySampledChannel
+) -> Tuple[bool, bool, bool, bool]:
+    """
+    The location flags were historically compared with the value of the last metadata entry of the barometer channel,
+    or of the microphone channel if the barometer has no metadata, instead of their own value.  That comparison is
+    kept so converted packets don't change.
+
+    :param packet: API 900 packet
+    :param loc_900: location channel of the packet
+    :return: the useLocation, desiredLocation, permissionLocation and enabledLocation flags of the location channel
+    """
+    compared_value: Optional[str] = None
+    barometer_900 = reader_utils.find_uneven_channel_raw(packet, {api_900.ChannelType.BAROMETER})
+    for channel in [packet.evenly_sampled_channels[0], barometer_900]:
+        if channel is not None and len(channel.metadata) > 0:
+            last_key: int = (len(channel.metadata) - 1) // 2 * 2
+            compared_value = channel.metadata[last_key + 1] if last_key + 1 < len(channel.metadata) else ""
+    metadata: List[str] = list(loc_900.metadata)
+    # noinspection PyTypeChecker
+    return tuple(
+        reader_utils.get_metadata_or_default(metadata, key, lambda val: compared_value == "T", False)
+        for key in ["useLocation", "desiredLocation", "permissionLocation", "enabledLocation"]
+    )
+
+
+def location_provider_900_raw(packet: api_900.RedvoxPacket, loc_900: api_900.UnevenlySampledChannel) -> int:
+    """
+    :param packet: API 900 packet
+    :param loc_900: location channel of the packet
+    :return: the API M location provider of the samples of the location channel
+    """
+    use_location, desired_location, permission_location, enabled_location = _location_flags_900_raw(packet, loc_900)
+    if desired_location:
+        return api_m.RedvoxPacketM.Sensors.Location.LocationProvider.USER
+    elif enabled_location:
+        return api_m.RedvoxPacketM.Sensors.Location.LocationProvider.GPS
+    elif use_location and desired_location and permission_location:
+        return api_m.RedvoxPacketM.Sensors.Location.LocationProvider.NETWORK
+    return api_m.RedvoxPacketM.Sensors.Location.LocationProvider.NONE
+
+
 # noinspection DuplicatedCode
-def convert_api_900_to_1000_raw(packet: api_900.RedvoxPacket) -> api_m.RedvoxPacketM:
+def convert_api_900_metadata_to_1000_raw(packet: api_900.RedvoxPacket) -> api_m.RedvoxPacketM:
     """
-    Converts a wrapped API 900 packet into a wrapped API M packet.
+    Converts the metadata of an API 900 packet into an API M packet without sensor samples.  The station information,
+    timing information (including the synch exchanges) and the description of the audio sensor are converted; the
+    audio samples and the other sensors are not.
 
     :param packet: API 900 packet to convert.
-    :return: A wrapped API M packet.
+    :return: An API M packet without sensor samples.
     """
     packet_m: api_m.RedvoxPacketM = api_m.RedvoxPacketM()
 
@@ -397,14 +441,31 @@ def convert_api_900_to_1000_raw(packet: api_900.RedvoxPacket) -> api_m.RedvoxPac
     )
     packet_m.sensors.audio.bits_of_precision = 16.0
     packet_m.sensors.audio.encoding = "counts"
+    for i in range(0, len(audio_900.metadata), 2):
+        v: str = audio_900.metadata[i + 1] if (i + 1) < len(audio_900.metadata) else ""
+        packet_m.sensors.audio.metadata[audio_900.metadata[i]] = v
+
+    return packet_m
+
+
+# noinspection DuplicatedCode
+def convert_api_900_to_1000_raw(packet: api_900.RedvoxPacket) -> api_m.RedvoxPacketM:
+    """
+    Converts a wrapped API 900 packet into a wrapped API M packet.
+
+    :param packet: API 900 packet to convert.
+    :return: A wrapped API M packet.
+    """
+    packet_m: api_m.RedvoxPacketM = convert_api_900_metadata_to_1000_raw(packet)
+
+    # Sensors
+    # Microphone / Audio
+    audio_900: api_900.EvenlySampledChannel = packet.evenly_sampled_channels[0]
     normalized_audio: np.ndarray = (
         reader_utils.extract_payload(audio_900) / _NORMALIZATION_CONSTANT
     )
     packet_m.sensors.audio.samples.values[:] = list(normalized_audio)
     packet_m.sensors.audio.samples.unit = api_m.RedvoxPacketM.Unit.NORMALIZED_COUNTS
-    for i in range(0, len(audio_900.metadata), 2):
-        v: str = audio_900.metadata[i + 1] if (i + 1) < len(audio_900.metadata) else ""
-        packet_m.sensors.audio.metadata[audio_900.metadata[i]] = v
     compute_stats_raw(packet_m.sensors.audio.samples)
 
     # Pressure
@@ -580,35 +641,10 @@ def convert_api_900_to_1000_raw(packet: api_900.RedvoxPacket) -> api_m.RedvoxPac
         compute_stats_raw(packet_m.sensors.location.bearing_accuracy_samples)
 
         # Bookkeeping
-        use_location: bool = reader_utils.get_metadata_or_default(
-            list(loc_900.metadata), "useLocation", lambda val: v == "T", False
-        )
-        desired_location: bool = reader_utils.get_metadata_or_default(
-            list(loc_900.metadata), "desiredLocation", lambda val: v == "T", False
-        )
-        permission_location: bool = reader_utils.get_metadata_or_default(
-            list(loc_900.metadata), "permissionLocation", lambda val: v == "T", False
-        )
-        enabled_location: bool = reader_utils.get_metadata_or_default(
-            list(loc_900.metadata), "enabledLocation", lambda val: v == "T", False
-        )
-
-        if desired_location:
-            packet_m.sensors.location.location_providers[:] = [
-                api_m.RedvoxPacketM.Sensors.Location.LocationProvider.USER
-            ] * total_samples
-        elif enabled_location:
-            packet_m.sensors.location.location_providers[:] = [
-                api_m.RedvoxPacketM.Sensors.Location.LocationProvider.GPS
-            ] * total_samples
-        elif use_location and desired_location and permission_location:
-            packet_m.sensors.location.location_providers[:] = [
-                api_m.RedvoxPacketM.Sensors.Location.LocationProvider.NETWORK
-            ] * total_samples
-        else:
-            packet_m.sensors.location.location_providers[:] = [
-                api_m.RedvoxPacketM.Sensors.Location.LocationProvider.NONE
-            ] * total_samples
+        use_location, desired_location, permission_location, _ = _location_flags_900_raw(packet, loc_900)
+        packet_m.sensors.location.location_providers[:] = [
+            location_provider_900_raw(packet, loc_900)
+        ] * total_samples
 
         packet_m.sensors.location.location_permissions_granted = permission_location
         packet_m.sensors.location.location_services_enabled = use_location
@@ -14,6 +14,8 @@ import redvox.settings as settings
 import redvox.api1000.proto.redvox_api_m_pb2 as api_m
 import redvox.common.date_time_utils as dtu
 from redvox.common import io, api_conversions as ac
+from redvox.common.index_cache import index_structured_cached, index_unstructured_cached
+from redvox.common.metadata_scan import stream_packet_metadata
 from redvox.common.parallel_utils import maybe_parallel_map
 from redvox.common.station import Station, STATION_ID_LENGTH
 from redvox.common.reader_session_model import ModelsContainer
@@ -95,6 +97,9 @@ class ApiReader:
         session_models: ModelContainer for cloud and local session models.
 
         debug: bool, if True, output additional information during function execution.  Default False.
+
+        use_index_cache: bool, if True, keep a persistent index of the files in base_dir and only rescan the
+        directories that changed since the last read.  Default False.
     """
 
     def __init__(
@@ -104,6 +109,7 @@ class ApiReader:
         read_filter: io.ReadFilter = None,
         debug: bool = False,
         pool: Optional[multiprocessing.pool.Pool] = None,
+        use_index_cache: bool = False,
     ):
         """
         Initialize the ApiReader object
@@ -113,9 +119,9 @@ class ApiReader:
                                 api formats.  If False, base_dir only has the data files.  Default False.
         :param read_filter: ReadFilter for the data files, if None, get everything.  Default None
         :param debug: if True, output program warnings/errors during function execution.  Default False.
+        :param pool: optional multiprocessing pool
+        :param use_index_cache: if True, use a persistent index cache stored in base_dir.  Default False.
         """
-        _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-
         if read_filter:
             self.filter: io.ReadFilter = read_filter
             if self.filter.station_ids:
@@ -129,44 +135,48 @@ class ApiReader:
         self.base_dir: str = base_dir
         self.structured_dir: bool = structured_dir
         self.debug: bool = debug
+        self.use_index_cache: bool = use_index_cache
         self.errors: RedVoxExceptions = RedVoxExceptions("APIReader")
         self.session_models: ModelsContainer = ModelsContainer()
-        self.files_index: List[io.Index] = self._get_all_files(_pool)
+        self.files_index: List[io.Index] = self._get_all_files(pool)
         self.index_summary: io.IndexSummary = io.IndexSummary.from_index(self._flatten_files_index())
-        if len(self.files_index) > 0:
-            mem_split_factor = len(self.files_index) if settings.is_parallelism_enabled() else 1
-            self.chunk_limit = psutil.virtual_memory().available * PERCENT_FREE_MEM_USE / mem_split_factor
-            max_file_size = max([fe.decompressed_file_size_bytes for fi in self.files_index for fe in fi.entries])
-            total_est_size = max_file_size * sum([len(fi.entries) for fi in self.files_index])
-            if max_file_size > self.chunk_limit:
-                raise MemoryError(
-                    f"System requires {max_file_size} bytes of memory to process a file but only has "
-                    f"{self.chunk_limit} available.  Please free or add more RAM."
-                )
-            elif total_est_size / mem_split_factor > self.chunk_limit:
-                raise MemoryError(
-                    f"{total_est_size} of data requested, but only {self.chunk_limit} available; "
-                    f"please reduce the amount of data you are requesting."
-                )
-            if debug:
-                if mem_split_factor == 1:
-                    print(
-                        f"{len(self.files_index)} stations have {int(self.chunk_limit)} "
-                        f"bytes for loading files in memory."
-                    )
-                else:
-                    print(
-                        f"{mem_split_factor} stations each have "
-                        f"{int(self.chunk_limit)} bytes for loading files in memory."
-                    )
-        else:
-            self.chunk_limit = 0
+        # stations are read one file at a time, so all the data doesn't have to fit in memory while reading
+        self.chunk_limit: float = self._check_memory_limits(check_total_size=False)
 
         if debug:
             self.errors.print()
 
-        if pool is None:
-            _pool.close()
+    def _check_memory_limits(self, check_total_size: bool = True) -> float:
+        """
+        compute the amount of memory each station can use and make sure the requested data fits in it.
+        Raises a MemoryError if a single file can't be processed, or if check_total_size is True and all the
+        data can't be held in memory at once.
+
+        :param check_total_size: if True, check that all the requested data fits in memory.  Default True
+        :return: the number of bytes of memory available to each station, or 0 if there are no files
+        """
+        if len(self.files_index) < 1:
+            return 0
+        mem_split_factor = len(self.files_index) if settings.is_parallelism_enabled() else 1
+        chunk_limit = psutil.virtual_memory().available * PERCENT_FREE_MEM_USE / mem_split_factor
+        max_file_size = max([fe.decompressed_file_size_bytes for fi in self.files_index for fe in fi.entries])
+        total_est_size = max_file_size * sum([len(fi.entries) for fi in self.files_index])
+        if max_file_size > chunk_limit:
+            raise MemoryError(
+                f"System requires {max_file_size} bytes of memory to process a file but only has "
+                f"{chunk_limit} available.  Please free or add more RAM."
+            )
+        elif check_total_size and total_est_size / mem_split_factor > chunk_limit:
+            raise MemoryError(
+                f"{total_est_size} of data requested, but only {chunk_limit} available; "
+                f"please reduce the amount of data you are requesting."
+            )
+        if self.debug:
+            if mem_split_factor == 1:
+                print(f"{len(self.files_index)} stations have {int(chunk_limit)} bytes for loading files in memory.")
+            else:
+                print(f"{mem_split_factor} stations each have {int(chunk_limit)} bytes for loading files in memory.")
+        return chunk_limit
 
     def _flatten_files_index(self):
         """
@@ -244,10 +254,9 @@ class ApiReader:
 
         :return: index with all the files that match the filter
         """
-        _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
         index: List[io.Index] = []
         # this guarantees that all ids we search for are valid
-        all_index = self._apply_filter(pool=_pool)
+        all_index = self._apply_filter(pool=pool)
         all_index_ids = all_index.summarize().station_ids()
         # get models using the cloud to correct timing
         self._get_cloud_models(all_index_ids)
@@ -267,7 +276,7 @@ class ApiReader:
                     continue  # if nothing found, just skip the index
                 # attempt to make a session model using local data.  if failure, use what we got initially.
                 try:
-                    stats = SessionModel().create_from_stream(self.read_files_in_index(id_index))
+                    stats = SessionModel().create_from_stream(list(stream_packet_metadata(id_index)))
                     checked_index = self._reset_index(stats.cloud_session)
                     self.session_models.add_local_session(stats)
                 except (RedVoxError, Exception):
@@ -277,9 +286,6 @@ class ApiReader:
             if len(checked_index.entries) > 0:
                 index.append(checked_index)
 
-        if pool is None:
-            _pool.close()
-
         if len(all_index_ids) > 0:
             self.filter.station_ids = set(all_index_ids)
 
@@ -296,15 +302,17 @@ class ApiReader:
         :param reader_filter: optional filter; if None, use the reader's filter, default None
         :return: index of the filtered files
         """
-        _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
         if not reader_filter:
             reader_filter = self.filter
-        if self.structured_dir:
-            index = io.index_structured(self.base_dir, reader_filter, pool=_pool)
+        if self.use_index_cache:
+            if self.structured_dir:
+                index = index_structured_cached(self.base_dir, reader_filter)
+            else:
+                index = index_unstructured_cached(self.base_dir, reader_filter)
+        elif self.structured_dir:
+            index = io.index_structured(self.base_dir, reader_filter, pool=pool)
         else:
-            index = io.index_unstructured(self.base_dir, reader_filter, pool=_pool)
-        if pool is None:
-            _pool.close()
+            index = io.index_unstructured(self.base_dir, reader_filter, pool=pool)
         return index
 
     def _redo_index(self, station_ids: set, new_start: datetime, new_end: datetime) -> Optional[io.Index]:
@@ -331,28 +339,6 @@ class ApiReader:
             return new_index
         return None
 
-    def _split_workload(self, findex: io.Index) -> List[io.Index]:
-        """
-        takes an index and splits it into chunks based on a size limit
-        while running_total + next_file_size < limit, adds files to a chunk (Index)
-        if limit is exceeded, adds the chunk and puts the next file into a new chunk
-
-        :param findex: index of files to split
-        :return: list of Index to process
-        """
-        packet_list = []
-        chunk_queue = 0
-        chunk_list = []
-        for f in findex.entries:
-            chunk_queue += f.decompressed_file_size_bytes
-            if chunk_queue > self.chunk_limit:
-                packet_list.append(io.Index(chunk_list))
-                chunk_queue = 0
-                chunk_list = []
-            chunk_list.append(f)
-        packet_list.append(io.Index(chunk_list))
-        return packet_list
-
     @staticmethod
     def read_files_in_index(indexf: io.Index) -> List[api_m.RedvoxPacketM]:
         """
@@ -360,22 +346,7 @@ class ApiReader:
 
         :return: list of RedvoxPacketM, converted from API 900 if necessary
         """
-        result: List[api_m.RedvoxPacketM] = []
-
-        # Iterate over the API 900 packets in a memory efficient way
-        # and convert to API 1000
-        # noinspection PyTypeChecker
-        for packet_900 in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_900})):
-            # noinspection Mypy
-            result.append(ac.convert_api_900_to_1000_raw(packet_900))
-
-        # Grab the API 1000 packets
-        # noinspection PyTypeChecker
-        for packet in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_1000})):
-            # noinspection Mypy
-            result.append(packet)
-
-        return result
+        return indexf.read_contents()
 
     # noinspection PyTypeChecker
     def read_files_by_id(self, station_id: str) -> Optional[List[api_m.RedvoxPacketM]]:
@@ -407,10 +378,15 @@ class ApiReader:
 
     def _station_by_index(self, findex: io.Index) -> Station:
         """
+        files are read one at a time; only the data of the station is kept in memory
+
         :param findex: index with files to build a station with
         :return: Station built from files in findex
         """
-        return Station.create_from_packets(self.read_files_in_index(findex))
+        if len(findex.entries) > 0:
+            return Station.create_from_indexes([findex])
+        self.errors.append("No files found to create station.")
+        return Station()
 
     def get_stations(self, pool: Optional[multiprocessing.pool.Pool] = None) -> List[Station]:
         """
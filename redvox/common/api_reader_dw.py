@@ -31,6 +31,7 @@ class ApiReaderDw(ApiReader):
         dw_save_mode: io.FileSystemSaveMode = io.FileSystemSaveMode.TEMP,
         debug: bool = False,
         pool: Optional[multiprocessing.pool.Pool] = None,
+        use_index_cache: bool = False,
     ):
         """
         initialize API reader for data window
@@ -46,8 +47,10 @@ class ApiReaderDw(ApiReader):
                             this value doesn't matter.  default "." (current directory)
         :param dw_save_mode: save method for the data window.  Default "FileSystemSaveMode.TEMP"; save to temp_dir
         :param debug: if True, output program warnings/errors during function execution.  Default False.
+        :param pool: optional multiprocessing pool
+        :param use_index_cache: if True, use a persistent index cache stored in base_dir.  Default False.
         """
-        super().__init__(base_dir, structured_dir, read_filter, debug, pool)
+        super().__init__(base_dir, structured_dir, read_filter, debug, pool, use_index_cache)
         self.correct_timestamps = correct_timestamps
         self.use_model_correction = use_model_correction
         self.dw_base_dir = dw_base_dir
@@ -55,23 +58,31 @@ class ApiReaderDw(ApiReader):
         self.all_files_size = np.sum([idx.files_size() for idx in self.files_index])
         self._stations = self._read_stations()
 
+    def _check_memory_limits(self, check_total_size: bool = False) -> float:
+        """
+        compute the amount of memory each station can use.  Stations are read one file at a time and are written to
+        disk if they do not fit in memory, so only the size of a single file is checked.
+
+        :param check_total_size: if True, check that all the requested data fits in memory.  Default False
+        :return: the number of bytes of memory available to each station, or 0 if there are no files
+        """
+        return super()._check_memory_limits(check_total_size)
+
     def _station_by_index(self, findex: io.Index) -> Station:
         """
         builds station using the index of files to read
 
-        splits the index into smaller chunks if entire record cannot be held in memory
+        files are read one at a time; if the entire record cannot be held in memory, the data is written to disk
 
         :param findex: index with files to build a station with
         :return: Station built from files in findex, without building the data from parquet
         """
-        split_list = self._split_workload(findex)
-        use_temp_dir = True if len(split_list) > 1 else False
-
-        if len(split_list) > 0:
+        if len(findex.entries) > 0:
+            use_temp_dir = findex.files_size() > self.chunk_limit
             if self.debug and use_temp_dir:
                 print("Writing data to temporary disk; this may take a few minutes to complete.")
             station_from_index = Station.create_from_indexes(
-                split_list,
+                [findex],
                 correct_timestamps=self.correct_timestamps,
                 use_model_correction=self.use_model_correction,
                 base_out_dir=self.dw_base_dir,
@@ -79,8 +90,6 @@ class ApiReaderDw(ApiReader):
             )
             if self.debug:
                 print(f"station {station_from_index.id()} files read: {len(findex.entries)}")
-                if len(split_list) > 1:
-                    print(f"required making {len(split_list)} smaller segments due to memory restraints")
             if self.dw_save_mode == io.FileSystemSaveMode.MEM and use_temp_dir:
                 self.dw_save_mode = io.FileSystemSaveMode.TEMP
             return station_from_index
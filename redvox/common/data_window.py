@@ -3,7 +3,7 @@ This module creates specific time-bounded segments of data for users
 combines the base data files into a single composite object based on the user parameters
 """
 from pathlib import Path
-from typing import Optional, Set, List, Dict, Iterable
+from typing import Optional, Set, List, Dict, Iterable, Tuple, Union
 from datetime import timedelta
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
@@ -16,13 +16,16 @@ import multiprocessing
 import multiprocessing.pool
 import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 
 import redvox
+import redvox.settings as settings
 from redvox.common import run_me, io, data_window_io as dw_io, date_time_utils as dtu, gap_and_pad_utils as gpu
 from redvox.common.data_window_configuration import DataWindowConfigFile
 from redvox.common.parallel_utils import maybe_parallel_map
 from redvox.common.station import Station, STATION_ID_LENGTH
-from redvox.common.sensor_data import SensorType, SensorData
+from redvox.common.sensor_data import SensorType, SensorData, interpolate_table
 from redvox.common.api_reader_dw import ApiReaderDw
 from redvox.common.errors import RedVoxExceptions
 
@@ -32,6 +35,241 @@ DEFAULT_END_BUFFER_TD: timedelta = timedelta(minutes=2.0)  # default padding to
 DATA_DROP_DURATION_S: float = 0.2
 
 
+def _table_to_ipc(table: pa.Table) -> pa.Buffer:
+    """
+    :param table: table to serialize
+    :return: the table as an Arrow IPC stream buffer
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _table_from_source(source: Union[str, pa.Buffer, pa.Table]) -> pa.Table:
+    """
+    :param source: directory of parquet files, Arrow IPC stream buffer or table to read
+    :return: the table stored in the source
+    """
+    if isinstance(source, str):
+        return ds.dataset(source, format="parquet", exclude_invalid_files=True).to_table()
+    if isinstance(source, pa.Buffer):
+        return pa.ipc.open_stream(source).read_all()
+    return source
+
+
+def window_sensor_table(
+    table: pa.Table,
+    sensor_type: SensorType,
+    sample_interval_s: float,
+    station_id: str,
+    start_date_timestamp: float,
+    end_date_timestamp: float,
+    window_start_timestamp: Optional[float] = None,
+    window_end_timestamp: Optional[float] = None,
+    copy_edge_points: gpu.DataPointCreationMode = gpu.DataPointCreationMode.COPY,
+) -> Tuple[Optional[pa.Table], Optional[str]]:
+    """
+    truncate a sensor's data to fit between start_date_timestamp and end_date_timestamp, then add points at the
+    edges of the window.  An empty table means all the data was removed.
+
+    :param table: the sensor's data, sorted by timestamps
+    :param sensor_type: type of the sensor
+    :param sample_interval_s: sample interval of the sensor in seconds
+    :param station_id: id of the station the sensor belongs to
+    :param start_date_timestamp: start of the data to keep
+    :param end_date_timestamp: end of the data to keep, non-inclusive
+    :param window_start_timestamp: start of the DataWindow's configuration, or None if not defined.  Default None
+    :param window_end_timestamp: end of the DataWindow's configuration, or None if not defined.  Default None
+    :param copy_edge_points: how to create points at the edges of non-audio sensors.  Default COPY
+    :return: the updated table or None if the sensor does not change, and an error message or None if no error
+    """
+    if table.num_rows < 1:
+        return None, f"Data window for {station_id} {sensor_type.name} sensor has no data points!"
+    timestamps = table["timestamps"].to_numpy()
+    # get only the timestamps between the start and end timestamps
+    before_start = np.where(timestamps < start_date_timestamp)[0]
+    after_end = np.where(end_date_timestamp <= timestamps)[0]
+    # start_index is inclusive of window start
+    if len(before_start) > 0:
+        last_before_start = before_start[-1]
+        start_index = last_before_start + 1
+    else:
+        last_before_start = None
+        start_index = 0
+    # end_index is non-inclusive of window end
+    if len(after_end) > 0:
+        first_after_end = after_end[0]
+        end_index = first_after_end
+    else:
+        first_after_end = None
+        end_index = table.num_rows
+    # check if all the samples have been cut off
+    is_audio = sensor_type == SensorType.AUDIO
+    if end_index <= start_index:
+        error = (
+            f"Data window for {station_id} {'Audio' if is_audio else sensor_type.name} "
+            f"sensor has truncated all data points"
+        )
+        # adjust data window to match the conditions of the remaining data
+        if is_audio:
+            return pa.Table.from_pydict({"timestamps": []}), error
+        elif last_before_start is not None and first_after_end is None:
+            first_entry = table.slice(last_before_start, 1).to_pydict()
+            first_entry["timestamps"] = [start_date_timestamp]
+            return pa.Table.from_pydict(first_entry), error
+        elif last_before_start is None and first_after_end is not None:
+            last_entry = table.slice(first_after_end, 1).to_pydict()
+            last_entry["timestamps"] = [start_date_timestamp]
+            return pa.Table.from_pydict(last_entry), error
+        elif last_before_start is not None and first_after_end is not None:
+            return (
+                interpolate_table(
+                    table,
+                    start_date_timestamp,
+                    last_before_start,
+                    1,
+                    copy_edge_points == gpu.DataPointCreationMode.COPY,
+                ),
+                error,
+            )
+        return None, error
+    _arrow = table.slice(start_index, end_index - start_index)
+    # if sensor is audio or location, we want nan'd edge points
+    if sensor_type in [SensorType.LOCATION, SensorType.AUDIO]:
+        new_point_mode = gpu.DataPointCreationMode.NAN
+    else:
+        new_point_mode = copy_edge_points
+    # add in the data points at the edges of the window if there are defined start and/or end times
+    slice_start = _arrow["timestamps"].to_numpy()[0]
+    slice_end = _arrow["timestamps"].to_numpy()[-1]
+    # add endpoints matching the audio endpoints to the non-audio sensors.
+    if not is_audio:
+        end_sample_interval = end_date_timestamp - slice_end
+        end_samples_to_add = 1
+        start_sample_interval = start_date_timestamp - slice_start
+        start_samples_to_add = 1
+    else:
+        end_sample_interval = dtu.seconds_to_microseconds(sample_interval_s)
+        start_sample_interval = -end_sample_interval
+        end_samples_to_add = (
+            int((window_end_timestamp - slice_end) / end_sample_interval) if window_end_timestamp is not None else 0
+        )
+        start_samples_to_add = (
+            int((slice_start - window_start_timestamp) / end_sample_interval)
+            if window_start_timestamp is not None
+            else 0
+        )
+    # add to end
+    _arrow = gpu.add_data_points_to_df(
+        data_table=_arrow,
+        start_index=_arrow.num_rows - 1,
+        sample_interval_micros=end_sample_interval,
+        num_samples_to_add=end_samples_to_add,
+        point_creation_mode=new_point_mode,
+    )
+    # add to begin
+    _arrow = gpu.add_data_points_to_df(
+        data_table=_arrow,
+        start_index=0,
+        sample_interval_micros=start_sample_interval,
+        num_samples_to_add=start_samples_to_add,
+        point_creation_mode=new_point_mode,
+    )
+    return pc.take(_arrow, pc.sort_indices(_arrow, sort_keys=[("timestamps", "ascending")])), None
+
+
+@dataclass
+class StationWindowTask:
+    """
+    The sensor data of a single station and the parameters needed to fit it into a DataWindow.
+    The audio sensor, if it exists, is always the first sensor.
+
+    Properties:
+        station_id: str, id of the station
+
+        sensor_types: List of SensorType, the type of each sensor
+
+        sample_intervals_s: List of float, the sample interval in seconds of each sensor
+
+        sources: List of the directory of parquet files, Arrow IPC stream buffer or table with each sensor's data
+
+        start_timestamp: float, start of the window in microseconds since epoch UTC
+
+        end_timestamp: float, non-inclusive end of the window in microseconds since epoch UTC
+
+        window_start_timestamp: Optional float, start of the DataWindow's configuration, default None
+
+        window_end_timestamp: Optional float, end of the DataWindow's configuration, default None
+
+        copy_edge_points: DataPointCreationMode, how to create points at the edges of non-audio sensors.
+        default COPY
+
+        use_ipc: bool, if True, return the updated data as Arrow IPC stream buffers.  default False
+    """
+
+    station_id: str
+    sensor_types: List[SensorType]
+    sample_intervals_s: List[float]
+    sources: List[Union[str, pa.Buffer, pa.Table]]
+    start_timestamp: float
+    end_timestamp: float
+    window_start_timestamp: Optional[float] = None
+    window_end_timestamp: Optional[float] = None
+    copy_edge_points: gpu.DataPointCreationMode = gpu.DataPointCreationMode.COPY
+    use_ipc: bool = False
+
+
+def window_station(task: StationWindowTask) -> Tuple[List[Optional[Union[pa.Buffer, pa.Table]]], List[str]]:
+    """
+    fit the data of a station into a DataWindow.  The audio sensor is truncated to the window, then every other
+    sensor is truncated to the remaining audio data.  Can be run in a separate process.
+
+    :param task: the station's data and window parameters
+    :return: the updated data of each sensor in the same order as the task's sensors, or None if the sensor does
+                not change, and the errors encountered
+    """
+    results: List[Optional[pa.Table]] = [None] * len(task.sources)
+    errors: List[str] = []
+    if len(task.sensor_types) < 1 or task.sensor_types[0] != SensorType.AUDIO:
+        return results, errors
+    audio_table = _table_from_source(task.sources[0])
+    results[0], error = window_sensor_table(
+        audio_table,
+        SensorType.AUDIO,
+        task.sample_intervals_s[0],
+        task.station_id,
+        task.start_timestamp,
+        task.end_timestamp,
+        task.window_start_timestamp,
+        task.window_end_timestamp,
+        task.copy_edge_points,
+    )
+    if error:
+        errors.append(error)
+    if results[0] is not None:
+        audio_table = results[0]
+    if audio_table.num_rows > 0:
+        audio_timestamps = audio_table["timestamps"].to_numpy()
+        for i in range(1, len(task.sources)):
+            results[i], error = window_sensor_table(
+                _table_from_source(task.sources[i]),
+                task.sensor_types[i],
+                task.sample_intervals_s[i],
+                task.station_id,
+                audio_timestamps[0],
+                audio_timestamps[-1],
+                task.window_start_timestamp,
+                task.window_end_timestamp,
+                task.copy_edge_points,
+            )
+            if error:
+                errors.append(error)
+    if task.use_ipc:
+        return [None if r is None else _table_to_ipc(r) for r in results], errors
+    return results, errors
+
+
 @dataclass_json
 @dataclass
 class EventOrigin:
@@ -243,7 +481,7 @@ class DataWindow:
 
     Protected:
         _fs_writer: DataWindowFileSystemWriter; includes event_name, output directory (Default "."),
-        output type (options: "PARQUET", "LZ4", "JSON", "NONE".  Default NONE), and option to make a
+        output type (options: "PARQUET", "ARROW", "LZ4", "JSON", "NONE".  Default NONE), and option to make a
         runme.py example file (Default False)
 
         _stations: List of Stations that belong to the DataWindow
@@ -272,7 +510,7 @@ class DataWindow:
         :param config: Optional DataWindowConfig which describes how to extract data from Redvox files.
                         Default None
         :param output_dir: output directory for saving files.  Default "." (current directory)
-        :param out_type: type of file to save the DataWindow as.  Options: "PARQUET", "LZ4", "JSON", "NONE".
+        :param out_type: type of file to save the DataWindow as.  Options: "PARQUET", "ARROW", "LZ4", "JSON", "NONE".
                             Default "NONE" (no saving)
         :param make_runme: if True, saves an example runme.py file with the data.  Default False
         :param debug: if True, outputs additional information during initialization.  Default False
@@ -358,7 +596,7 @@ class DataWindow:
 
     def set_out_type(self, new_out_type: str):
         """
-        set the output type of the DataWindow.  options are "NONE", "PARQUET", "LZ4" and "JSON".
+        set the output type of the DataWindow.  options are "NONE", "PARQUET", "ARROW", "LZ4" and "JSON".
         Invalid values become "NONE"
 
         :param new_out_type: new output type of the DataWindow
@@ -509,7 +747,11 @@ class DataWindow:
             )
         else:
             out_type = dw_io.DataWindowOutputType.str_to_type(json_dict["out_type"])
-            if out_type == dw_io.DataWindowOutputType.PARQUET or out_type == dw_io.DataWindowOutputType.JSON:
+            if out_type in [
+                dw_io.DataWindowOutputType.PARQUET,
+                dw_io.DataWindowOutputType.JSON,
+                dw_io.DataWindowOutputType.ARROW,
+            ]:
                 dwin = DataWindow(
                     json_dict["event_name"],
                     EventOrigin.from_dict(json_dict["event_origin"]),
@@ -534,6 +776,7 @@ class DataWindow:
         """
         save the DataWindow to disk if saving is enabled
         if saving is not enabled, adds an error to the DataWindow and returns an empty path.
+        saving as "arrow" rewrites the data files of the sensors as Arrow files, which the sensors use from then on.
 
         :return: the path to where the files exist; an empty path means no files were saved
         """
@@ -544,6 +787,8 @@ class DataWindow:
                 )
             if self._fs_writer.file_extension in ["parquet", "json"]:
                 return self._to_json_file()
+            elif self._fs_writer.file_extension == "arrow":
+                return dw_io.data_window_to_arrow(self, self.save_dir())
             elif self._fs_writer.file_extension == "lz4":
                 return self.serialize()
         else:
@@ -706,10 +951,6 @@ class DataWindow:
         updates the DataWindow to contain only the data within the window parameters
         stations without audio or any data outside the window are removed
         """
-        # Let's create and manage a single pool of workers that we can utilize throughout
-        # the instantiation of the data window.
-        _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-
         r_f = io.ReadFilter()
         if self._config.start_datetime:
             r_f.with_start_dt(self._config.start_datetime)
@@ -741,7 +982,7 @@ class DataWindow:
             dw_base_dir=self.save_dir(),
             dw_save_mode=self._fs_writer.save_mode(),
             debug=self.debug,
-            pool=_pool,
+            pool=pool,
         )
 
         # self._errors.extend_error(a_r.errors)
@@ -757,8 +998,16 @@ class DataWindow:
         sts = a_r.get_stations()
         if self.debug:
             print("number of stations loaded: ", len(sts))
-        for st in maybe_parallel_map(_pool, lambda s: s, iter(sts), chunk_size=1):
-            self.create_window_in_sensors(st, self._config.start_datetime, self._config.end_datetime)
+        use_ipc = settings.is_parallelism_enabled() and len(sts) > 1
+        tasks = (
+            self._station_window_task(st, self._config.start_datetime, self._config.end_datetime, use_ipc)
+            for st in sts
+        )
+        for st, (tables, errors) in zip(
+            sts,
+            maybe_parallel_map(pool, window_station, tasks, lambda: len(sts) > 1, chunk_size=1),
+        ):
+            self._apply_window_results(st, tables, errors)
             if self.debug:
                 print("station processed: ", st.id())
 
@@ -782,10 +1031,6 @@ class DataWindow:
                 np.max([t.last_data_timestamp() for t in self._stations]) + 1
             )
 
-        # If the pool was created by this function, then it needs to managed by this function.
-        if pool is None:
-            _pool.close()
-
     def _check_for_audio(self):
         """
         removes any station without audio data from the DataWindow
@@ -814,34 +1059,68 @@ class DataWindow:
                 if ids.zfill(STATION_ID_LENGTH) not in [i.id() for i in self._stations]:
                     self._errors.append(f"Requested {ids} but there is no data to read for that station")
 
-    def create_window_in_sensors(
+    def _station_window_task(
         self,
         station: Station,
         start_datetime: Optional[dtu.datetime] = None,
         end_datetime: Optional[dtu.datetime] = None,
-    ):
+        use_ipc: bool = False,
+    ) -> StationWindowTask:
         """
-        truncate the sensors in the station to only contain data from start_datetime to end_datetime.
-
-        if the start and/or end are not specified, uses the audio start and end to truncate the other sensors.
-
-        returns nothing, updates the station in place
-
-        :param station: station object to truncate sensors of
+        :param station: station to create the task for
         :param start_datetime: datetime of start of window, default None
         :param end_datetime: datetime of end of window, default None
+        :param use_ipc: if True, sensors kept in memory are sent as Arrow IPC stream buffers.  Default False
+        :return: the task that fits the station's sensors into the window
+        """
+        sensors = [s for s in station.data() if s.type() == SensorType.AUDIO] + [
+            s for s in station.data() if s.type() != SensorType.AUDIO
+        ]
+        sources = []
+        for sensor in sensors:
+            if sensor.fs_writer().is_save_disk() and sensor.file_format() == "parquet":
+                sources.append(sensor.save_dir())
+            else:
+                sources.append(_table_to_ipc(sensor.pyarrow_table()) if use_ipc else sensor.pyarrow_table())
+        return StationWindowTask(
+            station.id(),
+            [s.type() for s in sensors],
+            [s.sample_interval_s() for s in sensors],
+            sources,
+            dtu.datetime_to_epoch_microseconds_utc(start_datetime) if start_datetime else 0,
+            dtu.datetime_to_epoch_microseconds_utc(end_datetime if end_datetime else dtu.datetime.max),
+            dtu.datetime_to_epoch_microseconds_utc(self._config.start_datetime)
+            if self._config.start_datetime
+            else None,
+            dtu.datetime_to_epoch_microseconds_utc(self._config.end_datetime) if self._config.end_datetime else None,
+            self._config.copy_edge_points,
+            use_ipc,
+        )
+
+    def _apply_window_results(
+        self, station: Station, tables: List[Optional[Union[pa.Buffer, pa.Table]]], errors: List[str]
+    ):
         """
-        start_datetime = dtu.datetime_to_epoch_microseconds_utc(start_datetime) if start_datetime else 0
-        end_datetime = dtu.datetime_to_epoch_microseconds_utc(end_datetime if end_datetime else dtu.datetime.max)
-        self.process_sensor(station.audio_sensor(), station.id(), start_datetime, end_datetime)
+        updates the station's sensors with the results of window_station, then adds the station to the DataWindow
+        if it still has audio data.
+
+        :param station: station to update
+        :param tables: updated data of each sensor, in the order returned by window_station
+        :param errors: errors encountered while creating the window
+        """
+        sensors = [s for s in station.data() if s.type() == SensorType.AUDIO] + [
+            s for s in station.data() if s.type() != SensorType.AUDIO
+        ]
+        for sensor, table in zip(sensors, tables):
+            if table is not None:
+                table = _table_from_source(table)
+                if table.num_rows < 1:
+                    sensor.empty_data_table()
+                else:
+                    sensor.write_pyarrow_table(table)
+        for error in errors:
+            self._errors.append(error)
         if station.has_audio_data():
-            for sensor in [s for s in station.data() if s.type() != SensorType.AUDIO]:
-                self.process_sensor(
-                    sensor,
-                    station.id(),
-                    station.audio_sensor().first_data_timestamp(),
-                    station.audio_sensor().last_data_timestamp(),
-                )
             # recalculate metadata
             station.update_first_and_last_data_timestamps()
             station.set_packet_metadata(
@@ -858,6 +1137,27 @@ class DataWindow:
                 station.set_save_dir(self.save_dir() if self._fs_writer.is_use_disk() else self._fs_writer.get_temp())
             self._stations.append(station)
 
+    def create_window_in_sensors(
+        self,
+        station: Station,
+        start_datetime: Optional[dtu.datetime] = None,
+        end_datetime: Optional[dtu.datetime] = None,
+    ):
+        """
+        truncate the sensors in the station to only contain data from start_datetime to end_datetime.
+
+        if the start and/or end are not specified, uses the audio start and end to truncate the other sensors.
+
+        returns nothing, updates the station in place
+
+        :param station: station object to truncate sensors of
+        :param start_datetime: datetime of start of window, default None
+        :param end_datetime: datetime of end of window, default None
+        """
+        self._apply_window_results(
+            station, *window_station(self._station_window_task(station, start_datetime, end_datetime))
+        )
+
     def process_sensor(
         self, sensor: SensorData, station_id: str, start_date_timestamp: float, end_date_timestamp: float
     ):
@@ -869,105 +1169,26 @@ class DataWindow:
         :param start_date_timestamp: start of DataWindow
         :param end_date_timestamp: end of DataWindow
         """
-        if sensor.num_samples() > 0:
-            # get only the timestamps between the start and end timestamps
-            before_start = np.where(sensor.data_timestamps() < start_date_timestamp)[0]
-            after_end = np.where(end_date_timestamp <= sensor.data_timestamps())[0]
-            # start_index is inclusive of window start
-            if len(before_start) > 0:
-                last_before_start = before_start[-1]
-                start_index = last_before_start + 1
-            else:
-                last_before_start = None
-                start_index = 0
-            # end_index is non-inclusive of window end
-            if len(after_end) > 0:
-                first_after_end = after_end[0]
-                end_index = first_after_end
-            else:
-                first_after_end = None
-                end_index = sensor.num_samples()
-            # check if all the samples have been cut off
-            is_audio = sensor.type() == SensorType.AUDIO
-            if end_index <= start_index:
-                self._errors.append(
-                    f"Data window for {station_id} {'Audio' if is_audio else sensor.type().name} "
-                    f"sensor has truncated all data points"
-                )
-                # adjust data window to match the conditions of the remaining data
-                if is_audio:
-                    sensor.empty_data_table()
-                elif last_before_start is not None and first_after_end is None:
-                    first_entry = sensor.pyarrow_table().slice(last_before_start, 1).to_pydict()
-                    first_entry["timestamps"] = [start_date_timestamp]
-                    sensor.write_pyarrow_table(pa.Table.from_pydict(first_entry))
-                elif last_before_start is None and first_after_end is not None:
-                    last_entry = sensor.pyarrow_table().slice(first_after_end, 1).to_pydict()
-                    last_entry["timestamps"] = [start_date_timestamp]
-                    sensor.write_pyarrow_table(pa.Table.from_pydict(last_entry))
-                elif last_before_start is not None and first_after_end is not None:
-                    sensor.write_pyarrow_table(
-                        sensor.interpolate(
-                            start_date_timestamp,
-                            last_before_start,
-                            1,
-                            self._config.copy_edge_points == gpu.DataPointCreationMode.COPY,
-                        )
-                    )
+        table, error = window_sensor_table(
+            sensor.pyarrow_table(),
+            sensor.type(),
+            sensor.sample_interval_s(),
+            station_id,
+            start_date_timestamp,
+            end_date_timestamp,
+            dtu.datetime_to_epoch_microseconds_utc(self._config.start_datetime)
+            if self._config.start_datetime
+            else None,
+            dtu.datetime_to_epoch_microseconds_utc(self._config.end_datetime) if self._config.end_datetime else None,
+            self._config.copy_edge_points,
+        )
+        if error:
+            self._errors.append(error)
+        if table is not None:
+            if table.num_rows < 1:
+                sensor.empty_data_table()
             else:
-                _arrow = sensor.pyarrow_table().slice(start_index, end_index - start_index)
-                # if sensor is audio or location, we want nan'd edge points
-                if sensor.type() in [SensorType.LOCATION, SensorType.AUDIO]:
-                    new_point_mode = gpu.DataPointCreationMode.NAN
-                else:
-                    new_point_mode = self._config.copy_edge_points
-                # add in the data points at the edges of the window if there are defined start and/or end times
-                slice_start = _arrow["timestamps"].to_numpy()[0]
-                slice_end = _arrow["timestamps"].to_numpy()[-1]
-                # add endpoints matching the audio endpoints to the non-audio sensors.
-                if not is_audio:
-                    end_sample_interval = end_date_timestamp - slice_end
-                    end_samples_to_add = 1
-                    start_sample_interval = start_date_timestamp - slice_start
-                    start_samples_to_add = 1
-                else:
-                    end_sample_interval = dtu.seconds_to_microseconds(sensor.sample_interval_s())
-                    start_sample_interval = -end_sample_interval
-                    end_samples_to_add = (
-                        int(
-                            (dtu.datetime_to_epoch_microseconds_utc(self._config.end_datetime) - slice_end)
-                            / end_sample_interval
-                        )
-                        if self._config.end_datetime
-                        else 0
-                    )
-                    start_samples_to_add = (
-                        int(
-                            (slice_start - dtu.datetime_to_epoch_microseconds_utc(self._config.start_datetime))
-                            / end_sample_interval
-                        )
-                        if self._config.start_datetime
-                        else 0
-                    )
-                # add to end
-                _arrow = gpu.add_data_points_to_df(
-                    data_table=_arrow,
-                    start_index=_arrow.num_rows - 1,
-                    sample_interval_micros=end_sample_interval,
-                    num_samples_to_add=end_samples_to_add,
-                    point_creation_mode=new_point_mode,
-                )
-                # add to begin
-                _arrow = gpu.add_data_points_to_df(
-                    data_table=_arrow,
-                    start_index=0,
-                    sample_interval_micros=start_sample_interval,
-                    num_samples_to_add=start_samples_to_add,
-                    point_creation_mode=new_point_mode,
-                )
-                sensor.sort_by_data_timestamps(_arrow)
-        else:
-            self._errors.append(f"Data window for {station_id} {sensor.type().name} " f"sensor has no data points!")
+                sensor.write_pyarrow_table(table)
 
     def errors(self) -> RedVoxExceptions:
         """
@@ -45,7 +45,7 @@ class DataWindowConfigFile:
 
         output_dir: str, directory to output the data to.  Default "." (current directory)
 
-        output_type: str, type of file to output the data as.  Options are: "NONE", "PARQUET", "LZ4"
+        output_type: str, type of file to output the data as.  Options are: "NONE", "PARQUET", "ARROW", "LZ4"
         Default "NONE" (no saving).
 
         make_runme: bool, if True, save a runme.py example file along with the data.  Default False
@@ -33,6 +33,7 @@ class DataWindowOutputType(enum.Enum):
     LZ4: int = 1
     PARQUET: int = 2
     JSON: int = 3
+    ARROW: int = 4
 
     @staticmethod
     def list_names() -> List[str]:
@@ -109,7 +110,8 @@ class DataWindowFileSystemWriter(FileSystemWriter):
 
     def set_extension(self, ext: str):
         """
-        change the file extension.  Valid values are "PARQUET", "LZ4", "JSON" and "NONE".  Invalid values become "NONE"
+        change the file extension.  Valid values are "PARQUET", "ARROW", "LZ4", "JSON" and "NONE".
+        Invalid values become "NONE"
 
         :param ext: extension to change to
         """
@@ -157,6 +159,32 @@ def data_window_to_json(
         return file_path.resolve(False)
 
 
+def data_window_to_arrow(
+    data_window: "DataWindow",
+    base_dir: str = ".",
+    file_name: Optional[str] = None,
+) -> Path:
+    """
+    Writes the DataWindow as a JSON metadata file with the data of each sensor in its own uncompressed Arrow IPC
+    (Feather) file.  Loading the DataWindow memory-maps the sensor files and only reads a sensor's data when it is
+    used.
+
+    The sensors write their files into their own directories, so this changes the file format of every sensor in the
+    DataWindow to "arrow" and replaces their parquet files with Arrow files; the DataWindow reads the Arrow files
+    from then on.
+
+    :param data_window: The data window to write.
+    :param base_dir: The base directory to write the JSON file to (default=.).
+    :param file_name: The optional file name. If None, a default filename with the following format is used:
+                      [event_name].json
+    :return: The path to the written metadata file.
+    """
+    for s in data_window.stations():
+        for sensor in s.data():
+            sensor.set_file_format("arrow")
+    return data_window_to_json(data_window, base_dir, file_name)
+
+
 def json_file_to_data_window(file_path: str) -> Dict:
     """
     load a specifically named DataWindow as a dictionary from a directory
@@ -176,6 +204,8 @@ def serialize_data_window(
 ) -> Path:
     """
     Serializes and compresses a DataWindow to a file and creates a JSON metadata file for the compressed file.
+    The whole DataWindow must be read back into memory; use data_window_to_arrow to write a DataWindow that can be
+    loaded lazily.
 
     :param data_window: The data window to serialize and compress.
     :param base_dir: The base directory to write the serialized file to (default=.).
@@ -13,6 +13,21 @@ class RedVoxError(Exception):
     def __init__(self, message: str):
         super().__init__(f"RedVoxError: {message}")
 
+    def __reduce__(self):
+        # errors are sent between processes; unpickling must not add the prefix to the message again
+        return _unpickle_error, (self.__class__, self.args)
+
+
+def _unpickle_error(error_class: type, args: tuple) -> RedVoxError:
+    """
+    :param error_class: the class of the pickled error
+    :param args: the args of the pickled error
+    :return: the error, without calling its __init__
+    """
+    error = error_class.__new__(error_class)
+    error.args = args
+    return error
+
 
 class RedVoxExceptions:
     """
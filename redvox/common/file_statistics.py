@@ -16,18 +16,11 @@ from redvox.common.parallel_utils import maybe_parallel_map
 
 # noinspection Mypy
 if TYPE_CHECKING:
-    from redvox.api1000.wrapped_redvox_packet.sensors.audio import Audio
-    from redvox.api1000.wrapped_redvox_packet.sensors.location import Location
-    from redvox.api1000.wrapped_redvox_packet.sensors.sensors import Sensors
-    from redvox.api1000.wrapped_redvox_packet.station_information import (
-        StationInformation,
-    )
-    from redvox.api1000.wrapped_redvox_packet.timing_information import (
-        TimingInformation,
-    )
     from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
     from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
 
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+
 # noinspection Mypy
 from redvox.common.date_time_utils import datetime_from_epoch_microseconds_utc as us2dt
 
@@ -53,6 +46,10 @@ DURATION_TOTAL_POINTS: np.ndarray = np.array(POINTS_FACTOR_ARRAY * BASE_NUMBER_P
 # expected duration of packets in seconds
 DURATION_SECONDS: np.ndarray = np.divide(DURATION_TOTAL_POINTS, SAMPLE_RATE_HZ)
 
+# maximum number of files and decompressed bytes each worker reads at once when extracting stats in parallel
+STATS_CHUNK_MAX_FILES: int = 32
+STATS_CHUNK_MAX_BYTES: int = 64 * 1024 * 1024
+
 
 def get_file_stats(sample_rate: Union[float, int]) -> Tuple[int, float]:
     """
@@ -136,23 +133,6 @@ def _map_opt_numeric(
     return fn(opt)
 
 
-def _partition_list(lst: List[Any], chunks: int) -> List[Any]:
-    """
-    Partitions a list into k "chunks" of approximately equal length.
-    Adapted from: Adopted from: https://stackoverflow.com/questions/2130016/splitting-a-list-into-n-parts-of-approximately-equal-length/37414115#37414115
-
-    :param lst:
-    :param chunks:
-    :return:
-    """
-    n: int = len(lst)
-    k: int = chunks
-    return [
-        lst[i * (n // k) + min(i, n % k) : (i + 1) * (n // k) + min(i + 1, n % k)]
-        for i in range(k)
-    ]
-
-
 @dataclass
 class GpsDateTime:
     """
@@ -246,7 +226,6 @@ class StationStat:
             else 0.0,
         )
 
-    # noinspection Mypy
     @staticmethod
     def from_api_1000(packet: "WrappedRedvoxPacketM") -> "StationStat":
         """
@@ -255,19 +234,28 @@ class StationStat:
         :param packet: API 1000 packet to extract fields from.
         :return: An instance of StationStat.
         """
-        station_info: "StationInformation" = packet.get_station_information()
-        timing_info: "TimingInformation" = packet.get_timing_information()
-        sensors: "Sensors" = packet.get_sensors()
-        location_sensor: Optional["Location"] = sensors.get_location()
-        audio_sensor: Optional["Audio"] = sensors.get_audio()
+        return StationStat.from_raw_api_1000(packet.get_proto())
+
+    # noinspection Mypy
+    @staticmethod
+    def from_raw_api_1000(packet: RedvoxPacketM) -> "StationStat":
+        """
+        Extracts the required fields from an unwrapped API 1000 packet.
+
+        :param packet: API 1000 protobuf packet to extract fields from.
+        :return: An instance of StationStat.
+        """
+        station_info = packet.station_information
+        timing_info = packet.timing_information
+        sensors = packet.sensors
 
         # Optionally extract the GPS timestamps if the location sensor is available
         gps_timestamps: Optional[List[GpsDateTime]] = None
-        if location_sensor is not None:
+        if sensors.HasField("location"):
             gps_timestamps = []
-            _gps_timestamps = location_sensor.get_timestamps_gps().get_timestamps()
+            _gps_timestamps = np.array(sensors.location.timestamps_gps.timestamps)
             _gps_timestamps_len = len(_gps_timestamps)
-            for i, ts in enumerate(location_sensor.get_timestamps().get_timestamps()):
+            for i, ts in enumerate(np.array(sensors.location.timestamps.timestamps)):
                 # A GPS timestamp isn't always present in the location sensor. We can handle that here.
                 gps_ts: Optional[datetime] = (
                     us2dt(_gps_timestamps[i])
@@ -276,11 +264,11 @@ class StationStat:
                 )
                 gps_timestamps.append(GpsDateTime(us2dt(ts), gps_ts))
 
-        best_offset = timing_info.get_best_offset()
-        best_latency = timing_info.get_best_latency()
-        if len(timing_info.get_synch_exchange_array()) > 0:
+        best_offset = timing_info.best_offset
+        best_latency = timing_info.best_latency
+        if len(timing_info.synch_exchanges) > 0:
             tsd = TimeSync(
-                time_sync_exchanges_list=timing_info.get_synch_exchange_array()
+                time_sync_exchanges_list=TimeSync.exchanges_from_packet(packet)
             )
             if not best_offset or not best_latency:
                 best_offset = tsd.best_offset()
@@ -289,20 +277,43 @@ class StationStat:
         else:
             best_latency_timestamp = np.nan
 
+        sample_rate: Optional[float] = None
+        packet_duration: timedelta = timedelta(seconds=0)
+        if sensors.HasField("audio"):
+            sample_rate = sensors.audio.sample_rate
+            packet_duration = timedelta(
+                seconds=float(len(sensors.audio.samples.values)) / sample_rate
+            )
+
         return StationStat(
-            station_info.get_id(),
-            station_info.get_uuid(),
-            us2dt(timing_info.get_app_start_mach_timestamp()),
-            us2dt(timing_info.get_packet_start_mach_timestamp()),
-            us2dt(timing_info.get_server_acquisition_arrival_timestamp()),
+            station_info.id,
+            station_info.uuid,
+            us2dt(timing_info.app_start_mach_timestamp),
+            us2dt(timing_info.packet_start_mach_timestamp),
+            us2dt(timing_info.server_acquisition_arrival_timestamp),
             gps_timestamps,
             best_latency,
             best_latency_timestamp,
             best_offset,
-            _map_opt(audio_sensor, lambda sensor: sensor.get_sample_rate()),
-            packet.get_packet_duration(),
+            sample_rate,
+            packet_duration,
         )
 
+    @staticmethod
+    def from_entry(entry: io.IndexEntry) -> Optional["StationStat"]:
+        """
+        Reads the packet referenced by entry and extracts its StationStat.  API 1000 packets are read without
+        wrapping them.
+
+        :param entry: index entry of the packet to extract fields from.
+        :return: An instance of StationStat, or None if the entry is not an API 900 or API 1000 packet.
+        """
+        if entry.api_version == io.ApiVersion.API_1000:
+            return StationStat.from_raw_api_1000(entry.read_raw())
+        elif entry.api_version == io.ApiVersion.API_900:
+            return StationStat.from_api_900(entry.read())
+        return None
+
 
 # noinspection PyTypeChecker,DuplicatedCode
 def extract_stats_serial(index: io.Index) -> List[StationStat]:
@@ -325,32 +336,80 @@ def extract_stats_serial(index: io.Index) -> List[StationStat]:
     return list(stats_900) + list(stats_1000)
 
 
+def _chunk_entries(
+    entries: List[io.IndexEntry], max_files: int, max_bytes: int
+) -> List[List[io.IndexEntry]]:
+    """
+    Splits entries into consecutive chunks that hold at most max_files entries and, unless a single entry is
+    larger, at most max_bytes decompressed bytes.
+
+    :param entries: the entries to split.
+    :param max_files: the maximum number of entries per chunk.
+    :param max_bytes: the maximum total decompressed file size of a chunk.
+    :return: the chunks, in the same order as entries.
+    """
+    chunks: List[List[io.IndexEntry]] = []
+    chunk: List[io.IndexEntry] = []
+    chunk_bytes: int = 0
+    for entry in entries:
+        if len(chunk) > 0 and (
+            len(chunk) >= max_files
+            or chunk_bytes + entry.decompressed_file_size_bytes > max_bytes
+        ):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(entry)
+        chunk_bytes += entry.decompressed_file_size_bytes
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    return chunks
+
+
+def _extract_stats_chunk(entries: List[io.IndexEntry]) -> List[StationStat]:
+    """
+    Extracts StationStat information from every entry of a chunk.  Runs in the worker processes.
+
+    :param entries: the entries to read.
+    :return: A list of StationStat objects, in the same order as entries.
+    """
+    return list(map(StationStat.from_entry, entries))
+
+
 def extract_stats_parallel(
-    index: io.Index, pool: Optional[multiprocessing.pool.Pool] = None
+    index: io.Index,
+    pool: Optional[multiprocessing.pool.Pool] = None,
+    max_files_per_chunk: int = STATS_CHUNK_MAX_FILES,
+    max_bytes_per_chunk: int = STATS_CHUNK_MAX_BYTES,
 ) -> List[StationStat]:
     """
     Extracts StationStat information in parallel from packets stored in the provided index.
+    The index is split into chunks by file count and decompressed size; each free worker takes the next chunk, and
+    results are returned in the same order as extract_stats_serial.
 
     :param index: Index of packets to extract information from.
     :param pool: optional multiprocessing pool.
+    :param max_files_per_chunk: maximum number of files a worker reads at once, default STATS_CHUNK_MAX_FILES
+    :param max_bytes_per_chunk: maximum decompressed bytes a worker reads at once, default STATS_CHUNK_MAX_BYTES
     :return: A list of StationStat objects.
     """
-    # Partition the index entries by number of cores
-    num_cores: int = multiprocessing.cpu_count()
-    partitioned: List[List[io.IndexEntry]] = _partition_list(index.entries, num_cores)
-    indices: List[io.Index] = list(map(lambda entries: io.Index(entries), partitioned))
-
-    # Run da buggahs in parallel
-    # _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-    # nested: List[List[StationStat]] = _pool.map(extract_stats_serial, indices)
-    # if pool is None:
-    #     _pool.close()
+    chunks: List[List[io.IndexEntry]] = []
+    for api_version in [io.ApiVersion.API_900, io.ApiVersion.API_1000]:
+        read_filter = io.ReadFilter(api_versions={api_version})
+        chunks.extend(
+            _chunk_entries(
+                list(filter(read_filter.apply, index.entries)),
+                max_files_per_chunk,
+                max_bytes_per_chunk,
+            )
+        )
+
     nested: Iterator[List[StationStat]] = maybe_parallel_map(
         pool,
-        extract_stats_serial,
-        iter(indices),
-        lambda: len(indices) > 128,
-        chunk_size=64,
+        _extract_stats_chunk,
+        iter(chunks),
+        lambda: len(chunks) > 1,
+        chunk_size=1,
     )
     return [item for sublist in nested for item in sublist]
 
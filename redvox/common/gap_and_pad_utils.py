@@ -44,6 +44,17 @@ NON_NUMERIC_COLUMNS = [
     "wifi_wake_lock",
     "screen_state",
 ]
+# values used by the non-numeric columns when creating a data point without data
+NAN_FILL_VALUES: Dict[str, int] = {
+    "location_provider": LocationProvider["UNKNOWN"].value,
+    "image_codec": ImageCodec["UNKNOWN"].value,
+    "audio_codec": AudioCodec["UNKNOWN"].value,
+    "network_type": NetworkType["UNKNOWN_NETWORK"].value,
+    "power_state": PowerState["UNKNOWN_POWER_STATE"].value,
+    "cell_service": CellServiceState["UNKNOWN"].value,
+    "wifi_wake_lock": WifiWakeLock["NONE"].value,
+    "screen_state": ScreenState["UNKNOWN_SCREEN_STATE"].value,
+}
 
 
 # noinspection Mypy,DuplicatedCode
@@ -136,28 +147,79 @@ def check_gap_list(
     :param gaps: list of gaps to check
     :param start_timestamp: lowest possible timestamp for a gap to start at
     :param end_timestamp: lowest possible timestamp for a gap to end at
-    :return: list of correct, valid gaps
+    :return: list of correct, valid gaps, sorted by start time
     """
-    return_gaps: List[Tuple[float, float]] = []
-    for gap in gaps:
-        if start_timestamp:
-            gap = (np.max([start_timestamp, gap[0]]), np.max([start_timestamp, gap[1]]))
-        if end_timestamp:
-            gap = (np.min([end_timestamp, gap[0]]), np.min([end_timestamp, gap[1]]))
-        if gap[0] < gap[1]:
-            if len(return_gaps) < 1:
-                return_gaps.append(gap)
-            for a, r_g in enumerate(return_gaps):
-                if (gap[0] < r_g[0] and gap[1] < r_g[0]) or (gap[0] > r_g[1] and gap[1] > r_g[1]):
-                    return_gaps.append(gap)
-                    break
-                else:
-                    if gap[0] < r_g[0] < gap[1]:
-                        r_g = (gap[0], r_g[1])
-                    if gap[0] < r_g[1] < gap[1]:
-                        r_g = (r_g[0], gap[1])
-                    return_gaps[a] = r_g
-    return return_gaps
+    if len(gaps) < 1:
+        return []
+    gap_array = np.array(gaps, dtype=float).reshape(-1, 2)
+    if start_timestamp:
+        gap_array = np.maximum(gap_array, start_timestamp)
+    if end_timestamp:
+        gap_array = np.minimum(gap_array, end_timestamp)
+    gap_array = gap_array[gap_array[:, 0] < gap_array[:, 1]]
+    if len(gap_array) < 1:
+        return []
+    gap_array = gap_array[np.argsort(gap_array[:, 0], kind="stable")]
+    # a gap starts a new group if it starts at or after the end of every gap before it
+    group_ends = np.maximum.accumulate(gap_array[:, 1])
+    new_group = np.concatenate(([True], gap_array[1:, 0] >= group_ends[:-1]))
+    group_starts = np.flatnonzero(new_group)
+    group_last = np.append(group_starts[1:], len(gap_array)) - 1
+    return list(zip(gap_array[group_starts, 0].tolist(), group_ends[group_last].tolist()))
+
+
+def _gap_fill_columns(
+    arrow_df: pa.Table,
+    anchors: np.ndarray,
+    neighbors: np.ndarray,
+    new_timestamps: np.ndarray,
+    point_creation_mode: DataPointCreationMode,
+) -> pa.Table:
+    """
+    creates the data points that fill gaps in the table.  every new point is based on the data point at its anchor
+    index and the data point on the other side of the gap at its neighbor index.
+
+    :param arrow_df: pyarrow table with data.  first column is "timestamps"
+    :param anchors: index of the data point each new point is created from
+    :param neighbors: index of the data point on the other side of the gap from each anchor
+    :param new_timestamps: timestamps of the new points
+    :param point_creation_mode: the mode of point creation to use
+    :return: table of new points with the same schema as arrow_df
+    """
+    columns = []
+    if point_creation_mode == DataPointCreationMode.COPY:
+        copies = arrow_df.take(pa.array(anchors))
+        for field in arrow_df.schema:
+            columns.append(copies[field.name])
+    elif point_creation_mode == DataPointCreationMode.INTERPOLATE:
+        timestamps = arrow_df["timestamps"].to_numpy()
+        span = timestamps[neighbors] - timestamps[anchors]
+        weights = np.divide(
+            new_timestamps - timestamps[anchors], span, out=np.zeros(len(anchors)), where=span != 0
+        )
+        nearest = np.where(weights <= 0.5, anchors, neighbors)
+        for field in arrow_df.schema:
+            if field.name in NON_INTERPOLATED_COLUMNS:
+                columns.append(pa.nulls(len(anchors), field.type))
+            elif field.name in NON_NUMERIC_COLUMNS or not pa.types.is_floating(field.type):
+                columns.append(arrow_df[field.name].take(pa.array(nearest)))
+            else:
+                values = arrow_df[field.name].to_numpy()
+                columns.append(
+                    pa.array(values[anchors] + (values[neighbors] - values[anchors]) * weights, type=field.type)
+                )
+    else:
+        for field in arrow_df.schema:
+            if field.name in NAN_FILL_VALUES:
+                columns.append(pa.array(np.full(len(anchors), NAN_FILL_VALUES[field.name])).cast(field.type))
+            elif pa.types.is_floating(field.type):
+                columns.append(pa.array(np.full(len(anchors), np.nan), type=field.type))
+            else:
+                columns.append(pa.nulls(len(anchors), field.type))
+    columns[arrow_df.schema.get_field_index("timestamps")] = pa.array(
+        new_timestamps, type=arrow_df.schema.field("timestamps").type
+    )
+    return pa.Table.from_arrays(columns, schema=arrow_df.schema)
 
 
 def fill_gaps(
@@ -165,7 +227,7 @@ def fill_gaps(
 ) -> Tuple[pa.Table, List[Tuple[float, float]]]:
     """
     fills gaps in the table with np.nan or interpolated values by interpolating timestamps based on the
-    calculated sample interval
+    calculated sample interval.  all the new points are created at once, then added to the table.
 
     :param arrow_df: pyarrow table with data.  first column is "timestamps"
     :param gaps: list of tuples of known non-inclusive start and end timestamps of the gaps
@@ -182,39 +244,57 @@ def fill_gaps(
             np.floor(data_duration / sample_interval_micros)
             + (1 if data_duration % sample_interval_micros >= sample_interval_micros * DEFAULT_GAP_UPPER_LIMIT else 0)
         ) + 1
-        if expected_samples > len(data_time_stamps):
+        # make it safe to alter the gap values
+        my_gaps = check_gap_list(gaps, data_time_stamps[0], data_time_stamps[-1])
+        if expected_samples > len(data_time_stamps) and len(my_gaps) > 0:
             if fill_mode.lower() == "copy":
                 pcm = DataPointCreationMode["COPY"]
             elif fill_mode.lower() == "interpolate":
                 pcm = DataPointCreationMode["INTERPOLATE"]
             else:
                 pcm = DataPointCreationMode["NAN"]
-            # make it safe to alter the gap values
-            my_gaps = check_gap_list(gaps, data_time_stamps[0], data_time_stamps[-1])
-            for gap in my_gaps:
-                # if timestamps are around gaps, we have to update the values
-                before_start = np.argwhere([t <= gap[0] for t in data_time_stamps])
-                after_end = np.argwhere([t >= gap[1] for t in data_time_stamps])
-                if len(before_start) > 0:
-                    before_start = before_start[-1][0]
-                    # sim = gap[0] - data_time_stamps[before_start]
-                    # result_df = add_data_points_to_df(result_df, before_start, sim, point_creation_mode=pcm)
-                    gap = (data_time_stamps[before_start], gap[1])
-                else:
-                    before_start = None
-                if len(after_end) > 0:
-                    after_end = after_end[0][0]
-                    # sim = gap[1] - data_time_stamps[after_end]
-                    gap = (gap[0], data_time_stamps[after_end])
-                else:
-                    after_end = None
-                num_new_points = int((gap[1] - gap[0]) / sample_interval_micros) - 1
-                if before_start is not None:
-                    arrow_df = add_data_points_to_df(
-                        arrow_df, before_start, sample_interval_micros, num_new_points, pcm
-                    )
-                elif after_end is not None:
-                    arrow_df = add_data_points_to_df(arrow_df, after_end, -sample_interval_micros, num_new_points, pcm)
+            gap_array = np.array(my_gaps)
+            # if timestamps are around gaps, we have to update the values
+            before_start = np.searchsorted(data_time_stamps, gap_array[:, 0], side="right") - 1
+            after_end = np.searchsorted(data_time_stamps, gap_array[:, 1], side="left")
+            has_before = before_start >= 0
+            has_after = after_end < len(data_time_stamps)
+            gap_start = np.where(has_before, data_time_stamps[np.maximum(before_start, 0)], gap_array[:, 0])
+            gap_end = np.where(
+                has_after, data_time_stamps[np.minimum(after_end, len(data_time_stamps) - 1)], gap_array[:, 1]
+            )
+            num_new_points = np.trunc((gap_end - gap_start) / sample_interval_micros).astype(int) - 1
+            # new points are created after the last point before the gap, or before the first point after the gap
+            anchors = np.where(has_before, before_start, after_end)
+            steps = np.where(has_before, sample_interval_micros, -sample_interval_micros)
+            neighbors = np.clip(anchors + np.sign(steps).astype(int), 0, len(data_time_stamps) - 1)
+            valid = (has_before | has_after) & (num_new_points > 0)
+            anchors, steps, neighbors, num_new_points = (
+                anchors[valid],
+                steps[valid],
+                neighbors[valid],
+                num_new_points[valid],
+            )
+            if pcm == DataPointCreationMode.COPY:
+                # add_data_points_to_df creates only the copy farthest from the start point
+                offsets = num_new_points.astype(float)
+                num_new_points = np.ones(len(anchors), dtype=int)
+            else:
+                # position of each new point within its gap, starting at 1
+                offsets = np.arange(1, num_new_points.sum() + 1) - np.repeat(
+                    np.cumsum(num_new_points) - num_new_points, num_new_points
+                )
+            anchors = np.repeat(anchors, num_new_points)
+            new_timestamps = data_time_stamps[anchors] + offsets * np.repeat(steps, num_new_points)
+            if len(anchors) > 0:
+                arrow_df = pa.concat_tables(
+                    [
+                        arrow_df,
+                        _gap_fill_columns(
+                            arrow_df, anchors, np.repeat(neighbors, num_new_points), new_timestamps, pcm
+                        ),
+                    ]
+                )
         indic = pc.sort_indices(arrow_df, sort_keys=[("timestamps", "ascending")])
         return arrow_df.take(indic), gaps
     return arrow_df, gaps
@@ -342,26 +422,8 @@ def add_data_points_to_df(
             for column_index in data_table.schema.names:
                 if column_index == "timestamps":
                     empty_dict[column_index] = new_timestamps
-                elif column_index == "location_provider":
-                    empty_dict[column_index] = [LocationProvider["UNKNOWN"].value for i in range(num_samples_to_add)]
-                elif column_index == "image_codec":
-                    empty_dict[column_index] = [ImageCodec["UNKNOWN"].value for i in range(num_samples_to_add)]
-                elif column_index == "audio_codec":
-                    empty_dict[column_index] = [AudioCodec["UNKNOWN"].value for i in range(num_samples_to_add)]
-                elif column_index == "network_type":
-                    empty_dict[column_index] = [NetworkType["UNKNOWN_NETWORK"].value for i in range(num_samples_to_add)]
-                elif column_index == "power_state":
-                    empty_dict[column_index] = [
-                        PowerState["UNKNOWN_POWER_STATE"].value for i in range(num_samples_to_add)
-                    ]
-                elif column_index == "cell_service":
-                    empty_dict[column_index] = [CellServiceState["UNKNOWN"].value for i in range(num_samples_to_add)]
-                elif column_index == "wifi_wake_lock":
-                    empty_dict[column_index] = [WifiWakeLock["NONE"].value for i in range(num_samples_to_add)]
-                elif column_index == "screen_state":
-                    empty_dict[column_index] = [
-                        ScreenState["UNKNOWN_SCREEN_STATE"].value for i in range(num_samples_to_add)
-                    ]
+                elif column_index in NAN_FILL_VALUES:
+                    empty_dict[column_index] = [NAN_FILL_VALUES[column_index]] * num_samples_to_add
                 else:
                     empty_dict[column_index] = np.full(num_samples_to_add, np.nan).tolist()
             empty_df = pa.Table.from_pydict(empty_dict)
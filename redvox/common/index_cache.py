@@ -0,0 +1,373 @@
+"""
+This module provides a persistent, on-disk cache for indexes of RedVox data.
+
+The cache is a SQLite database stored next to the data.  It holds one row per RedVox file (the fields of its
+IndexEntry plus the file's modification time and size) and one row per scanned data directory (its modification time).
+Later indexing runs only rescan the directories whose modification time changed, and within those directories only the
+files that are new or whose modification time or size changed are read again.
+If the cache can't be opened or written, for example in a read-only data directory, the files are indexed without it.
+"""
+import logging
+import os
+import sqlite3
+import time
+from datetime import timedelta
+from pathlib import PurePath
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from redvox.api1000.common.common import check_type
+from redvox.common.date_time_utils import EPOCH, datetime_from_epoch_microseconds_utc as dt_us
+from redvox.common.io import (
+    Index,
+    IndexEntry,
+    ReadFilter,
+    _list_subdirs,
+    _structured_api_900_dirs,
+    _structured_api_1000_dirs,
+    index_structured,
+    index_unstructured,
+)
+from redvox.common.versioning import ApiVersion
+
+log = logging.getLogger(__name__)
+
+INDEX_CACHE_FILE_NAME: str = ".redvox_index.sqlite3"  # Default name of the cache file stored in the data directory
+INDEX_CACHE_VERSION: int = 1  # Version of the cache schema; caches with a different version are rebuilt
+# Directories modified this recently (in seconds) are not marked as up to date, since a file written in the same
+# file system timestamp tick as the scan would otherwise go unnoticed.
+RACY_MTIME_WINDOW_S: float = 2.0
+
+_ONE_US: timedelta = timedelta(microseconds=1)
+
+# (file_path, full_path, station_id, date_time_us, extension, api_version, compressed, decompressed, mtime_ns, size)
+_EntryRow = Tuple[str, str, str, int, str, str, int, int, int, int]
+
+
+def _entry_to_row(dir_path: str, file_path: str, entry: IndexEntry, stat: os.stat_result) -> Tuple:
+    """
+    :param dir_path: the directory containing the file
+    :param file_path: the path of the file as found while scanning dir_path
+    :param entry: the IndexEntry of the file
+    :param stat: the stat of the file
+    :return: the IndexEntry as a row of the entries table
+    """
+    return (
+        file_path,
+        dir_path,
+        entry.full_path,
+        entry.station_id,
+        (entry.date_time - EPOCH) // _ONE_US,
+        entry.extension,
+        entry.api_version.value,
+        entry.compressed_file_size_bytes,
+        entry.decompressed_file_size_bytes,
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+def _row_to_entry(row: _EntryRow) -> IndexEntry:
+    """
+    :param row: a row of the entries table, without the dir_path column
+    :return: the IndexEntry stored in the row
+    """
+    return IndexEntry(
+        full_path=row[1],
+        station_id=row[2],
+        date_time=dt_us(row[3]),
+        extension=row[4],
+        api_version=ApiVersion.from_str(row[5]),
+        compressed_file_size_bytes=row[6],
+        decompressed_file_size_bytes=row[7],
+    )
+
+
+class IndexCache:
+    """
+    A persistent cache of IndexEntry values backed by a SQLite database.
+
+    Properties:
+        cache_path: str, the path to the SQLite database
+
+        dirs_scanned: int, the number of directories that had to be scanned because they were new or changed
+
+        files_read: int, the number of files that had to be read because they were new or changed
+    """
+
+    def __init__(self, cache_path: str):
+        """
+        Opens the cache at cache_path, creating it if it does not exist.
+
+        :param cache_path: path to the SQLite database holding the cache
+        """
+        self.cache_path: str = cache_path
+        self.dirs_scanned: int = 0
+        self.files_read: int = 0
+        self._conn: sqlite3.Connection = sqlite3.connect(cache_path)
+        try:
+            # Keep the journal in memory; a journal file would change the mtime of the directory holding the cache.
+            self._conn.execute("PRAGMA journal_mode=MEMORY")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._create_tables()
+        except Exception:
+            self._conn.close()
+            raise
+
+    def __enter__(self) -> "IndexCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _create_tables(self) -> None:
+        """
+        Creates the tables of the cache, dropping the existing ones if they were written by another schema version.
+        """
+        with self._conn:
+            version: int = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_CACHE_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS dirs")
+                self._conn.execute("DROP TABLE IF EXISTS entries")
+                self._conn.execute(f"PRAGMA user_version={INDEX_CACHE_VERSION}")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS dirs (dir_path TEXT PRIMARY KEY, mtime_ns INTEGER)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "file_path TEXT PRIMARY KEY, dir_path TEXT NOT NULL, full_path TEXT NOT NULL, "
+                "station_id TEXT NOT NULL, date_time_us INTEGER NOT NULL, extension TEXT NOT NULL, "
+                "api_version TEXT NOT NULL, compressed_file_size_bytes INTEGER NOT NULL, "
+                "decompressed_file_size_bytes INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_dir_path ON entries (dir_path)")
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self._conn.close()
+
+    def _cached_rows(self, dir_path: str) -> List[_EntryRow]:
+        """
+        :param dir_path: the directory to get the cached rows of
+        :return: the cached rows of the directory, without the dir_path column
+        """
+        return self._conn.execute(
+            "SELECT file_path, full_path, station_id, date_time_us, extension, api_version, "
+            "compressed_file_size_bytes, decompressed_file_size_bytes, mtime_ns, size "
+            "FROM entries WHERE dir_path = ?",
+            (dir_path,),
+        ).fetchall()
+
+    def _rescan_dir(self, dir_path: str, dir_mtime_ns: int) -> List[IndexEntry]:
+        """
+        Scans a directory, reading only the files that are new or changed since they were cached, and replaces the
+        cached entries of the directory with the result.
+
+        :param dir_path: the directory to scan
+        :param dir_mtime_ns: the modification time of the directory before it was scanned
+        :return: the entries of the RedVox files in the directory
+        """
+        self.dirs_scanned += 1
+        cached: Dict[str, _EntryRow] = {row[0]: row for row in self._cached_rows(dir_path)}
+        entries: List[IndexEntry] = []
+        rows: List[Tuple] = []
+        with os.scandir(dir_path) as dir_entries:
+            for dir_entry in dir_entries:
+                # hidden files (like the cache itself) are never RedVox data and are skipped by glob as well
+                if dir_entry.name.startswith(".") or not dir_entry.is_file():
+                    continue
+                stat: os.stat_result = dir_entry.stat()
+                row: Optional[_EntryRow] = cached.get(dir_entry.path)
+                entry: Optional[IndexEntry]
+                if row is not None and row[8] == stat.st_mtime_ns and row[9] == stat.st_size:
+                    entry = _row_to_entry(row)
+                else:
+                    self.files_read += 1
+                    entry = IndexEntry.from_path(dir_entry.path)
+                if entry is None:
+                    continue
+                entries.append(entry)
+                rows.append(_entry_to_row(dir_path, dir_entry.path, entry, stat))
+
+        # a directory changed too recently may still be receiving files within the same mtime tick
+        is_racy: bool = time.time() - dir_mtime_ns / 1e9 < RACY_MTIME_WINDOW_S
+        with self._conn:
+            self._conn.execute("DELETE FROM entries WHERE dir_path = ?", (dir_path,))
+            self._conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?)", (dir_path, None if is_racy else dir_mtime_ns)
+            )
+        return entries
+
+    def entries_in_dir(self, data_dir: str) -> List[IndexEntry]:
+        """
+        Returns the entries of all RedVox files directly inside data_dir, rescanning the directory only if its
+        modification time changed since it was cached.
+
+        :param data_dir: the directory containing RedVox files
+        :return: the entries of the RedVox files in the directory
+        """
+        dir_path: str = os.path.abspath(data_dir)
+        try:
+            dir_mtime_ns: int = os.stat(dir_path).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        cached_mtime = self._conn.execute("SELECT mtime_ns FROM dirs WHERE dir_path = ?", (dir_path,)).fetchone()
+        if cached_mtime is not None and cached_mtime[0] == dir_mtime_ns:
+            return list(map(_row_to_entry, self._cached_rows(dir_path)))
+        return self._rescan_dir(dir_path, dir_mtime_ns)
+
+    def _index_dirs(self, data_dirs: Iterator[str], read_filter: ReadFilter, sort: bool) -> Index:
+        """
+        :param data_dirs: the directories containing RedVox files
+        :param read_filter: filter to apply to the entries
+        :param sort: if True, sort the resulting Index
+        :return: an Index of the filtered entries in all the directories
+        """
+        index: Index = Index()
+        for data_dir in data_dirs:
+            index.append(filter(read_filter.apply, self.entries_in_dir(data_dir)))
+        if sort:
+            index.sort()
+        return index
+
+    def index_unstructured(self, base_dir: str, read_filter: ReadFilter = ReadFilter(), sort: bool = True) -> Index:
+        """
+        Cached version of io.index_unstructured.
+
+        :param base_dir: Directory containing unstructured data.
+        :param read_filter: An (optional) ReadFilter for specifying station IDs and time windows.
+        :param sort: When True, the resulting Index will be sorted before being returned (default=True).
+        :return: An Index of RedVox files.
+        """
+        check_type(base_dir, [str])
+        check_type(read_filter, [ReadFilter])
+        return self._index_dirs(iter([base_dir]), read_filter, sort)
+
+    def index_structured_api_900(
+        self, base_dir: str, read_filter: ReadFilter = ReadFilter(), sort: bool = True
+    ) -> Index:
+        """
+        Cached version of io.index_structured_api_900.
+
+        :param base_dir: Base directory (should be named api900)
+        :param read_filter: Filter to filter files with
+        :param sort: When True, the resulting Index will be sorted before being returned (default=True).
+        :return: An Index of RedVox files.
+        """
+        return self._index_dirs(_structured_api_900_dirs(base_dir, read_filter), read_filter, sort)
+
+    def index_structured_api_1000(
+        self, base_dir: str, read_filter: ReadFilter = ReadFilter(), sort: bool = True
+    ) -> Index:
+        """
+        Cached version of io.index_structured_api_1000.
+
+        :param base_dir: Base directory (should be named api1000)
+        :param read_filter: Filter to filter files with
+        :param sort: When True, the resulting Index will be sorted before being returned (default=True).
+        :return: An Index of RedVox files.
+        """
+        return self._index_dirs(_structured_api_1000_dirs(base_dir, read_filter), read_filter, sort)
+
+    def index_structured(self, base_dir: str, read_filter: ReadFilter = ReadFilter()) -> Index:
+        """
+        Cached version of io.index_structured.
+
+        :param base_dir: The base_dir may either end with api900, api1000, or be a parent directory to one or both of
+                         API 900 and API 1000.
+        :param read_filter: Filter to further filter results.
+        :return: An Index of RedVox files.
+        """
+        base_path: PurePath = PurePath(base_dir)
+        if base_path.name == "api900":
+            return self.index_structured_api_900(base_dir, read_filter)
+        elif base_path.name == "api1000":
+            return self.index_structured_api_1000(base_dir, read_filter)
+
+        index: Index = Index()
+        subdirs: List[str] = list(_list_subdirs(base_dir, {"api900", "api1000"}))
+        if "api900" in subdirs:
+            index.append(
+                iter(self.index_structured_api_900(str(base_path.joinpath("api900")), read_filter, False).entries)
+            )
+        if "api1000" in subdirs:
+            index.append(
+                iter(self.index_structured_api_1000(str(base_path.joinpath("api1000")), read_filter, False).entries)
+            )
+        index.sort()
+        return index
+
+
+def default_cache_path(base_dir: str) -> str:
+    """
+    :param base_dir: the data directory
+    :return: the default location of the index cache for the data directory
+    """
+    return os.path.join(base_dir, INDEX_CACHE_FILE_NAME)
+
+
+def _index_cached(
+    base_dir: str,
+    cache_path: Optional[str],
+    index_fn: Callable[[IndexCache], Index],
+    uncached_index_fn: Callable[[], Index],
+) -> Index:
+    """
+    Indexes the files using the cache, or without it if the cache can't be opened or written.
+
+    :param base_dir: the data directory
+    :param cache_path: Optional path to the cache.  If None, the cache is stored in base_dir
+    :param index_fn: function that indexes the files using the cache
+    :param uncached_index_fn: function that indexes the files without the cache
+    :return: An Index of RedVox files.
+    """
+    if cache_path is None:
+        cache_path = default_cache_path(base_dir)
+    try:
+        with IndexCache(cache_path) as cache:
+            return index_fn(cache)
+    except (sqlite3.DatabaseError, PermissionError) as e:
+        log.warning("Unable to use the index cache at %s, indexing without it: %s", cache_path, e)
+        return uncached_index_fn()
+
+
+def index_structured_cached(
+    base_dir: str, read_filter: ReadFilter = ReadFilter(), cache_path: Optional[str] = None
+) -> Index:
+    """
+    Indexes both API 900 and API 1000 structured directory layouts using a persistent index cache.
+    If the cache can't be used, the files are indexed without it.
+
+    :param base_dir: The base_dir may either end with api900, api1000, or be a parent directory to one or both of
+                     API 900 and API 1000.
+    :param read_filter: Filter to further filter results.
+    :param cache_path: Optional path to the cache.  If None, the cache is stored in base_dir.  Default None
+    :return: An Index of RedVox files.
+    """
+    return _index_cached(
+        base_dir,
+        cache_path,
+        lambda cache: cache.index_structured(base_dir, read_filter),
+        lambda: index_structured(base_dir, read_filter),
+    )
+
+
+def index_unstructured_cached(
+    base_dir: str, read_filter: ReadFilter = ReadFilter(), sort: bool = True, cache_path: Optional[str] = None
+) -> Index:
+    """
+    Returns the list of file paths that match the given filter for unstructured data using a persistent index cache.
+    If the cache can't be used, the files are indexed without it.
+
+    :param base_dir: Directory containing unstructured data.
+    :param read_filter: An (optional) ReadFilter for specifying station IDs and time windows.
+    :param sort: When True, the resulting Index will be sorted before being returned (default=True).
+    :param cache_path: Optional path to the cache.  If None, the cache is stored in base_dir.  Default None
+    :return: An Index of RedVox files.
+    """
+    return _index_cached(
+        base_dir,
+        cache_path,
+        lambda cache: cache.index_unstructured(base_dir, read_filter, sort),
+        lambda: index_unstructured(base_dir, read_filter, sort),
+    )
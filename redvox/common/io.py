@@ -11,16 +11,20 @@ import json
 import os.path
 import multiprocessing
 import multiprocessing.pool
+import struct
 import tempfile
+import time
 from pathlib import Path, PurePath
 from shutil import copy2, move, rmtree
 from typing import (
     Any,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
     Set,
+    Tuple,
     Union,
     TYPE_CHECKING,
     Callable,
@@ -34,7 +38,7 @@ from redvox.common import api_conversions as ac
 from redvox.api1000.common.common import check_type
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
-from redvox.common.versioning import check_version, ApiVersion
+from redvox.common.versioning import check_version_buf, ApiVersion
 from redvox.common.date_time_utils import (
     datetime_from_epoch_microseconds_utc as dt_us,
     datetime_from_epoch_milliseconds_utc as dt_ms,
@@ -42,7 +46,7 @@ from redvox.common.date_time_utils import (
     truncate_dt_ymd,
     truncate_dt_ymdh,
 )
-from redvox.common.parallel_utils import maybe_parallel_map
+from redvox.common.parallel_utils import AUTO_CHUNK_SIZE, maybe_parallel_map, prefetch_map
 
 if TYPE_CHECKING:
     from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
@@ -380,6 +384,73 @@ def _not_none(value: Optional[Any]) -> bool:
     return value is not None
 
 
+# Number of bytes read from the start of a file to determine its API version and decompressed size.
+# This covers the largest possible LZ4 frame header (API M) and the 4 byte length prefix (API 900).
+FILE_HEADER_PROBE_BYTES: int = 19
+
+
+@dataclass
+class FileHeader:
+    """
+    The API version and sizes of a RedVox file, determined by reading only the header of the file.
+    A decompressed size of 0 means the size could not be determined from the header.
+    """
+
+    api_version: ApiVersion
+    compressed_file_size_bytes: int = 0
+    decompressed_file_size_bytes: int = 0
+
+    @staticmethod
+    def from_buf(buf: bytes, compressed_file_size_bytes: int) -> "FileHeader":
+        """
+        :param buf: The first FILE_HEADER_PROBE_BYTES (or fewer, if the file is shorter) bytes of a file.
+        :param compressed_file_size_bytes: The size of the file on disk.
+        :return: The header described by the buffer.
+        """
+        api_version: ApiVersion = check_version_buf(buf)
+        decompressed_size: int = 0
+        try:
+            if api_version == ApiVersion.API_1000:
+                decompressed_size = lz4.frame.get_frame_info(buf)["content_size"]
+            else:
+                decompressed_size = calculate_uncompressed_size(buf)
+        except (RuntimeError, struct.error):
+            # The header is truncated or malformed; leave the size as unknown
+            pass
+        return FileHeader(api_version, compressed_file_size_bytes, decompressed_size)
+
+    @staticmethod
+    def from_path(path: str, buf: Optional[bytearray] = None) -> "FileHeader":
+        """
+        Opens a file once and reads only its header.
+
+        :param path: The path of the file to probe.
+        :param buf: An optional buffer of at least FILE_HEADER_PROBE_BYTES to read the header into.
+                    Reusing a buffer avoids an allocation per file when probing many files.
+        :return: The header of the file, or a header with an UNKNOWN API version if the file DNE.
+        """
+        if buf is None:
+            buf = bytearray(FILE_HEADER_PROBE_BYTES)
+        try:
+            with open(path, "rb", buffering=0) as fin:
+                num_read: int = fin.readinto(memoryview(buf)[:FILE_HEADER_PROBE_BYTES])
+                return FileHeader.from_buf(bytes(buf[:num_read]), os.fstat(fin.fileno()).st_size)
+        except FileNotFoundError:
+            return FileHeader(ApiVersion.UNKNOWN)
+
+
+def read_file_headers(paths: Iterable[str]) -> Iterator[FileHeader]:
+    """
+    Probes the headers of many files, reusing a single read buffer.
+
+    :param paths: The paths of the files to probe.
+    :return: An iterator over the header of each file, in the same order as paths.
+    """
+    buf: bytearray = bytearray(FILE_HEADER_PROBE_BYTES)
+    for path in paths:
+        yield FileHeader.from_path(path, buf)
+
+
 @dataclass
 class IndexEntry:
     """
@@ -396,16 +467,21 @@ class IndexEntry:
     decompressed_file_size_bytes: int = 0
 
     @staticmethod
-    def from_path(path_str: str, strict: bool = True) -> Optional["IndexEntry"]:
+    def from_path(
+        path_str: str, strict: bool = True, header: Optional[FileHeader] = None, resolve: bool = True
+    ) -> Optional["IndexEntry"]:
         """
         Attempts to parse a file path into an IndexEntry. If a given path is not recognized as a valid RedVox file,
         None will be returned instead.
 
         :param path_str: The file system path to attempt to parse.
         :param strict: When set, None is returned if the referenced file DNE.
+        :param header: The header of the file, if it was already probed.  If None, the header is read from the file
+                       only if the file name is valid.  Default None
+        :param resolve: When set, the full path of the entry is path_str resolved.  Otherwise path_str is used as is,
+                        which avoids resolving paths already known to be absolute and free of links.  Default True
         :return: Either an IndexEntry or successful parse or None.
         """
-        api_version: ApiVersion = check_version(path_str)
         path: Path = Path(path_str)
         name: str = path.stem
         ext: str = path.suffix
@@ -430,6 +506,11 @@ class IndexEntry:
         if _is_int(station_id) is None or timestamp is None:
             return None
 
+        # A single read of the file header provides both the API version and the decompressed size
+        if header is None:
+            header = FileHeader.from_path(path_str)
+        api_version: ApiVersion = header.api_version
+
         # Parse the datetime per the specified API version
         date_time: datetime
         if api_version == ApiVersion.API_1000:
@@ -437,15 +518,35 @@ class IndexEntry:
         else:
             date_time = dt_ms(timestamp)
 
-        full_path: str
-        try:
-            full_path = str(path.resolve(strict=True))
-        except FileNotFoundError:
-            if strict:
-                return None
-            full_path = path_str
+        full_path: str = path_str
+        if resolve:
+            try:
+                full_path = str(path.resolve(strict=True))
+            except FileNotFoundError:
+                if strict:
+                    return None
+
+        return IndexEntry(
+            full_path,
+            station_id,
+            date_time,
+            ext,
+            api_version,
+            header.compressed_file_size_bytes,
+            header.decompressed_file_size_bytes,
+        )
+
+    @staticmethod
+    def from_paths(paths: Iterable[str], strict: bool = True) -> List[Optional["IndexEntry"]]:
+        """
+        Parses many file paths into IndexEntries, reading only the header of each file.
 
-        return IndexEntry(full_path, station_id, date_time, ext, api_version)._set_compressed_decompressed_lz4_size()
+        :param paths: The file system paths to attempt to parse.
+        :param strict: When set, None is returned for any referenced file that DNE.
+        :return: An IndexEntry or None for each path, in the same order as paths.
+        """
+        buf: bytearray = bytearray(FILE_HEADER_PROBE_BYTES)
+        return [IndexEntry.from_path(path, strict, FileHeader.from_path(path, buf)) for path in paths]
 
     @staticmethod
     def from_native(entry) -> "IndexEntry":
@@ -478,14 +579,10 @@ class IndexEntry:
 
         :return: updated self
         """
-        if os.path.exists(self.full_path):
-            self.compressed_file_size_bytes = os.path.getsize(self.full_path)
-            with open(self.full_path, "rb") as fp:
-                if self.api_version == ApiVersion.API_1000:
-                    header = lz4.frame.get_frame_info(fp.read())
-                    self.decompressed_file_size_bytes = header["content_size"]
-                elif self.api_version == ApiVersion.API_900:
-                    self.decompressed_file_size_bytes = calculate_uncompressed_size(fp.read())
+        header: FileHeader = FileHeader.from_path(self.full_path)
+        if header.api_version != ApiVersion.UNKNOWN:
+            self.compressed_file_size_bytes = header.compressed_file_size_bytes
+            self.decompressed_file_size_bytes = header.decompressed_file_size_bytes
         return self
 
     def read(self) -> Optional[Union[WrappedRedvoxPacketM, "WrappedRedvoxPacket"]]:
@@ -945,14 +1042,23 @@ class Index:
         """
         return Index([en for en in self.entries if en.station_id == station_id])
 
-    def stream_raw(self, read_filter: ReadFilter = ReadFilter()) -> Iterator[Union["RedvoxPacket", RedvoxPacketM]]:
+    def stream_raw(
+        self, read_filter: ReadFilter = ReadFilter(), prefetch: int = 0, workers: int = 1
+    ) -> Iterator[Union["RedvoxPacket", RedvoxPacketM]]:
         """
         Read, decompress, deserialize, and then stream RedVox data pointed to by this index.
+        When prefetch is positive, up to prefetch files are read ahead of the consumer on a pool of threads; packets
+        are still streamed in index order.
 
         :param read_filter: Additional filtering to specify which data should be streamed.
+        :param prefetch: maximum number of packets read ahead of the consumer.  If 0, files are read one at a time
+                            as they are consumed.  Default 0
+        :param workers: number of threads reading files when prefetch is positive.  Default 1
         :return: An iterator over RedvoxPacket and RedvoxPacketM instances.
         """
         filtered: Iterator[IndexEntry] = filter(read_filter.apply, self.entries)
+        if prefetch > 0:
+            return prefetch_map(IndexEntry.read_raw, filtered, prefetch, workers)
         # noinspection Mypy
         return map(IndexEntry.read_raw, filtered)
 
@@ -993,28 +1099,43 @@ class Index:
         """
         return float(np.sum([entry.decompressed_file_size_bytes for entry in self.entries]))
 
-    def read_contents(self) -> List[RedvoxPacketM]:
+    def stream_contents(
+        self, prefetch: int = 0, workers: int = 1, convert_api_900: bool = True
+    ) -> Iterator[Union["RedvoxPacket", RedvoxPacketM]]:
         """
-        read all the files in the index
+        read the files in the index one at a time; only the packet being processed and up to prefetch packets read
+        ahead of it are kept in memory
 
-        :return: list of RedvoxPacketM, converted from API 900 if necessary
+        :param prefetch: maximum number of packets read ahead of the consumer, see stream_raw.  Default 0
+        :param workers: number of threads reading files when prefetch is positive.  Default 1
+        :param convert_api_900: if True, convert API 900 packets to API 1000, otherwise return them as they are read,
+                                    i.e. for packet_to_pyarrow to convert them directly.  Default True
+        :return: iterator over RedvoxPacketM, converted from API 900 if necessary, and RedvoxPacket if
+                    convert_api_900 is False
         """
-        result: List[RedvoxPacketM] = []
-
         # Iterate over the API 900 packets in a memory efficient way
         # and convert to API 1000
         # noinspection PyTypeChecker
-        for packet_900 in self.stream_raw(ReadFilter.empty().with_api_versions({ApiVersion.API_900})):
+        for packet_900 in self.stream_raw(
+            ReadFilter.empty().with_api_versions({ApiVersion.API_900}), prefetch, workers
+        ):
             # noinspection Mypy
-            result.append(ac.convert_api_900_to_1000_raw(packet_900))
+            yield ac.convert_api_900_to_1000_raw(packet_900) if convert_api_900 else packet_900
 
         # Grab the API 1000 packets
         # noinspection PyTypeChecker
-        for packet in self.stream_raw(ReadFilter.empty().with_api_versions({ApiVersion.API_1000})):
-            # noinspection Mypy
-            result.append(packet)
+        yield from self.stream_raw(ReadFilter.empty().with_api_versions({ApiVersion.API_1000}), prefetch, workers)
 
-        return result
+    def read_contents(self, convert_api_900: bool = True) -> List[Union["RedvoxPacket", RedvoxPacketM]]:
+        """
+        read all the files in the index
+
+        :param convert_api_900: if True, convert API 900 packets to API 1000, otherwise return them as they are read.
+                                    Default True
+        :return: list of RedvoxPacketM, converted from API 900 if necessary, and RedvoxPacket if convert_api_900 is
+                    False
+        """
+        return list(self.stream_contents(convert_api_900=convert_api_900))
 
     def read_first_packet(self) -> Optional[RedvoxPacketM]:
         """
@@ -1057,6 +1178,48 @@ def _list_subdirs(base_dir: str, valid_choices: Set[str]) -> Iterator[str]:
     return filter(valid_choices.__contains__, subdirs)
 
 
+def _structured_api_900_dirs(base_dir: str, read_filter: ReadFilter) -> Iterator[str]:
+    """
+    Lists the day directories of a structured API 900 layout that may contain files accepted by the filter.
+
+    :param base_dir: Base directory (should be named api900)
+    :param read_filter: Filter used to skip directories outside the requested time range
+    :return: An iterator over the paths of the day directories.
+    """
+    for year in _list_subdirs(base_dir, __VALID_YEARS):
+        for month in _list_subdirs(os.path.join(base_dir, year), __VALID_MONTHS):
+            for day in _list_subdirs(os.path.join(base_dir, year, month), __VALID_DATES):
+                # Before scanning for *.rdvxz files, let's see if the current year, month, day, are in the
+                # filter's range. If not, we can short circuit and skip getting the *.rdvxz files.
+                if not read_filter.apply_dt(datetime(int(year), int(month), int(day)), dt_fn=truncate_dt_ymd):
+                    continue
+
+                yield os.path.join(base_dir, year, month, day)
+
+
+def _structured_api_1000_dirs(base_dir: str, read_filter: ReadFilter) -> Iterator[str]:
+    """
+    Lists the hour directories of a structured API M layout that may contain files accepted by the filter.
+
+    :param base_dir: Base directory (should be named api1000)
+    :param read_filter: Filter used to skip directories outside the requested time range
+    :return: An iterator over the paths of the hour directories.
+    """
+    for year in _list_subdirs(base_dir, __VALID_YEARS):
+        for month in _list_subdirs(os.path.join(base_dir, year), __VALID_MONTHS):
+            for day in _list_subdirs(os.path.join(base_dir, year, month), __VALID_DATES):
+                for hour in _list_subdirs(os.path.join(base_dir, year, month, day), __VALID_HOURS):
+                    # Before scanning for *.rdvxm files, let's see if the current year, month, day, hour are in the
+                    # filter's range. If not, we can short circuit and skip getting the *.rdvxm files.
+                    if not read_filter.apply_dt(
+                        datetime(int(year), int(month), int(day), int(hour)),
+                        dt_fn=truncate_dt_ymdh,
+                    ):
+                        continue
+
+                    yield os.path.join(base_dir, year, month, day, hour)
+
+
 # These fields are set at runtime and provide the implementation (either native or pure python) for IO methods
 __INDEX_STRUCTURED_FN: Callable[[str, ReadFilter, Optional[multiprocessing.pool.Pool]], Index]
 __INDEX_STRUCTURED_900_FN: Callable[[str, ReadFilter, bool, Optional[multiprocessing.pool.Pool]], Index]
@@ -1139,8 +1302,7 @@ def index_unstructured_py(
         pool,
         IndexEntry.from_path,
         iter(all_paths),
-        lambda: len(all_paths) > 128,
-        chunk_size=64,
+        chunk_size=AUTO_CHUNK_SIZE,
     )
 
     # if len(all_paths) > 128:
@@ -1180,24 +1342,12 @@ def index_structured_api_900_py(
     """
     index: Index = Index()
 
-    _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-
-    for year in _list_subdirs(base_dir, __VALID_YEARS):
-        for month in _list_subdirs(os.path.join(base_dir, year), __VALID_MONTHS):
-            for day in _list_subdirs(os.path.join(base_dir, year, month), __VALID_DATES):
-                # Before scanning for *.rdvxz files, let's see if the current year, month, day, are in the
-                # filter's range. If not, we can short circuit and skip getting the *.rdvxz files.
-                if not read_filter.apply_dt(datetime(int(year), int(month), int(day)), dt_fn=truncate_dt_ymd):
-                    continue
-
-                data_dir: str = os.path.join(base_dir, year, month, day)
-                entries: Iterator[IndexEntry] = iter(
-                    index_unstructured_py(data_dir, read_filter, sort=False, pool=_pool).entries
-                )
-                index.append(entries)
-
-    if pool is None:
-        _pool.close()
+    data_dir: str
+    for data_dir in _structured_api_900_dirs(base_dir, read_filter):
+        entries: Iterator[IndexEntry] = iter(
+            index_unstructured_py(data_dir, read_filter, sort=False, pool=pool).entries
+        )
+        index.append(entries)
 
     if sort:
         index.sort()
@@ -1221,28 +1371,12 @@ def index_structured_api_1000_py(
     """
     index: Index = Index()
 
-    _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-
-    for year in _list_subdirs(base_dir, __VALID_YEARS):
-        for month in _list_subdirs(os.path.join(base_dir, year), __VALID_MONTHS):
-            for day in _list_subdirs(os.path.join(base_dir, year, month), __VALID_DATES):
-                for hour in _list_subdirs(os.path.join(base_dir, year, month, day), __VALID_HOURS):
-                    # Before scanning for *.rdvxm files, let's see if the current year, month, day, hour are in the
-                    # filter's range. If not, we can short circuit and skip getting the *.rdvxm files.
-                    if not read_filter.apply_dt(
-                        datetime(int(year), int(month), int(day), int(hour)),
-                        dt_fn=truncate_dt_ymdh,
-                    ):
-                        continue
-
-                    data_dir: str = os.path.join(base_dir, year, month, day, hour)
-                    entries: Iterator[IndexEntry] = iter(
-                        index_unstructured_py(data_dir, read_filter, sort=False, pool=_pool).entries
-                    )
-                    index.append(entries)
-
-    if pool is None:
-        _pool.close()
+    data_dir: str
+    for data_dir in _structured_api_1000_dirs(base_dir, read_filter):
+        entries: Iterator[IndexEntry] = iter(
+            index_unstructured_py(data_dir, read_filter, sort=False, pool=pool).entries
+        )
+        index.append(entries)
 
     if sort:
         index.sort()
@@ -1265,14 +1399,12 @@ def index_structured_py(
     """
     base_path: PurePath = PurePath(base_dir)
 
-    _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
-
     # API 900
     if base_path.name == "api900":
-        return index_structured_api_900_py(base_dir, read_filter, pool=_pool)
+        return index_structured_api_900_py(base_dir, read_filter, pool=pool)
     # API 1000
     elif base_path.name == "api1000":
-        return index_structured_api_1000_py(base_dir, read_filter, pool=_pool)
+        return index_structured_api_1000_py(base_dir, read_filter, pool=pool)
     # Maybe parent to one or both?
     else:
         index: Index = Index()
@@ -1284,7 +1416,7 @@ def index_structured_py(
                         str(base_path.joinpath("api900")),
                         read_filter,
                         sort=False,
-                        pool=_pool,
+                        pool=pool,
                     ).entries
                 )
             )
@@ -1296,14 +1428,11 @@ def index_structured_py(
                         str(base_path.joinpath("api1000")),
                         read_filter,
                         sort=False,
-                        pool=_pool,
+                        pool=pool,
                     ).entries
                 )
             )
 
-        if pool is None:
-            _pool.close()
-
         index.sort()
         return index
 
@@ -1486,20 +1615,162 @@ def index_structured(
     return __INDEX_STRUCTURED_FN(base_dir, read_filter, pool)
 
 
+# number of threads reading headers and copying or moving files when sorting unstructured data
+DEFAULT_SORT_WORKERS: int = 8
+
+
+@dataclass
+class SortSummary:
+    """
+    Summary of sorting unstructured RedVox files into the structured layout
+
+    Properties:
+        num_files: int, number of files sorted, default 0
+
+        num_bytes: int, total size of the sorted files in bytes, default 0
+
+        num_dirs: int, number of directories the files were sorted into, default 0
+
+        num_linked: int, number of files that were hardlinked or renamed instead of having their contents copied,
+        default 0
+
+        elapsed_s: float, time spent sorting in seconds, including reading the headers of the files, default 0.0
+    """
+
+    num_files: int = 0
+    num_bytes: int = 0
+    num_dirs: int = 0
+    num_linked: int = 0
+    elapsed_s: float = 0.0
+
+    def files_per_s(self) -> float:
+        """
+        :return: number of files sorted per second
+        """
+        return self.num_files / self.elapsed_s if self.elapsed_s > 0 else float("nan")
+
+    def mb_per_s(self) -> float:
+        """
+        :return: number of megabytes sorted per second
+        """
+        return self.num_bytes / 1e6 / self.elapsed_s if self.elapsed_s > 0 else float("nan")
+
+    def __str__(self):
+        return (
+            f"sorted {self.num_files} files ({self.num_bytes / 1e6:.1f} MB) into {self.num_dirs} directories "
+            f"in {self.elapsed_s:.2f} s: {self.files_per_s():.1f} files/s, {self.mb_per_s():.1f} MB/s; "
+            f"{self.num_linked} files linked or renamed"
+        )
+
+
+def _list_unstructured_paths(input_dir: str, extensions: Optional[Set[str]]) -> List[Tuple[str, bool]]:
+    """
+    lists the directory once and keeps the files glob would find with the pattern *{extension} for each extension
+
+    :param input_dir: directory to list
+    :param extensions: extensions of the files to keep, or None to keep every file
+    :return: path of each file to keep, and True if the path is resolved (the file is not a link)
+    """
+    suffixes: Tuple[str, ...] = tuple(extensions) if extensions is not None else ("",)
+    with os.scandir(os.path.realpath(input_dir)) as dir_entries:
+        return [
+            (entry.path, not entry.is_symlink())
+            for entry in dir_entries
+            if not entry.name.startswith(".") and entry.name.endswith(suffixes) and entry.is_file()
+        ]
+
+
+def _plan_sort(entries: List[IndexEntry], output_dir: str) -> Tuple[List[Tuple[str, str]], Set[str]]:
+    """
+    finds where each entry belongs in the structured layout.  Each target directory is computed once.
+
+    :param entries: the entries to sort; they must be API 900 or API 1000 entries
+    :param output_dir: base directory of the structured layout
+    :return: the source and target path of each entry, and the target directories
+    """
+    dirs: Dict[Tuple[ApiVersion, datetime], str] = {}
+    plan: List[Tuple[str, str]] = []
+    for entry in entries:
+        if entry.api_version == ApiVersion.API_1000:
+            key = (entry.api_version, truncate_dt_ymdh(entry.date_time))
+            if key not in dirs:
+                dirs[key] = str(
+                    PurePath(output_dir).joinpath(
+                        "api1000", f"{key[1].year:04}", f"{key[1].month:02}", f"{key[1].day:02}", f"{key[1].hour:02}"
+                    )
+                )
+        else:
+            key = (entry.api_version, truncate_dt_ymd(entry.date_time))
+            if key not in dirs:
+                dirs[key] = str(
+                    PurePath(output_dir).joinpath(
+                        "api900", f"{key[1].year:04}", f"{key[1].month:02}", f"{key[1].day:02}"
+                    )
+                )
+        plan.append((entry.full_path, os.path.join(dirs[key], os.path.basename(entry.full_path))))
+    return plan, set(dirs.values())
+
+
+def _transfer_file(src: str, dst: str, copy: bool, link: bool) -> bool:
+    """
+    copies or moves a file.  If link is True, the file is hardlinked when copying or renamed when moving; this falls
+    back to copying the contents if it fails, i.e. when src and dst are on different file systems.
+
+    :param src: path of the file
+    :param dst: path to copy or move the file to
+    :param copy: if True, copy the file, otherwise move it
+    :param link: if True, try to hardlink or rename the file first
+    :return: True if the file was hardlinked or renamed, False if its contents were copied
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        # already sorted, i.e. hardlinked by an earlier sort; moving only has to remove the source
+        if not copy:
+            os.remove(src)
+        return link
+    if link:
+        try:
+            if copy:
+                if os.path.lexists(dst):
+                    os.remove(dst)
+                os.link(src, dst)
+            else:
+                os.replace(src, dst)
+            return True
+        except OSError:
+            pass
+    if copy:
+        copy2(src, dst)
+    else:
+        move(src, dst)
+    return False
+
+
 def sort_unstructured_redvox_data(
     input_dir: str,
     output_dir: Optional[str] = None,
     read_filter: ReadFilter = ReadFilter(),
     copy: bool = True,
+    link: bool = False,
+    workers: int = DEFAULT_SORT_WORKERS,
+    summary_out: Optional[List[SortSummary]] = None,
 ) -> bool:
     """
-    takes all redvox files in input_dir and sorts them into appropriate subdirectories
+    takes all redvox files in input_dir and sorts them into appropriate subdirectories.
+
+    The directory is listed once and only the header of each file is read.  The target directories are planned and
+    created before any file is copied or moved, then the files are copied or moved on a pool of threads.
 
     :param input_dir: directory containing all the files to sort
     :param output_dir: optional directory to put the results in; if this is None, uses the input_dir, default None.
     :param read_filter: optional ReadFilter to limit which files to sort, default empty filter (sort everything)
     :param copy: optional value that when set ensures the file contents are copied into the new structure. When this
                  is set to False, the files will instead be moved.
+    :param link: if True and the files are on the same file system as output_dir, hardlink the files instead of
+                    copying them, or rename them instead of moving them.  Files that can't be linked are copied or
+                    moved.  Moving always renames files on the same file system.  Default False
+    :param workers: number of threads reading headers and copying or moving files; 1 does everything in the calling
+                    thread.  Default DEFAULT_SORT_WORKERS
+    :param summary_out: When provided, a SortSummary of the files sorted is appended to it.
 
     :return: True if success, False if failure
     """
@@ -1517,47 +1788,49 @@ def sort_unstructured_redvox_data(
         print(f"Base directory for creation: {output_dir} does not exist.  Please create it.  Stopping program.")
         return False
 
-    index: Index = Index()
-    extension: str
-    for extension in read_filter.extensions:
-        pattern: str = str(PurePath(input_dir).joinpath(f"*{extension}"))
-        paths: List[str] = glob(os.path.join(input_dir, pattern))
-        entries: Iterator[IndexEntry] = filter(read_filter.apply, filter(_not_none, map(IndexEntry.from_path, paths)))
-        index.append(entries)
+    start: float = time.perf_counter()
+    prefetch: int = 4 * workers if workers > 1 else 0
+    paths: List[Tuple[str, bool]] = _list_unstructured_paths(input_dir, read_filter.extensions)
+    entries: List[IndexEntry] = list(
+        filter(
+            read_filter.apply,
+            filter(
+                _not_none,
+                prefetch_map(
+                    lambda path: IndexEntry.from_path(path[0], resolve=not path[1]), paths, prefetch, workers
+                ),
+            ),
+        )
+    )
 
-    if len(index.entries) < 1:
+    if len(entries) < 1:
         print(f"Directory with files to sort: {input_dir} does not contain Redvox data to read.  Stopping program.")
         return False
 
-    for value in index.entries:
-        api_version = value.api_version
-        if api_version == ApiVersion.API_1000:
-            file_out_dir = str(
-                PurePath(output_dir).joinpath(
-                    "api1000",
-                    f"{value.date_time.year:04}",
-                    f"{value.date_time.month:02}",
-                    f"{value.date_time.day:02}",
-                    f"{value.date_time.hour:02}",
-                )
-            )
-        elif api_version == ApiVersion.API_900:
-            file_out_dir = str(
-                PurePath(output_dir).joinpath(
-                    "api900",
-                    f"{value.date_time.year:04}",
-                    f"{value.date_time.month:02}",
-                    f"{value.date_time.day:02}",
-                )
-            )
-        else:
-            print(f"Unknown API version {api_version} found in data.  Stopping program.")
+    for entry in entries:
+        if entry.api_version not in [ApiVersion.API_1000, ApiVersion.API_900]:
+            print(f"Unknown API version {entry.api_version} found in data.  Stopping program.")
             return False
-        os.makedirs(file_out_dir, exist_ok=True)
 
-        if copy:
-            copy2(value.full_path, file_out_dir)
-        else:
-            move(value.full_path, file_out_dir)
+    plan, target_dirs = _plan_sort(entries, output_dir)
+    for target_dir in sorted(target_dirs):
+        os.makedirs(target_dir, exist_ok=True)
+
+    # renaming a file on the same file system is always cheaper than moving it
+    link = (link or not copy) and os.stat(input_dir).st_dev == os.stat(output_dir).st_dev
+    # links and renames only touch directory entries, which threads slow down
+    num_linked: int = sum(
+        prefetch_map(lambda paths_: _transfer_file(*paths_, copy, link), plan, 0 if link else prefetch, workers)
+    )
 
+    if summary_out is not None:
+        summary_out.append(
+            SortSummary(
+                len(entries),
+                sum(entry.compressed_file_size_bytes for entry in entries),
+                len(target_dirs),
+                num_linked,
+                time.perf_counter() - start,
+            )
+        )
     return True
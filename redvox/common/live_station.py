@@ -0,0 +1,513 @@
+"""
+Builds a Station incrementally from a live stream of RedVox packets, such as a cloud subscription.
+
+Every packet is converted once, when it is appended: its sensor data is converted to pyarrow tables, its audio gap
+is detected against the previous packet and its time sync exchanges are extracted.  The converted data is added to
+running tables of the audio and of every other sensor, and to a running list of time sync exchanges, so a snapshot of
+the station uses them as they are instead of joining the history again.  An optional retention window drops the
+packets that are too old to keep the station bounded; their data is trimmed from the front of the running tables.
+all timestamps are integers in microseconds unless otherwise stated
+"""
+from collections import deque
+import copy
+from dataclasses import dataclass
+from math import modf
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import redvox.api1000.proto.redvox_api_m_pb2 as api_m
+from redvox.common import gap_and_pad_utils as gpu
+from redvox.common import packet_to_pyarrow as ptp
+from redvox.common import station_utils as st_utils
+from redvox.common.date_time_utils import seconds_to_microseconds as s_to_us
+from redvox.common.errors import RedVoxExceptions
+from redvox.common.event_stream import EventStreams
+from redvox.common.sensor_data import SensorType
+from redvox.common.station import Station
+from redvox.common.timesync import TimeSync
+
+
+@dataclass
+class LivePacket:
+    """
+    a packet converted by a LiveStation
+
+    Properties:
+        start: float, packet start timestamp
+
+        end: float, packet end timestamp
+
+        metadata: StationPacketMetadata of the packet
+
+        exchanges: time sync exchanges of the packet as a flat list of a1, a2, a3, b1, b2, b3 values
+
+        summaries: summaries of the non-audio sensors of the packet, with their data in memory
+
+        audio: the audio data points of the packet, or None if the packet has no audio
+
+        gap: the audio gap before the packet, or None if there is no gap
+
+        gap_fill: the data points filling the audio gap before the packet, or None if there is no gap
+
+        events: a packet holding only the event streams of the packet, or None if the packet has no event streams
+    """
+
+    start: float
+    end: float
+    metadata: st_utils.StationPacketMetadata
+    exchanges: List[float]
+    summaries: List[ptp.PyarrowSummary]
+    audio: Optional[pa.Table] = None
+    gap: Optional[Tuple[float, float]] = None
+    gap_fill: Optional[pa.Table] = None
+    events: Optional[api_m.RedvoxPacketM] = None
+
+
+def audio_points(start: float, samples: pa.Table, sample_interval_micros: float) -> pa.Table:
+    """
+    :param start: timestamp of the first sample
+    :param samples: table with the microphone samples
+    :param sample_interval_micros: sample interval in microseconds
+    :return: table of the audio data points, see gap_and_pad_utils.AudioWithGaps.create_timestamps
+    """
+    timestamps = gpu.calc_evenly_sampled_timestamps(start, samples.num_rows, sample_interval_micros)
+    return pa.Table.from_pydict(
+        dict(zip(gpu.AUDIO_DF_COLUMNS, [timestamps, timestamps, samples["microphone"].to_numpy().astype(float)]))
+    )
+
+
+def audio_gap_points(gap: Tuple[float, float], sample_interval_micros: float) -> pa.Table:
+    """
+    :param gap: non-inclusive start and end timestamps of the gap
+    :param sample_interval_micros: sample interval in microseconds
+    :return: table of the data points filling the gap, see gap_and_pad_utils.AudioWithGaps.create_timestamps
+    """
+    fractional, whole = modf((gap[1] - gap[0]) / sample_interval_micros)
+    num_samples = int((whole - 1) if fractional < gpu.DEFAULT_GAP_LOWER_LIMIT else whole)
+    timestamps = gpu.calc_evenly_sampled_timestamps(
+        gap[0] + sample_interval_micros, num_samples, sample_interval_micros
+    )
+    return pa.Table.from_pydict(
+        dict(zip(gpu.AUDIO_DF_COLUMNS, [timestamps, timestamps, np.full(len(timestamps), np.nan)]))
+    )
+
+
+def _num_before(table: pa.Table, timestamp: float) -> int:
+    """
+    :param table: table sorted by timestamps
+    :param timestamp: timestamp to compare to
+    :return: number of rows at the start of the table with timestamps before the timestamp
+    """
+    count = 0
+    for chunk in table["timestamps"].chunks:
+        timestamps = chunk.to_numpy()
+        num_before = int(np.searchsorted(timestamps, timestamp, side="left"))
+        count += num_before
+        if num_before < len(timestamps):
+            break
+    return count
+
+
+def _num_after(table: pa.Table, timestamp: float) -> int:
+    """
+    :param table: table sorted by timestamps
+    :param timestamp: timestamp to compare to
+    :return: number of rows at the end of the table with timestamps after the timestamp
+    """
+    count = 0
+    for chunk in reversed(table["timestamps"].chunks):
+        timestamps = chunk.to_numpy()
+        num_after = len(timestamps) - int(np.searchsorted(timestamps, timestamp, side="right"))
+        count += num_after
+        if num_after < len(timestamps):
+            break
+    return count
+
+
+def append_sorted(table: Optional[pa.Table], points: pa.Table) -> pa.Table:
+    """
+    adds data points to a table sorted by timestamps.  Only the rows of the table after the first new point are
+    sorted again, so the result is the same as a stable sort of both tables joined, without sorting the whole table.
+
+    :param table: table sorted by timestamps, or None
+    :param points: data points sorted by timestamps to add
+    :return: table with the points added, sorted by timestamps
+    """
+    if table is None:
+        return points
+    if points.num_rows < 1:
+        return table
+    num_after = _num_after(table, points["timestamps"][0].as_py())
+    if num_after < 1:
+        return pa.concat_tables([table, points])
+    tail = pa.concat_tables([table.slice(table.num_rows - num_after), points])
+    tail = pc.take(tail, pc.sort_indices(tail, sort_keys=[("timestamps", "ascending")]))
+    return pa.concat_tables([table.slice(0, table.num_rows - num_after), tail])
+
+
+def remove_oldest_sorted(table: pa.Table, points: List[pa.Table]) -> pa.Table:
+    """
+    removes the oldest data points added to a table with append_sorted.  The result is the same as a stable sort of
+    the tables that were added after the points, and only the start of the table up to the last point is read.
+
+    :param table: table sorted by timestamps
+    :param points: the data points to remove, which must be the first ones added to the table
+    :return: table without the points
+    """
+    removed = np.sort(np.concatenate([p["timestamps"].to_numpy() for p in points]))
+    if len(removed) < 1:
+        return table
+    last = removed[-1]
+    # the removed points come before the points added later with the same timestamp
+    head_rows = _num_before(table, last) + len(removed) - int(np.searchsorted(removed, last, side="left"))
+    head = table.slice(0, head_rows)
+    head_timestamps = head["timestamps"].to_numpy()
+    rank = np.arange(head_rows) - np.searchsorted(head_timestamps, head_timestamps, side="left")
+    num_removed = np.searchsorted(removed, head_timestamps, side="right") - np.searchsorted(
+        removed, head_timestamps, side="left"
+    )
+    return pa.concat_tables([head.filter(pa.array(rank >= num_removed)), table.slice(head_rows)])
+
+
+class LiveStation:
+    """
+    a Station that packets are appended to as they arrive.  Packets must be appended in order of their start
+    timestamps and belong to the same station; other packets are rejected.
+
+    Properties:
+        retention_s: float, if set, only the packets that end within retention_s seconds of the end of the newest
+        packet are kept.  Default None (keep every packet)
+
+        correct_timestamps: bool, if True, the timestamps of the station snapshots are corrected.  Default False
+
+        use_model_correction: bool, if True, use OffsetModel functions for time correction, add OffsetModel
+        best offset (intercept value) otherwise.  Default True
+
+        gap_lower_limit: float, percentage of packet length required to disregard an audio gap.
+        Default DEFAULT_GAP_LOWER_LIMIT
+
+        _packets: the converted packets in the retention window, oldest first
+
+        _first_packet: the first packet appended, used for the station metadata and to validate new packets
+
+        _audio_summary: summary of the audio of the first packet with audio, used for the audio sensor metadata
+
+        _next_audio_timestamp: expected timestamp of the first audio sample of the next packet
+
+        _audio: the audio data points and gap fills of the packets in the retention window, sorted by timestamp
+
+        _sensor_tables: the data of every other sensor in the packets in the retention window, by sensor type
+
+        _sensor_summaries: the summaries of every other sensor in the packets in the retention window, by sensor type
+
+        _exchanges: time sync exchanges of the packets in the retention window as a flat list
+
+        _timesync: time sync data of _exchanges, or None if the exchanges changed since it was computed
+
+        _timesync_range: start and end timestamps of the data _timesync was computed for
+
+        _station: the latest snapshot of the station, or None if packets were appended since it was made
+
+        _errors: RedVoxExceptions, errors encountered by the LiveStation
+    """
+
+    def __init__(
+        self,
+        retention_s: Optional[float] = None,
+        correct_timestamps: bool = False,
+        use_model_correction: bool = True,
+        gap_lower_limit: float = gpu.DEFAULT_GAP_LOWER_LIMIT,
+    ):
+        """
+        initialize LiveStation
+
+        :param retention_s: if set, only keep the packets that end within retention_s seconds of the end of the
+                            newest packet.  Default None (keep every packet)
+        :param correct_timestamps: if True, correct the timestamps of the station snapshots.  Default False
+        :param use_model_correction: if True, use OffsetModel functions for time correction, add OffsetModel
+                                        best offset (intercept value) otherwise.  Default True
+        :param gap_lower_limit: percentage of packet length required to disregard an audio gap.
+                                Default DEFAULT_GAP_LOWER_LIMIT
+        """
+        if retention_s is not None and retention_s <= 0:
+            raise ValueError("retention_s must be > 0")
+        self.retention_s: Optional[float] = retention_s
+        self.correct_timestamps: bool = correct_timestamps
+        self.use_model_correction: bool = use_model_correction
+        self.gap_lower_limit: float = gap_lower_limit
+        self._packets: Deque[LivePacket] = deque()
+        self._first_packet: Optional[api_m.RedvoxPacketM] = None
+        self._audio_summary: Optional[ptp.PyarrowSummary] = None
+        self._next_audio_timestamp: float = np.nan
+        self._audio: Optional[pa.Table] = None
+        self._sensor_tables: Dict[SensorType, pa.Table] = {}
+        self._sensor_summaries: Dict[SensorType, Deque[ptp.PyarrowSummary]] = {}
+        self._exchanges: List[float] = []
+        self._timesync: Optional[TimeSync] = None
+        self._timesync_range: Tuple[float, float] = (np.nan, np.nan)
+        self._station: Optional[Station] = None
+        self._errors: RedVoxExceptions = RedVoxExceptions("LiveStation")
+
+    def _validate_packet(self, packet: api_m.RedvoxPacketM) -> bool:
+        """
+        :param packet: packet to check
+        :return: True if the packet belongs to the station and starts after the newest packet
+        """
+        first = self._first_packet
+        if (
+            packet.station_information.id != first.station_information.id
+            or packet.station_information.uuid != first.station_information.uuid
+            or packet.timing_information.app_start_mach_timestamp != first.timing_information.app_start_mach_timestamp
+        ):
+            self._errors.append(
+                f"Packet from station {packet.station_information.id} does not belong to station "
+                f"{first.station_information.id}; packet rejected."
+            )
+            return False
+        if packet.sensors.audio.sample_rate != first.sensors.audio.sample_rate:
+            self._errors.append(
+                f"Packet audio sample rate {packet.sensors.audio.sample_rate} does not match the station's "
+                f"{first.sensors.audio.sample_rate}; packet rejected."
+            )
+            return False
+        if len(self._packets) > 0 and packet.timing_information.packet_start_mach_timestamp <= self._packets[-1].start:
+            self._errors.append(
+                f"Packet starting at {packet.timing_information.packet_start_mach_timestamp} is not newer than the "
+                f"last packet starting at {self._packets[-1].start}; packet rejected."
+            )
+            return False
+        return True
+
+    def _convert_audio(self, live_packet: LivePacket, audio: ptp.PyarrowSummary):
+        """
+        converts the audio of a packet and detects the gap before it, see gap_and_pad_utils.fill_audio_gaps
+
+        :param live_packet: the converted packet to add the audio to
+        :param audio: summary of the audio of the packet
+        """
+        sample_interval_micros = s_to_us(1 / audio.srate_hz)
+        start_ts = int(live_packet.start)
+        samples_in_packet = audio.data().num_rows
+        if np.isnan(self._next_audio_timestamp):
+            self._next_audio_timestamp = start_ts
+        packet_length = sample_interval_micros * samples_in_packet
+        last_timestamp_diff = start_ts - self._next_audio_timestamp
+        if last_timestamp_diff > self.gap_lower_limit * packet_length:
+            live_packet.gap = (self._next_audio_timestamp - sample_interval_micros, start_ts)
+            live_packet.gap_fill = audio_gap_points(live_packet.gap, sample_interval_micros)
+            self._next_audio_timestamp = start_ts
+        elif last_timestamp_diff < -self.gap_lower_limit * packet_length:
+            self._errors.append(
+                f"Packet start timestamp: {start_ts} is before last timestamp of previous "
+                f"packet: {self._next_audio_timestamp - sample_interval_micros}"
+            )
+        self._next_audio_timestamp += samples_in_packet * sample_interval_micros
+        live_packet.audio = audio_points(start_ts, audio.data(), sample_interval_micros)
+
+    def _add_to_running_data(self, live_packet: LivePacket):
+        """
+        adds the converted data of a packet to the running tables and exchanges
+
+        :param live_packet: the converted packet to add
+        """
+        # the gap before the oldest packet in the retention window is not filled
+        if live_packet.gap_fill is not None and len(self._packets) > 0:
+            self._audio = append_sorted(self._audio, live_packet.gap_fill)
+        if live_packet.audio is not None:
+            self._audio = append_sorted(self._audio, live_packet.audio)
+        for summary in live_packet.summaries:
+            if summary.stype in self._sensor_tables:
+                table = self._sensor_tables[summary.stype]
+                self._sensor_tables[summary.stype] = pa.concat_tables([table, summary.data()])
+                self._sensor_summaries[summary.stype].append(summary)
+            else:
+                self._sensor_tables[summary.stype] = summary.data()
+                self._sensor_summaries[summary.stype] = deque([summary])
+        if live_packet.exchanges:
+            self._exchanges.extend(live_packet.exchanges)
+            self._timesync = None
+
+    def _drop_oldest_packet(self):
+        """
+        removes the oldest packet in the retention window and trims its data from the running tables and exchanges
+        """
+        dropped = self._packets.popleft()
+        audio_points: List[pa.Table] = [] if dropped.audio is None else [dropped.audio]
+        # the new oldest packet's gap is no longer filled
+        if self._packets and self._packets[0].gap_fill is not None:
+            audio_points.append(self._packets[0].gap_fill)
+        if audio_points:
+            self._audio = remove_oldest_sorted(self._audio, audio_points)
+        for summary in dropped.summaries:
+            self._sensor_summaries[summary.stype].popleft()
+            if self._sensor_summaries[summary.stype]:
+                table = self._sensor_tables[summary.stype]
+                self._sensor_tables[summary.stype] = table.slice(summary.data().num_rows)
+            else:
+                del self._sensor_summaries[summary.stype]
+                del self._sensor_tables[summary.stype]
+        if dropped.exchanges:
+            del self._exchanges[: len(dropped.exchanges)]
+            self._timesync = None
+
+    def append_packet(self, packet: api_m.RedvoxPacketM) -> bool:
+        """
+        converts a packet and adds it to the station, then drops the packets outside the retention window
+
+        :param packet: API M redvox packet to add
+        :return: True if the packet was added, False if it was rejected
+        """
+        if self._first_packet is None:
+            self._first_packet = api_m.RedvoxPacketM()
+            self._first_packet.CopyFrom(packet)
+        elif not self._validate_packet(packet):
+            return False
+        live_packet = LivePacket(
+            packet.timing_information.packet_start_mach_timestamp,
+            packet.timing_information.packet_end_mach_timestamp,
+            st_utils.StationPacketMetadata(packet),
+            TimeSync.exchanges_from_packet(packet),
+            [],
+        )
+        for summary in ptp.packet_to_pyarrow(packet).summaries:
+            if summary.stype == ptp.SensorType.AUDIO:
+                if self._audio_summary is None:
+                    self._audio_summary = summary
+                self._convert_audio(live_packet, summary)
+            else:
+                live_packet.summaries.append(summary)
+        if len(packet.event_streams) > 0:
+            live_packet.events = api_m.RedvoxPacketM()
+            live_packet.events.event_streams.extend(packet.event_streams)
+        self._add_to_running_data(live_packet)
+        self._packets.append(live_packet)
+        if self.retention_s is not None:
+            oldest_end = live_packet.end - s_to_us(self.retention_s)
+            while self._packets[0].end < oldest_end:
+                self._drop_oldest_packet()
+        self._station = None
+        return True
+
+    def append_packets(self, packets: Iterable[api_m.RedvoxPacketM]) -> int:
+        """
+        :param packets: API M redvox packets to add, in order
+        :return: number of packets added
+        """
+        return sum(self.append_packet(packet) for packet in packets)
+
+    def num_packets(self) -> int:
+        """
+        :return: number of packets in the retention window
+        """
+        return len(self._packets)
+
+    def first_packet_start(self) -> float:
+        """
+        :return: start timestamp of the oldest packet in the retention window, np.nan if there are no packets
+        """
+        return self._packets[0].start if self._packets else np.nan
+
+    def last_packet_end(self) -> float:
+        """
+        :return: end timestamp of the newest packet in the retention window, np.nan if there are no packets
+        """
+        return self._packets[-1].end if self._packets else np.nan
+
+    def gaps(self) -> List[Tuple[float, float]]:
+        """
+        :return: the audio gaps between the packets in the retention window
+        """
+        return [p.gap for p in list(self._packets)[1:] if p.gap is not None]
+
+    def timesync_data(self) -> TimeSync:
+        """
+        the time sync data is only computed again when the exchanges or the range of the data change
+
+        :return: time sync data of the packets in the retention window
+        """
+        data_range = (self.first_packet_start(), self.last_packet_end())
+        if self._timesync is None or self._timesync_range != data_range:
+            self._timesync = TimeSync().from_exchanges(self._exchanges, data_range[0], data_range[1])
+            self._timesync_range = data_range
+        # snapshots set the file locations of their time sync data, so each gets its own copy
+        return copy.copy(self._timesync)
+
+    def _sensor_types(self) -> List[SensorType]:
+        """
+        :return: the types of the sensors other than audio, in the order they first appear in the retention window
+        """
+        types: List[SensorType] = []
+        for p in self._packets:
+            for summary in p.summaries:
+                if summary.stype not in types:
+                    types.append(summary.stype)
+            if len(types) == len(self._sensor_tables):
+                break
+        return types
+
+    def station(self) -> Station:
+        """
+        a snapshot of the packets in the retention window.  The snapshot is reused until another packet is added.
+
+        :return: Station with the data of the packets in the retention window
+        """
+        if self._station is None:
+            station = Station(correct_timestamps=self.correct_timestamps, use_model_correction=self.use_model_correction)
+            if self._packets:
+                summaries = ptp.AggregateSummary()
+                summaries.gaps = self.gaps()
+                if self._audio_summary is not None:
+                    audio = self._audio
+                    first = self._audio_summary
+                    summaries.add_summary(
+                        ptp.PyarrowSummary(
+                            first.name,
+                            first.stype,
+                            self._packets[0].start,
+                            first.srate_hz,
+                            first.fdir,
+                            audio.num_rows,
+                            first.smint_s,
+                            first.sstd_s,
+                            audio,
+                        )
+                    )
+                for stype in self._sensor_types():
+                    sensor_summaries = self._sensor_summaries[stype]
+                    table = self._sensor_tables[stype]
+                    first = sensor_summaries[0]
+                    # the mean intervals of the packets are checked against the merged data, as for separate summaries
+                    summaries.add_summary(
+                        ptp.PyarrowSummary(
+                            first.name,
+                            stype,
+                            first.start,
+                            first.srate_hz,
+                            first.fdir,
+                            table.num_rows,
+                            float(np.mean([s.smint_s for s in sensor_summaries])),
+                            float(np.mean([s.sstd_s for s in sensor_summaries])),
+                            table,
+                        )
+                    )
+                events = EventStreams()
+                events.read_from_packets_list([p.events for p in self._packets if p.events is not None])
+                station.load_from_converted_packets(
+                    self._first_packet,
+                    [copy.copy(p.metadata) for p in self._packets],
+                    self.timesync_data(),
+                    summaries,
+                    events,
+                )
+                station.errors().extend_error(self._errors)
+            self._station = station
+        return self._station
+
+    def errors(self) -> RedVoxExceptions:
+        """
+        :return: errors encountered by the LiveStation
+        """
+        return self._errors
@@ -0,0 +1,242 @@
+"""
+Reads the metadata of RedVox packets without parsing their sensor payloads.
+
+API 1000 files are filtered on the protobuf wire format before they are parsed: the bulky payload fields are skipped
+over without being decoded, so the remaining message is small and cheap to parse.  API 900 files are read completely
+and converted to API 1000.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import lz4.frame
+import pyarrow as pa
+
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+from redvox.common import api_conversions as ac
+from redvox.common import io
+from redvox.common.parallel_utils import prefetch_map
+
+# A filter maps a field number to None if the field is dropped, or to the filter of the sub-message it holds.
+# Fields that are not in a filter are kept as is.
+FieldFilter = Dict[int, Optional["FieldFilter"]]
+
+# Removes the audio samples, compressed audio bytes and image samples, and the event streams; everything else in the
+# sensors (descriptions, sample rates, timestamps, location) is kept.
+_PAYLOAD_FILTER: FieldFilter = {
+    5: {  # sensors
+        3: {7: None},  # audio.samples
+        4: {5: None},  # compressed_audio.audio_bytes
+        7: {3: None},  # image.samples
+    },
+    6: None,  # event_streams
+}
+
+# Removes the sensors and the event streams; only the station information, timing information and metadata are kept.
+_SENSORS_FILTER: FieldFilter = {5: None, 6: None}
+
+METADATA_SCHEMA: pa.Schema = pa.schema(
+    [
+        ("station_id", pa.string()),
+        ("station_uuid", pa.string()),
+        ("api", pa.float64()),
+        ("sub_api", pa.float64()),
+        ("make", pa.string()),
+        ("model", pa.string()),
+        ("os", pa.int32()),
+        ("app_version", pa.string()),
+        ("app_start_mach_timestamp", pa.float64()),
+        ("packet_start_mach_timestamp", pa.float64()),
+        ("packet_end_mach_timestamp", pa.float64()),
+        ("packet_start_os_timestamp", pa.float64()),
+        ("packet_end_os_timestamp", pa.float64()),
+        ("server_acquisition_arrival_timestamp", pa.float64()),
+        ("best_latency", pa.float64()),
+        ("best_offset", pa.float64()),
+        ("num_synch_exchanges", pa.int64()),
+        ("synch_exchanges", pa.list_(pa.float64())),
+    ]
+)
+
+
+def _read_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    """
+    :param buf: the buffer to read from
+    :param pos: position of the varint in buf
+    :return: the value of the varint and the position after it
+    """
+    result: int = 0
+    shift: int = 0
+    while True:
+        byte: int = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_varint(value: int) -> bytes:
+    """
+    :param value: a non-negative integer
+    :return: value encoded as a varint
+    """
+    out: bytearray = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _filter_fields(buf: memoryview, field_filter: FieldFilter) -> List[memoryview]:
+    """
+    walks the fields of a serialized message and keeps the ones allowed by the filter
+
+    :param buf: the serialized message
+    :param field_filter: the fields to drop or filter further
+    :return: the parts of the filtered message, in order
+    """
+    parts: List[memoryview] = []
+    pos: int = 0
+    end: int = len(buf)
+    while pos < end:
+        field_start: int = pos
+        key, pos = _read_varint(buf, pos)
+        field_number: int = key >> 3
+        wire_type: int = key & 0x7
+        key_end: int = pos
+        if wire_type == 0:
+            _, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value_start: int = pos
+            pos += length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type} for field {field_number}")
+
+        if field_number not in field_filter:
+            parts.append(buf[field_start:pos])
+        elif field_filter[field_number] is not None and wire_type == 2:
+            sub_parts: List[memoryview] = _filter_fields(buf[value_start:pos], field_filter[field_number])
+            parts.append(buf[field_start:key_end])
+            parts.append(memoryview(_encode_varint(sum(len(part) for part in sub_parts))))
+            parts.extend(sub_parts)
+    return parts
+
+
+def strip_packet_payloads(buf: bytes, keep_sensors: bool = True) -> bytes:
+    """
+    removes the bulky fields from a serialized, uncompressed RedvoxPacketM without parsing the packet
+
+    :param buf: the serialized packet
+    :param keep_sensors: if True, keep the sensors but remove the audio samples, compressed audio bytes and image
+                            samples; if False, remove the sensors completely.  Event streams are always removed.
+                            Default True
+    :return: the serialized packet without the removed fields
+    """
+    return b"".join(_filter_fields(memoryview(buf), _PAYLOAD_FILTER if keep_sensors else _SENSORS_FILTER))
+
+
+def read_packet_metadata(entry: io.IndexEntry, keep_sensors: bool = True) -> Optional[RedvoxPacketM]:
+    """
+    reads the packet referenced by entry without its sensor payloads.  API 900 packets are read completely and
+    converted to API 1000.
+
+    :param entry: index entry of the packet to read
+    :param keep_sensors: if True, keep the sensors without their audio and image payloads, otherwise remove the
+                            sensors completely.  Default True
+    :return: the packet, or None if the entry is not an API 900 or API 1000 packet
+    """
+    if entry.api_version == io.ApiVersion.API_1000:
+        with open(entry.full_path, "rb") as file_in:
+            buf: bytes = lz4.frame.decompress(file_in.read())
+        packet: RedvoxPacketM = RedvoxPacketM()
+        packet.ParseFromString(strip_packet_payloads(buf, keep_sensors))
+        return packet
+    elif entry.api_version == io.ApiVersion.API_900:
+        packet_900 = entry.read_raw()
+        return None if packet_900 is None else ac.convert_api_900_to_1000_raw(packet_900)
+    return None
+
+
+def entries_in_stream_order(index: io.Index) -> List[io.IndexEntry]:
+    """
+    :param index: index of the packets to read
+    :return: the API 900 and API 1000 entries of the index, in the order Index.stream_contents reads them
+    """
+    return [
+        entry
+        for api_version in [io.ApiVersion.API_900, io.ApiVersion.API_1000]
+        for entry in filter(io.ReadFilter.empty().with_api_versions({api_version}).apply, index.entries)
+    ]
+
+
+def stream_packet_metadata(
+    index: io.Index, keep_sensors: bool = True, prefetch: int = 0, workers: int = 1
+) -> Iterator[RedvoxPacketM]:
+    """
+    reads the packets in the index without their sensor payloads, in the same order as Index.stream_contents
+
+    :param index: index of the packets to read
+    :param keep_sensors: if True, keep the sensors without their audio and image payloads, otherwise remove the
+                            sensors completely.  Default True
+    :param prefetch: maximum number of packets read ahead of the consumer, see Index.stream_raw.  Default 0
+    :param workers: number of threads reading files when prefetch is positive.  Default 1
+    :return: iterator over RedvoxPacketM
+    """
+    entries: List[io.IndexEntry] = entries_in_stream_order(index)
+    for packet in prefetch_map(lambda entry: read_packet_metadata(entry, keep_sensors), entries, prefetch, workers):
+        if packet is not None:
+            yield packet
+
+
+def metadata_table(packets: Iterator[RedvoxPacketM]) -> pa.Table:
+    """
+    :param packets: the packets to summarize; their sensors are not used
+    :return: table with one row of station and timing information per packet, following METADATA_SCHEMA
+    """
+    columns: Dict[str, list] = {name: [] for name in METADATA_SCHEMA.names}
+    for packet in packets:
+        station = packet.station_information
+        timing = packet.timing_information
+        exchanges: List[float] = []
+        for ex in timing.synch_exchanges:
+            exchanges.extend((ex.a1, ex.a2, ex.a3, ex.b1, ex.b2, ex.b3))
+        for name, value in (
+            ("station_id", station.id),
+            ("station_uuid", station.uuid),
+            ("api", packet.api),
+            ("sub_api", packet.sub_api),
+            ("make", station.make),
+            ("model", station.model),
+            ("os", station.os),
+            ("app_version", station.app_version),
+            ("app_start_mach_timestamp", timing.app_start_mach_timestamp),
+            ("packet_start_mach_timestamp", timing.packet_start_mach_timestamp),
+            ("packet_end_mach_timestamp", timing.packet_end_mach_timestamp),
+            ("packet_start_os_timestamp", timing.packet_start_os_timestamp),
+            ("packet_end_os_timestamp", timing.packet_end_os_timestamp),
+            ("server_acquisition_arrival_timestamp", timing.server_acquisition_arrival_timestamp),
+            ("best_latency", timing.best_latency),
+            ("best_offset", timing.best_offset),
+            ("num_synch_exchanges", len(timing.synch_exchanges)),
+            ("synch_exchanges", exchanges),
+        ):
+            columns[name].append(value)
+    return pa.Table.from_pydict(columns, schema=METADATA_SCHEMA)
+
+
+def scan_metadata(index: io.Index, prefetch: int = 0, workers: int = 1) -> pa.Table:
+    """
+    reads the station and timing information of every packet in the index without parsing the sensors
+
+    :param index: index of the packets to read
+    :param prefetch: maximum number of packets read ahead, see Index.stream_raw.  Default 0
+    :param workers: number of threads reading files when prefetch is positive.  Default 1
+    :return: table with one row per packet, in the same order as Index.stream_contents, following METADATA_SCHEMA
+    """
+    return metadata_table(stream_packet_metadata(index, False, prefetch, workers))
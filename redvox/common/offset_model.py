@@ -470,27 +470,29 @@ def get_offset_at_new_time(new_time: float, slope: float, intercept: float, mode
 def get_binned_df(full_df: pd.DataFrame, bin_times: np.ndarray, n_samples: float) -> pd.DataFrame:
     """
     Returns a subset of the full_df with n_samples per binned times.
-    nan latencies values will be ignored.
+    nan latencies values will be ignored unless a bin has fewer than n_samples valid latencies.
 
     :param full_df: pandas DataFrame containing latencies, offsets, and times.
     :param bin_times: array of edge times for each bin
     :param n_samples: number of samples to take per bin
     :return: binned_df
     """
-    # Initialize the data frame
-    binned_df = pd.DataFrame()
-
-    # Loop through each bin and get the n smallest samples
-    for i in range(len(bin_times) - 1):
-        # select the time range
-        select_df = full_df[full_df["times"] < bin_times[i + 1]]
-        select_df = select_df[select_df["times"] > bin_times[i]]
-
-        # select n_samples smallest values (ignores nan values)
-        n_smallest = select_df.nsmallest(n_samples, "latencies")
-
-        # append the n_smallest entries
-        binned_df = pd.concat([binned_df, n_smallest])
+    times = full_df["times"].to_numpy()
+    latencies = full_df["latencies"].to_numpy()
+
+    # the bin each time falls in; times on a bin edge or outside the bins are not in any bin
+    bin_index = np.searchsorted(bin_times, times, side="right") - 1
+    in_bin = (bin_index >= 0) & (bin_index < len(bin_times) - 1)
+    in_bin[in_bin] &= times[in_bin] > bin_times[bin_index[in_bin]]
+    rows = np.flatnonzero(in_bin)
+
+    # order the rows by bin, then by latency (nan last), then by position; the first n_samples rows of each bin
+    # are the same rows DataFrame.nsmallest would pick for that bin
+    rows = rows[np.lexsort((rows, latencies[rows], bin_index[rows]))]
+    bins = bin_index[rows]
+    bin_starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]]) if len(bins) > 0 else np.array([], dtype=int)
+    rank = np.arange(len(rows)) - np.repeat(bin_starts, np.diff(np.r_[bin_starts, len(rows)]))
+    binned_df = full_df.iloc[rows[rank < n_samples]]
 
     # Sort the binned_df by time
     binned_df = binned_df.sort_values(by=["times"])
@@ -2,7 +2,7 @@
 Converts data from RedVox packets into pyarrow tables.
 """
 
-from typing import Optional, Dict, Callable, List, Tuple
+from typing import Optional, Dict, Callable, Iterator, List, Tuple, Union
 import os
 from pathlib import Path
 from itertools import repeat
@@ -16,6 +16,9 @@ from dataclasses import dataclass, field
 from dataclasses_json import dataclass_json
 
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+import redvox.api900.lib.api900_pb2 as api_900
+import redvox.api900.reader_utils as reader_utils
+from redvox.common import api_conversions as ac
 from redvox.common import sensor_reader_utils as srupa
 from redvox.common import date_time_utils as dtu
 from redvox.common import gap_and_pad_utils as gpu
@@ -79,6 +82,10 @@ class PyarrowSummary:
         sstd: float, std dev of sample rate in seconds
 
         _data: optional data as a Pyarrow Table
+
+        sink_file: str, parquet file written by a ParquetSink that contains the data, default empty string
+
+        row_group: int, index of the row group in sink_file that contains the data, default -1 (not in a sink)
     """
 
     name: str
@@ -90,6 +97,8 @@ class PyarrowSummary:
     smint_s: float = np.nan
     sstd_s: float = np.nan
     _data: Optional[pa.Table] = None
+    sink_file: str = ""
+    row_group: int = -1
 
     def file_name(self) -> str:
         """
@@ -138,10 +147,110 @@ class PyarrowSummary:
         """
         if self.check_data():
             return self._data
+        if self.is_in_sink():
+            return pq.ParquetFile(self.sink_file).read_row_group(self.row_group)
         if os.path.exists(self.file_name()):
             return pq.read_table(self.file_name())
         return pa.Table.from_pydict({})
 
+    def is_in_sink(self) -> bool:
+        """
+        :return: True if the data was written to a row group of a ParquetSink file
+        """
+        return self.row_group >= 0 and os.path.exists(self.sink_file)
+
+
+def read_summaries_data(summaries: List[PyarrowSummary]) -> List[pa.Table]:
+    """
+    read the data of many summaries, opening each ParquetSink file only once
+
+    :param summaries: summaries to read
+    :return: the data of each summary, in the same order as summaries
+    """
+    sink_files: Dict[str, pq.ParquetFile] = {}
+    result = []
+    for smry in summaries:
+        if not smry.check_data() and smry.is_in_sink():
+            if smry.sink_file not in sink_files:
+                sink_files[smry.sink_file] = pq.ParquetFile(smry.sink_file)
+            result.append(sink_files[smry.sink_file].read_row_group(smry.row_group))
+        else:
+            result.append(smry.data())
+    for pf in sink_files.values():
+        pf.close()
+    return result
+
+
+class ParquetSink:
+    """
+    Streams the data of PyarrowSummary to disk using one parquet file per sensor type.  Each summary written adds a
+    row group to the file of its sensor type instead of creating a new file.  A summary whose schema can't be made
+    to match its file starts a new file.  Close the sink before reading the data of any summary written to it.
+
+    Properties:
+        out_dir: str, directory to write to.  Each sensor type is written to a subdirectory named {type}_SUMMARY
+
+        _writers: dictionary of sensor type to the open writer, its file path and the number of row groups written
+    """
+
+    def __init__(self, out_dir: str):
+        """
+        :param out_dir: directory to write to
+        """
+        self.out_dir: str = out_dir
+        self._writers: Dict[SensorType, Tuple[pq.ParquetWriter, str, int]] = {}
+
+    def __enter__(self) -> "ParquetSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, summary: PyarrowSummary) -> PyarrowSummary:
+        """
+        append the data of the summary to the file of its sensor type, then remove the data from the summary
+
+        :param summary: summary to write
+        :return: the updated summary
+        """
+        summary.fdir = os.path.join(self.out_dir, f"{summary.stype.name}_SUMMARY")
+        if not summary.check_data():
+            return summary
+        table = summary._data
+        if summary.stype in self._writers:
+            writer, path, row_groups = self._writers[summary.stype]
+            if not table.schema.equals(writer.schema):
+                try:
+                    table = table.cast(writer.schema)
+                except (ValueError, NotImplementedError):
+                    self._close_writer(summary.stype)
+        if summary.stype not in self._writers:
+            os.makedirs(summary.fdir, exist_ok=True)
+            path = summary.file_name()
+            self._writers[summary.stype] = (pq.ParquetWriter(path, table.schema), path, 0)
+        writer, path, row_groups = self._writers[summary.stype]
+        writer.write_table(table)
+        self._writers[summary.stype] = (writer, path, row_groups + 1)
+        summary.sink_file = path
+        summary.row_group = row_groups
+        summary._data = None
+        return summary
+
+    def _close_writer(self, stype: SensorType):
+        """
+        close the file of a sensor type
+
+        :param stype: the sensor type of the file to close
+        """
+        self._writers.pop(stype)[0].close()
+
+    def close(self):
+        """
+        close all files.  the sink can still be written to, but new files will be created
+        """
+        for stype in list(self._writers.keys()):
+            self._close_writer(stype)
+
 
 @dataclass_json
 @dataclass
@@ -182,8 +291,8 @@ class AggregateSummary:
         audio_lst = self.get_audio()
         frst_audio = audio_lst[0]
         use_mem = frst_audio.check_data()
-        for adl in audio_lst:
-            pckt_info.append((int(adl.start), adl.data()))
+        for adl, adl_data in zip(audio_lst, read_summaries_data(audio_lst)):
+            pckt_info.append((int(adl.start), adl_data))
 
         audio_data = gpu.fill_audio_gaps(pckt_info, dtu.seconds_to_microseconds(1 / frst_audio.srate_hz))
         tbl = audio_data.create_timestamps()
@@ -221,18 +330,28 @@ class AggregateSummary:
             if len(smrys) > 0:
                 combined_mint = np.mean([smrs.smint_s for smrs in smrys])
                 combined_std = np.mean([smrs.sstd_s for smrs in smrys])
-                first_summary = smrys.pop(0)
-                tbl = first_summary.data()
-                if not first_summary.check_data():
-                    os.makedirs(first_summary.fdir, exist_ok=True)
-                for smrs in smrys:
-                    tbl = pa.concat_tables([tbl, smrs.data()])
-                    if not first_summary.check_data():
-                        os.remove(smrs.file_name())
-                if first_summary.check_data():
-                    first_summary._data = tbl
+                first_summary = smrys[0]
+                sink_files = list(dict.fromkeys(smrs.sink_file for smrs in smrys))
+                if all(smrs.is_in_sink() for smrs in smrys):
+                    # every row group of the sink files belongs to this sensor, so read the whole files
+                    tbl = pa.concat_tables([pq.read_table(f) for f in sink_files])
+                    if len(sink_files) > 1:
+                        for f in sink_files:
+                            os.remove(f)
+                        pq.write_table(tbl, first_summary.file_name())
                 else:
-                    pq.write_table(tbl, first_summary.file_name())
+                    smrys.pop(0)
+                    tbl = first_summary.data()
+                    if not first_summary.check_data():
+                        os.makedirs(first_summary.fdir, exist_ok=True)
+                    for smrs in smrys:
+                        tbl = pa.concat_tables([tbl, smrs.data()])
+                        if not first_summary.check_data():
+                            os.remove(smrs.file_name())
+                    if first_summary.check_data():
+                        first_summary._data = tbl
+                    else:
+                        pq.write_table(tbl, first_summary.file_name())
                 # sort data by timestamps
                 tbl = pc.take(tbl, pc.sort_indices(tbl, sort_keys=[("timestamps", "ascending")]))
                 timestamps = tbl["timestamps"].to_numpy()
@@ -352,31 +471,74 @@ class AggregateSummary:
         return result
 
 
-def stream_to_pyarrow(packets: List[RedvoxPacketM], out_dir: Optional[str] = None) -> AggregateSummary:
+def stream_to_pyarrow(
+    packets: List[Union[RedvoxPacketM, api_900.RedvoxPacket]], out_dir: Optional[str] = None
+) -> AggregateSummary:
     """
     stream the packets to parquet files for later processing.
 
-    :param packets: redvox packets to convert
+    :param packets: redvox packets to convert; API 900 packets are converted directly, see api_900_to_pyarrow
     :param out_dir: optional directory to write the pyarrow files to; if None, don't write files.  default None
     :return: AggregateSummary of the sensors' metadata, data, and location of the data if written to disk
     """
     summary = AggregateSummary()
-    for k in map(packet_to_pyarrow, packets, repeat(out_dir)):
-        for t in k.summaries:
-            summary.add_summary(t)
+    sink = ParquetSink(out_dir) if out_dir else None
+    try:
+        for k in map(packet_to_pyarrow, packets, repeat(out_dir), repeat(sink)):
+            for t in k.summaries:
+                summary.add_summary(t)
+    finally:
+        if sink:
+            sink.close()
 
     return summary
 
 
-def packet_to_pyarrow(packet: RedvoxPacketM, out_dir: Optional[str] = None) -> AggregateSummary:
+def _add_summaries(
+    result: AggregateSummary,
+    sensors: Iterator[Optional[PyarrowSummary]],
+    packet_start: int,
+    out_dir: Optional[str],
+    sink: Optional[ParquetSink],
+) -> AggregateSummary:
+    """
+    sets the start of the summaries of a packet, writes their data if requested and adds them to result
+
+    :param result: the aggregate to add the summaries to
+    :param sensors: the summaries of a packet; None for sensors the packet doesn't have
+    :param packet_start: the start of the packet in microseconds since epoch utc
+    :param out_dir: optional directory to write the pyarrow files to; if None, don't write files
+    :param sink: optional ParquetSink to append the data to instead of writing one file per sensor to out_dir
+    :return: the updated result
+    """
+    for data in sensors:
+        if data:
+            data.start = packet_start
+            if sink:
+                sink.write(data)
+            elif out_dir:
+                data.fdir = os.path.join(out_dir, f"{data.stype.name}_SUMMARY")
+                data.write_data()
+            result.add_summary(data)
+    return result
+
+
+def packet_to_pyarrow(
+    packet: Union[RedvoxPacketM, api_900.RedvoxPacket],
+    out_dir: Optional[str] = None,
+    sink: Optional[ParquetSink] = None,
+) -> AggregateSummary:
     """
     gets non-audio sensor information by keeping it memory or writing it into folders named with the sensor names
 
-    :param packet: packet to extract data from
+    :param packet: packet to extract data from; API 900 packets are converted directly, see api_900_to_pyarrow
     :param out_dir: optional directory to write the pyarrow files to; if None, don't write files.  default None
+    :param sink: optional ParquetSink to append the data to instead of writing one file per sensor to out_dir.
+                    default None
     :return: AggregateSummary of the sensors' metadata, data, and location of the data if written to disk
     """
-    result = AggregateSummary()
+    if isinstance(packet, api_900.RedvoxPacket):
+        return api_900_to_pyarrow(packet, out_dir, sink)
     packet_start = int(packet.timing_information.packet_start_mach_timestamp)
     funcs = [
         load_apim_audio,
@@ -399,15 +561,40 @@ def packet_to_pyarrow(packet: RedvoxPacketM, out_dir: Optional[str] = None) -> A
         load_apim_rotation_vector,
         load_apim_velocity,
     ]
-    sensors = map(lambda fn: fn(packet), funcs)
-    for data in sensors:
-        if data:
-            data.start = packet_start
-            if out_dir:
-                data.fdir = os.path.join(out_dir, f"{data.stype.name}_SUMMARY")
-                data.write_data()
-            result.add_summary(data)
-    return result
+    return _add_summaries(AggregateSummary(), map(lambda fn: fn(packet), funcs), packet_start, out_dir, sink)
+
+
+def api_900_to_pyarrow(
+    packet: api_900.RedvoxPacket, out_dir: Optional[str] = None, sink: Optional[ParquetSink] = None
+) -> AggregateSummary:
+    """
+    converts the channels of an API 900 packet straight into the summaries packet_to_pyarrow creates for the packet
+    converted to API M, without building the API M packet.
+
+    :param packet: API 900 packet to extract data from
+    :param out_dir: optional directory to write the pyarrow files to; if None, don't write files.  default None
+    :param sink: optional ParquetSink to append the data to instead of writing one file per sensor to out_dir.
+                    default None
+    :return: AggregateSummary of the sensors' metadata, data, and location of the data if written to disk
+    """
+    if len(packet.evenly_sampled_channels) < 1:
+        raise ValueError("Cannot convert API900 to API1000; Audio sensor missing.")
+    audio_900: api_900.EvenlySampledChannel = packet.evenly_sampled_channels[0]
+    packet_dur_s = reader_utils.payload_len(audio_900) / audio_900.sample_rate_hz
+    sensors = [
+        load_api900_audio(audio_900),
+        load_api900_health(packet),
+        load_api900_location(packet, packet_dur_s),
+        load_api900_single(packet, {api_900.ChannelType.BAROMETER}, srupa.SensorType.PRESSURE, packet_dur_s),
+        load_api900_single(packet, {api_900.ChannelType.LIGHT}, srupa.SensorType.LIGHT, packet_dur_s),
+        load_api900_single(packet, {api_900.ChannelType.INFRARED}, srupa.SensorType.PROXIMITY, packet_dur_s),
+        load_api900_xyz(packet, srupa.SensorType.ACCELEROMETER, packet_dur_s),
+        load_api900_xyz(packet, srupa.SensorType.GYROSCOPE, packet_dur_s),
+        load_api900_xyz(packet, srupa.SensorType.MAGNETOMETER, packet_dur_s),
+    ]
+    return _add_summaries(
+        AggregateSummary(), iter(sensors), int(packet.app_file_start_timestamp_machine), out_dir, sink
+    )
 
 
 def load_apim_audio(packet: RedvoxPacketM) -> Optional[PyarrowSummary]:
@@ -772,3 +959,268 @@ def load_apim_velocity(packet: RedvoxPacketM) -> Optional[PyarrowSummary]:
     :return: velocity sensor data if it exists, None otherwise
     """
     return load_xyz(packet, srupa.SensorType.VELOCITY)
+
+
+# The API 900 channels holding the samples of the xyz sensors API 900 can have
+_API_900_XYZ_CHANNELS: Dict[srupa.SensorType, set] = {
+    srupa.SensorType.ACCELEROMETER: {
+        api_900.ChannelType.ACCELEROMETER_X,
+        api_900.ChannelType.ACCELEROMETER_Y,
+        api_900.ChannelType.ACCELEROMETER_Z,
+    },
+    srupa.SensorType.GYROSCOPE: {
+        api_900.ChannelType.GYROSCOPE_X,
+        api_900.ChannelType.GYROSCOPE_Y,
+        api_900.ChannelType.GYROSCOPE_Z,
+    },
+    srupa.SensorType.MAGNETOMETER: {
+        api_900.ChannelType.MAGNETOMETER_X,
+        api_900.ChannelType.MAGNETOMETER_Y,
+        api_900.ChannelType.MAGNETOMETER_Z,
+    },
+}
+
+# The API 900 channels holding the location samples, the location columns they fill, and whether API M stores the
+# samples as doubles
+_API_900_LOCATION_CHANNELS: List[Tuple[int, str, bool]] = [
+    (api_900.ChannelType.LATITUDE, "latitude", True),
+    (api_900.ChannelType.LONGITUDE, "longitude", True),
+    (api_900.ChannelType.ALTITUDE, "altitude", False),
+    (api_900.ChannelType.SPEED, "speed", False),
+    (api_900.ChannelType.ACCURACY, "horizontal_accuracy", False),
+]
+
+
+def _api_900_payload(channel: Union[api_900.EvenlySampledChannel, api_900.UnevenlySampledChannel]) -> np.ndarray:
+    """
+    :param channel: API 900 channel to read
+    :return: the payload of the channel as floats
+    """
+    payload_type = reader_utils.payload_type(channel)
+    if payload_type == "byte_payload":
+        return np.frombuffer(channel.byte_payload.payload, np.uint8).astype(float)
+    if payload_type is None:
+        return np.array([])
+    payload = getattr(channel, payload_type).payload
+    return np.fromiter(payload, dtype=float, count=len(payload))
+
+
+def _as_apim_samples(values: np.ndarray) -> np.ndarray:
+    """
+    :param values: sample values to convert
+    :return: the values with the precision of the samples of an API M packet, which are stored as 32 bit floats
+    """
+    return np.asarray(values, dtype=np.float32).astype(float)
+
+
+def _api_900_timestamps(channel: api_900.UnevenlySampledChannel) -> np.ndarray:
+    """
+    :param channel: API 900 channel to read
+    :return: the timestamps of the channel as floats
+    """
+    return np.fromiter(
+        channel.timestamps_microseconds_utc, dtype=float, count=len(channel.timestamps_microseconds_utc)
+    )
+
+
+def _interval_stats(timestamps: np.ndarray, packet_dur_s: float) -> Tuple[float, float]:
+    """
+    :param timestamps: timestamps of the samples of a packet
+    :param packet_dur_s: duration of the packet in seconds
+    :return: mean interval and interval std dev in seconds; the packet duration and 0 if there are less than 2 samples
+    """
+    if len(timestamps) > 1:
+        return (
+            dtu.microseconds_to_seconds(float(np.mean(np.diff(timestamps)))),
+            dtu.microseconds_to_seconds(float(np.std(np.diff(timestamps)))),
+        )
+    return packet_dur_s, 0.0
+
+
+def load_api900_audio(audio_900: api_900.EvenlySampledChannel) -> PyarrowSummary:
+    """
+    load audio data from an API 900 microphone channel
+
+    :param audio_900: the microphone channel
+    :return: audio sensor data, normalized like the samples of an API M packet
+    """
+    samples = _as_apim_samples(_api_900_payload(audio_900) / ac._NORMALIZATION_CONSTANT)
+    return PyarrowSummary(
+        audio_900.sensor_name,
+        srupa.SensorType.AUDIO,
+        np.nan,
+        audio_900.sample_rate_hz,
+        "",
+        len(samples),
+        1.0 / audio_900.sample_rate_hz,
+        0.0,
+        pa.Table.from_pydict({"microphone": samples}),
+    )
+
+
+def load_api900_health(packet: api_900.RedvoxPacket) -> PyarrowSummary:
+    """
+    load station health data from an API 900 packet.  API 900 only has the battery level and temperature of the
+    station, sampled once per packet.
+
+    :param packet: packet with data to load
+    :return: station health data
+    """
+    station_metrics = RedvoxPacketM.StationInformation.StationMetrics
+    timestamp = [float(packet.app_file_start_timestamp_machine)]
+    return PyarrowSummary(
+        "station health",
+        srupa.SensorType.STATION_HEALTH,
+        np.nan,
+        np.nan,
+        "",
+        1,
+        np.nan,
+        0.0,
+        pa.Table.from_pydict(
+            dict(
+                zip(
+                    srupa.STATION_HEALTH_COLUMNS,
+                    [
+                        timestamp,
+                        timestamp,
+                        _as_apim_samples([packet.battery_level_percent]),
+                        [np.nan],
+                        _as_apim_samples([packet.device_temperature_c]),
+                        [int(station_metrics.NetworkType.UNKNOWN_NETWORK)],
+                        [np.nan],
+                        [int(station_metrics.PowerState.UNKNOWN_POWER_STATE)],
+                        [np.nan],
+                        [np.nan],
+                        [int(station_metrics.CellServiceState.UNKNOWN)],
+                        [np.nan],
+                        [int(station_metrics.WifiWakeLock.OTHER)],
+                        [int(station_metrics.ScreenState.UNKNOWN_SCREEN_STATE)],
+                        [np.nan],
+                    ],
+                )
+            )
+        ),
+    )
+
+
+def load_api900_location(packet: api_900.RedvoxPacket, packet_dur_s: float) -> Optional[PyarrowSummary]:
+    """
+    load location data from an API 900 packet
+
+    :param packet: packet with data to load
+    :param packet_dur_s: duration of the packet in seconds
+    :return: location sensor data if it exists, None otherwise
+    """
+    loc_900 = reader_utils.find_uneven_channel_raw(packet, {ch for ch, _, _ in _API_900_LOCATION_CHANNELS})
+    if loc_900 is None:
+        return None
+    timestamps = _api_900_timestamps(loc_900)
+    num_samples = len(timestamps)
+    if num_samples < 1:
+        return None
+    payload = _api_900_payload(loc_900)
+    total_channels = len(loc_900.channel_types)
+    columns: Dict[str, np.ndarray] = {
+        "timestamps": timestamps,
+        "unaltered_timestamps": timestamps,
+        "gps_timestamps": np.full(num_samples, np.nan),
+    }
+    for channel_type, column, is_double in _API_900_LOCATION_CHANNELS:
+        idx = reader_utils.extract_uneven_payload_idx_raw(packet, channel_type)
+        values = [] if idx is None else payload[idx::total_channels]
+        columns[column] = srupa.__padded_array(values if is_double else _as_apim_samples(values), num_samples, np.nan)
+    for column in ["bearing", "vertical_accuracy", "speed_accuracy", "bearing_accuracy"]:
+        columns[column] = np.full(num_samples, np.nan)
+    columns["location_provider"] = np.full(num_samples, ac.location_provider_900_raw(packet, loc_900), dtype=np.int64)
+    m_intv, intv_std = _interval_stats(timestamps, packet_dur_s)
+    return PyarrowSummary(
+        loc_900.sensor_name,
+        srupa.SensorType.LOCATION,
+        np.nan,
+        np.nan,
+        "",
+        num_samples,
+        m_intv,
+        intv_std,
+        pa.Table.from_pydict({column: columns[column] for column in srupa.LOCATION_COLUMNS}),
+    )
+
+
+def load_api900_single(
+    packet: api_900.RedvoxPacket, channel_types: set, sensor_type: srupa.SensorType, packet_dur_s: float
+) -> Optional[PyarrowSummary]:
+    """
+    load a sensor with a single data channel from an API 900 packet
+
+    :param packet: packet with data to load
+    :param channel_types: the API 900 channel types of the sensor
+    :param sensor_type: the type of the sensor
+    :param packet_dur_s: duration of the packet in seconds
+    :return: sensor data if it exists, None otherwise
+    """
+    channel = reader_utils.find_uneven_channel_raw(packet, channel_types)
+    if channel is None:
+        return None
+    timestamps = _api_900_timestamps(channel)
+    if len(timestamps) < 1:
+        return None
+    m_intv, intv_std = _interval_stats(timestamps, packet_dur_s)
+    return PyarrowSummary(
+        channel.sensor_name,
+        sensor_type,
+        np.nan,
+        np.nan,
+        "",
+        len(timestamps),
+        m_intv,
+        intv_std,
+        pa.Table.from_pydict(
+            {
+                "timestamps": timestamps,
+                "unaltered_timestamps": timestamps,
+                srupa.__SENSOR_TYPE_TO_FIELD_NAME[sensor_type]: _as_apim_samples(_api_900_payload(channel)),
+            }
+        ),
+    )
+
+
+def load_api900_xyz(
+    packet: api_900.RedvoxPacket, sensor_type: srupa.SensorType, packet_dur_s: float
+) -> Optional[PyarrowSummary]:
+    """
+    load a sensor with xyz data channels from an API 900 packet
+
+    :param packet: packet with data to load
+    :param sensor_type: the type of the sensor, one of the keys of _API_900_XYZ_CHANNELS
+    :param packet_dur_s: duration of the packet in seconds
+    :return: sensor data if it exists, None otherwise
+    """
+    channel = reader_utils.find_uneven_channel_raw(packet, _API_900_XYZ_CHANNELS[sensor_type])
+    if channel is None:
+        return None
+    timestamps = _api_900_timestamps(channel)
+    if len(timestamps) < 1:
+        return None
+    payload = _as_apim_samples(_api_900_payload(channel))
+    column_id = srupa.__SENSOR_TYPE_TO_FIELD_NAME[sensor_type]
+    m_intv, intv_std = _interval_stats(timestamps, packet_dur_s)
+    return PyarrowSummary(
+        channel.sensor_name,
+        sensor_type,
+        np.nan,
+        np.nan,
+        "",
+        len(timestamps),
+        m_intv,
+        intv_std,
+        pa.Table.from_pydict(
+            {
+                "timestamps": timestamps,
+                "unaltered_timestamps": timestamps,
+                f"{column_id}_x": payload[0::3],
+                f"{column_id}_y": payload[1::3],
+                f"{column_id}_z": payload[2::3],
+            }
+        ),
+    )
@@ -2,10 +2,22 @@
 Module that contains utilities for working with data in parallel.
 """
 
+import atexit
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum
+import itertools
+import math
 import multiprocessing
 from multiprocessing.pool import Pool
-from typing import Callable, Iterator, List, Optional, TypeVar
+import operator
+import os
+import pickle
+import threading
+import time
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import numpy
 
@@ -15,32 +27,308 @@ T = TypeVar("T")
 R = TypeVar("R")
 
 
+# chunk_size value that lets maybe_parallel_map pick the chunk size from the measured cost of the first items
+AUTO_CHUNK_SIZE: Optional[int] = None
+AUTO_CHUNK_SAMPLE_ITEMS: int = 2  # number of items mapped and measured in the calling process
+AUTO_CHUNK_TARGET_S: float = 0.05  # target time for a worker to map one chunk
+AUTO_CHUNK_MAX_BYTES: int = 8 * 1024 * 1024  # maximum estimated pickled size of a chunk and its results
+AUTO_CHUNKS_PER_PROCESS: int = 4  # minimum number of chunks per worker, so slow chunks can be balanced
+AUTO_PARALLEL_MIN_WORK_S: float = 0.2  # estimated serial time below which the remaining items are mapped serially
+AUTO_CHUNK_MAX_LOOKAHEAD_ITEMS: int = 4096  # maximum number of items read ahead when the number of items is unknown
+
+
 class MappingType(Enum):
     ParallelManaged: str = "ParallelManaged"
     ParallelUnmanaged: str = "ParallelUnmanaged"
     Serial: str = "Serial"
 
 
+@dataclass
+class MapTelemetry:
+    """
+    Measurements of one call to maybe_parallel_map or maybe_parallel_smap, passed to the telemetry hooks once the
+    map is exhausted.
+
+    Properties:
+        call_site: str, name of the call site; the qualified name of the mapped function unless one is given
+
+        mapping_type: MappingType, how the items after the measured sample were mapped
+
+        num_items: int, number of items mapped
+
+        chunk_size: int, chunk size of the parallel map; 0 if the items were mapped serially
+
+        elapsed_s: float, time from the first request for a result to the last result
+
+        wait_s: float, time the consumer spent waiting for results
+
+        item_s: float, measured or estimated time to map one item in a single process; nan if unknown
+
+        pickle_s: float, estimated time spent pickling items and results; 0 if the items were mapped serially,
+                    nan if unknown
+
+        pickled_bytes: float, estimated size of the pickled items and results; nan if unknown
+    """
+
+    call_site: str
+    mapping_type: MappingType
+    num_items: int
+    chunk_size: int
+    elapsed_s: float
+    wait_s: float
+    item_s: float = float("nan")
+    pickle_s: float = float("nan")
+    pickled_bytes: float = float("nan")
+
+    def items_per_s(self) -> float:
+        """
+        :return: number of items mapped per second
+        """
+        return self.num_items / self.elapsed_s if self.elapsed_s > 0 else float("nan")
+
+
+__TELEMETRY_HOOKS: List[Callable[[MapTelemetry], None]] = []
+
+
+def add_telemetry_hook(hook: Callable[[MapTelemetry], None]) -> None:
+    """
+    Adds a function that is called with the MapTelemetry of every call to maybe_parallel_map and maybe_parallel_smap.
+
+    :param hook: the function to call
+    """
+    __TELEMETRY_HOOKS.append(hook)
+
+
+def remove_telemetry_hook(hook: Callable[[MapTelemetry], None]) -> None:
+    """
+    Removes a function added with add_telemetry_hook.
+
+    :param hook: the function to remove
+    """
+    if hook in __TELEMETRY_HOOKS:
+        __TELEMETRY_HOOKS.remove(hook)
+
+
+@contextmanager
+def record_map_telemetry() -> Iterator[List[MapTelemetry]]:
+    """
+    Records the MapTelemetry of every call to maybe_parallel_map and maybe_parallel_smap made inside the context.
+
+    :return: the list the MapTelemetry are appended to
+    """
+    records: List[MapTelemetry] = []
+    add_telemetry_hook(records.append)
+    try:
+        yield records
+    finally:
+        remove_telemetry_hook(records.append)
+
+
+def _new_telemetry(map_fn: Callable, call_site: Optional[str]) -> MapTelemetry:
+    """
+    :param map_fn: the function being mapped
+    :param call_site: optional name of the call site
+    :return: empty telemetry of a serial map, named after the call site or the function
+    """
+    return MapTelemetry(
+        call_site if call_site is not None else getattr(map_fn, "__qualname__", repr(map_fn)),
+        MappingType.Serial,
+        0,
+        0,
+        0.0,
+        0.0,
+    )
+
+
+def _timed(results: Iterable[R], telemetry: MapTelemetry) -> Iterator[R]:
+    """
+    Passes results through, adding the number of results and the time spent waiting for them to the telemetry.
+
+    :param results: the results to pass through
+    :param telemetry: the telemetry to update
+    :return: the results
+    """
+    wait_start: float = time.perf_counter()
+    for result in results:
+        telemetry.wait_s += time.perf_counter() - wait_start
+        telemetry.num_items += 1
+        yield result
+        wait_start = time.perf_counter()
+    telemetry.wait_s += time.perf_counter() - wait_start
+
+
+def _report(telemetry: MapTelemetry, start: float) -> None:
+    """
+    Completes the telemetry of an exhausted map and passes it to the telemetry hooks.
+
+    :param telemetry: the telemetry of the map
+    :param start: value of time.perf_counter() when the map started
+    """
+    if telemetry.mapping_type == MappingType.Serial:
+        telemetry.pickle_s = 0.0
+        if telemetry.num_items > 0:
+            telemetry.item_s = telemetry.wait_s / telemetry.num_items
+    telemetry.elapsed_s = time.perf_counter() - start
+    for hook in list(__TELEMETRY_HOOKS):
+        hook(telemetry)
+
+
+def _measure_item(map_fn: Callable[[T], R], value: T) -> Tuple[R, float, float, float]:
+    """
+    Maps a single value and measures the cost of mapping and pickling it.
+
+    :param map_fn: the function to map with
+    :param value: the value to map
+    :return: the result, the time to map the value, the time to pickle the value and result, and their pickled size
+    """
+    start: float = time.perf_counter()
+    res: R = map_fn(value)
+    map_s: float = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        num_bytes: int = len(pickle.dumps(value)) + len(pickle.dumps(res))
+        return res, map_s, time.perf_counter() - start, num_bytes
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return res, map_s, float("nan"), float("nan")
+
+
+def auto_chunk_size(item_s: float, item_bytes: float, num_items: int, num_processes: int) -> int:
+    """
+    Picks a chunk size so that each chunk takes about AUTO_CHUNK_TARGET_S to map, its pickled size stays below
+    AUTO_CHUNK_MAX_BYTES, and every worker gets at least AUTO_CHUNKS_PER_PROCESS chunks.
+
+    :param item_s: time to map one item
+    :param item_bytes: pickled size of one item and its result; nan if unknown
+    :param num_items: number of items to map
+    :param num_processes: number of worker processes
+    :return: the chunk size, at least 1
+    """
+    by_time: float = AUTO_CHUNK_TARGET_S / max(item_s, 1e-9)
+    by_bytes: float = AUTO_CHUNK_MAX_BYTES / item_bytes if item_bytes > 0 else by_time
+    by_balance: float = num_items / max(1, num_processes * AUTO_CHUNKS_PER_PROCESS)
+    return max(1, int(min(by_time, by_bytes, by_balance)))
+
+
+class PoolManager:
+    """
+    Lazily creates a process pool on first use and reuses it until it is shut down, so consecutive parallel maps
+    don't each pay for starting their own workers.  Can be used as a context manager that shuts the pool down on exit.
+
+    A pool inherited by a forked child process is never used by the child.
+
+    Properties:
+        max_processes: optional maximum number of worker processes.  If None, redvox.settings.get_max_processes()
+                        is used, and if that is 0, one process per CPU is used.
+
+        pools_created: int, number of pools created by the manager
+    """
+
+    def __init__(self, max_processes: Optional[int] = None):
+        """
+        :param max_processes: optional maximum number of worker processes.  Default None
+        """
+        self.max_processes: Optional[int] = max_processes
+        self.pools_created: int = 0
+        self._pool: Optional[Pool] = None
+        self._pool_size: int = 0
+        self._retired: List[Pool] = []
+        self._pid: int = os.getpid()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> "PoolManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+    def num_processes(self) -> int:
+        """
+        :return: the number of worker processes the next pool will have
+        """
+        max_processes: int = settings.get_max_processes() if self.max_processes is None else self.max_processes
+        return multiprocessing.cpu_count() if max_processes < 1 else max_processes
+
+    def is_running(self) -> bool:
+        """
+        :return: True if the manager has a pool that can be used by this process
+        """
+        return self._pool is not None and self._pid == os.getpid()
+
+    def get(self) -> Pool:
+        """
+        :return: the managed pool, created if it doesn't exist or if the number of processes has changed.
+                    A replaced pool is closed without waiting for the tasks it was given.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # the pools belong to the parent process; forget them without touching them
+                self._pool = None
+                self._retired = []
+                self._pid = os.getpid()
+            num_processes: int = self.num_processes()
+            if self._pool is not None and self._pool_size != num_processes:
+                # maps still running on the old pool finish on it; shutdown() waits for its workers to exit
+                self._pool.close()
+                self._retired.append(self._pool)
+                self._pool = None
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(num_processes)
+                self._pool_size = num_processes
+                self.pools_created += 1
+            return self._pool
+
+    def shutdown(self) -> None:
+        """
+        closes the managed pool and any pools it replaced, and waits for their workers to finish the tasks they
+        were given.  The next call to get() creates a new pool.
+        """
+        with self._lock:
+            pools: List[Pool] = []
+            if self._pid == os.getpid():
+                pools = self._retired if self._pool is None else self._retired + [self._pool]
+            self._pool = None
+            self._retired = []
+        # joined without the lock, so other threads can get a new pool meanwhile
+        for pool in pools:
+            pool.close()
+            pool.join()
+
+
+# The pool used by maybe_parallel_map and maybe_parallel_smap when no pool is provided
+SHARED_POOL: PoolManager = PoolManager()
+atexit.register(SHARED_POOL.shutdown)
+
+
 def maybe_parallel_map(pool: Optional[Pool],
                        map_fn: Callable[[T], R],
                        iterator: Iterator[T],
                        condition: Optional[Callable[[], bool]] = None,
-                       chunk_size: int = 64,
-                       usage_out: Optional[List[MappingType]] = None) -> Iterator[R]:
+                       chunk_size: Optional[int] = 64,
+                       usage_out: Optional[List[MappingType]] = None,
+                       call_site: Optional[str] = None,
+                       num_processes: Optional[int] = None) -> Iterator[R]:
     """
     Maps a function over a set of values. This will either be run in parallel or serially depending on the value
     of redvox.settings.
 
+    If chunk_size is AUTO_CHUNK_SIZE and the map may run in parallel, the first AUTO_CHUNK_SAMPLE_ITEMS values are
+    mapped in this process to measure their cost.  The remaining values are mapped serially if that is estimated to
+    take less than AUTO_PARALLEL_MIN_WORK_S, otherwise in parallel with a chunk size from auto_chunk_size.  If the
+    iterator doesn't give its length, up to AUTO_CHUNK_MAX_LOOKAHEAD_ITEMS values are read ahead to estimate it.
+
     :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool
-                 is not provided, one is created by this process and then closed at the end of this process.
+                 is not provided, SHARED_POOL is used; it is created on first use and kept for later calls.
     :param map_fn: A function that maps each value in the provided iterator.
     :param iterator: An iterator of elements to be mapped.
     :param condition: An optional condition, that when provided, will be checked and if the condition passes, this
                       function may run in parallel. This is useful for things like, only run in parallel if more than
                       n entries are provided.
-    :param chunk_size: An optional chunk side to pass to parallel maps.
+    :param chunk_size: An optional chunk side to pass to parallel maps, or AUTO_CHUNK_SIZE to pick one.
     :param usage_out: When provided, this value will be filled with a single value
                       describing which mapping strategy was used.
+    :param call_site: An optional name for the telemetry of this call.  Default is the name of map_fn.
+    :param num_processes: An optional number of worker processes of the pool, used to pick the chunk size when
+                          chunk_size is AUTO_CHUNK_SIZE.  Default is SHARED_POOL.num_processes().
     :return: A transformed iterator.
     """
 
@@ -48,39 +336,82 @@ def maybe_parallel_map(pool: Optional[Pool],
         if usage_out is not None:
             usage_out.append(mapping_type)
 
+    telemetry: MapTelemetry = _new_telemetry(map_fn, call_site)
+    start: float = time.perf_counter()
+
     # If a condition is not provided, then it's always True.
     _condition: bool = True if condition is None else condition()
     res: R
-    if settings.is_parallelism_enabled() and _condition:
-        _pool: Pool = multiprocessing.Pool() if pool is None else pool
-        for res in _pool.imap(map_fn, iterator, chunksize=chunk_size):
-            yield res
+    # Worker processes can't start their own pools
+    if settings.is_parallelism_enabled() and _condition and not multiprocessing.current_process().daemon:
+        values: Iterator[T] = iter(iterator)
+        if chunk_size is AUTO_CHUNK_SIZE:
+            sample: List[T] = list(itertools.islice(values, AUTO_CHUNK_SAMPLE_ITEMS))
+            measured: List[Tuple[R, float, float, float]] = [_measure_item(map_fn, value) for value in sample]
+            if len(measured) > 0:
+                telemetry.item_s = float(numpy.mean([m[1] for m in measured]))
+                telemetry.pickle_s = float(numpy.mean([m[2] for m in measured]))
+                telemetry.pickled_bytes = float(numpy.mean([m[3] for m in measured]))
+            for res in _timed((m[0] for m in measured), telemetry):
+                yield res
+            num_remaining: int = operator.length_hint(values, -1)
+            has_more: bool = False
+            if len(measured) > 0 and num_remaining < 0:
+                # read ahead only as many values as it takes to tell if the pool is worth its overhead
+                num_ahead: int = min(
+                    AUTO_CHUNK_MAX_LOOKAHEAD_ITEMS, math.ceil(AUTO_PARALLEL_MIN_WORK_S / max(telemetry.item_s, 1e-9))
+                )
+                ahead: List[T] = list(itertools.islice(values, num_ahead))
+                values = itertools.chain(ahead, values)
+                num_remaining = len(ahead)
+                has_more = num_remaining == num_ahead
+            if len(measured) == 0 or (not has_more and telemetry.item_s * num_remaining < AUTO_PARALLEL_MIN_WORK_S):
+                chunk_size = 0
+            else:
+                chunk_size = auto_chunk_size(
+                    telemetry.item_s,
+                    telemetry.pickled_bytes,
+                    num_remaining,
+                    SHARED_POOL.num_processes() if num_processes is None else num_processes,
+                )
 
-        # If we're managing this pool, close it.
-        if pool is None:
-            __usage_out(MappingType.ParallelManaged)
-            _pool.close()
+        if chunk_size == 0:
+            # Not worth the overhead of the pool
+            for res in _timed(map(map_fn, values), telemetry):
+                yield res
+            __usage_out(MappingType.Serial)
         else:
-            __usage_out(MappingType.ParallelUnmanaged)
+            _pool: Pool = SHARED_POOL.get() if pool is None else pool
+            telemetry.chunk_size = chunk_size
+            num_sampled: int = telemetry.num_items
+            for res in _timed(_pool.imap(map_fn, values, chunksize=chunk_size), telemetry):
+                yield res
+            telemetry.mapping_type = MappingType.ParallelManaged if pool is None else MappingType.ParallelUnmanaged
+            telemetry.pickle_s *= telemetry.num_items - num_sampled
+            telemetry.pickled_bytes *= telemetry.num_items - num_sampled
+            __usage_out(telemetry.mapping_type)
     else:
         # Run serially
         __usage_out(MappingType.Serial)
-        for res in map(map_fn, iterator):
+        for res in _timed(map(map_fn, iterator), telemetry):
             yield res
 
+    _report(telemetry, start)
+
 
 def maybe_parallel_smap(pool: Optional[Pool],
                         map_fn: Callable[[T], R],
                         iterator: List[Iterator[T]],
                         condition: Optional[Callable[[], bool]] = None,
                         chunk_size: int = 64,
-                        usage_out: Optional[List[MappingType]] = None) -> Iterator[R]:
+                        usage_out: Optional[List[MappingType]] = None,
+                        call_site: Optional[str] = None) -> Iterator[R]:
     """
     Maps a function over a set of values. This will either be run in parallel or serially depending on the value
     of redvox.settings.  accepts multiple arguments for the function
 
     :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool
-                 is not provided, one is created by this process and then closed at the end of this process.
+                 is not provided, SHARED_POOL is used; it is created on first use and kept for later calls.
     :param map_fn: A function that maps each value in the provided iterator.
     :param iterator: A list of iterator of elements to be mapped.
     :param condition: An optional condition, that when provided, will be checked and if the condition passes, this
@@ -89,6 +420,7 @@ def maybe_parallel_smap(pool: Optional[Pool],
     :param chunk_size: An optional chunk side to pass to parallel maps.
     :param usage_out: When provided, this value will be filled with a single value
                       describing which mapping strategy was used.
+    :param call_site: An optional name for the telemetry of this call.  Default is the name of map_fn.
     :return: A transformed iterator.
     """
 
@@ -96,22 +428,73 @@ def maybe_parallel_smap(pool: Optional[Pool],
         if usage_out is not None:
             usage_out.append(mapping_type)
 
+    telemetry: MapTelemetry = _new_telemetry(map_fn, call_site)
+    start: float = time.perf_counter()
     # If a condition is not provided, then it's always True.
     _condition: bool = True if condition is None else condition()
     res: R
-    if settings.is_parallelism_enabled() and _condition:
-        _pool: Pool = multiprocessing.Pool() if pool is None else pool
-        for res in _pool.starmap(map_fn, iterator, chunksize=chunk_size):
+    # Worker processes can't start their own pools
+    if settings.is_parallelism_enabled() and _condition and not multiprocessing.current_process().daemon:
+        _pool: Pool = SHARED_POOL.get() if pool is None else pool
+        telemetry.chunk_size = chunk_size
+        # starmap returns once every result is ready, so the whole map is waited for before the first result
+        wait_start: float = time.perf_counter()
+        results: List[R] = _pool.starmap(map_fn, iterator, chunksize=chunk_size)
+        telemetry.wait_s += time.perf_counter() - wait_start
+        for res in _timed(results, telemetry):
             yield res
 
-        # If we're managing this pool, close it.
-        if pool is None:
-            __usage_out(MappingType.ParallelManaged)
-            _pool.close()
-        else:
-            __usage_out(MappingType.ParallelUnmanaged)
+        telemetry.mapping_type = MappingType.ParallelManaged if pool is None else MappingType.ParallelUnmanaged
+        __usage_out(telemetry.mapping_type)
     else:
         # Run serially
         __usage_out(MappingType.Serial)
-        for res in map(map_fn, *iterator):
+        for res in _timed(map(map_fn, *iterator), telemetry):
             yield res
+
+    _report(telemetry, start)
+
+
+def prefetch_map(map_fn: Callable[[T], R],
+                 iterator: Iterable[T],
+                 prefetch: int,
+                 workers: int = 1) -> Iterator[R]:
+    """
+    Maps a function over a set of values on a pool of threads, running up to prefetch calls ahead of the consumer.
+    Results are yielded in the same order as the values.  At most prefetch results are held in memory at once, so
+    this is meant for I/O bound functions such as reading and decompressing files.
+    If prefetch is less than 1, the function is mapped serially in the calling thread.
+
+    :param map_fn: A function that maps each value in the provided iterator.
+    :param iterator: An iterator of elements to be mapped.
+    :param prefetch: The maximum number of values mapped ahead of the consumer.
+    :param workers: The number of threads used to map values, default 1.
+    :return: A transformed iterator.
+    """
+    if prefetch < 1:
+        yield from map(map_fn, iterator)
+        return
+
+    values: Iterator[T] = iter(iterator)
+    pending: Deque[Future] = deque()
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    def __submit_next() -> bool:
+        for value in values:
+            pending.append(executor.submit(map_fn, value))
+            return True
+        return False
+
+    try:
+        while len(pending) < prefetch and __submit_next():
+            pass
+        while len(pending) > 0:
+            result: R = pending.popleft().result()
+            # Refill before handing the result over so the workers stay busy while the consumer works
+            __submit_next()
+            yield result
+    finally:
+        # If the consumer stops early, drop the work that hasn't started yet
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,241 @@
+"""
+Exports the sensor data of RedVox packets to a Parquet dataset partitioned by station, sensor and date.
+
+Each input file becomes one Parquet file per sensor it contains, written to
+{out_dir}/station_id={id}/sensor={sensor}/date={YYYY-MM-DD}/{input file name}.parquet, using the tables created by
+packet_to_pyarrow.  Audio tables gain a timestamps column, so every file holds the timestamps of its samples.
+
+Exported input files are listed in the manifest file EXPORT_MANIFEST_FILE_NAME in out_dir along with their size and
+modification time.  Inputs listed with an unchanged size and modification time are skipped by later exports.  Input
+files that can't be read or hold no sensor data are not listed, so they are exported once they are fixed.  The
+manifest starts with an underscore, so pyarrow datasets ignore it.
+"""
+
+from dataclasses import dataclass
+from functools import partial
+from glob import glob
+import logging
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from redvox.common import io
+from redvox.common import packet_to_pyarrow as ptp
+from redvox.common.parallel_utils import PoolManager
+from redvox.common.sensor_data import SensorType
+
+# pylint: disable=C0103
+log = logging.getLogger(__name__)
+
+EXPORT_MANIFEST_FILE_NAME: str = "_exported.tsv"
+
+# partition columns as read by sensor_dataset; station ids are kept as strings to preserve leading zeros
+PARTITIONING: ds.Partitioning = ds.partitioning(
+    pa.schema([("station_id", pa.string()), ("sensor", pa.string()), ("date", pa.string())]), flavor="hive"
+)
+
+
+@dataclass
+class ParquetExportSummary:
+    """
+    Summary of exporting RedVox files to a Parquet dataset
+
+    Properties:
+        num_inputs: int, number of input files exported, default 0
+
+        num_skipped: int, number of input files skipped because they were already exported, default 0
+
+        num_files: int, number of Parquet files written, default 0
+
+        num_rows: int, number of rows written, default 0
+
+        num_failed: int, number of input files that couldn't be read or held no sensor data, default 0
+
+        elapsed_s: float, time spent exporting in seconds, default 0.0
+    """
+
+    num_inputs: int = 0
+    num_skipped: int = 0
+    num_files: int = 0
+    num_rows: int = 0
+    num_failed: int = 0
+    elapsed_s: float = 0.0
+
+    def inputs_per_s(self) -> float:
+        """
+        :return: number of input files exported per second
+        """
+        return self.num_inputs / self.elapsed_s if self.elapsed_s > 0 else float("nan")
+
+    def __str__(self):
+        return (
+            f"exported {self.num_inputs} files into {self.num_files} parquet files ({self.num_rows} rows) "
+            f"in {self.elapsed_s:.2f} s: {self.inputs_per_s():.1f} files/s; "
+            f"{self.num_skipped} files already exported, {self.num_failed} files failed"
+        )
+
+
+def sensor_name(stype: SensorType) -> str:
+    """
+    :param stype: type of sensor
+    :return: value of the sensor partition for the sensor type
+    """
+    return stype.name.lower()
+
+
+def partition_dir(out_dir: str, station_id: str, stype: SensorType, date: str) -> str:
+    """
+    :param out_dir: base directory of the dataset
+    :param station_id: id of the station
+    :param stype: type of sensor
+    :param date: date of the data as YYYY-MM-DD
+    :return: directory of the partition
+    """
+    return os.path.join(out_dir, f"station_id={station_id}", f"sensor={sensor_name(stype)}", f"date={date}")
+
+
+def read_manifest(out_dir: str) -> Dict[str, Tuple[int, int]]:
+    """
+    :param out_dir: base directory of the dataset
+    :return: the size and modification time in nanoseconds of every exported input file, by file name
+    """
+    manifest: Dict[str, Tuple[int, int]] = {}
+    manifest_path: str = os.path.join(out_dir, EXPORT_MANIFEST_FILE_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as manifest_in:
+            for line in manifest_in:
+                parts: List[str] = line.rstrip("\n").split("\t")
+                if len(parts) == 3:
+                    manifest[parts[0]] = (int(parts[1]), int(parts[2]))
+    return manifest
+
+
+def _file_key(path: str) -> Tuple[int, int]:
+    """
+    :param path: path of a file
+    :return: the size and modification time in nanoseconds of the file
+    """
+    stat: os.stat_result = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _summary_table(summary: ptp.PyarrowSummary) -> pa.Table:
+    """
+    :param summary: summary of the data of a sensor from one packet
+    :return: the data of the sensor, with the timestamps of the samples added to audio data
+    """
+    table: pa.Table = summary.data()
+    if summary.stype == SensorType.AUDIO and "timestamps" not in table.schema.names:
+        table = table.add_column(
+            0, "timestamps", pa.array(summary.start + np.arange(table.num_rows) * (1e6 / summary.srate_hz))
+        )
+    return table
+
+
+def export_entry(entry: io.IndexEntry, out_dir: str) -> Tuple[str, int, int]:
+    """
+    writes the sensor data of a RedVox file to the partitions of the dataset
+
+    :param entry: the file to export
+    :param out_dir: base directory of the dataset
+    :return: the name of the exported file, the number of Parquet files written and the number of rows written.
+                No files are written if the file can't be read.
+    """
+    file_name: str = os.path.basename(entry.full_path)
+    try:
+        packet = entry.read_raw()
+        summaries: List[ptp.PyarrowSummary] = [] if packet is None else ptp.packet_to_pyarrow(packet).summaries
+    except Exception as ex:  # corrupt files raise decompression, protobuf or conversion errors
+        log.warning("Could not read %s: %s", entry.full_path, ex)
+        return file_name, 0, 0
+    date: str = entry.date_time.strftime("%Y-%m-%d")
+    out_name: str = f"{os.path.splitext(file_name)[0]}.parquet"
+    num_files: int = 0
+    num_rows: int = 0
+    for summary in summaries:
+        table: pa.Table = _summary_table(summary)
+        path: str = partition_dir(out_dir, entry.station_id, summary.stype, date)
+        os.makedirs(path, exist_ok=True)
+        pq.write_table(table, os.path.join(path, out_name))
+        num_files += 1
+        num_rows += table.num_rows
+    return file_name, num_files, num_rows
+
+
+def export_parquet(
+    index: io.Index,
+    out_dir: str,
+    jobs: int = 1,
+    force: bool = False,
+    summary_out: Optional[List[ParquetExportSummary]] = None,
+) -> bool:
+    """
+    exports the sensor data of the files in an index to a Parquet dataset partitioned by station, sensor and date.
+    Files already exported with the same size and modification time are skipped.
+
+    :param index: the files to export
+    :param out_dir: base directory of the dataset; created if it doesn't exist
+    :param jobs: number of processes exporting files; 1 exports the files in this process.  Default 1
+    :param force: if True, export every file even if it was already exported.  Default False
+    :param summary_out: When provided, a ParquetExportSummary of the export is appended to it.
+    :return: True if success, False if any file couldn't be exported
+    """
+    start: float = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest: Dict[str, Tuple[int, int]] = {} if force else read_manifest(out_dir)
+    summary: ParquetExportSummary = ParquetExportSummary()
+    keys: Dict[str, Tuple[int, int]] = {}
+    entries: List[io.IndexEntry] = []
+    for entry in index.entries:
+        file_name: str = os.path.basename(entry.full_path)
+        keys[file_name] = _file_key(entry.full_path)
+        if manifest.get(file_name) == keys[file_name]:
+            summary.num_skipped += 1
+        else:
+            entries.append(entry)
+
+    export_fn = partial(export_entry, out_dir=out_dir)
+    with open(os.path.join(out_dir, EXPORT_MANIFEST_FILE_NAME), "a") as manifest_out:
+        with PoolManager(jobs) as pool_manager:
+            results: Iterator[Tuple[str, int, int]] = (
+                pool_manager.get().imap_unordered(export_fn, entries)
+                if jobs > 1 and len(entries) > 1
+                else map(export_fn, entries)
+            )
+            for file_name, num_files, num_rows in results:
+                if num_files < 1:
+                    # not recorded, so the file is tried again once it is fixed
+                    summary.num_failed += 1
+                    continue
+                summary.num_inputs += 1
+                summary.num_files += num_files
+                summary.num_rows += num_rows
+                # recorded after the file is written, so an interrupted export redoes only unfinished files
+                size, mtime_ns = keys[file_name]
+                manifest_out.write(f"{file_name}\t{size}\t{mtime_ns}\n")
+                manifest_out.flush()
+
+    summary.elapsed_s = time.perf_counter() - start
+    if summary_out is not None:
+        summary_out.append(summary)
+    return summary.num_failed == 0
+
+
+def sensor_dataset(out_dir: str, stype: SensorType) -> Optional[ds.Dataset]:
+    """
+    :param out_dir: base directory of the dataset
+    :param stype: type of sensor to read
+    :return: the data of the sensor from every station and date, with the partitions as columns, or None if there is
+                no data for the sensor
+    """
+    paths: List[str] = sorted(
+        glob(os.path.join(out_dir, "station_id=*", f"sensor={sensor_name(stype)}", "date=*", "*.parquet"))
+    )
+    if len(paths) < 1:
+        return None
+    return ds.dataset(paths, format="parquet", partitioning=PARTITIONING, partition_base_dir=out_dir)
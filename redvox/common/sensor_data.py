@@ -12,12 +12,15 @@ import pandas as pd
 import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.fs as pa_fs
 import pyarrow.parquet as pq
 
 import redvox.common.sensor_io as io
 import redvox.common.date_time_utils as dtu
 from redvox.common.io import FileSystemSaveMode, FileSystemWriter as Fsw, get_json_file, json_file_to_dict
 from redvox.common import offset_model as om
+from redvox.common.table_cache import TABLE_CACHE, cached_table
 from redvox.common.errors import RedVoxExceptions
 from redvox.common.gap_and_pad_utils import calc_evenly_sampled_timestamps, AudioWithGaps
 from redvox.api1000.wrapped_redvox_packet.station_information import (
@@ -126,6 +129,47 @@ class SensorType(enum.Enum):
             return SensorType.UNKNOWN_SENSOR
 
 
+def interpolate_table(
+    table: pa.Table, interpolate_timestamp: float, first_point: int, second_point: int = 0, copy: bool = True
+) -> pa.Table:
+    """
+    interpolates two points of a table at the chosen timestamp.  If copy is true, copies the values of the closest
+    point, otherwise interpolates any numerical value.  Non-numeric values are set to a copy of the closest point.
+
+    :param table: pyarrow Table with a timestamps column to interpolate
+    :param interpolate_timestamp: timestamp to interpolate other values
+    :param first_point: index of first point
+    :param second_point: delta to second point, default 0 (same as first point)
+    :param copy: if True, copies the values of the first point, otherwise uses the interpolated value.
+                    Default True
+    :return: pyarrow Table of interpolated points
+    """
+    start_point = table.slice(first_point, 1).to_pydict()
+    if not copy and second_point:
+        i_p = {}
+        end_point = table.slice(first_point + second_point, 1).to_pydict()
+        first_closer = np.abs(start_point[0] - interpolate_timestamp) <= np.abs(
+            end_point[0] - interpolate_timestamp
+        )
+        for col in table.schema.names:
+            # process each column independently into new table object
+            if col not in NON_INTERPOLATED_COLUMNS + NON_NUMERIC_COLUMNS:
+                numeric_diff = end_point[col] - start_point[col]
+                numeric_diff = (numeric_diff / numeric_diff["timestamps"]) * (
+                    interpolate_timestamp - start_point[col]
+                ) + start_point[col]
+                i_p[col] = numeric_diff
+            elif col in NON_NUMERIC_COLUMNS:
+                if first_closer:
+                    i_p[col] = start_point[col]
+                else:
+                    i_p[col] = end_point[col]
+    else:
+        i_p = start_point
+    i_p["timestamps"] = [interpolate_timestamp]
+    return pa.Table.from_pydict(i_p)
+
+
 class SensorData:
     """
     Generic Redvox Sensor class for API-independent analysis
@@ -479,15 +523,21 @@ class SensorData:
         """
         if base_dir is None:
             base_dir = self.save_dir()
+        if self._fs_writer.file_extension == "arrow":
+            return ds.dataset(
+                base_dir, format="ipc", filesystem=pa_fs.LocalFileSystem(use_mmap=True), exclude_invalid_files=True
+            )
         return ds.dataset(base_dir, format="parquet", exclude_invalid_files=True)
 
     def pyarrow_table(self) -> pa.Table:
         """
+        tables read from self.save_dir() are kept in redvox.common.table_cache if it is enabled
+
         :return: the table defined by the _data property or the dataset stored in self.save_dir()
         """
         if self._data or self._fs_writer.is_use_mem():
             return self._data
-        return self.pyarrow_ds().to_table()
+        return cached_table(self.save_dir(), lambda: self.pyarrow_ds().to_table())
 
     def data_df(self) -> pd.DataFrame:
         """
@@ -495,14 +545,64 @@ class SensorData:
         """
         return self.pyarrow_table().to_pandas()
 
+    def _table_in_memory(self, table: pa.Table) -> pa.Table:
+        """
+        tables read from Arrow IPC files are memory-mapped; they are copied into memory so the files in
+        self.save_dir() can be removed while the table is still in use
+
+        :param table: a table that may be memory-mapped from the files in self.save_dir()
+        :return: the table, copied into memory if the data of the sensor is in Arrow IPC files
+        """
+        if self._fs_writer.file_extension != "arrow" or not self._fs_writer.is_save_disk():
+            return table
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return pa.ipc.open_stream(sink.getvalue()).read_all()
+
+    def _write_table_file(self, table: pa.Table):
+        """
+        writes the table to self.full_path() as an uncompressed Arrow IPC (Feather) file if the file extension is
+        "arrow", otherwise as a parquet file
+
+        :param table: the table to write
+        """
+        if self._fs_writer.file_extension == "arrow":
+            feather.write_feather(table, self.full_path(), compression="uncompressed")
+        else:
+            pq.write_table(table, self.full_path())
+
+    def set_file_format(self, file_format: str):
+        """
+        sets the format of the files the data is written to; if the data is on disk, it is rewritten in the new format.
+        "arrow" files are uncompressed Arrow IPC (Feather) files which are memory-mapped when read.
+
+        :param file_format: "parquet" or "arrow"
+        """
+        file_format = file_format.lower()
+        if file_format != self._fs_writer.file_extension:
+            if self._fs_writer.is_save_disk():
+                table = self._table_in_memory(self.pyarrow_table())
+                self._fs_writer.set_extension(file_format)
+                self.write_pyarrow_table(table)
+            else:
+                self._fs_writer.set_extension(file_format)
+
+    def file_format(self) -> str:
+        """
+        :return: the format of the files the data is written to, "parquet" or "arrow"
+        """
+        return self._fs_writer.file_extension
+
     def write_pyarrow_table(self, table: pa.Table, update_file_name: Optional[bool] = True):
         """
         saves the pyarrow table to disk or to memory.
 
         * if there is no data or there is no column named timestamps in the table, an error will be created
-        * if writing to disk, uses a default filename: {sensor_type}_{first_timestamp}.parquet
+        * if writing to disk, uses a default filename: {sensor_type}_{first_timestamp}.{file_format}
         * uses the directory defined by self.save_dir().  Creates the directory if it doesn't exist and removes any
-          existing parquet files from the directory if it exists
+          existing files from the directory if it exists.  A table memory-mapped from those files is copied into
+          memory first
 
         :param table: the table to write
         :param update_file_name: if True, updates the file name to match the new data.  Default True
@@ -510,10 +610,12 @@ class SensorData:
         if table.num_rows < 1 or "timestamps" not in table.schema.names:
             self._errors.append("Attempted to write invalid table.")
         elif self._fs_writer.is_save_disk():
+            table = self._table_in_memory(table)
+            TABLE_CACHE.invalidate(self.save_dir())
             self._fs_writer.create_dir()
             if update_file_name:
                 self.set_file_name(f"{self.type().name}_{int(table['timestamps'][0].as_py())}")
-            pq.write_table(table, self.full_path())
+            self._write_table_file(table)
             self._data = None
         else:
             self._data = table
@@ -524,7 +626,8 @@ class SensorData:
         """
         tbl = pa.Table.from_pydict({"timestamps": []})
         if self._fs_writer.is_save_disk():
-            pq.write_table(tbl, self.full_path())
+            TABLE_CACHE.invalidate(self.save_dir())
+            self._write_table_file(tbl)
             self._data = None
         else:
             self._data = tbl
@@ -536,7 +639,9 @@ class SensorData:
         :param new_dir: directory to save files into
         """
         old_sensor_save_dir = self.save_dir()
+        TABLE_CACHE.invalidate(old_sensor_save_dir)
         self.set_save_dir(os.path.join(new_dir, self._type.name))
+        TABLE_CACHE.invalidate(self.save_dir())
         for r, d, f in os.walk(old_sensor_save_dir):
             for file in f:
                 self._fs_writer.create_dir()
@@ -862,30 +967,7 @@ class SensorData:
                         Default True
         :return: pyarrow Table of interpolated points
         """
-        start_point = self.pyarrow_table().slice(first_point, 1).to_pydict()
-        if not copy and second_point:
-            i_p = {}
-            end_point = self.pyarrow_table().slice(first_point + second_point, 1).to_pydict()
-            first_closer = np.abs(start_point[0] - interpolate_timestamp) <= np.abs(
-                end_point[0] - interpolate_timestamp
-            )
-            for col in self.pyarrow_table().schema.names:
-                # process each column independently into new table object
-                if col not in NON_INTERPOLATED_COLUMNS + NON_NUMERIC_COLUMNS:
-                    numeric_diff = end_point[col] - start_point[col]
-                    numeric_diff = (numeric_diff / numeric_diff["timestamps"]) * (
-                        interpolate_timestamp - start_point[col]
-                    ) + start_point[col]
-                    i_p[col] = numeric_diff
-                elif col in NON_NUMERIC_COLUMNS:
-                    if first_closer:
-                        i_p[col] = start_point[col]
-                    else:
-                        i_p[col] = end_point[col]
-        else:
-            i_p = start_point
-        i_p["timestamps"] = [interpolate_timestamp]
-        return pa.Table.from_pydict(i_p)
+        return interpolate_table(self.pyarrow_table(), interpolate_timestamp, first_point, second_point, copy)
 
     def as_dict(self) -> dict:
         """
@@ -927,7 +1009,8 @@ class SensorData:
     @staticmethod
     def from_json_file(file_dir: str, file_name: Optional[str] = None) -> "SensorData":
         """
-        convert contents of json file to Sensor
+        convert contents of json file to Sensor.  if the data is stored in an Arrow IPC (.arrow) file, the data is not
+        read until it is used, and is memory-mapped when it is.
 
         :param file_dir: full path to containing directory for the file
         :param file_name: optional name of file and extension to load data from; if not specified, finds the first one
@@ -940,7 +1023,26 @@ class SensorData:
                 result.append_error("JSON file to load Sensor from not found.")
                 return result
         json_data = json_file_to_dict(os.path.join(file_dir, file_name))
-        if "name" in json_data.keys():
+        arrow_files = sorted(Path(file_dir).glob("*.arrow"))
+        if "name" in json_data.keys() and arrow_files:
+            result = SensorData(
+                json_data["name"],
+                None,
+                SensorType[json_data["type"]],
+                json_data["sample_rate_hz"],
+                json_data["sample_interval_s"],
+                json_data["sample_interval_std_s"],
+                json_data["is_sample_rate_fixed"],
+                json_data["timestamps_altered"],
+                False,
+                json_data["use_offset_model"],
+                True,
+                os.path.abspath(file_dir),
+            )
+            result.set_errors(RedVoxExceptions.from_dict(json_data["errors"]))
+            result._fs_writer.set_name_and_extension(arrow_files[0].stem, "arrow")
+            result.set_gaps(json_data["gaps"])
+        elif "name" in json_data.keys():
             result = SensorData.from_dir(
                 json_data["name"],
                 file_dir,
@@ -355,43 +355,56 @@ def apim_best_location_to_pyarrow(
     )
 
 
+def __padded_array(values, num_samples: int, fill_value: float, dtype: type = float) -> np.ndarray:
+    """
+    :param values: repeated field of values to convert
+    :param num_samples: the number of samples in the result
+    :param fill_value: value for the samples missing from values
+    :param dtype: type of the result, default float
+    :return: the values as an array of num_samples samples, padded with fill_value or truncated as needed
+    """
+    data = np.fromiter(values, dtype=dtype, count=len(values))
+    if len(data) == num_samples:
+        return data
+    result = np.full(num_samples, fill_value, dtype=dtype)
+    result[: min(len(data), num_samples)] = data[:num_samples]
+    return result
+
+
 def apim_location_to_pyarrow(loc: api_m.RedvoxPacketM.Sensors.Location) -> pa.Table:
     """
     :param loc: location sensor to convert
     :return: pyarrow table representation of location data
     """
-    timestamps = loc.timestamps.timestamps
-    gps_timestamps = loc.timestamps_gps.timestamps
-    lat_samples = loc.latitude_samples.values
-    lon_samples = loc.longitude_samples.values
-    alt_samples = loc.altitude_samples.values
-    spd_samples = loc.speed_samples.values
-    bear_samples = loc.bearing_samples.values
-    hor_acc_samples = loc.horizontal_accuracy_samples.values
-    vert_acc_samples = loc.vertical_accuracy_samples.values
-    spd_acc_samples = loc.speed_accuracy_samples.values
-    bear_acc_samples = loc.bearing_accuracy_samples.values
-    loc_prov_samples = loc.location_providers
-    data_for_df = [[], [], [], [], [], [], [], [], [], [], [], [], []]
-    for i in range(len(timestamps)):
-        data_for_df[0].append(timestamps[i])
-        data_for_df[1].append(timestamps[i])
-        data_for_df[2].append(np.nan if len(gps_timestamps) <= i else gps_timestamps[i])
-        data_for_df[3].append(lat_samples[i])
-        data_for_df[4].append(lon_samples[i])
-        data_for_df[5].append(np.nan if len(alt_samples) <= i else alt_samples[i])
-        data_for_df[6].append(np.nan if len(spd_samples) <= i else spd_samples[i])
-        data_for_df[7].append(np.nan if len(bear_samples) <= i else bear_samples[i])
-        data_for_df[8].append(np.nan if len(hor_acc_samples) <= i else hor_acc_samples[i])
-        data_for_df[9].append(np.nan if len(vert_acc_samples) <= i else vert_acc_samples[i])
-        data_for_df[10].append(np.nan if len(spd_acc_samples) <= i else spd_acc_samples[i])
-        data_for_df[11].append(np.nan if len(bear_acc_samples) <= i else bear_acc_samples[i])
-        data_for_df[12].append(
-            api_m.RedvoxPacketM.Sensors.Location.LocationProvider.UNKNOWN
-            if len(loc_prov_samples) <= i
-            else loc_prov_samples[i]
+    timestamps = np.fromiter(loc.timestamps.timestamps, dtype=float, count=len(loc.timestamps.timestamps))
+    num_samples = len(timestamps)
+    return pa.Table.from_pydict(
+        dict(
+            zip(
+                LOCATION_COLUMNS,
+                [
+                    timestamps,
+                    timestamps,
+                    __padded_array(loc.timestamps_gps.timestamps, num_samples, np.nan),
+                    __padded_array(loc.latitude_samples.values, num_samples, np.nan),
+                    __padded_array(loc.longitude_samples.values, num_samples, np.nan),
+                    __padded_array(loc.altitude_samples.values, num_samples, np.nan),
+                    __padded_array(loc.speed_samples.values, num_samples, np.nan),
+                    __padded_array(loc.bearing_samples.values, num_samples, np.nan),
+                    __padded_array(loc.horizontal_accuracy_samples.values, num_samples, np.nan),
+                    __padded_array(loc.vertical_accuracy_samples.values, num_samples, np.nan),
+                    __padded_array(loc.speed_accuracy_samples.values, num_samples, np.nan),
+                    __padded_array(loc.bearing_accuracy_samples.values, num_samples, np.nan),
+                    __padded_array(
+                        loc.location_providers,
+                        num_samples,
+                        api_m.RedvoxPacketM.Sensors.Location.LocationProvider.UNKNOWN,
+                        np.int64,
+                    ),
+                ],
+            )
         )
-    return pa.Table.from_pydict(dict(zip(LOCATION_COLUMNS, data_for_df)))
+    )
 
 
 def apim_health_to_pyarrow(metrics: api_m.RedvoxPacketM.StationInformation.StationMetrics) -> pa.Table:
@@ -399,55 +412,38 @@ def apim_health_to_pyarrow(metrics: api_m.RedvoxPacketM.StationInformation.Stati
     :param metrics: station metrics to convert
     :return: pyarrow table representation of station metrics data
     """
-    timestamps = metrics.timestamps.timestamps
-    bat_samples = metrics.battery.values
-    bat_cur_samples = metrics.battery_current.values
-    temp_samples = metrics.temperature.values
-    net_samples = metrics.network_type
-    net_str_samples = metrics.network_strength.values
-    pow_samples = metrics.power_state
-    avail_ram_samples = metrics.available_ram.values
-    avail_disk_samples = metrics.available_disk.values
-    cell_samples = metrics.cell_service_state
-    cpu_util_samples = metrics.cpu_utilization.values
-    wake_lock_samples = metrics.wifi_wake_lock
-    screen_state_samples = metrics.screen_state
-    screen_bright_samples = metrics.screen_brightness.values
-    data_for_df = [], [], [], [], [], [], [], [], [], [], [], [], [], [], []
-    for i in range(len(timestamps)):
-        data_for_df[0].append(timestamps[i])
-        data_for_df[1].append(timestamps[i])
-        data_for_df[2].append(np.nan if len(bat_samples) < i + 1 else bat_samples[i])
-        data_for_df[3].append(np.nan if len(bat_cur_samples) < i + 1 else bat_cur_samples[i])
-        data_for_df[4].append(np.nan if len(temp_samples) < i + 1 else temp_samples[i])
-        data_for_df[5].append(
-            api_m.RedvoxPacketM.StationInformation.StationMetrics.NetworkType.UNKNOWN_NETWORK
-            if len(net_samples) < i + 1
-            else net_samples[i]
-        )
-        data_for_df[6].append(np.nan if len(net_str_samples) < i + 1 else net_str_samples[i])
-        data_for_df[7].append(
-            api_m.RedvoxPacketM.StationInformation.StationMetrics.PowerState.UNKNOWN_POWER_STATE
-            if len(pow_samples) < i + 1
-            else pow_samples[i]
-        )
-        data_for_df[8].append(np.nan if len(avail_ram_samples) < i + 1 else avail_ram_samples[i])
-        data_for_df[9].append(np.nan if len(avail_disk_samples) < i + 1 else avail_disk_samples[i])
-        data_for_df[10].append(
-            api_m.RedvoxPacketM.StationInformation.StationMetrics.CellServiceState.UNKNOWN
-            if len(cell_samples) < i + 1
-            else cell_samples[i]
-        )
-        data_for_df[11].append(np.nan if len(cpu_util_samples) < i + 1 else cpu_util_samples[i])
-        data_for_df[12].append(
-            api_m.RedvoxPacketM.StationInformation.StationMetrics.WifiWakeLock.NONE
-            if len(wake_lock_samples) < i + 1
-            else wake_lock_samples[i]
-        )
-        data_for_df[13].append(
-            api_m.RedvoxPacketM.StationInformation.StationMetrics.ScreenState.UNKNOWN_SCREEN_STATE
-            if len(screen_state_samples) < i + 1
-            else screen_state_samples[i]
+    timestamps = np.fromiter(metrics.timestamps.timestamps, dtype=float, count=len(metrics.timestamps.timestamps))
+    num_samples = len(timestamps)
+    station_metrics = api_m.RedvoxPacketM.StationInformation.StationMetrics
+    return pa.Table.from_pydict(
+        dict(
+            zip(
+                STATION_HEALTH_COLUMNS,
+                [
+                    timestamps,
+                    timestamps,
+                    __padded_array(metrics.battery.values, num_samples, np.nan),
+                    __padded_array(metrics.battery_current.values, num_samples, np.nan),
+                    __padded_array(metrics.temperature.values, num_samples, np.nan),
+                    __padded_array(
+                        metrics.network_type, num_samples, station_metrics.NetworkType.UNKNOWN_NETWORK, np.int64
+                    ),
+                    __padded_array(metrics.network_strength.values, num_samples, np.nan),
+                    __padded_array(
+                        metrics.power_state, num_samples, station_metrics.PowerState.UNKNOWN_POWER_STATE, np.int64
+                    ),
+                    __padded_array(metrics.available_ram.values, num_samples, np.nan),
+                    __padded_array(metrics.available_disk.values, num_samples, np.nan),
+                    __padded_array(
+                        metrics.cell_service_state, num_samples, station_metrics.CellServiceState.UNKNOWN, np.int64
+                    ),
+                    __padded_array(metrics.cpu_utilization.values, num_samples, np.nan),
+                    __padded_array(metrics.wifi_wake_lock, num_samples, station_metrics.WifiWakeLock.NONE, np.int64),
+                    __padded_array(
+                        metrics.screen_state, num_samples, station_metrics.ScreenState.UNKNOWN_SCREEN_STATE, np.int64
+                    ),
+                    __padded_array(metrics.screen_brightness.values, num_samples, np.nan),
+                ],
+            )
         )
-        data_for_df[14].append(np.nan if len(screen_bright_samples) < i + 1 else screen_bright_samples[i])
-    return pa.Table.from_pydict(dict(zip(STATION_HEALTH_COLUMNS, data_for_df)))
+    )
@@ -1,17 +1,20 @@
+from multiprocessing.pool import Pool
 import os.path
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
 import redvox
 import redvox.api1000.proto.redvox_api_m_pb2 as api_m
 from redvox.cloud import session_model_api as cloud_sm
-import redvox.common.api_conversions as ac
 import redvox.common.date_time_utils as dtu
 from redvox.common.errors import RedVoxError, RedVoxExceptions
 from redvox.common import io
+from redvox.common.index_cache import index_structured_cached, index_unstructured_cached
+from redvox.common.metadata_scan import entries_in_stream_order, stream_packet_metadata
 from redvox.common.offset_model import OffsetModel
+from redvox.common.parallel_utils import maybe_parallel_map
 import redvox.common.session_io as s_io
 import redvox.common.session_model_utils as smu
 
@@ -22,6 +25,7 @@ CLIENT_VERSION = SESSION_VERSION  # Version of the client used to create the Ses
 APP_NAME = "RedVox"  # Default name of the app
 DAILY_SESSION_NAME = "Day"  # Identifier for day-long dynamic sessions
 HOURLY_SESSION_NAME = "Hour"  # Identifier for hour-long dynamic sessions
+SESSION_CHUNK_MAX_FILES = 256  # maximum number of files a worker reads at once when building SessionModels from files
 
 
 def _get_session_key_from_packet(packet: api_m.RedvoxPacketM) -> str:
@@ -126,15 +130,19 @@ class SessionModel:
         )
 
     @staticmethod
-    def create_from_packet(packet: api_m.RedvoxPacketM) -> "SessionModel":
+    def create_from_packet(packet: api_m.RedvoxPacketM, require_timing: bool = True) -> "SessionModel":
         """
+        Writes an error if the packet has no timesync or GNSS time data, the same as add_data_from_packet
+
         :param packet: API M packet of data to read
+        :param require_timing: if True, raises an error if the packet has neither timesync nor GNSS time data,
+                                otherwise only writes the errors.  Default True
         :return: Session using the data from the packet
         """
         try:
             local_ts = smu.get_local_timesync(packet)
             local_gts = smu.get_gps_timing(packet)
-            if local_ts[2] == local_gts[2] == 0:
+            if require_timing and local_ts[2] == local_gts[2] == 0:
                 raise RedVoxError(
                     f"Unable to find timing data for station {packet.station_information.id}.\n"
                     f"Timing is required to complete SessionModel.\nNow Quitting."
@@ -182,6 +190,16 @@ class SessionModel:
                 )
             )
             result.cloud_session.sub = [result.add_dynamic_day(packet)]
+            if local_ts[2] == 0:
+                result._errors.append(
+                    f"Timesync doesn't exist in packet starting at "
+                    f"{packet.timing_information.packet_start_mach_timestamp}."
+                )
+            if local_gts[2] == 0:
+                result._errors.append(
+                    f"GNSS time data doesn't exist in packet starting at "
+                    f"{packet.timing_information.packet_start_mach_timestamp}."
+                )
         except Exception as e:
             raise e
         return result
@@ -210,11 +228,16 @@ class SessionModel:
         structured_dir: bool = True,
         start_datetime: Optional[dtu.datetime] = None,
         end_datetime: Optional[dtu.datetime] = None,
+        use_index_cache: bool = False,
+        pool: Optional[Pool] = None,
     ) -> "SessionModel":
         """
         Since the return value is the first SessionModel to be found in the data, your results may not be what you
         expected.  Adjust the input parameters as needed if so.
 
+        The files are read in chunks; each chunk is turned into partial models in parallel and the partial models are
+        merged in order.
+
         Raises an error if files are not found for the specified ID
 
         :param in_dir: input directory
@@ -222,15 +245,14 @@ class SessionModel:
         :param structured_dir: if True, input directory is organized as per api1000/api900 specifications.  Default True
         :param start_datetime: optional start datetime to get data from.  Default None
         :param end_datetime: optional end datetime to get data until.  Default None
+        :param use_index_cache: if True, use a persistent index cache stored in in_dir.  Default False
+        :param pool: optional multiprocessing pool.  Default None
         :return: the first SessionModel in the data
         """
         reader_filter = io.ReadFilter(station_ids={station_id}).with_start_dt(start_datetime).with_end_dt(end_datetime)
-        if structured_dir:
-            index = io.index_structured(in_dir, reader_filter)
-        else:
-            index = io.index_unstructured(in_dir, reader_filter)
+        index = SessionModel._index_dir(in_dir, reader_filter, structured_dir, use_index_cache)
         if len(index.entries) > 0:
-            return SessionModel().create_from_stream(SessionModel()._read_files_in_index(index))
+            return SessionModel._first_session(SessionModel._models_from_index(index, pool).sessions)
         err_m = f"{station_id}"
         if start_datetime:
             err_m += f" with start_datetime {start_datetime}"
@@ -246,51 +268,102 @@ class SessionModel:
         station_ids: Optional[List[str]] = None,
         start_datetime: Optional[dtu.datetime] = None,
         end_datetime: Optional[dtu.datetime] = None,
+        use_index_cache: bool = False,
+        pool: Optional[Pool] = None,
     ) -> List["SessionModel"]:
         """
+        The files of all stations are read in chunks; each chunk is turned into partial models in parallel and the
+        partial models are merged in order.
+
         :param in_dir: input directory
         :param structured_dir: if True, input directory is organized as per api1000/api900 specifications.  Default True
         :param station_ids: optional list of station IDs to get files for.  Default None
         :param start_datetime: optional start datetime to get data from.  Default None
         :param end_datetime: optional end datetime to get data until.  Default None
+        :param use_index_cache: if True, use a persistent index cache stored in in_dir.  Default False
+        :param pool: optional multiprocessing pool.  Default None
         :return: as many SessionModel as in the data
         """
-        result = []
         if station_ids:
             station_ids = set(station_ids)
         reader_filter = (
             io.ReadFilter().with_start_dt(start_datetime).with_end_dt(end_datetime).with_station_ids(station_ids)
         )
-        if structured_dir:
-            index = io.index_structured(in_dir, reader_filter)
-        else:
-            index = io.index_unstructured(in_dir, reader_filter)
-        all_index_ids = index.summarize().station_ids()
-        for station_id in all_index_ids:
-            result.append(
-                SessionModel().create_from_stream(
-                    SessionModel()._read_files_in_index(index.get_index_for_station_id(station_id))
-                )
-            )
+        index = SessionModel._index_dir(in_dir, reader_filter, structured_dir, use_index_cache)
+        models = SessionModel._models_from_index(index, pool)
+        return [
+            SessionModel._first_session([s for s in models.sessions if s.cloud_session.id == station_id])
+            for station_id in index.summarize().station_ids()
+        ]
+
+    @staticmethod
+    def _models_from_index(
+        index: io.Index, pool: Optional[Pool] = None, max_files_per_chunk: int = SESSION_CHUNK_MAX_FILES
+    ) -> "LocalSessionModels":
+        """
+        splits the files in the index into consecutive chunks, builds partial models of each chunk in parallel,
+        then merges the partial models in order
+
+        :param index: Index of the files to read
+        :param pool: optional multiprocessing pool.  Default None
+        :param max_files_per_chunk: maximum number of files per chunk, default SESSION_CHUNK_MAX_FILES
+        :return: LocalSessionModels of all sessions in the files, in order of their first packet
+        """
+        entries = entries_in_stream_order(index)
+        # only the first chunk has the first packet of every session that must have timing data
+        chunks = [(entries[i : i + max_files_per_chunk], i == 0) for i in range(0, len(entries), max_files_per_chunk)]
+        result = LocalSessionModels()
+        for partial in maybe_parallel_map(
+            pool, _local_models_from_entries, iter(chunks), lambda: len(chunks) > 1, chunk_size=1
+        ):
+            result.merge(partial)
         return result
 
+    @staticmethod
+    def _first_session(sessions: List["SessionModel"]) -> "SessionModel":
+        """
+        Raises an error if there are no sessions
+
+        :param sessions: SessionModels of a single station, in order of their first packet
+        :return: the first SessionModel, with an error for every packet of the other sessions, the same as
+                    create_from_stream on all of the packets
+        """
+        if len(sessions) < 1:
+            raise RedVoxError("Unable to find data files for a model.")
+        model = sessions[0]
+        for other in sessions[1:]:
+            for _ in range(other.cloud_session.n_pkts):
+                model._errors.append(
+                    f"Attempted to add packet with invalid key: {other.cloud_session.session_key()}!\n"
+                    f"Valid key is: {model.cloud_session.session_key()}"
+                )
+        return model
+
+    @staticmethod
+    def _index_dir(in_dir: str, reader_filter: io.ReadFilter, structured_dir: bool, use_index_cache: bool) -> io.Index:
+        """
+        :param in_dir: input directory
+        :param reader_filter: filter to apply to the files in the directory
+        :param structured_dir: if True, input directory is organized as per api1000/api900 specifications
+        :param use_index_cache: if True, use a persistent index cache stored in in_dir
+        :return: Index of the files in in_dir that match the filter
+        """
+        if use_index_cache:
+            if structured_dir:
+                return index_structured_cached(in_dir, reader_filter)
+            return index_unstructured_cached(in_dir, reader_filter)
+        if structured_dir:
+            return io.index_structured(in_dir, reader_filter)
+        return io.index_unstructured(in_dir, reader_filter)
+
     @staticmethod
     def _read_files_in_index(indexf: io.Index) -> List[api_m.RedvoxPacketM]:
         """
+        the audio, compressed audio and image payloads of API 1000 packets are not read; they are not used by the model
+
         :return: list of RedvoxPacketM, converted from API 900 if necessary
         """
-        result: List[api_m.RedvoxPacketM] = []
-        # Iterate over the API 900 packets in a memory efficient way and convert to API 1000
-        # noinspection PyTypeChecker
-        for packet_900 in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_900})):
-            # noinspection Mypy
-            result.append(ac.convert_api_900_to_1000_raw(packet_900))
-        # Grab the API 1000 packets
-        # noinspection PyTypeChecker
-        for packet in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_1000})):
-            # noinspection Mypy
-            result.append(packet)
-        return result
+        return list(stream_packet_metadata(indexf))
 
     def add_data_from_packet(self, packet: api_m.RedvoxPacketM):
         """
@@ -312,7 +385,7 @@ class SessionModel:
             for f in local_ts[5]:
                 smu.add_to_fst_buffer(timing.fst_lst.fst, timing.fst_lst.fst_max_size, f.ts, f)
                 smu.add_to_lst_buffer(timing.fst_lst.lst, timing.fst_lst.lst_max_size, f.ts, f)
-            timing.mean_lat = (timing.mean_lat * self.cloud_session.n_pkts + local_ts[4]) / (
+            timing.mean_lat = (timing.mean_lat * self.cloud_session.n_pkts + local_ts[3]) / (
                 self.cloud_session.n_pkts + 1
             )
             timing.mean_off = (timing.mean_off * self.cloud_session.n_pkts + local_ts[4]) / (
@@ -443,9 +516,69 @@ class SessionModel:
                 for s in sub:
                     if s not in self.dynamic_sessions[key].sub:
                         self.dynamic_sessions[key].sub.append(s)
-                    child_key = f"{self.dynamic_sessions[key].session_key}:{s}"
-                    if child_key in self.dynamic_sessions.keys():
-                        self._update_dynamic_session(child_key, data, self.dynamic_sessions[child_key].sub)
+
+    def merge(self, other: "SessionModel") -> "SessionModel":
+        """
+        Adds the data of another SessionModel of the same session to this SessionModel.  The packets of other must
+        come after the packets of this SessionModel; the result is the same as adding other's packets one at a time.
+        If other doesn't have the same key as the SessionModel, writes an error and no data is added.
+        Objects of other may be reused by this SessionModel; do not use other after merging it.
+
+        :param other: SessionModel to add
+        :return: the updated SessionModel
+        """
+        if self.cloud_session.session_key() != other.cloud_session.session_key():
+            self._errors.append(
+                f"Attempted to merge SessionModel with invalid key: {other.cloud_session.session_key()}!\n"
+                f"Valid key is: {self.cloud_session.session_key()}"
+            )
+            return self
+        n_pkts = self.cloud_session.n_pkts
+        other_n_pkts = other.cloud_session.n_pkts
+        total_pkts = float(n_pkts + other_n_pkts)
+        timing = self.cloud_session.timing
+        other_timing = other.cloud_session.timing
+        if other_timing.n_ex > 0:
+            smu.merge_fst_lst_buffers(timing.fst_lst, other_timing.fst_lst)
+            timing.mean_lat = (timing.mean_lat * n_pkts + other_timing.mean_lat * other_n_pkts) / total_pkts
+            timing.mean_off = (timing.mean_off * n_pkts + other_timing.mean_off * other_n_pkts) / total_pkts
+            timing.n_ex += other_timing.n_ex
+            if other_timing.first_data_ts < timing.first_data_ts:
+                timing.first_data_ts = other_timing.first_data_ts
+            if other_timing.last_data_ts > timing.last_data_ts:
+                timing.last_data_ts = other_timing.last_data_ts
+        g_timing = self.cloud_session.gnss_timing
+        other_g_timing = other.cloud_session.gnss_timing
+        if other_g_timing.n_ex > 0:
+            smu.merge_fst_lst_buffers(g_timing.fst_lst, other_g_timing.fst_lst)
+            g_timing.n_ex += other_g_timing.n_ex
+            g_timing.mean_off = (g_timing.mean_off * n_pkts + other_g_timing.mean_off * other_n_pkts) / total_pkts
+            if other_g_timing.first_data_ts < g_timing.first_data_ts:
+                g_timing.first_data_ts = other_g_timing.first_data_ts
+            if other_g_timing.last_data_ts > g_timing.last_data_ts:
+                g_timing.last_data_ts = other_g_timing.last_data_ts
+        for s in other.cloud_session.sensors:
+            sensor = self.get_sensor(s.name, s.description)
+            if sensor is not None:
+                sensor.sample_rate_stats = smu.merge_stats(sensor.sample_rate_stats, s.sample_rate_stats)
+            else:
+                self.cloud_session.sensors.append(s)
+        for key, dynamic in other.dynamic_sessions.items():
+            if key in self.dynamic_sessions.keys():
+                mine = self.dynamic_sessions[key]
+                mine.n_pkts += dynamic.n_pkts
+                mine.location = smu.merge_location_data(mine.location, dynamic.location)
+                mine.battery = smu.merge_stats(mine.battery, dynamic.battery)
+                mine.temperature = smu.merge_stats(mine.temperature, dynamic.temperature)
+                if mine.dur != HOURLY_SESSION_NAME:
+                    for s in dynamic.sub:
+                        if s not in mine.sub:
+                            mine.sub.append(s)
+            else:
+                self.dynamic_sessions[key] = dynamic
+        self.cloud_session.n_pkts += other_n_pkts
+        self._errors.extend_error(other._errors)
+        return self
 
     def sdk_version(self) -> str:
         """
@@ -555,11 +688,13 @@ class LocalSessionModels:
         result.sessions = in_dict["sessions"]
         return result
 
-    def add_packet(self, packet: api_m.RedvoxPacketM) -> str:
+    def add_packet(self, packet: api_m.RedvoxPacketM, require_timing: bool = True) -> str:
         """
         add a packet to one of the models, or make a new one
 
         :param packet: packet of data to add.
+        :param require_timing: if True, raises an error if a new model's packet has no timing data, otherwise only
+                                writes the errors.  Default True
         :return: session key of new or updated session model
         """
         key = _get_session_key_from_packet(packet)
@@ -568,9 +703,25 @@ class LocalSessionModels:
                 s.add_data_from_packet(packet)
                 return s.cloud_session.session_key()
         # if here, key is not in the sessions.
-        self.sessions.append(SessionModel.create_from_packet(packet))
+        self.sessions.append(SessionModel.create_from_packet(packet, require_timing))
         return key
 
+    def merge(self, other: "LocalSessionModels") -> "LocalSessionModels":
+        """
+        merges the models of other into the matching models, or adds them as new models.
+        The packets of other must come after the packets of these models.
+
+        :param other: LocalSessionModels to add
+        :return: the updated LocalSessionModels
+        """
+        for s in other.sessions:
+            model = self.get_session(s.cloud_session.session_key())
+            if model is not None:
+                model.merge(s)
+            else:
+                self.sessions.append(s)
+        return self
+
     def add_stream(self, data_stream: List[api_m.RedvoxPacketM]):
         """
         add data from the stream into the models.  Makes new models as needed.
@@ -581,14 +732,16 @@ class LocalSessionModels:
             self.add_packet(p)
 
     @staticmethod
-    def create_from_stream(data_stream: List[api_m.RedvoxPacketM]) -> "LocalSessionModels":
+    def create_from_stream(data_stream: List[api_m.RedvoxPacketM], require_timing: bool = True) -> "LocalSessionModels":
         """
         :param data_stream: list of API M packets to read
+        :param require_timing: if True, raises an error if the first packet of a model has no timing data, otherwise
+                                only writes the errors.  Default True
         :return: LocalSessionModels using the data packets from the stream
         """
         result = LocalSessionModels()
         for p in data_stream:
-            result.add_packet(p)
+            result.add_packet(p, require_timing)
         return result
 
     def get_session(self, key: str) -> Optional[SessionModel]:
@@ -600,3 +753,17 @@ class LocalSessionModels:
             if key == s.cloud_session.session_key():
                 return s
         return None
+
+
+def _local_models_from_entries(chunk: Tuple[List[io.IndexEntry], bool]) -> LocalSessionModels:
+    """
+    Builds partial models of a chunk of files.  Runs in the worker processes.
+    The first packet of a model in a later chunk is not the first packet of its session; if it has no timing data, the
+    sequential reader only writes an error for it, so the partial model does the same.
+
+    :param chunk: the entries to read, in the order Index.stream_contents reads them, and True if the chunk is the
+                    first chunk
+    :return: LocalSessionModels of the packets in the entries
+    """
+    entries, is_first_chunk = chunk
+    return LocalSessionModels.create_from_stream(list(stream_packet_metadata(io.Index(entries))), is_first_chunk)
@@ -343,6 +343,61 @@ def add_to_stats(value: float, stats: Optional[sm.Stats] = None) -> sm.Stats:
     return stats
 
 
+def merge_welford(welford: sm.WelfordAggregator, other: sm.WelfordAggregator) -> sm.WelfordAggregator:
+    """
+    adds the values summarized by other to the welford, then returns the updated object.
+    uses the parallel form of the algorithm; the result is the same as adding each value to the welford in order.
+
+    :param welford: WelfordAggregator object to update
+    :param other: WelfordAggregator object to add
+    :return: updated WelfordAggregator object
+    """
+    if other.cnt < 1:
+        return welford
+    cnt = welford.cnt + other.cnt
+    delta = other.mean - welford.mean
+    welford.m2 += other.m2 + delta * delta * welford.cnt * other.cnt / float(cnt)
+    welford.mean += delta * other.cnt / float(cnt)
+    welford.cnt = cnt
+    return welford
+
+
+def merge_stats(stats: sm.Stats, other: sm.Stats) -> sm.Stats:
+    """
+    adds the values summarized by other to the stats, then returns the updated object.
+
+    :param stats: Stats object to update
+    :param other: Stats object to add
+    :return: updated Stats object
+    """
+    if other.min < stats.min:
+        stats.min = other.min
+    if other.max > stats.max:
+        stats.max = other.max
+    merge_welford(stats.welford, other.welford)
+    return stats
+
+
+def merge_fst_lst_buffers(
+    fst_lst: Union[sm.FirstLastBufTimeSync, sm.FirstLastBufLocation],
+    other: Union[sm.FirstLastBufTimeSync, sm.FirstLastBufLocation],
+) -> Union[sm.FirstLastBufTimeSync, sm.FirstLastBufLocation]:
+    """
+    adds the values in the first and last buffers of other to the buffers of fst_lst, then returns the updated object.
+    values outside the first or last buffer of other can't be in the first or last buffer of the combined data, so
+    the result is the same as adding all of other's values one at a time.
+
+    :param fst_lst: first and last buffers to update
+    :param other: first and last buffers to add
+    :return: updated first and last buffers
+    """
+    for timestamp, value in other.fst:
+        add_to_fst_buffer(fst_lst.fst, fst_lst.fst_max_size, timestamp, value)
+    for timestamp, value in other.lst:
+        add_to_lst_buffer(fst_lst.lst, fst_lst.lst_max_size, timestamp, value)
+    return fst_lst
+
+
 def get_location_data(packet: api_m.RedvoxPacketM) -> List[Tuple[str, float, float, float, float]]:
     """
     :param packet: packet to get location data from
@@ -451,3 +506,26 @@ def add_location_data(
     for s in data:
         loc_dict[s[0]] = add_to_location(s[1], s[2], s[3], s[4], loc_dict[s[0]] if s[0] in loc_dict.keys() else None)
     return loc_dict
+
+
+def merge_location_data(
+    loc_dict: Dict[str, sm.LocationStat], other: Dict[str, sm.LocationStat]
+) -> Dict[str, sm.LocationStat]:
+    """
+    adds the LocationStat of other to the dictionary of LocationStat, then returns the updated dictionary.
+    LocationStat of sources that are not in loc_dict are added without being copied.
+
+    :param loc_dict: the location dictionary to update
+    :param other: the location dictionary to add
+    :return: the updated location dictionary
+    """
+    for source, loc_stat in other.items():
+        if source in loc_dict.keys():
+            mine = loc_dict[source]
+            merge_fst_lst_buffers(mine.fst_lst, loc_stat.fst_lst)
+            mine.lat = merge_stats(mine.lat, loc_stat.lat)
+            mine.lng = merge_stats(mine.lng, loc_stat.lng)
+            mine.alt = merge_stats(mine.alt, loc_stat.alt)
+        else:
+            loc_dict[source] = loc_stat
+    return loc_dict
@@ -3,7 +3,8 @@ Defines generic station objects for API-independent analysis
 all timestamps are integers in microseconds unless otherwise stated
 Utilizes RedvoxPacketM (API M data packets) as the format of the data due to their versatility
 """
-from typing import List, Optional, Tuple, Union
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import os
 from pathlib import Path
 
@@ -19,6 +20,8 @@ from redvox.common.offset_model import OffsetModel, GPS_LATENCY_MICROS
 from redvox.common.timesync import TimeSync
 from redvox.common.errors import RedVoxExceptions
 import redvox.api1000.proto.redvox_api_m_pb2 as api_m
+import redvox.api900.lib.api900_pb2 as api_900
+from redvox.common import api_conversions as ac
 from redvox.common import packet_to_pyarrow as ptp
 from redvox.common import gap_and_pad_utils as gpu
 from redvox.common.date_time_utils import datetime_from_epoch_microseconds_utc, seconds_to_microseconds as s_to_us
@@ -28,6 +31,16 @@ from redvox.common.event_stream import EventStreams
 STATION_ID_LENGTH: int = 10  # the length of a station ID string
 
 
+def _metadata_packet(packet: Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]) -> api_m.RedvoxPacketM:
+    """
+    :param packet: API M or API 900 packet
+    :return: the API M packet, or the metadata of the API 900 packet converted to API M without its samples
+    """
+    if isinstance(packet, api_900.RedvoxPacket):
+        return ac.convert_api_900_metadata_to_1000_raw(packet)
+    return packet
+
+
 class Station:
     """
     generic station for api-independent stuff; uses API M as the core data object since it's quite versatile
@@ -400,23 +413,88 @@ class Station:
 
     def load_from_indexes(self, indexes: List[Index]):
         """
-        fill station using data from a list of Indexes
+        fill station using data from a list of Indexes.  Files are read one at a time.
 
         :param indexes: List of indexes of the files to read
         """
         self._load_metadata_from_packet(indexes[0].read_first_packet())
+        self._load_packet_stream(chain.from_iterable(idx.stream_contents(convert_api_900=False) for idx in indexes))
+
+    @staticmethod
+    def create_from_stream(
+        packets: Iterable[api_m.RedvoxPacketM],
+        correct_timestamps: bool = False,
+        use_model_correction: bool = True,
+        base_out_dir: str = ".",
+        save_output: bool = False,
+        use_temp_dir: bool = False,
+    ) -> "Station":
+        """
+        Use a stream of Redvox packets to create a Station.  Only one packet is held in memory at a time.
+
+        :param packets: API M redvox packets with data to load
+        :param correct_timestamps: if True, correct timestamps as soon as possible.  Default False
+        :param use_model_correction: if True, use OffsetModel functions for time correction, add OffsetModel
+                                        best offset (intercept value) otherwise.  Default True
+        :param base_out_dir: directory to save parquet files, default "." (current directory)
+        :param save_output: if True, save the parquet files to base_out_dir, otherwise delete them.  default False
+        :param use_temp_dir: if True, save the parquet files to a temp dir.  default False
+        :return: Station using data from redvox packets.
+        """
+        station = Station(
+            correct_timestamps=correct_timestamps,
+            use_model_correction=use_model_correction,
+            base_dir=base_out_dir,
+            save_data=save_output,
+            use_temp_dir=use_temp_dir,
+        )
+        station.load_from_stream(packets)
+        return station
+
+    def load_from_stream(self, packets: Iterable[Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]]):
+        """
+        fill station with data from a stream of packets.  Each packet is converted as soon as it is read, so only the
+        converted data is kept in memory.  Does nothing if the stream is empty.
+
+        :param packets: API M or API 900 redvox packets with data to load
+        """
+        packets = iter(packets)
+        first_packet: Optional[Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]] = next(packets, None)
+        if first_packet is not None:
+            self._load_metadata_from_packet(_metadata_packet(first_packet))
+            self._load_packet_stream(chain([first_packet], packets))
+
+    def _load_packet_stream(self, packets: Iterator[Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]]):
+        """
+        converts packets one at a time into sensor data, timesync exchanges, event streams and packet metadata, then
+        computes the timesync statistics and merges the sensor data.  Station metadata must be loaded before this.
+        API 900 packets are converted straight into sensor data without converting their samples to API M.
+
+        :param packets: API M or API 900 redvox packets with data to load
+        """
         self._timesync_data.arrow_dir = os.path.join(self.save_dir(), "timesync")
         self._timesync_data.arrow_file = f"timesync_{self.start_date_as_str()}"
-        all_summaries = ptp.AggregateSummary()
         self._event_data.set_save_dir(os.path.join(self.save_dir(), "events"))
-        for idx in indexes:
-            pkts = idx.read_contents()
-            self._packet_metadata.extend([st_utils.StationPacketMetadata(packet) for packet in pkts])
-            self._timesync_data.append_timesync(TimeSync().from_raw_packets(pkts))
-            self._event_data.read_from_packets_list(pkts)
-            all_summaries.add_aggregate_summary(
-                ptp.stream_to_pyarrow(pkts, self._fs_writer.get_temp() if self.is_save_to_disk() else None)
-            )
+        out_dir: Optional[str] = self._fs_writer.get_temp() if self.is_save_to_disk() else None
+        all_summaries = ptp.AggregateSummary()
+        exchanges: List[float] = []
+        data_start: float = np.nan
+        data_end: float = np.nan
+        sink: Optional[ptp.ParquetSink] = ptp.ParquetSink(out_dir) if out_dir else None
+        try:
+            for packet in packets:
+                metadata_packet = _metadata_packet(packet)
+                if np.isnan(data_start):
+                    data_start = metadata_packet.timing_information.packet_start_mach_timestamp
+                data_end = metadata_packet.timing_information.packet_end_mach_timestamp
+                self._packet_metadata.append(st_utils.StationPacketMetadata(metadata_packet))
+                exchanges.extend(TimeSync.exchanges_from_packet(metadata_packet))
+                self._event_data.read_from_packets_list([metadata_packet])
+                all_summaries.add_aggregate_summary(ptp.packet_to_pyarrow(packet, out_dir, sink))
+        finally:
+            if sink:
+                sink.close()
+        self._timesync_data.from_exchanges(exchanges, data_start, data_end)
         all_summaries.merge_all_summaries()
         self._set_pyarrow_sensors(all_summaries)
         if self._correct_timestamps:
@@ -424,7 +502,7 @@ class Station:
 
     @staticmethod
     def create_from_packets(
-        packets: List[api_m.RedvoxPacketM],
+        packets: List[Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]],
         correct_timestamps: bool = False,
         use_model_correction: bool = True,
         base_out_dir: str = ".",
@@ -434,7 +512,7 @@ class Station:
         """
         Use a list of Redvox packets to create a Station
 
-        :param packets: API M redvox packets with data to load
+        :param packets: API M or API 900 redvox packets with data to load
         :param correct_timestamps: if True, correct timestamps as soon as possible.  Default False
         :param use_model_correction: if True, use OffsetModel functions for time correction, add OffsetModel
                                         best offset (intercept value) otherwise.  Default True
@@ -481,17 +559,19 @@ class Station:
         station._load_metadata_from_packet(packet)
         return station
 
-    def load_data_from_packets(self, packets: List[api_m.RedvoxPacketM]):
+    def load_data_from_packets(self, packets: List[Union[api_m.RedvoxPacketM, api_900.RedvoxPacket]]):
         """
-        fill station with data from packets
+        fill station with data from packets.  API 900 packets are converted straight into sensor data without
+        converting their samples to API M.
 
-        :param packets: API M redvox packets with data to load
+        :param packets: API M or API 900 redvox packets with data to load
         """
-        if packets and st_utils.validate_station_key_list(packets, self._errors):
+        metadata_packets: List[api_m.RedvoxPacketM] = [_metadata_packet(packet) for packet in packets]
+        if packets and st_utils.validate_station_key_list(metadata_packets, self._errors):
             # noinspection Mypy
-            self._load_metadata_from_packet(packets[0])
-            self._packet_metadata = [st_utils.StationPacketMetadata(packet) for packet in packets]
-            self._timesync_data = TimeSync().from_raw_packets(packets)
+            self._load_metadata_from_packet(metadata_packets[0])
+            self._packet_metadata = [st_utils.StationPacketMetadata(packet) for packet in metadata_packets]
+            self._timesync_data = TimeSync().from_raw_packets(metadata_packets)
             self._timesync_data.arrow_dir = os.path.join(self.save_dir(), "timesync")
             self._timesync_data.arrow_file = f"timesync_{self.start_date_as_str()}"
             summaries = ptp.stream_to_pyarrow(packets, self._fs_writer.get_temp() if self.is_save_to_disk() else None)
@@ -500,7 +580,37 @@ class Station:
             if self._correct_timestamps:
                 self.update_timestamps()
             self._event_data.set_save_dir(os.path.join(self.save_dir(), "events"))
-            self._event_data.read_from_packets_list(packets)
+            self._event_data.read_from_packets_list(metadata_packets)
+
+    def load_from_converted_packets(
+        self,
+        first_packet: api_m.RedvoxPacketM,
+        packet_metadata: List[st_utils.StationPacketMetadata],
+        timesync: TimeSync,
+        summaries: ptp.AggregateSummary,
+        event_data: EventStreams,
+    ):
+        """
+        fill station with packets that were already converted, i.e. by a LiveStation.  The sensor summaries must
+        contain a single merged audio summary with the audio gaps filled, and the gaps of the audio data.
+
+        :param first_packet: API M redvox packet to load the station metadata from
+        :param packet_metadata: metadata of the converted packets, in order
+        :param timesync: time sync data of the converted packets
+        :param summaries: summaries of the sensor data of the converted packets
+        :param event_data: event streams of the converted packets
+        """
+        self._load_metadata_from_packet(first_packet)
+        self._packet_metadata = packet_metadata
+        self._timesync_data = timesync
+        self._timesync_data.arrow_dir = os.path.join(self.save_dir(), "timesync")
+        self._timesync_data.arrow_file = f"timesync_{self.start_date_as_str()}"
+        self._event_data = event_data
+        self._event_data.set_save_dir(os.path.join(self.save_dir(), "events"))
+        summaries.merge_non_audio_summaries()
+        self._set_pyarrow_sensors(summaries)
+        if self._correct_timestamps:
+            self.update_timestamps()
 
     def _load_metadata_from_packet(self, packet: api_m.RedvoxPacketM):
         """
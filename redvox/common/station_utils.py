@@ -15,6 +15,18 @@ from redvox.common.errors import RedVoxExceptions
 import redvox.api1000.proto.redvox_api_m_pb2 as api_m
 
 
+def packet_duration_s(packet: api_m.RedvoxPacketM) -> float:
+    """
+    :param packet: packet to get the duration of
+    :return: duration of the audio samples of the packet in seconds.  Packets converted from API 900 without their
+                samples (see api_conversions.convert_api_900_metadata_to_1000_raw) use their samples per window.
+    """
+    num_samples = len(packet.sensors.audio.samples.values)
+    if num_samples == 0 and packet.sub_api == 900:
+        num_samples = packet.station_information.app_settings.samples_per_window
+    return num_samples / packet.sensors.audio.sample_rate
+
+
 def validate_station_key_list(data_packets: List[api_m.RedvoxPacketM], errors: RedVoxExceptions) -> bool:
     """
     Checks for consistency in the data packets.  Returns False if discrepancies are found.
@@ -41,7 +53,7 @@ def validate_station_key_list(data_packets: List[api_m.RedvoxPacketM], errors: R
                 t.station_information.os_version,
                 t.station_information.app_version,
                 t.station_information.is_private,
-                len(t.sensors.audio.samples.values) / t.sensors.audio.sample_rate,
+                packet_duration_s(t),
             ]
             for t in data_packets
         ]
@@ -200,7 +212,7 @@ class StationMetadata:
             self.os_version = packet.station_information.os_version
             self.app_version = packet.station_information.app_version
             self.is_private = packet.station_information.is_private
-            self.packet_duration_s = len(packet.sensors.audio.samples.values) / packet.sensors.audio.sample_rate
+            self.packet_duration_s = packet_duration_s(packet)
             self.station_description = packet.station_information.description
         else:
             self.api = np.nan
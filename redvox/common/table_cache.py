@@ -0,0 +1,149 @@
+"""
+This module provides a bounded, least recently used cache of pyarrow Tables read from disk.
+The cache is disabled by default; use redvox.settings.set_table_cache_max_bytes to enable it.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import pyarrow as pa
+
+import redvox.settings as settings
+
+
+class TableCache:
+    """
+    Least recently used cache of pyarrow Tables, keyed by the directory the table was read from.
+    An entry is only used while the modification time of its directory is unchanged.
+
+    Properties:
+        hits: int, number of times get found a table in the cache
+
+        misses: int, number of times get didn't find a table in the cache
+
+    Protected:
+        _entries: OrderedDict of directory to the directory's modification time and the table read from it,
+        from least to most recently used
+
+        _nbytes: int, total size in bytes of the cached tables
+
+        _lock: threading.Lock, protects the entries and the counters
+    """
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[str, Tuple[int, pa.Table]]" = OrderedDict()
+        self._nbytes: int = 0
+        self._lock = threading.Lock()
+
+    def nbytes(self) -> int:
+        """
+        :return: total size in bytes of the cached tables
+        """
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str) -> Optional[pa.Table]:
+        """
+        :param path: directory the table was read from
+        :return: the cached table or None if it isn't cached or the directory has changed since it was cached
+        """
+        mtime_ns = _mtime_ns(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != mtime_ns:
+                self._remove(path)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, path: str, table: pa.Table, max_bytes: int):
+        """
+        add a table to the cache, then remove the least recently used tables until the cache fits in max_bytes.
+        tables larger than max_bytes are not cached.
+
+        :param path: directory the table was read from
+        :param table: the table to cache
+        :param max_bytes: maximum total size of the cached tables in bytes
+        """
+        mtime_ns = _mtime_ns(path)
+        with self._lock:
+            self._remove(path)
+            if mtime_ns is None or table.nbytes > max_bytes:
+                return
+            self._entries[path] = (mtime_ns, table)
+            self._nbytes += table.nbytes
+            while self._nbytes > max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path: str):
+        """
+        remove the table read from path from the cache, if it exists
+
+        :param path: directory the table was read from
+        """
+        with self._lock:
+            self._remove(path)
+
+    def clear(self):
+        """
+        remove all tables from the cache and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _remove(self, path: str):
+        """
+        remove an entry without locking
+
+        :param path: directory of the entry to remove
+        """
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._nbytes -= entry[1].nbytes
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """
+    :param path: path to check
+    :return: modification time of the path in nanoseconds or None if the path doesn't exist
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+TABLE_CACHE: TableCache = TableCache()
+
+
+def cached_table(path: str, read_fn: Callable[[], pa.Table]) -> pa.Table:
+    """
+    get the table stored in path from the cache, or read it and add it to the cache.
+    if the cache is disabled, always reads the table.
+
+    :param path: directory containing the table's files
+    :param read_fn: function that reads the table from path
+    :return: the table stored in path
+    """
+    max_bytes = settings.get_table_cache_max_bytes()
+    if max_bytes < 1:
+        return read_fn()
+    table = TABLE_CACHE.get(path)
+    if table is not None:
+        return table
+    table = read_fn()
+    TABLE_CACHE.put(path, table, max_bytes)
+    return table
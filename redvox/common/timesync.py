@@ -5,7 +5,6 @@ Also includes functions for correcting time arrays.
 ALL timestamps in microseconds unless otherwise stated
 """
 
-from functools import reduce
 from typing import List, Optional, Union
 from pathlib import Path
 import os
@@ -127,9 +126,7 @@ class TimeSync:
             self._best_exchange_index_list = []
             self._offset_model: OffsetModel = OffsetModel.empty_model()
         else:
-            self._time_sync_exchanges_list = np.transpose(
-                [time_sync_exchanges_list[i : i + 6] for i in range(0, len(time_sync_exchanges_list), 6)]
-            )
+            self._time_sync_exchanges_list = np.reshape(np.array(time_sync_exchanges_list, dtype=float), (-1, 6)).T
             if self._latencies is None:
                 if not np.isnan(self._data_start):
                     self._data_start = self.get_exchange_timestamps(4)[0]
@@ -371,32 +368,22 @@ class TimeSync:
 
         :param new_data: another TimeSync object
         """
-        self._time_sync_exchanges_list[0] = np.append(
-            self._time_sync_exchanges_list[0], new_data._time_sync_exchanges_list[0]
-        )
-        self._time_sync_exchanges_list[1] = np.append(
-            self._time_sync_exchanges_list[1], new_data._time_sync_exchanges_list[1]
-        )
-        self._time_sync_exchanges_list[2] = np.append(
-            self._time_sync_exchanges_list[2], new_data._time_sync_exchanges_list[2]
-        )
-        self._time_sync_exchanges_list[3] = np.append(
-            self._time_sync_exchanges_list[3], new_data._time_sync_exchanges_list[3]
-        )
-        self._time_sync_exchanges_list[4] = np.append(
-            self._time_sync_exchanges_list[4], new_data._time_sync_exchanges_list[4]
-        )
-        self._time_sync_exchanges_list[5] = np.append(
-            self._time_sync_exchanges_list[5], new_data._time_sync_exchanges_list[5]
-        )
-        if np.isnan(self._data_start):
-            self._data_start = new_data._data_start
-        elif not np.isnan(new_data._data_start):
-            self._data_start = np.min([self._data_start, new_data._data_start])
-        if np.isnan(self._data_end):
-            self._data_end = new_data._data_end
-        elif not np.isnan(new_data._data_end):
-            self._data_end = np.max([self._data_end, new_data._data_end])
+        self.append_timesyncs([new_data])
+
+    def append_timesyncs(self, new_data: List["TimeSync"]):
+        """
+        adds timesync data from every TimeSync in new_data to current, then computes the statistics once
+
+        :param new_data: list of other TimeSync objects
+        """
+        exchanges = [self._time_sync_exchanges_list] + [ts._time_sync_exchanges_list for ts in new_data]
+        self._time_sync_exchanges_list = [
+            np.concatenate([np.asarray(exch[i], dtype=float) for exch in exchanges]) for i in range(6)
+        ]
+        starts = [ts._data_start for ts in [self] + new_data if not np.isnan(ts._data_start)]
+        ends = [ts._data_end for ts in [self] + new_data if not np.isnan(ts._data_end)]
+        self._data_start = np.min(starts) if starts else np.nan
+        self._data_end = np.max(ends) if ends else np.nan
         self._stats_from_exchanges()
 
     def from_raw_packets(self, packets: List[Union[RedvoxPacketM, RedvoxPacket]]) -> "TimeSync":
@@ -418,28 +405,46 @@ class TimeSync:
 
         packet: Union[RedvoxPacketM, RedvoxPacket]
         for packet in packets:
-            if isinstance(packet, RedvoxPacketM):
-                all_exchanges.extend(
-                    reduce(
-                        lambda acc, ex: acc + [ex.a1, ex.a2, ex.a3, ex.b1, ex.b2, ex.b3],
-                        packet.timing_information.synch_exchanges,
-                        [],
-                    )
-                )
-            else:
-                # Get synch exchanges
-                ch: api900_pb2.UnevenlySampledChannel
-                for ch in packet.unevenly_sampled_channels:
-                    if api900_pb2.TIME_SYNCHRONIZATION in ch.channel_types:
-                        all_exchanges.extend(util_900.extract_payload(ch))
+            all_exchanges.extend(TimeSync.exchanges_from_packet(packet))
 
         if len(all_exchanges) > 0:
-            self._time_sync_exchanges_list = np.transpose(
-                [all_exchanges[i : i + 6] for i in range(0, len(all_exchanges), 6)]
-            )
+            self._time_sync_exchanges_list = np.reshape(np.array(all_exchanges, dtype=float), (-1, 6)).T
             self._stats_from_exchanges()
         return self
 
+    @staticmethod
+    def exchanges_from_packet(packet: Union[RedvoxPacketM, RedvoxPacket]) -> List[float]:
+        """
+        :param packet: RedvoxPacketM or RedvoxPacket to get the time sync exchanges of
+        :return: the time sync exchanges of the packet as a flat list of a1, a2, a3, b1, b2, b3 values
+        """
+        exchanges: List[float] = []
+        if isinstance(packet, RedvoxPacketM):
+            for ex in packet.timing_information.synch_exchanges:
+                exchanges.extend((ex.a1, ex.a2, ex.a3, ex.b1, ex.b2, ex.b3))
+        else:
+            # Get synch exchanges
+            ch: api900_pb2.UnevenlySampledChannel
+            for ch in packet.unevenly_sampled_channels:
+                if api900_pb2.TIME_SYNCHRONIZATION in ch.channel_types:
+                    exchanges.extend(util_900.extract_payload(ch))
+        return exchanges
+
+    def from_exchanges(self, exchanges: List[float], data_start: float, data_end: float) -> "TimeSync":
+        """
+        sets the time sync exchanges and the data range, then performs analysis once
+
+        :param exchanges: time sync exchanges as a flat list of a1, a2, a3, b1, b2, b3 values
+        :param data_start: start timestamp of the data
+        :param data_end: end timestamp of the data
+        :return: modified version of self
+        """
+        self._data_start = data_start
+        self._data_end = data_end
+        self._time_sync_exchanges_list = list(np.reshape(np.array(exchanges, dtype=float), (-1, 6)).T)
+        self._stats_from_exchanges()
+        return self
+
     def sync_exchanges(self) -> np.ndarray:
         """
         :return: time sync exchanges
@@ -6,6 +6,8 @@ import os
 from typing import Optional
 
 REDVOX_ENABLE_PARALLELISM_ENV: str = "REDVOX_ENABLE_PARALLELISM"
+REDVOX_TABLE_CACHE_MAX_BYTES_ENV: str = "REDVOX_TABLE_CACHE_MAX_BYTES"
+REDVOX_MAX_PROCESSES_ENV: str = "REDVOX_MAX_PROCESSES"
 
 
 def is_parallelism_enabled_env() -> Optional[bool]:
@@ -51,6 +53,75 @@ def is_parallelism_enabled() -> bool:
     return False if __PARALLELISM_ENABLED is None else __PARALLELISM_ENABLED
 
 
+def table_cache_max_bytes_env() -> Optional[int]:
+    """
+    Reads the maximum size of the sensor table cache from an environmental variable.
+    :return: The number of bytes if the env var exists and can be parsed as an integer, None otherwise.
+    """
+    try:
+        return int(os.environ[REDVOX_TABLE_CACHE_MAX_BYTES_ENV])
+    except (KeyError, ValueError):
+        return None
+
+
+__TABLE_CACHE_MAX_BYTES: Optional[int] = table_cache_max_bytes_env()
+
+
+def set_table_cache_max_bytes(max_bytes: int) -> None:
+    """
+    Sets the maximum total size of the pyarrow tables that sensors keep cached after reading them from disk.
+    :param max_bytes: maximum size in bytes; 0 disables the cache
+    """
+    global __TABLE_CACHE_MAX_BYTES
+    __TABLE_CACHE_MAX_BYTES = max_bytes
+
+
+def get_table_cache_max_bytes() -> int:
+    """
+    Returns the maximum total size of the pyarrow tables that sensors keep cached after reading them from disk.
+    :return: maximum size in bytes; 0 (the default) if the cache is disabled
+    """
+    global __TABLE_CACHE_MAX_BYTES
+    if __TABLE_CACHE_MAX_BYTES is None:
+        __TABLE_CACHE_MAX_BYTES = table_cache_max_bytes_env()
+    return 0 if __TABLE_CACHE_MAX_BYTES is None else __TABLE_CACHE_MAX_BYTES
+
+
+def max_processes_env() -> Optional[int]:
+    """
+    Reads the maximum number of worker processes of the shared process pool from an environmental variable.
+    :return: The number of processes if the env var exists and can be parsed as an integer, None otherwise.
+    """
+    try:
+        return int(os.environ[REDVOX_MAX_PROCESSES_ENV])
+    except (KeyError, ValueError):
+        return None
+
+
+__MAX_PROCESSES: Optional[int] = max_processes_env()
+
+
+def set_max_processes(max_processes: int) -> None:
+    """
+    Sets the maximum number of worker processes of the shared process pool used when parallelism is enabled.
+    A running shared pool of a different size is replaced the next time it is used.
+    :param max_processes: maximum number of processes; 0 uses one process per CPU
+    """
+    global __MAX_PROCESSES
+    __MAX_PROCESSES = max_processes
+
+
+def get_max_processes() -> int:
+    """
+    Returns the maximum number of worker processes of the shared process pool used when parallelism is enabled.
+    :return: maximum number of processes; 0 (the default) if one process per CPU is used
+    """
+    global __MAX_PROCESSES
+    if __MAX_PROCESSES is None:
+        __MAX_PROCESSES = max_processes_env()
+    return 0 if __MAX_PROCESSES is None else __MAX_PROCESSES
+
+
 def is_gui_extra_enabled() -> bool:
     """
     :return: True if the GUI extra is enabled, False otherwise
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import lz4.frame
+
+import redvox.cli.conversions as conversions
+from redvox.tests import TEST_DATA_DIR
+
+
+class TestConversions(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.in_dir = os.path.join(self.temp_dir.name, "in")
+        os.makedirs(os.path.join(self.in_dir, "sub"))
+        # example.rdvxz can't be converted to API M, so only the files named by station and timestamp are used
+        self.rdvxz_names = sorted(
+            name for name in os.listdir(TEST_DATA_DIR) if name.endswith(".rdvxz") and name[0].isdigit()
+        )
+        for name in self.rdvxz_names[:-1]:
+            shutil.copyfile(os.path.join(TEST_DATA_DIR, name), os.path.join(self.in_dir, name))
+        shutil.copyfile(
+            os.path.join(TEST_DATA_DIR, self.rdvxz_names[-1]), os.path.join(self.in_dir, "sub", self.rdvxz_names[-1])
+        )
+        shutil.copyfile(os.path.join(TEST_DATA_DIR, "example.json"), os.path.join(self.in_dir, "example.json"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def out_dir(self, name: str) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        os.makedirs(path)
+        return path
+
+    def test_iter_paths(self):
+        file_path = os.path.join(self.in_dir, "example.json")
+        self.assertListEqual(
+            [os.path.join(self.in_dir, name) for name in self.rdvxz_names[:-1]] + [file_path],
+            list(conversions.iter_paths([self.in_dir, file_path], ".rdvxz")),
+        )
+        self.assertListEqual(
+            [os.path.join(self.in_dir, name) for name in self.rdvxz_names[:-1]]
+            + [os.path.join(self.in_dir, "sub", self.rdvxz_names[-1])],
+            list(conversions.iter_paths([self.in_dir], ".rdvxz", recursive=True)),
+        )
+
+    def test_rdvxz_to_rdvxm_jobs(self):
+        serial_dir = self.out_dir("serial")
+        parallel_dir = self.out_dir("parallel")
+        fast_dir = self.out_dir("fast")
+        self.assertTrue(
+            conversions.rdvxz_to_rdvxm(conversions.iter_paths([self.in_dir], ".rdvxz", True), serial_dir)
+        )
+        self.assertTrue(
+            conversions.rdvxz_to_rdvxm(conversions.iter_paths([self.in_dir], ".rdvxz", True), parallel_dir, jobs=2)
+        )
+        self.assertTrue(
+            conversions.rdvxz_to_rdvxm(
+                conversions.iter_paths([self.in_dir], ".rdvxz", True), fast_dir, compression_level=0, jobs=2
+            )
+        )
+        names = sorted(os.listdir(serial_dir))
+        self.assertEqual(len(self.rdvxz_names), len(names))
+        self.assertListEqual(names, sorted(os.listdir(parallel_dir)))
+        self.assertListEqual(names, sorted(os.listdir(fast_dir)))
+        for name in names:
+            with open(os.path.join(serial_dir, name), "rb") as serial_in:
+                serial = serial_in.read()
+            with open(os.path.join(parallel_dir, name), "rb") as parallel_in:
+                self.assertEqual(serial, parallel_in.read())
+            with open(os.path.join(fast_dir, name), "rb") as fast_in:
+                fast = fast_in.read()
+            self.assertEqual(lz4.frame.decompress(serial), lz4.frame.decompress(fast))
+            self.assertLess(len(serial), len(fast))
+
+    def test_rdvxm_to_json_jobs(self):
+        rdvxm_dir = self.out_dir("rdvxm")
+        serial_dir = self.out_dir("serial")
+        parallel_dir = self.out_dir("parallel")
+        self.assertTrue(conversions.rdvxz_to_rdvxm(conversions.iter_paths([self.in_dir], ".rdvxz"), rdvxm_dir))
+        self.assertTrue(conversions.rdvxm_to_json(conversions.iter_paths([rdvxm_dir], ".rdvxm"), serial_dir))
+        self.assertTrue(
+            conversions.rdvxm_to_json(conversions.iter_paths([rdvxm_dir], ".rdvxm"), parallel_dir, jobs=2)
+        )
+        names = sorted(os.listdir(serial_dir))
+        self.assertEqual(len(self.rdvxz_names) - 1, len(names))
+        self.assertListEqual(names, sorted(os.listdir(parallel_dir)))
+        for name in names:
+            with open(os.path.join(serial_dir, name)) as serial_in:
+                with open(os.path.join(parallel_dir, name)) as parallel_in:
+                    self.assertEqual(serial_in.read(), parallel_in.read())
+        self.assertTrue(conversions.validate_rdvxm(conversions.iter_paths([rdvxm_dir], ".rdvxm"), jobs=2))
@@ -1,5 +1,7 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import os
-from typing import Optional, Callable, TypeVar, Union
+import threading
+from typing import Optional, Callable, TypeVar, Union, Dict, List, Tuple
 
 from redvox.cloud.client import CloudClient
 
@@ -52,3 +54,79 @@ def client_from_credentials() -> CloudClient:
 def cloud_env_template() -> str:
     return f"{CloudEnvKeys.USERNAME}= {CloudEnvKeys.PASSWORD}= {CloudEnvKeys.SECRET}= {CloudEnvKeys.PROTOCOL}= " \
            f"{CloudEnvKeys.HOST}= {CloudEnvKeys.PORT}="
+
+
+class LocalFileServer:
+    """
+    A local HTTP stand-in for the RedVox data bucket.  Files are served from memory, honor Range requests, and can be
+    made to fail a given number of times or to drop the connection part of the way through.
+    """
+
+    def __init__(self, files: Dict[str, bytes]):
+        self.files: Dict[str, bytes] = files
+        # key -> number of requests that fail with a 503 before the file is served
+        self.failures: Dict[str, int] = {}
+        # key -> number of bytes sent before the connection is dropped on the first request
+        self.truncate: Dict[str, int] = {}
+        self.requests: List[Tuple[str, Optional[str]]] = []
+        self._lock: threading.Lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                path, _, _ = self.path.partition("?")
+                key: str = path.replace("/rdvxdata/", "", 1)
+                range_header: Optional[str] = self.headers.get("Range")
+                with server._lock:
+                    server.requests.append((key, range_header))
+                    failures: int = server.failures.get(key, 0)
+                    if failures > 0:
+                        server.failures[key] = failures - 1
+                    truncate_at: Optional[int] = server.truncate.pop(key, None)
+                if key not in server.files:
+                    self.send_error(404)
+                    return
+                if failures > 0:
+                    self.send_error(503)
+                    return
+                data: bytes = server.files[key]
+                start: int = 0
+                if range_header is not None:
+                    start = int(range_header.replace("bytes=", "").rstrip("-"))
+                    if start >= len(data):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(data) - start))
+                self.end_headers()
+                if truncate_at is not None:
+                    self.wfile.write(data[start:truncate_at])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(data[start:])
+
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, key: str) -> str:
+        """
+        :param key: key of a file on the server
+        :return: a URL to the file shaped like a signed S3 URL
+        """
+        return f"http://127.0.0.1:{self._server.server_port}/rdvxdata/{key}?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+
+    def __enter__(self) -> "LocalFileServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
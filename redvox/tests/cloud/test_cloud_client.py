@@ -0,0 +1,85 @@
+"""
+tests for the concurrent chunked requests of the cloud client
+"""
+import threading
+import time
+import unittest
+from unittest import mock
+
+import redvox.cloud.data_api as data_api
+import redvox.cloud.errors as cloud_errors
+import redvox.cloud.metadata_api as metadata_api
+from redvox.cloud.client import CloudClient, cloud_client
+from redvox.cloud.config import RedVoxConfig
+from redvox.cloud.query_timing_correction import CorrectedQuery
+
+
+class SlowEndpoint:
+    """
+    stands in for an API function; answers slower for earlier chunks so responses complete out of order
+    """
+
+    def __init__(self, make_resp):
+        self.make_resp = make_resp
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, redvox_config, req, session=None, timeout=None, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(max(0.0, 0.05 - req.start_ts_s * 0.001))
+        with self.lock:
+            self.in_flight -= 1
+        return self.make_resp(req)
+
+
+class CloudClientConcurrencyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = RedVoxConfig.from_auth_token("token", host="127.0.0.1")
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(cloud_errors.CloudApiError):
+            CloudClient(self.config, max_concurrent_requests=0)
+
+    def test_metadata_m_stream_order(self):
+        endpoint = SlowEndpoint(lambda req: metadata_api.MetadataRespM([req.start_ts_s]))
+        with mock.patch.object(metadata_api, "request_metadata_m", endpoint):
+            with cloud_client(self.config, max_concurrent_requests=4) as client:
+                resps = list(client.request_metadata_m_stream(0, 40, ["1"], ["station_id"], chunk_by_seconds=1))
+                merged = client.request_metadata_m(0, 40, ["1"], ["station_id"], chunk_by_seconds=1)
+        self.assertListEqual(list(range(40)), [r.db_packets[0] for r in resps])
+        self.assertListEqual(list(range(40)), merged.db_packets)
+        self.assertEqual(4, endpoint.max_in_flight)
+
+    def test_serial_requests(self):
+        endpoint = SlowEndpoint(lambda req: metadata_api.MetadataRespM([req.start_ts_s]))
+        with mock.patch.object(metadata_api, "request_metadata_m", endpoint):
+            with cloud_client(self.config, max_concurrent_requests=1) as client:
+                resps = list(client.request_metadata_m_stream(0, 10, ["1"], ["station_id"], chunk_by_seconds=1))
+        self.assertListEqual(list(range(10)), [r.db_packets[0] for r in resps])
+        self.assertEqual(1, endpoint.max_in_flight)
+
+    def test_geo_metadata_stream_order(self):
+        endpoint = SlowEndpoint(lambda req: req.start_ts_s)
+        with mock.patch.object(metadata_api, "request_geo_metadata", endpoint):
+            with cloud_client(self.config, max_concurrent_requests=3) as client:
+                resps = list(
+                    client.request_geo_metadata_stream(
+                        0, 20, None, metadata_api.BoundingCircle(metadata_api.LatLng(0.0, 0.0), 1.0), ["station_id"], chunk_by_seconds=1
+                    )
+                )
+        self.assertListEqual(list(range(20)), resps)
+        self.assertEqual(3, endpoint.max_in_flight)
+
+    def test_data_range_corrected_queries(self):
+        queries = [CorrectedQuery(str(i), i, i + 10, i + 0.4, i + 10.4) for i in range(12)]
+        endpoint = SlowEndpoint(lambda req: data_api.DataRangeResp([req.redvox_ids[0]]))
+        with mock.patch.object(data_api, "request_range_data", endpoint), mock.patch(
+            "redvox.cloud.client.do_correct_query_timing", return_value=queries
+        ):
+            with cloud_client(self.config, max_concurrent_requests=4) as client:
+                resp = client.request_data_range(0, 10, [q.station_id for q in queries], out_queue=mock.Mock())
+        self.assertListEqual([q.station_id for q in queries], resp.signed_urls)
+        self.assertEqual(4, endpoint.max_in_flight)
@@ -0,0 +1,143 @@
+"""
+tests for downloading files from a local stand-in for the data bucket
+"""
+import os
+import tempfile
+import unittest
+from queue import Queue
+
+from redvox.cloud import data_client, data_io
+from redvox.tests.cloud.cloud_test_utils import LocalFileServer
+
+KEY_1000: str = "0000000001_1609459200000000.rdvxm"
+KEY_900: str = "0000000002_1609459200000.rdvxz"
+
+
+class StructuredDataKeyTests(unittest.TestCase):
+    def test_structured_data_key(self):
+        self.assertEqual(f"api1000/2021/01/01/00/{KEY_1000}", data_io.structured_data_key(KEY_1000))
+        self.assertEqual(f"api900/2021/01/01/{KEY_900}", data_io.structured_data_key(KEY_900))
+        self.assertEqual(
+            f"api1000/2021/01/01/00/{KEY_1000}", data_io.structured_data_key(f"api1000/2021/01/01/00/{KEY_1000}")
+        )
+        self.assertEqual("report/data.zip", data_io.structured_data_key("report/data.zip"))
+
+    def test_backoff(self):
+        self.assertListEqual([0.5, 1.0, 2.0], [data_io.backoff_delay_s(a) for a in range(1, 4)])
+        self.assertEqual(data_io.MAX_BACKOFF_S, data_io.backoff_delay_s(100))
+
+
+class DownloadFilesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.files = {f"0000000001_{1609459200000000 + i * 60_000_000}.rdvxm": os.urandom(1000 + i) for i in range(20)}
+
+    def tearDown(self) -> None:
+        self.out_dir.cleanup()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.out_dir.name, data_io.structured_data_key(key))
+
+    def test_download_files(self):
+        with LocalFileServer(self.files) as server:
+            out_queue = Queue()
+            results = data_client.download_files(
+                [server.url(k) for k in self.files], self.out_dir.name, 2, num_workers=4, out_queue=out_queue
+            )
+        self.assertEqual(set(self.files), {r.data_key for r in results})
+        for key, data in self.files.items():
+            with open(self._path(key), "rb") as f:
+                self.assertEqual(data, f.read())
+        messages = []
+        while not out_queue.empty():
+            messages.append(out_queue.get())
+        self.assertEqual(len(self.files) + 1, len(messages))
+        self.assertEqual("done", messages[-1])
+        self.assertFalse(
+            [f for _, _, fs in os.walk(self.out_dir.name) for f in fs if f.endswith(data_io.PARTIAL_SUFFIX)]
+        )
+
+    def test_skip_existing(self):
+        key = next(iter(self.files))
+        os.makedirs(os.path.dirname(self._path(key)))
+        with open(self._path(key), "wb") as f:
+            f.write(b"existing")
+        with LocalFileServer(self.files) as server:
+            results = data_client.download_files([server.url(key)], self.out_dir.name, 0, out_queue=Queue())
+        self.assertTrue(results[0].skipped)
+        self.assertFalse(results[0].failed)
+        self.assertEqual(key, results[0].data_key)
+        self.assertEqual([], server.requests)
+
+    def test_retry_server_errors(self):
+        key = next(iter(self.files))
+        with LocalFileServer(self.files) as server:
+            server.failures[key] = 2
+            results = data_client.download_files(
+                [server.url(key)], self.out_dir.name, 2, out_queue=Queue(), backoff_s=0.01
+            )
+        self.assertEqual(3, len(server.requests))
+        self.assertEqual(key, results[0].data_key)
+        with open(self._path(key), "rb") as f:
+            self.assertEqual(self.files[key], f.read())
+
+    def test_retries_exhausted(self):
+        key = next(iter(self.files))
+        with LocalFileServer(self.files) as server:
+            server.failures[key] = 5
+            results = data_client.download_files(
+                [server.url(key)], self.out_dir.name, 1, out_queue=Queue(), backoff_s=0.01
+            )
+            self.assertTrue(results[0].failed)
+            self.assertEqual(key, results[0].data_key)
+            self.assertFalse(os.path.exists(self._path(key)))
+            # a missing file is not retried
+            out_queue = Queue()
+            missing = data_client.download_files(
+                [server.url("missing.rdvxm")], self.out_dir.name, 3, out_queue=out_queue, backoff_s=0.01
+            )
+        self.assertTrue(missing[0].failed)
+        self.assertEqual("missing.rdvxm", missing[0].data_key)
+        self.assertIn("FAILED", out_queue.get())
+        self.assertEqual(1, len([r for r in server.requests if r[0] == "missing.rdvxm"]))
+
+    def test_get_file_not_retried(self):
+        with LocalFileServer(self.files) as server:
+            self.assertIsNone(data_io.get_file(server.url("missing.rdvxm"), 3, backoff_s=10.0))
+            key = next(iter(self.files))
+            server.failures[key] = 1
+            self.assertEqual(self.files[key], data_io.get_file(server.url(key), 1, backoff_s=0.01))
+        self.assertEqual(1, len([r for r in server.requests if r[0] == "missing.rdvxm"]))
+        self.assertEqual(2, len([r for r in server.requests if r[0] == key]))
+
+    def test_num_processes_alias(self):
+        with LocalFileServer(self.files) as server:
+            with self.assertWarns(DeprecationWarning):
+                results = data_client.download_files(
+                    [server.url(k) for k in self.files], self.out_dir.name, 0, out_queue=Queue(), num_processes=2
+                )
+        self.assertEqual(set(self.files), {r.data_key for r in results})
+        self.assertFalse(any(r.failed for r in results))
+
+    def test_resume_partial_file(self):
+        key = next(iter(self.files))
+        with LocalFileServer(self.files) as server:
+            server.truncate[key] = 300
+            results = data_client.download_files(
+                [server.url(key)], self.out_dir.name, 2, out_queue=Queue(), backoff_s=0.01
+            )
+        self.assertListEqual([(key, None), (key, "bytes=300-")], server.requests)
+        self.assertEqual(len(self.files[key]), results[0].resp_len)
+        with open(self._path(key), "rb") as f:
+            self.assertEqual(self.files[key], f.read())
+
+    def test_resume_left_over_partial_file(self):
+        key = next(iter(self.files))
+        os.makedirs(os.path.dirname(self._path(key)))
+        with open(self._path(key) + data_io.PARTIAL_SUFFIX, "wb") as f:
+            f.write(self.files[key][:500])
+        with LocalFileServer(self.files) as server:
+            data_client.download_files([server.url(key)], self.out_dir.name, 0, out_queue=Queue())
+        self.assertListEqual([(key, "bytes=500-")], server.requests)
+        with open(self._path(key), "rb") as f:
+            self.assertEqual(self.files[key], f.read())
@@ -0,0 +1,131 @@
+"""
+tests for decoding subscription messages
+"""
+import glob
+import os
+import threading
+import time
+import unittest
+
+import pyarrow as pa
+
+import redvox.tests as tests
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
+from redvox.cloud import subscription as sub
+from redvox.common.metadata_scan import METADATA_SCHEMA
+
+
+def with_header(file_path: str, msg: bytes) -> bytes:
+    header: bytes = sub.PubHeader(file_path).to_json().encode("utf-8")
+    return b"\xc0\xff\xee" + len(header).to_bytes(2, "little", signed=False) + header + msg
+
+
+class SubscriptionPipelineTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.paths = sorted(glob.glob(os.path.join(tests.TEST_DATA_DIR, "*.rdvxm")))
+        cls.msgs = []
+        for path in cls.paths:
+            with open(path, "rb") as f:
+                cls.msgs.append(f.read())
+
+    def test_decode_in_order(self):
+        pipeline = sub.SubscriptionPipeline(sub.decode_proto, num_decode_workers=4)
+        for _ in range(5):
+            for path, msg in zip(self.paths, self.msgs):
+                pipeline.receive(with_header(path, msg))
+        pipeline.close()
+        decoded = list(pipeline)
+        self.assertEqual(5 * len(self.msgs), len(decoded))
+        for i, pub_msg in enumerate(decoded):
+            expected = RedvoxPacketM()
+            expected.ParseFromString(sub.lz4.frame.decompress(self.msgs[i % len(self.msgs)]))
+            self.assertEqual(self.paths[i % len(self.paths)], pub_msg.header.file_path)
+            self.assertEqual(
+                expected.timing_information.packet_start_mach_timestamp,
+                pub_msg.msg.timing_information.packet_start_mach_timestamp,
+            )
+        self.assertEqual(len(decoded), pipeline.stats.received)
+        self.assertEqual(len(decoded), pipeline.stats.decoded)
+        self.assertEqual(len(decoded), pipeline.stats.delivered)
+        self.assertEqual(
+            5 * sum(len(with_header(p, m)) for p, m in zip(self.paths, self.msgs)), pipeline.stats.received_bytes
+        )
+        self.assertEqual(0, pipeline.stats.dropped)
+        self.assertLessEqual(pipeline.stats.mean_lag_s(), pipeline.stats.max_lag_s)
+
+    def test_decode_packet_and_batch(self):
+        pipeline = sub.SubscriptionPipeline(sub.decode_packet)
+        pipeline.receive(self.msgs[0])
+        pipeline.close()
+        pub_msg = next(iter(pipeline))
+        self.assertIsNone(pub_msg.header)
+        self.assertIsInstance(pub_msg.msg, WrappedRedvoxPacketM)
+
+        pipeline = sub.SubscriptionPipeline(sub.decode_metadata_batch)
+        for msg in self.msgs:
+            pipeline.receive(msg)
+        pipeline.close()
+        table = pa.Table.from_batches([m.msg for m in pipeline])
+        self.assertEqual(METADATA_SCHEMA, table.schema)
+        self.assertEqual(len(self.msgs), table.num_rows)
+
+    def test_decode_errors(self):
+        pipeline = sub.SubscriptionPipeline(sub.decode_proto)
+        pipeline.receive(self.msgs[0])
+        pipeline.receive(b"not a packet")
+        pipeline.receive(self.msgs[1])
+        pipeline.close()
+        self.assertEqual(2, len(list(pipeline)))
+        self.assertEqual(1, pipeline.stats.decode_errors)
+
+        errors = []
+        pipeline = sub.SubscriptionPipeline(sub.decode_proto, on_error=lambda msg, ex: errors.append((msg, ex)))
+        pipeline.receive(b"not a packet")
+        pipeline.receive(self.msgs[0])
+        pipeline.receive(b"nor this")
+        pipeline.close()
+        self.assertEqual(1, len(list(pipeline)))
+        self.assertListEqual([b"not a packet", b"nor this"], [msg for msg, _ in errors])
+        self.assertTrue(all(isinstance(ex, Exception) for _, ex in errors))
+        self.assertEqual(2, pipeline.stats.decode_errors)
+
+    def test_subscribe_is_lazy(self):
+        num_threads = threading.active_count()
+        subscriptions = [sub.subscribe_proto("ws://localhost:1", None), sub.subscribe_packet("ws://localhost:1", None)]
+        self.assertEqual(num_threads, threading.active_count())
+        for subscription in subscriptions:
+            subscription.close()
+
+    def test_drop_when_full(self):
+        pipeline = sub.SubscriptionPipeline(
+            sub.decode_proto, max_queue_size=4, num_decode_workers=1, drop_when_full=True
+        )
+        for _ in range(100):
+            pipeline.receive(self.msgs[0])
+        pipeline.close()
+        delivered = len(list(pipeline))
+        self.assertEqual(100, pipeline.stats.received)
+        self.assertEqual(100, delivered + pipeline.stats.dropped)
+        self.assertGreater(pipeline.stats.dropped, 0)
+        self.assertLessEqual(pipeline.stats.max_queue_depth, 4)
+
+    def test_backpressure(self):
+        pipeline = sub.SubscriptionPipeline(sub.decode_proto, max_queue_size=2, num_decode_workers=1)
+        done = threading.Event()
+
+        def produce():
+            for _ in range(20):
+                pipeline.receive(self.msgs[0])
+            pipeline.close()
+            done.set()
+
+        threading.Thread(target=produce, daemon=True).start()
+        time.sleep(0.2)
+        # the receiver blocks once the queue and the decoded buffer are full
+        self.assertFalse(done.is_set())
+        self.assertLess(pipeline.stats.received, 20)
+        self.assertEqual(20, len(list(pipeline)))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(0, pipeline.stats.dropped)
@@ -2,13 +2,18 @@
 tests for api X reader
 """
 from datetime import timedelta
+from types import SimpleNamespace
 import unittest
+from unittest import mock
 import os
 
+import numpy as np
+
 import redvox.tests as tests
 from redvox.common import date_time_utils as dtu
 from redvox.common import api_reader
 from redvox.common.io import ReadFilter
+from redvox.common.station import Station
 
 
 class ApiReaderTest(unittest.TestCase):
@@ -173,3 +178,22 @@ class ApiReaderTest(unittest.TestCase):
         for i in reader.index_summary.station_summaries.values():
             for s in i.values():
                 self.assertTrue(s.single_packet_decompressed_size_bytes > 0)
+
+    def test_get_stations_larger_than_memory(self):
+        reader = api_reader.ApiReader(tests.TEST_DATA_DIR)
+        max_file_size = max([fe.decompressed_file_size_bytes for fi in reader.files_index for fe in fi.entries])
+        # enough memory for a single file, but not for all of them
+        memory = SimpleNamespace(available=2 * max_file_size / api_reader.PERCENT_FREE_MEM_USE)
+        with mock.patch.object(api_reader.psutil, "virtual_memory", return_value=memory):
+            reader = api_reader.ApiReader(tests.TEST_DATA_DIR)
+        stations = reader.get_stations()
+        self.assertEqual(len(reader.files_index), len(stations))
+        for findex, station in zip(reader.files_index, stations):
+            expected = Station.create_from_packets(findex.read_contents(convert_api_900=False))
+            self.assertEqual(expected.id(), station.id())
+            self.assertEqual(len(expected.packet_metadata()), len(station.packet_metadata()))
+            self.assertEqual(expected.get_sensors(), station.get_sensors())
+            np.testing.assert_array_equal(
+                expected.audio_sensor().get_data_channel("microphone"),
+                station.audio_sensor().get_data_channel("microphone"),
+            )
@@ -1,11 +1,20 @@
 """
 tests for data window objects
 """
+import os
+import tempfile
 import unittest
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import redvox.settings as settings
 import redvox.tests as tests
 import redvox.common.date_time_utils as dt
 from redvox.common import data_window as dw
+from redvox.common import data_window_io as dw_io
+from redvox.common.sensor_data import SensorData, SensorType
 
 
 class EventOriginTest(unittest.TestCase):
@@ -110,6 +119,135 @@ class DataWindowTest(unittest.TestCase):
         self.assertEqual("1637650010", first_station.id())
 
 
+class DataWindowParallelTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def test_parallel_matches_serial(self):
+        settings.set_parallelism_enabled(False)
+        serial = dw.DataWindow(config=dw.DataWindowConfig(input_dir=tests.TEST_DATA_DIR, structured_layout=False))
+        settings.set_parallelism_enabled(True)
+        parallel = dw.DataWindow(config=dw.DataWindowConfig(input_dir=tests.TEST_DATA_DIR, structured_layout=False))
+        self.assertEqual(serial.station_ids(), parallel.station_ids())
+        for s_stn, p_stn in zip(serial.stations(), parallel.stations()):
+            self.assertEqual(s_stn.first_data_timestamp(), p_stn.first_data_timestamp())
+            self.assertEqual(s_stn.last_data_timestamp(), p_stn.last_data_timestamp())
+            self.assertEqual(len(s_stn.packet_metadata()), len(p_stn.packet_metadata()))
+            for s_sensor, p_sensor in zip(s_stn.data(), p_stn.data()):
+                pd.testing.assert_frame_equal(s_sensor.data_df(), p_sensor.data_df())
+
+
+class DataWindowArrowTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # DataWindows change the working directory to their output directory
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.window = dw.DataWindow(
+            "arrow_test",
+            config=dw.DataWindowConfig(input_dir=os.path.abspath(tests.TEST_DATA_DIR), structured_layout=False),
+            output_dir=self.temp_dir.name,
+            out_type="ARROW",
+        )
+        self.json_path = os.path.join(self.temp_dir.name, "arrow_test.json")
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_str_to_type(self):
+        self.assertEqual(dw_io.DataWindowOutputType.str_to_type("arrow"), dw_io.DataWindowOutputType.ARROW)
+        self.assertEqual(self.window.out_type(), "arrow")
+
+    def test_round_trip(self):
+        self.window.save()
+        loaded = dw.DataWindow.load(self.json_path)
+        self.assertEqual(self.window.station_ids(), loaded.station_ids())
+        for stn, l_stn in zip(self.window.stations(), loaded.stations()):
+            self.assertEqual(stn.first_data_timestamp(), l_stn.first_data_timestamp())
+            self.assertEqual(stn.last_data_timestamp(), l_stn.last_data_timestamp())
+            self.assertEqual(len(stn.packet_metadata()), len(l_stn.packet_metadata()))
+            self.assertEqual([s.type() for s in stn.data()], [s.type() for s in l_stn.data()])
+            for sensor, l_sensor in zip(stn.data(), l_stn.data()):
+                self.assertEqual("arrow", l_sensor.file_format())
+                np.testing.assert_equal(sensor.sample_rate_hz(), l_sensor.sample_rate_hz())
+                pd.testing.assert_frame_equal(sensor.data_df(), l_sensor.data_df())
+
+    def test_lazy_memory_mapped_load(self):
+        self.window.save()
+        allocated = pa.total_allocated_bytes()
+        loaded = dw.DataWindow.load(self.json_path)
+        audio = loaded.get_station("0000000001")[0].audio_sensor()
+        self.assertIsNone(audio._data)
+        self.assertEqual(720000, audio.num_samples())
+        self.assertLess(pa.total_allocated_bytes() - allocated, 1_000_000)
+
+    def test_read_one_sensor(self):
+        self.window.save()
+        sensor = self.window.get_station("1637650010")[0].accelerometer_sensor()
+        loaded = SensorData.from_json_file(sensor.save_dir())
+        self.assertEqual(SensorType.ACCELEROMETER, loaded.type())
+        self.assertEqual(643, loaded.num_samples())
+        pd.testing.assert_frame_equal(sensor.data_df(), loaded.data_df())
+
+    def test_save_again(self):
+        self.window.save()
+        sensor = self.window.get_station("1637650010")[0].accelerometer_sensor()
+        self.assertEqual("arrow", sensor.file_format())
+        expected = sensor.data_df()
+        # the memory-mapped Arrow files are read back before they are replaced
+        self.window.save()
+        pd.testing.assert_frame_equal(expected, sensor.data_df())
+        loaded = dw.DataWindow.load(self.json_path)
+        pd.testing.assert_frame_equal(expected, loaded.get_station("1637650010")[0].accelerometer_sensor().data_df())
+
+    def test_arrow_to_parquet(self):
+        self.window.save()
+        sensor = SensorData.from_json_file(self.window.get_station("1637650010")[0].accelerometer_sensor().save_dir())
+        expected = sensor.data_df()
+        table = sensor.pyarrow_table()
+        allocated = pa.total_allocated_bytes()
+        in_memory = sensor._table_in_memory(table)
+        self.assertGreaterEqual(pa.total_allocated_bytes() - allocated, table.nbytes)
+        self.assertTrue(in_memory.equals(table))
+        sensor.set_file_format("parquet")
+        self.assertListEqual(
+            [f"{sensor.file_name()}.parquet"], [f for f in os.listdir(sensor.save_dir()) if not f.endswith(".json")]
+        )
+        pd.testing.assert_frame_equal(expected, sensor.data_df())
+
+
+class WindowSensorTableTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = pa.Table.from_pydict(
+            {"timestamps": [10.0, 20.0, 30.0, 40.0, 50.0], "pressure": [1.0, 2.0, 3.0, 4.0, 5.0]}
+        )
+
+    def test_truncate_and_pad(self):
+        table, error = dw.window_sensor_table(self.table, SensorType.PRESSURE, np.nan, "0", 15.0, 45.0)
+        self.assertIsNone(error)
+        np.testing.assert_array_equal(table["timestamps"].to_numpy(), [15.0, 20.0, 30.0, 40.0, 45.0])
+        np.testing.assert_array_equal(table["pressure"].to_numpy(), [2.0, 2.0, 3.0, 4.0, 4.0])
+
+    def test_all_truncated(self):
+        table, error = dw.window_sensor_table(self.table, SensorType.PRESSURE, np.nan, "0", 60.0, 70.0)
+        self.assertIsNotNone(error)
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table["timestamps"][0].as_py(), 60.0)
+
+    def test_audio_truncated(self):
+        table, error = dw.window_sensor_table(self.table, SensorType.AUDIO, 0.00001, "0", 60.0, 70.0)
+        self.assertIsNotNone(error)
+        self.assertEqual(table.num_rows, 0)
+
+    def test_no_data(self):
+        table, error = dw.window_sensor_table(self.table.slice(0, 0), SensorType.PRESSURE, np.nan, "0", 0.0, 1.0)
+        self.assertIsNone(table)
+        self.assertIsNotNone(error)
+
+
 # doesn't work with test module, but works on its own.
 # class DataWindowConfigFileTest(unittest.TestCase):
 #     def test_load(self):
@@ -2,9 +2,13 @@
 Redvox file helper test module
 """
 
+import multiprocessing
 import unittest
 
+import redvox.settings as settings
+import redvox.tests as tests
 from redvox.common import file_statistics
+from redvox.common import io
 
 
 class RdvxFileHelperTests(unittest.TestCase):
@@ -26,3 +30,39 @@ class RdvxFileHelperTests(unittest.TestCase):
         self.assertEqual(40.96, file_statistics.get_duration_seconds_from_sample_rate(800))
         self.assertEqual(32.768, file_statistics.get_duration_seconds_from_sample_rate(8000))
         self.assertRaises(ValueError, file_statistics.get_duration_seconds_from_sample_rate, 100)
+
+
+class ExtractStatsParallelTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+        self.index = io.index_unstructured(tests.TEST_DATA_DIR)
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def test_chunk_entries(self):
+        entries = self.index.entries
+        chunks = file_statistics._chunk_entries(entries, 3, 2 ** 40)
+        self.assertListEqual([3, 3, 1], [len(c) for c in chunks])
+        self.assertListEqual(entries, [e for c in chunks for e in c])
+        chunks = file_statistics._chunk_entries(entries, 100, 1)
+        self.assertEqual(len(entries), len(chunks))
+        self.assertListEqual([], file_statistics._chunk_entries([], 3, 1))
+
+    def test_raw_api_1000_same_as_wrapped(self):
+        for entry in self.index.entries:
+            if entry.api_version == io.ApiVersion.API_1000:
+                self.assertEqual(
+                    repr(file_statistics.StationStat.from_api_1000(entry.read())),
+                    repr(file_statistics.StationStat.from_raw_api_1000(entry.read_raw())),
+                )
+
+    def test_same_as_serial(self):
+        expected = repr(file_statistics.extract_stats_serial(self.index))
+        settings.set_parallelism_enabled(False)
+        self.assertEqual(expected, repr(file_statistics.extract_stats_parallel(self.index, max_files_per_chunk=2)))
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool(2) as pool:
+            self.assertEqual(
+                expected, repr(file_statistics.extract_stats_parallel(self.index, pool, max_files_per_chunk=2))
+            )
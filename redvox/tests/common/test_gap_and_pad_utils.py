@@ -53,6 +53,43 @@ class InterpolateGapsTest(unittest.TestCase):
         filled_df = gpu.fill_gaps(my_df, gaps, 1000.)
         self.assertEqual(len(filled_df[0]["timestamps"].to_numpy()), 15)
 
+    def test_create_many_gaps(self):
+        timestamps = np.arange(0., 100000., 1000.)
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[10:13] = keep[40:45] = keep[80:81] = False
+        my_df = pa.Table.from_pydict({"timestamps": timestamps[keep], "data": timestamps[keep] / 10.})
+        gaps = [(9000., 13000.), (39000., 45000.), (79000., 81000.)]
+        filled_df = gpu.fill_gaps(my_df, gaps, 1000.)[0]
+        np.testing.assert_array_equal(filled_df["timestamps"].to_numpy(), timestamps)
+        self.assertEqual(np.count_nonzero(np.isnan(filled_df["data"].to_numpy())), 9)
+
+    def test_fill_interpolate(self):
+        my_df = pa.Table.from_pydict({"timestamps": [1000., 5000.], "data": [10., 50.], "location_provider": [1, 2]})
+        filled_df = gpu.fill_gaps(my_df, [(1000., 5000.)], 1000., "interpolate")[0]
+        np.testing.assert_array_equal(filled_df["timestamps"].to_numpy(), [1000., 2000., 3000., 4000., 5000.])
+        np.testing.assert_array_almost_equal(filled_df["data"].to_numpy(), [10., 20., 30., 40., 50.])
+        self.assertEqual(filled_df["location_provider"].to_pylist(), [1, 1, 1, 2, 2])
+
+    def test_fill_nan_non_numeric(self):
+        my_df = pa.Table.from_pydict({"timestamps": [1000., 4000.], "location_provider": [1, 2]})
+        filled_df = gpu.fill_gaps(my_df, [(1000., 4000.)], 1000.)[0]
+        self.assertEqual(filled_df["location_provider"].to_pylist(), [1, 0, 0, 2])
+
+
+class CheckGapListTest(unittest.TestCase):
+    def test_merge_overlapping(self):
+        gaps = gpu.check_gap_list([(4000., 6000.), (1000., 8000.), (9000., 15000.), (14000., 16000.)])
+        self.assertEqual(gaps, [(1000., 8000.), (9000., 16000.)])
+
+    def test_touching_gaps_kept(self):
+        gaps = gpu.check_gap_list([(1000., 3000.), (3000., 5000.)])
+        self.assertEqual(gaps, [(1000., 3000.), (3000., 5000.)])
+
+    def test_clip_to_bounds(self):
+        gaps = gpu.check_gap_list([(0., 2000.), (3000., 4000.), (9000., 12000.)], 1000., 10000.)
+        self.assertEqual(gaps, [(1000., 2000.), (3000., 4000.), (9000., 10000.)])
+        self.assertEqual(gpu.check_gap_list([(0., 500.)], 1000., 10000.), [])
+
 
 class AudioGapFillTest(unittest.TestCase):
     @classmethod
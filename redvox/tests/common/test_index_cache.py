@@ -0,0 +1,108 @@
+import os
+import os.path
+import sqlite3
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+import redvox.common.io as io
+from redvox.common.index_cache import IndexCache, index_structured_cached, index_unstructured_cached
+from redvox.tests.common.test_io import IoTestCase, copy_api_900, copy_api_1000
+
+
+def _age_dirs(base_dir: str) -> None:
+    """
+    sets the mtime of every directory under base_dir far enough in the past to be trusted by the cache
+    """
+    for root, dirs, _ in os.walk(base_dir):
+        for d in dirs + [""]:
+            os.utime(os.path.join(root, d), (1_600_000_000, 1_600_000_000))
+
+
+class IndexCacheTests(IoTestCase):
+    def setUp(self) -> None:
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.data_dir.name, "cache.sqlite3")
+        copy_api_900(self.template_900_path, self.data_dir.name, True, "0", datetime(2020, 1, 1, 1))
+        copy_api_900(self.template_900_path, self.data_dir.name, True, "1", datetime(2020, 1, 2, 1))
+        copy_api_1000(self.template_1000_path, self.data_dir.name, True, "0", datetime(2020, 1, 1, 1))
+        copy_api_1000(self.template_1000_path, self.data_dir.name, True, "1", datetime(2020, 1, 1, 2))
+        _age_dirs(self.data_dir.name)
+
+    def tearDown(self) -> None:
+        self.data_dir.cleanup()
+
+    def test_same_as_uncached(self):
+        expected = io.index_structured(self.data_dir.name)
+        with IndexCache(self.cache_path) as cache:
+            first = cache.index_structured(self.data_dir.name)
+            second = cache.index_structured(self.data_dir.name)
+        for index in [first, second]:
+            self.assertEqual(len(expected.entries), len(index.entries))
+            for exp, ent in zip(expected.entries, index.entries):
+                self.assertEqual(exp.full_path, ent.full_path)
+                self.assertEqual(exp.station_id, ent.station_id)
+                self.assertEqual(exp.date_time, ent.date_time)
+                self.assertEqual(exp.api_version, ent.api_version)
+                self.assertEqual(exp.decompressed_file_size_bytes, ent.decompressed_file_size_bytes)
+
+    def test_unchanged_dirs_not_rescanned(self):
+        with IndexCache(self.cache_path) as cache:
+            cache.index_structured(self.data_dir.name)
+            self.assertEqual(4, cache.dirs_scanned)
+            self.assertEqual(4, cache.files_read)
+        with IndexCache(self.cache_path) as cache:
+            with mock.patch.object(io.IndexEntry, "from_path") as from_path:
+                index = cache.index_structured(self.data_dir.name)
+                from_path.assert_not_called()
+            self.assertEqual(4, len(index.entries))
+            self.assertEqual(0, cache.dirs_scanned)
+
+    def test_new_file_rescans_only_its_dir(self):
+        index_structured_cached(self.data_dir.name, cache_path=self.cache_path)
+        copy_api_1000(self.template_1000_path, self.data_dir.name, True, "2", datetime(2020, 1, 1, 2, 30))
+        with IndexCache(self.cache_path) as cache:
+            index = cache.index_structured(self.data_dir.name)
+            self.assertEqual(1, cache.dirs_scanned)
+            self.assertEqual(1, cache.files_read)
+        self.assertEqual(5, len(index.entries))
+        self.assertEqual(3, len(index.summarize().station_ids(io.ApiVersion.API_1000)))
+
+    def test_removed_file(self):
+        index_structured_cached(self.data_dir.name, cache_path=self.cache_path)
+        entry = io.index_structured(self.data_dir.name, io.ReadFilter().with_station_ids({"1"})).entries[0]
+        os.remove(entry.full_path)
+        index = index_structured_cached(self.data_dir.name, cache_path=self.cache_path)
+        self.assertEqual(3, len(index.entries))
+
+    def test_filter(self):
+        index_structured_cached(self.data_dir.name, cache_path=self.cache_path)
+        index = index_structured_cached(
+            self.data_dir.name, io.ReadFilter().with_api_versions({io.ApiVersion.API_1000}), self.cache_path
+        )
+        self.assertEqual(2, len(index.entries))
+        self.assertTrue(all(e.api_version == io.ApiVersion.API_1000 for e in index.entries))
+
+    def test_unstructured_default_cache_path(self):
+        copy_api_1000(self.template_1000_path, self.data_dir.name, False, "0", datetime(2020, 1, 1, 1))
+        copy_api_900(self.template_900_path, self.data_dir.name, False, "0", datetime(2020, 1, 1, 1))
+        index = index_unstructured_cached(self.data_dir.name)
+        self.assertEqual(2, len(index.entries))
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir.name, ".redvox_index.sqlite3")))
+        self.assertEqual(2, len(index_unstructured_cached(self.data_dir.name).entries))
+
+    def test_cache_cannot_be_opened(self):
+        cache_path = os.path.join(self.data_dir.name, "missing_dir", "cache.sqlite3")
+        with self.assertLogs("redvox.common.index_cache", "WARNING"):
+            index = index_structured_cached(self.data_dir.name, cache_path=cache_path)
+        self.assertEqual(4, len(index.entries))
+        self.assertFalse(os.path.exists(cache_path))
+
+    def test_cache_cannot_be_written(self):
+        copy_api_1000(self.template_1000_path, self.data_dir.name, False, "0", datetime(2020, 1, 1, 1))
+        with mock.patch.object(
+            IndexCache, "_rescan_dir", side_effect=sqlite3.OperationalError("attempt to write a readonly database")
+        ):
+            with self.assertLogs("redvox.common.index_cache", "WARNING"):
+                index = index_unstructured_cached(self.data_dir.name, cache_path=self.cache_path)
+        self.assertEqual(1, len(index.entries))
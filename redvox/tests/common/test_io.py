@@ -448,6 +448,68 @@ class IndexEntryTests(IoTestCase):
         self.assertIsNotNone(packet)
         self.assertEqual(1000.0, packet.api)
 
+    def test_sizes_match_full_read(self):
+        import lz4.frame
+        from redvox.api900.reader_utils import calculate_uncompressed_size
+
+        path_900: str = copy_exact(self.template_900_path, self.unstructured_900_dir, "0000000900_1609459200000.rdvxz")
+        path_1000: str = copy_exact(
+            self.template_1000_path, self.unstructured_1000_dir, "0000001000_1609459200000000.rdvxm"
+        )
+        entry_900: io.IndexEntry = io.IndexEntry.from_path(path_900)
+        entry_1000: io.IndexEntry = io.IndexEntry.from_path(path_1000)
+        with open(path_900, "rb") as fin:
+            self.assertEqual(calculate_uncompressed_size(fin.read()), entry_900.decompressed_file_size_bytes)
+        with lz4.frame.open(path_1000, "rb") as fin:
+            self.assertEqual(len(fin.read()), entry_1000.decompressed_file_size_bytes)
+        self.assertEqual(os.path.getsize(path_900), entry_900.compressed_file_size_bytes)
+        self.assertEqual(os.path.getsize(path_1000), entry_1000.compressed_file_size_bytes)
+
+    def test_from_paths(self):
+        paths = [
+            copy_exact(self.template_900_path, self.unstructured_900_dir, "0000000900_1609459200000.rdvxz"),
+            "/foo/0_0.rdvxm",
+            copy_exact(self.template_1000_path, self.unstructured_1000_dir, "0000001000_1609459200000000.rdvxm"),
+        ]
+        entries = io.IndexEntry.from_paths(paths)
+        self.assertEqual(3, len(entries))
+        self.assertEqual(io.ApiVersion.API_900, entries[0].api_version)
+        self.assertIsNone(entries[1])
+        self.assertEqual(io.ApiVersion.API_1000, entries[2].api_version)
+        self.assertEqual(io.IndexEntry.from_path(paths[2]).decompressed_file_size_bytes,
+                         entries[2].decompressed_file_size_bytes)
+
+
+class FileHeaderTests(IoTestCase):
+    def test_from_path_900(self):
+        header: io.FileHeader = io.FileHeader.from_path(self.template_900_path)
+        self.assertEqual(io.ApiVersion.API_900, header.api_version)
+        self.assertEqual(os.path.getsize(self.template_900_path), header.compressed_file_size_bytes)
+        self.assertTrue(header.decompressed_file_size_bytes > 0)
+
+    def test_from_path_1000(self):
+        header: io.FileHeader = io.FileHeader.from_path(self.template_1000_path)
+        self.assertEqual(io.ApiVersion.API_1000, header.api_version)
+        self.assertEqual(os.path.getsize(self.template_1000_path), header.compressed_file_size_bytes)
+        self.assertTrue(header.decompressed_file_size_bytes > 0)
+
+    def test_from_path_dne(self):
+        header: io.FileHeader = io.FileHeader.from_path("/foo/0_0.rdvxm")
+        self.assertEqual(io.ApiVersion.UNKNOWN, header.api_version)
+        self.assertEqual(0, header.decompressed_file_size_bytes)
+
+    def test_truncated(self):
+        path: str = copy_exact(self.template_1000_path, self.unstructured_1000_dir, "truncated.rdvxm")
+        with open(path, "r+b") as fout:
+            fout.truncate(6)
+        header: io.FileHeader = io.FileHeader.from_path(path)
+        self.assertEqual(io.ApiVersion.API_1000, header.api_version)
+        self.assertEqual(0, header.decompressed_file_size_bytes)
+
+    def test_read_file_headers(self):
+        headers = list(io.read_file_headers([self.template_900_path, self.template_1000_path]))
+        self.assertEqual([io.ApiVersion.API_900, io.ApiVersion.API_1000], [h.api_version for h in headers])
+
 
 class IndexTests(IoTestCase):
     def test_empty_index(self):
@@ -570,6 +632,24 @@ class IndexTests(IoTestCase):
 
         self.assertEqual(8, len(index.entries))
 
+    def test_stream_raw_prefetch(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            for i in range(12):
+                packet: WrappedRedvoxPacketM = WrappedRedvoxPacketM.new()
+                packet.set_api(1000.0)
+                packet.get_station_information().set_id(f"{i:010}")
+                packet.write_compressed_to_file(data_dir, f"{i:010}_1609459200000000.rdvxm")
+            index: io.Index = io.index_unstructured(data_dir)
+            expected = [packet.station_information.id for packet in index.stream_raw()]
+            self.assertEqual(12, len(set(expected)))
+            for prefetch, workers in [(1, 1), (3, 2), (16, 4)]:
+                streamed = [packet.station_information.id for packet in index.stream_raw(prefetch=prefetch,
+                                                                                          workers=workers)]
+                self.assertListEqual(expected, streamed)
+            self.assertListEqual(
+                expected, [packet.station_information.id for packet in index.stream_contents(prefetch=4, workers=2)]
+            )
+
     def test_read_all_raw(self):
         from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
 
@@ -1072,3 +1152,84 @@ class FileSystemWriterTests(TestCase):
         self.assertEqual("mem.test", self.mem_fsw.full_name())
         self.assertEqual("temp.test", self.temp_fsw.full_name())
         self.assertEqual("disk.test", self.disk_fsw.full_name())
+
+
+class SortUnstructuredTests(IoTestCase):
+    def setUp(self) -> None:
+        self.sort_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.sort_dir.name, "in")
+        self.output_dir = os.path.join(self.sort_dir.name, "out")
+        os.makedirs(self.output_dir)
+        self.expected = []
+        for i in range(3):
+            path = copy_api_900(self.template_900_path, self.input_dir, False, "900", datetime(2021, 1, 1 + i, 1))
+            self.expected.append(
+                (path, os.path.join(self.output_dir, "api900", "2021", "01", f"{1 + i:02}", os.path.basename(path)))
+            )
+            path = copy_api_1000(self.template_1000_path, self.input_dir, False, "1000", datetime(2021, 1, 1, i))
+            self.expected.append(
+                (path, os.path.join(self.output_dir, "api1000", "2021", "01", "01", f"{i:02}", os.path.basename(path)))
+            )
+        copy_exact(self.template_1000_path, self.input_dir, "not_redvox.txt")
+
+    def tearDown(self) -> None:
+        self.sort_dir.cleanup()
+
+    def sort(self, **kwargs) -> io.SortSummary:
+        summaries = []
+        self.assertTrue(
+            io.sort_unstructured_redvox_data(self.input_dir, self.output_dir, summary_out=summaries, **kwargs)
+        )
+        self.assertEqual(1, len(summaries))
+        self.assertEqual(len(self.expected), summaries[0].num_files)
+        self.assertEqual(sum(os.path.getsize(dst) for _, dst in self.expected), summaries[0].num_bytes)
+        self.assertEqual(6, summaries[0].num_dirs)
+        self.assertEqual(len(self.expected), len(io.index_structured(self.output_dir).entries))
+        return summaries[0]
+
+    def test_copy(self):
+        summary = self.sort(workers=4)
+        self.assertEqual(0, summary.num_linked)
+        for src, dst in self.expected:
+            self.assertTrue(os.path.isfile(src))
+            self.assertTrue(os.path.isfile(dst))
+            self.assertNotEqual(os.stat(src).st_ino, os.stat(dst).st_ino)
+
+    def test_copy_serial(self):
+        self.sort(workers=1)
+        for src, dst in self.expected:
+            self.assertTrue(os.path.isfile(src))
+            self.assertTrue(os.path.isfile(dst))
+
+    def test_link(self):
+        summary = self.sort(link=True)
+        self.assertEqual(len(self.expected), summary.num_linked)
+        for src, dst in self.expected:
+            self.assertEqual(os.stat(src).st_ino, os.stat(dst).st_ino)
+        # sorting again leaves the existing links in place
+        self.sort(link=True)
+        for src, dst in self.expected:
+            self.assertEqual(os.stat(src).st_ino, os.stat(dst).st_ino)
+
+    def test_move_linked(self):
+        self.sort(link=True)
+        self.sort(copy=False)
+        for src, dst in self.expected:
+            self.assertFalse(os.path.exists(src))
+            self.assertTrue(os.path.isfile(dst))
+
+    def test_move(self):
+        summary = self.sort(copy=False)
+        self.assertEqual(len(self.expected), summary.num_linked)
+        for src, dst in self.expected:
+            self.assertFalse(os.path.exists(src))
+            self.assertTrue(os.path.isfile(dst))
+        self.assertTrue(os.path.isfile(os.path.join(self.input_dir, "not_redvox.txt")))
+
+    def test_no_data(self):
+        self.assertFalse(
+            io.sort_unstructured_redvox_data(
+                self.input_dir, self.output_dir, io.ReadFilter().with_station_ids({"no_station"})
+            )
+        )
+        self.assertListEqual([], os.listdir(self.output_dir))
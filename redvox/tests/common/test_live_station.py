@@ -0,0 +1,130 @@
+"""
+tests for building stations from live packet streams
+"""
+import unittest
+from unittest import mock
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import redvox.tests as tests
+from redvox.common import io
+from redvox.common import live_station as ls
+from redvox.common.live_station import LiveStation
+from redvox.common.station import Station
+from redvox.common.timesync import TimeSync
+
+
+class LiveStationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        index = io.index_unstructured(tests.TEST_DATA_DIR)
+        cls.packets = index.get_index_for_station_id("0000000001").read_contents()
+        cls.other_packets = index.get_index_for_station_id("1637680001").read_contents()
+
+    def assert_same_station(self, expected: Station, live: Station):
+        self.assertListEqual(expected.get_station_sensor_types(), live.get_station_sensor_types())
+        for exp_sensor, live_sensor in zip(expected.data(), live.data()):
+            self.assertTrue(exp_sensor.data_df().equals(live_sensor.data_df()))
+            np.testing.assert_equal(exp_sensor.sample_rate_hz(), live_sensor.sample_rate_hz())
+        self.assertListEqual(expected.gaps(), live.gaps())
+        self.assertEqual(str(expected.metadata()), str(live.metadata()))
+        self.assertEqual(str(expected.packet_metadata()), str(live.packet_metadata()))
+        self.assertEqual(expected.first_data_timestamp(), live.first_data_timestamp())
+        self.assertEqual(expected.last_data_timestamp(), live.last_data_timestamp())
+        np.testing.assert_array_equal(
+            expected.timesync_data().sync_exchanges(), live.timesync_data().sync_exchanges()
+        )
+        self.assertEqual(expected.timesync_data().best_latency(), live.timesync_data().best_latency())
+
+    def test_append_matches_create_from_packets(self):
+        for packets in [self.packets, self.other_packets]:
+            live = LiveStation()
+            for i, packet in enumerate(packets):
+                self.assertTrue(live.append_packet(packet))
+                self.assert_same_station(Station.create_from_packets(packets[: i + 1]), live.station())
+            self.assertEqual(len(packets), live.num_packets())
+
+    def test_snapshot_reused(self):
+        live = LiveStation()
+        live.append_packets(self.packets[:2])
+        snapshot = live.station()
+        self.assertIs(snapshot, live.station())
+        live.append_packet(self.packets[2])
+        self.assertIsNot(snapshot, live.station())
+
+    def test_gap(self):
+        live = LiveStation()
+        self.assertEqual(2, live.append_packets([self.packets[0], self.packets[2]]))
+        expected = Station.create_from_packets([self.packets[0], self.packets[2]])
+        self.assertEqual(1, len(live.gaps()))
+        self.assert_same_station(expected, live.station())
+
+    def test_retention(self):
+        duration_s = (
+            self.packets[0].timing_information.packet_end_mach_timestamp
+            - self.packets[0].timing_information.packet_start_mach_timestamp
+        ) / 1e6
+        live = LiveStation(retention_s=duration_s * 1.5)
+        self.assertEqual(3, live.append_packets(self.packets))
+        self.assertEqual(2, live.num_packets())
+        self.assert_same_station(Station.create_from_packets(self.packets[1:]), live.station())
+
+        # dropping the packet before a gap drops the filled gap too
+        live = LiveStation(retention_s=duration_s * 1.5)
+        self.assertEqual(2, live.append_packets([self.packets[0], self.packets[2]]))
+        self.assertEqual(1, live.num_packets())
+        self.assertListEqual([], live.gaps())
+        self.assertEqual(self.packets[2].timing_information.packet_start_mach_timestamp, live.first_packet_start())
+        self.assert_same_station(Station.create_from_packets([self.packets[2]]), live.station())
+
+    def test_refresh_cost(self):
+        def snapshot_work(num_packets: int):
+            live = LiveStation()
+            live.append_packets(self.packets[:num_packets])
+            with mock.patch.object(pa, "concat_tables", wraps=pa.concat_tables) as concat, mock.patch.object(
+                TimeSync, "from_exchanges", autospec=True, side_effect=TimeSync.from_exchanges
+            ) as from_exchanges:
+                live.station()
+                live.timesync_data()
+            return sum(len(c.args[0]) for c in concat.call_args_list), from_exchanges.call_count
+
+        # a snapshot joins no tables and fits the time sync data once, however many packets there are
+        self.assertEqual((0, 1), snapshot_work(1))
+        self.assertEqual((0, 1), snapshot_work(len(self.packets)))
+
+    def test_running_audio_stays_sorted(self):
+        def points(start: float, num: int) -> pa.Table:
+            return pa.Table.from_pydict({"timestamps": start + np.arange(num, dtype=float), "index": [float(start)] * num})
+
+        def sort(tables):
+            table = pa.concat_tables(tables)
+            return pc.take(table, pc.sort_indices(table, sort_keys=[("timestamps", "ascending")]))
+
+        # overlapping and tied timestamps
+        added = [points(0, 10), points(7.5, 10), points(17, 5), points(21, 10), points(30.5, 3)]
+        table = None
+        for i, p in enumerate(added):
+            table = ls.append_sorted(table, p)
+            self.assertTrue(sort(added[: i + 1]).equals(table))
+        for i in range(1, len(added)):
+            table = ls.remove_oldest_sorted(table, [added[i - 1]])
+            self.assertTrue(sort(added[i:]).equals(table))
+
+    def test_rejected_packets(self):
+        live = LiveStation()
+        live.append_packets(self.packets[1:])
+        self.assertFalse(live.append_packet(self.packets[0]))
+        self.assertFalse(live.append_packet(self.packets[2]))
+        self.assertFalse(live.append_packet(self.other_packets[0]))
+        self.assertEqual(2, live.num_packets())
+        self.assertEqual(3, live.errors().get_num_errors())
+
+    def test_empty(self):
+        live = LiveStation()
+        self.assertEqual(0, live.num_packets())
+        self.assertTrue(np.isnan(live.first_packet_start()))
+        self.assertListEqual([], live.station().data())
+        with self.assertRaises(ValueError):
+            LiveStation(retention_s=0)
@@ -0,0 +1,75 @@
+"""
+tests for reading packet metadata without the sensor payloads
+"""
+import unittest
+
+import numpy as np
+
+import redvox.tests as tests
+from redvox.common import io
+from redvox.common import metadata_scan as ms
+from redvox.common.session_model import SessionModel
+from redvox.common.timesync import TimeSync
+
+
+class MetadataScanTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = io.index_unstructured(tests.TEST_DATA_DIR)
+        cls.entries_1000 = [e for e in cls.index.entries if e.api_version == io.ApiVersion.API_1000]
+
+    def test_strip_payloads(self):
+        for entry in self.entries_1000:
+            full = entry.read_raw()
+            expected = type(full)()
+            expected.CopyFrom(full)
+            expected.sensors.audio.ClearField("samples")
+            expected.ClearField("event_streams")
+            self.assertEqual(str(expected), str(ms.read_packet_metadata(entry)))
+            self.assertLess(
+                len(ms.read_packet_metadata(entry).SerializeToString()), len(full.SerializeToString()) / 100
+            )
+
+    def test_strip_sensors(self):
+        for entry in self.entries_1000:
+            full = entry.read_raw()
+            packet = ms.read_packet_metadata(entry, keep_sensors=False)
+            self.assertFalse(packet.HasField("sensors"))
+            self.assertEqual(str(full.station_information), str(packet.station_information))
+            self.assertEqual(str(full.timing_information), str(packet.timing_information))
+
+    def test_stream_order(self):
+        expected = [p.timing_information.packet_start_mach_timestamp for p in self.index.stream_contents()]
+        streamed = [p.timing_information.packet_start_mach_timestamp for p in ms.stream_packet_metadata(self.index)]
+        self.assertListEqual(expected, streamed)
+        prefetched = [
+            p.timing_information.packet_start_mach_timestamp
+            for p in ms.stream_packet_metadata(self.index, prefetch=3, workers=2)
+        ]
+        self.assertListEqual(expected, prefetched)
+
+    def test_scan_metadata(self):
+        packets = self.index.read_contents()
+        table = ms.scan_metadata(self.index)
+        self.assertEqual(ms.METADATA_SCHEMA, table.schema)
+        self.assertEqual(len(packets), table.num_rows)
+        self.assertListEqual([p.station_information.id for p in packets], table["station_id"].to_pylist())
+        self.assertListEqual(
+            [p.timing_information.packet_start_mach_timestamp for p in packets],
+            table["packet_start_mach_timestamp"].to_pylist(),
+        )
+        self.assertListEqual(
+            [len(p.timing_information.synch_exchanges) for p in packets], table["num_synch_exchanges"].to_pylist()
+        )
+        for packet, exchanges in zip(packets, table["synch_exchanges"].to_pylist()):
+            self.assertListEqual(TimeSync.exchanges_from_packet(packet), exchanges)
+
+    def test_session_model_same_as_full_packets(self):
+        station_index = self.index.get_index_for_station_id("0000000001")
+        full = SessionModel.create_from_stream(station_index.read_contents())
+        lite = SessionModel.create_from_stream(list(ms.stream_packet_metadata(station_index)))
+        self.assertEqual(str(full.as_dict()), str(lite.as_dict()))
+        ts_full = TimeSync().from_raw_packets(station_index.read_contents())
+        ts_lite = TimeSync().from_raw_packets(list(ms.stream_packet_metadata(station_index, keep_sensors=False)))
+        np.testing.assert_array_equal(ts_full.sync_exchanges(), ts_lite.sync_exchanges())
+        self.assertEqual(ts_full.best_latency(), ts_lite.best_latency())
@@ -4,6 +4,7 @@ tests for offset model
 import unittest
 
 import numpy as np
+import pandas as pd
 
 import redvox.tests as tests
 from redvox.common import offset_model as om
@@ -38,3 +39,39 @@ class OffsetModelTest(unittest.TestCase):
         self.assertEqual(model.n_samples, 3)
         self.assertEqual(model.mean_latency, 0.0)
         self.assertEqual(model.std_dev_latency, 0.0)
+
+
+def _loop_binned_df(full_df: pd.DataFrame, bin_times: np.ndarray, n_samples: int) -> pd.DataFrame:
+    """
+    the per-bin implementation of get_binned_df, kept as a reference
+    """
+    binned_df = pd.DataFrame(columns=full_df.columns)
+    for i in range(len(bin_times) - 1):
+        select_df = full_df[full_df["times"] < bin_times[i + 1]]
+        select_df = select_df[select_df["times"] > bin_times[i]]
+        binned_df = pd.concat([binned_df, select_df.nsmallest(n_samples, "latencies")])
+    return binned_df.sort_values(by=["times"])
+
+
+class GetBinnedDfTest(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(42)
+        times = np.sort(rng.uniform(0, 3.6e9, 2000))
+        latencies = rng.integers(100, 120, 2000).astype(float)
+        latencies[rng.choice(2000, 100, replace=False)] = np.nan
+        self.bin_times = np.linspace(0, 3.6e9, 13)
+        times[:12] = self.bin_times[:12]
+        self.full_df = pd.DataFrame(
+            data={"latencies": latencies, "offsets": rng.normal(0, 10, 2000), "times": np.sort(times)}
+        )
+
+    def test_same_as_loop(self):
+        for n_samples in [1, 3, 500]:
+            expected = _loop_binned_df(self.full_df, self.bin_times, n_samples)
+            result = om.get_binned_df(self.full_df, self.bin_times, n_samples)
+            pd.testing.assert_frame_equal(expected.astype(self.full_df.dtypes), result)
+
+    def test_no_rows_in_bins(self):
+        result = om.get_binned_df(self.full_df, np.array([-10.0, -5.0]), 3)
+        self.assertEqual(0, len(result))
+        self.assertListEqual(list(self.full_df.columns), list(result.columns))
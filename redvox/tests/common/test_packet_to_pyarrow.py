@@ -3,9 +3,19 @@ tests for packet to pyarrow
 """
 import unittest
 import contextlib
+import os
+import tempfile
+from glob import glob
+from unittest import mock
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 import redvox.tests as tests
 from redvox.common import api_reader
+from redvox.common import api_conversions as ac
+from redvox.common import io
 from redvox.common.io import ReadFilter
 import redvox.common.packet_to_pyarrow as ptp
 from redvox.common.sensor_data import SensorType
@@ -37,3 +47,105 @@ class PyarrowSummaryTest(unittest.TestCase):
         dct = summaries.to_dict()
         frm_dct = ptp.AggregateSummary.from_dict(dct)
         self.assertEqual(len(frm_dct.summaries), len(summaries.summaries))
+
+
+class Api900ToPyarrowTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.packets = io.index_unstructured(tests.TEST_DATA_DIR).read_raw(
+            ReadFilter.empty().with_api_versions({io.ApiVersion.API_900})
+        )
+
+    def assert_same_summaries(self, expected: ptp.AggregateSummary, result: ptp.AggregateSummary):
+        self.assertListEqual([s.stype for s in expected.summaries], [s.stype for s in result.summaries])
+        for exp_smry, smry in zip(expected.summaries, result.summaries):
+            for prop in ["name", "start", "srate_hz", "fdir", "scount", "smint_s", "sstd_s"]:
+                np.testing.assert_equal(getattr(smry, prop), getattr(exp_smry, prop))
+            self.assertTrue(exp_smry.data().schema.equals(smry.data().schema))
+            for column in exp_smry.data().column_names:
+                np.testing.assert_equal(smry.data()[column].to_numpy(), exp_smry.data()[column].to_numpy())
+
+    def test_same_as_converted_packet(self):
+        self.assertGreater(len(self.packets), 0)
+        for pkt in self.packets:
+            self.assert_same_summaries(
+                ptp.packet_to_pyarrow(ac.convert_api_900_to_1000_raw(pkt)), ptp.api_900_to_pyarrow(pkt)
+            )
+
+    def test_packet_to_pyarrow_dispatches(self):
+        summary = ptp.packet_to_pyarrow(self.packets[0])
+        self.assertTrue(SensorType.AUDIO in summary.sensor_types())
+        self.assertTrue(SensorType.LOCATION in summary.sensor_types())
+        self.assert_same_summaries(ptp.api_900_to_pyarrow(self.packets[0]), summary)
+
+    def test_stream_to_sink(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            summary = ptp.stream_to_pyarrow(self.packets, temp_dir)
+            converted = ptp.stream_to_pyarrow([ac.convert_api_900_to_1000_raw(p) for p in self.packets])
+            for disk_smry, mem_smry in zip(summary.summaries, converted.summaries):
+                self.assertFalse(disk_smry.check_data())
+                self.assertTrue(mem_smry.data().to_pandas().equals(disk_smry.data().to_pandas()))
+
+
+class ParquetSinkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with contextlib.redirect_stdout(None):
+            reader = api_reader.ApiReader(
+                tests.TEST_DATA_DIR,
+                False,
+                ReadFilter(extensions={".rdvxm"}, station_ids={"0000000001"}),
+            )
+            cls.packets = reader.files_index[0].read_contents()
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_one_file_per_sensor(self):
+        with ptp.ParquetSink(self.temp_dir.name) as sink:
+            summaries = [ptp.packet_to_pyarrow(p, self.temp_dir.name, sink) for p in self.packets]
+        for stype in summaries[0].sensor_types():
+            self.assertEqual(len(glob(os.path.join(self.temp_dir.name, f"{stype.name}_SUMMARY", "*.parquet"))), 1)
+        for pkt, summary in zip(self.packets, summaries):
+            in_mem = ptp.packet_to_pyarrow(pkt)
+            for mem_smry, disk_smry in zip(in_mem.summaries, summary.summaries):
+                self.assertFalse(disk_smry.check_data())
+                self.assertTrue(mem_smry.data().to_pandas().equals(disk_smry.data().to_pandas()))
+
+    def test_mismatched_schema_starts_new_file(self):
+        with ptp.ParquetSink(self.temp_dir.name) as sink:
+            for i, table in enumerate(
+                [pa.table({"timestamps": [1.0], "a": [1.0]}), pa.table({"timestamps": [2.0], "b": ["x"]})]
+            ):
+                sink.write(ptp.PyarrowSummary("test", SensorType.PRESSURE, float(i), 1.0, "", 1, _data=table))
+        self.assertEqual(len(glob(os.path.join(self.temp_dir.name, "PRESSURE_SUMMARY", "*.parquet"))), 2)
+
+    def test_stream_error_closes_sink(self):
+        def packets():
+            yield from self.packets
+            raise RuntimeError("bad packet")
+
+        close = ptp.ParquetSink.close
+        with mock.patch.object(ptp.ParquetSink, "close", autospec=True, side_effect=close) as mock_close:
+            with self.assertRaises(RuntimeError):
+                ptp.stream_to_pyarrow(packets(), self.temp_dir.name)
+        mock_close.assert_called_once()
+        files = glob(os.path.join(self.temp_dir.name, "*_SUMMARY", "*.parquet"))
+        self.assertGreater(len(files), 0)
+        for file in files:
+            self.assertEqual(pq.ParquetFile(file).num_row_groups, len(self.packets))
+
+    def test_merge_from_sink(self):
+        summary = ptp.stream_to_pyarrow(self.packets, self.temp_dir.name)
+        mem_summary = ptp.stream_to_pyarrow(self.packets)
+        summary.merge_all_summaries()
+        mem_summary.merge_all_summaries()
+        for stype in mem_summary.sensor_types():
+            disk_smry = summary.get_sensor(stype)[0]
+            mem_smry = mem_summary.get_sensor(stype)[0]
+            self.assertEqual(len(glob(os.path.join(disk_smry.fdir, "*.parquet"))), 1)
+            self.assertEqual(mem_smry.scount, disk_smry.scount)
+            self.assertTrue(mem_smry.data().to_pandas().equals(disk_smry.data().to_pandas()))
@@ -1,13 +1,32 @@
+import random
+import threading
+import time
 from typing import List
 from unittest import TestCase
 from multiprocessing import Pool
 
 import redvox.settings as settings
-from redvox.common.parallel_utils import maybe_parallel_map, MappingType
+import redvox.common.parallel_utils as parallel_utils
+from redvox.common.parallel_utils import (maybe_parallel_map, maybe_parallel_smap, prefetch_map, MappingType,
+                                          PoolManager, AUTO_CHUNK_SIZE)
 
 def map_fn(v: int) -> str:
     return str(v * v)
 
+
+def slow_map_fn(v: int) -> str:
+    time.sleep(0.05)
+    return str(v * v)
+
+
+def short_map_fn(v: int) -> str:
+    time.sleep(0.002)
+    return str(v * v)
+
+
+def add_fn(a: int, b: int) -> int:
+    return a + b
+
 class TestParallelUtils(TestCase):
     def setUp(self) -> None:
         self.data: List[int] = list(range(10))
@@ -52,4 +71,225 @@ class TestParallelUtils(TestCase):
         res = maybe_parallel_map(None, map_fn, self.data, usage_out=usage_out, condition=lambda: len(self.data) > 10)
         self.assertEqual(self.res, list(res))
         self.assertEqual(MappingType.Serial, usage_out[0])
-        settings.set_parallelism_enabled(False)
\ No newline at end of file
+        settings.set_parallelism_enabled(False)
+
+
+class TestPoolManager(TestCase):
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+        self.max_processes = settings.get_max_processes()
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+        settings.set_max_processes(self.max_processes)
+
+    def test_lazy_and_reused(self):
+        with PoolManager(2) as manager:
+            self.assertFalse(manager.is_running())
+            self.assertEqual(0, manager.pools_created)
+            pool = manager.get()
+            self.assertIs(pool, manager.get())
+            self.assertEqual([1, 4, 9], list(pool.imap(abs, [-1, 4, -9])))
+            self.assertEqual(1, manager.pools_created)
+            self.assertTrue(manager.is_running())
+        self.assertFalse(manager.is_running())
+        manager.get()
+        self.assertEqual(2, manager.pools_created)
+        manager.shutdown()
+
+    def test_size_limit(self):
+        manager = PoolManager()
+        settings.set_max_processes(2)
+        self.assertEqual(2, manager.num_processes())
+        first = manager.get()
+        self.assertIs(first, manager.get())
+        settings.set_max_processes(1)
+        self.assertEqual(1, manager.num_processes())
+        self.assertIsNot(first, manager.get())
+        self.assertEqual(2, manager.pools_created)
+        manager.shutdown()
+        settings.set_max_processes(0)
+        self.assertLessEqual(1, PoolManager().num_processes())
+
+    def test_resize_during_map(self):
+        settings.set_parallelism_enabled(True)
+        settings.set_max_processes(2)
+        parallel_utils.SHARED_POOL.shutdown()
+        values = list(range(40))
+        results = maybe_parallel_map(None, slow_map_fn, iter(values), chunk_size=1)
+        self.assertEqual("0", next(results))
+        settings.set_max_processes(1)
+        start = time.perf_counter()
+        resized = parallel_utils.SHARED_POOL.get()
+        # the old pool still has about a second of work left, which get() doesn't wait for
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(["4", "9"], list(maybe_parallel_map(None, map_fn, iter([2, 3]))))
+        self.assertIs(resized, parallel_utils.SHARED_POOL.get())
+        self.assertEqual([map_fn(v) for v in values[1:]], list(results))
+        parallel_utils.SHARED_POOL.shutdown()
+        self.assertFalse(parallel_utils.SHARED_POOL.is_running())
+
+    def test_shared_pool_reused_by_maybe_parallel_map(self):
+        settings.set_parallelism_enabled(True)
+        created = parallel_utils.SHARED_POOL.pools_created
+        for _ in range(3):
+            usage_out = []
+            self.assertEqual(["0", "1", "4"], list(maybe_parallel_map(None, map_fn, iter(range(3)),
+                                                                      usage_out=usage_out)))
+            self.assertEqual(MappingType.ParallelManaged, usage_out[0])
+        self.assertLessEqual(parallel_utils.SHARED_POOL.pools_created, created + 1)
+        self.assertTrue(parallel_utils.SHARED_POOL.is_running())
+
+    def test_serial_does_not_create_pool(self):
+        settings.set_parallelism_enabled(False)
+        parallel_utils.SHARED_POOL.shutdown()
+        self.assertEqual(["0", "1"], list(maybe_parallel_map(None, map_fn, iter(range(2)))))
+        self.assertFalse(parallel_utils.SHARED_POOL.is_running())
+
+
+class TestAutoChunkAndTelemetry(TestCase):
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def test_auto_chunk_size(self):
+        # cheap items: limited by the number of chunks per worker
+        self.assertEqual(10_000 // (4 * parallel_utils.AUTO_CHUNKS_PER_PROCESS),
+                         parallel_utils.auto_chunk_size(1e-6, 100, 10_000, 4))
+        # expensive items: one per chunk
+        self.assertEqual(1, parallel_utils.auto_chunk_size(1.0, 100, 10_000, 4))
+        # large payloads: limited by the bytes per chunk
+        self.assertEqual(8, parallel_utils.auto_chunk_size(1e-6, parallel_utils.AUTO_CHUNK_MAX_BYTES / 8,
+                                                           10_000, 4))
+        self.assertEqual(1, parallel_utils.auto_chunk_size(1e-6, float("nan"), 1, 4))
+
+    def test_auto_cheap_items_run_serially(self):
+        settings.set_parallelism_enabled(True)
+        usage_out = []
+        with parallel_utils.record_map_telemetry() as records:
+            res = list(maybe_parallel_map(None, map_fn, iter(range(100)), chunk_size=AUTO_CHUNK_SIZE,
+                                          usage_out=usage_out, call_site="cheap"))
+        self.assertEqual([map_fn(v) for v in range(100)], res)
+        self.assertEqual(MappingType.Serial, usage_out[0])
+        self.assertEqual(1, len(records))
+        self.assertEqual("cheap", records[0].call_site)
+        self.assertEqual(100, records[0].num_items)
+        self.assertEqual(0, records[0].chunk_size)
+
+    def test_auto_expensive_items_run_in_parallel(self):
+        settings.set_parallelism_enabled(True)
+        usage_out = []
+        with parallel_utils.record_map_telemetry() as records:
+            res = list(maybe_parallel_map(None, slow_map_fn, iter(range(12)), chunk_size=AUTO_CHUNK_SIZE,
+                                          usage_out=usage_out))
+        self.assertEqual([map_fn(v) for v in range(12)], res)
+        self.assertEqual(MappingType.ParallelManaged, usage_out[0])
+        telemetry = records[0]
+        self.assertEqual("slow_map_fn", telemetry.call_site)
+        self.assertEqual(12, telemetry.num_items)
+        self.assertEqual(1, telemetry.chunk_size)
+        self.assertGreaterEqual(telemetry.item_s, 0.04)
+        self.assertGreater(telemetry.pickled_bytes, 0)
+        self.assertGreater(telemetry.items_per_s(), 0)
+        self.assertLessEqual(telemetry.wait_s, telemetry.elapsed_s)
+
+    def test_auto_reads_values_lazily(self):
+        settings.set_parallelism_enabled(True)
+        pulled = []
+
+        def values():
+            for v in range(100):
+                pulled.append(v)
+                yield v
+
+        usage_out = []
+        with parallel_utils.record_map_telemetry() as records:
+            res = maybe_parallel_map(None, map_fn, values(), chunk_size=AUTO_CHUNK_SIZE, usage_out=usage_out)
+            self.assertEqual("0", next(res))
+            self.assertEqual(parallel_utils.AUTO_CHUNK_SAMPLE_ITEMS, len(pulled))
+            self.assertEqual([map_fn(v) for v in range(1, 100)], list(res))
+        self.assertEqual(MappingType.Serial, usage_out[0])
+        self.assertEqual(100, records[0].num_items)
+
+    def test_auto_unknown_length_runs_in_parallel(self):
+        settings.set_parallelism_enabled(True)
+        usage_out = []
+        values = (v for v in range(12))
+        res = list(maybe_parallel_map(None, slow_map_fn, values, chunk_size=AUTO_CHUNK_SIZE, usage_out=usage_out))
+        self.assertEqual([map_fn(v) for v in range(12)], res)
+        self.assertEqual(MappingType.ParallelManaged, usage_out[0])
+
+    def test_auto_num_processes(self):
+        settings.set_parallelism_enabled(True)
+        with Pool(2) as pool:
+            with parallel_utils.record_map_telemetry() as records:
+                res = list(maybe_parallel_map(pool, short_map_fn, iter(range(200)), chunk_size=AUTO_CHUNK_SIZE,
+                                              num_processes=10))
+        self.assertEqual([map_fn(v) for v in range(200)], res)
+        self.assertEqual(MappingType.ParallelUnmanaged, records[0].mapping_type)
+        # limited by the number of chunks per worker of the given number of processes
+        self.assertEqual(198 // (10 * parallel_utils.AUTO_CHUNKS_PER_PROCESS), records[0].chunk_size)
+
+    def test_smap_hook(self):
+        for parallel, mapping_type in [(False, MappingType.Serial), (True, MappingType.ParallelManaged)]:
+            settings.set_parallelism_enabled(parallel)
+            args = [(1, 2), (3, 4), (5, 6)] if parallel else [[1, 3, 5], [2, 4, 6]]
+            with parallel_utils.record_map_telemetry() as records:
+                self.assertEqual([3, 7, 11], list(maybe_parallel_smap(None, add_fn, args, call_site="add")))
+            self.assertEqual(1, len(records))
+            self.assertEqual("add", records[0].call_site)
+            self.assertEqual(mapping_type, records[0].mapping_type)
+            self.assertEqual(3, records[0].num_items)
+            self.assertLessEqual(records[0].wait_s, records[0].elapsed_s)
+
+    def test_hook_serial(self):
+        settings.set_parallelism_enabled(False)
+        seen = []
+        parallel_utils.add_telemetry_hook(seen.append)
+        try:
+            self.assertEqual([map_fn(v) for v in range(5)], list(maybe_parallel_map(None, map_fn, range(5))))
+        finally:
+            parallel_utils.remove_telemetry_hook(seen.append)
+        list(maybe_parallel_map(None, map_fn, range(5)))
+        self.assertEqual(1, len(seen))
+        self.assertEqual(MappingType.Serial, seen[0].mapping_type)
+        self.assertEqual(5, seen[0].num_items)
+        self.assertEqual(0.0, seen[0].pickle_s)
+
+
+class TestPrefetchMap(TestCase):
+    def setUp(self) -> None:
+        self.data: List[int] = list(range(50))
+        self.started: List[int] = []
+        self.lock = threading.Lock()
+
+    def slow_map_fn(self, v: int) -> str:
+        with self.lock:
+            self.started.append(v)
+        time.sleep(random.random() * 0.002)
+        return map_fn(v)
+
+    def test_keeps_order(self):
+        for prefetch, workers in [(0, 1), (1, 1), (4, 4), (8, 3), (100, 8)]:
+            res = prefetch_map(self.slow_map_fn, iter(self.data), prefetch, workers)
+            self.assertEqual(list(map(map_fn, self.data)), list(res))
+
+    def test_bounded(self):
+        res = prefetch_map(self.slow_map_fn, iter(self.data), 5, 4)
+        self.assertEqual("0", next(res))
+        time.sleep(0.05)
+        self.assertLessEqual(len(self.started), 6)
+        res.close()
+        self.assertLess(len(self.started), len(self.data))
+
+    def test_error_raised_in_order(self):
+        def failing_fn(v: int) -> int:
+            if v == 3:
+                raise ValueError("bad value")
+            return v
+
+        res = prefetch_map(failing_fn, iter(self.data), 4, 2)
+        self.assertEqual([0, 1, 2], [next(res) for _ in range(3)])
+        self.assertRaises(ValueError, next, res)
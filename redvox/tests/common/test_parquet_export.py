@@ -0,0 +1,109 @@
+"""
+tests for exporting packets to a partitioned Parquet dataset
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pyarrow.parquet as pq
+
+import redvox.tests as tests
+from redvox.common import io
+from redvox.common import packet_to_pyarrow as ptp
+from redvox.common import parquet_export as pe
+from redvox.common.sensor_data import SensorType
+
+
+class ParquetExportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = io.index_unstructured(tests.TEST_DATA_DIR)
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.out_dir = os.path.join(self.temp_dir.name, "dataset")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def export(self, **kwargs) -> pe.ParquetExportSummary:
+        summaries = []
+        self.assertTrue(pe.export_parquet(self.index, self.out_dir, summary_out=summaries, **kwargs))
+        self.assertEqual(1, len(summaries))
+        return summaries[0]
+
+    def test_export(self):
+        summary = self.export()
+        self.assertEqual(len(self.index.entries), summary.num_inputs)
+        self.assertEqual(0, summary.num_skipped)
+        entry = [e for e in self.index.entries if e.api_version == io.ApiVersion.API_1000][0]
+        expected = {s.stype: s for s in ptp.packet_to_pyarrow(entry.read_raw()).summaries}
+        audio = expected[SensorType.AUDIO]
+        path = os.path.join(
+            pe.partition_dir(self.out_dir, entry.station_id, SensorType.AUDIO, entry.date_time.strftime("%Y-%m-%d")),
+            os.path.basename(entry.full_path).replace(".rdvxm", ".parquet"),
+        )
+        table = pq.read_table(path)
+        np.testing.assert_array_equal(audio.data()["microphone"].to_numpy(), table["microphone"].to_numpy())
+        np.testing.assert_array_almost_equal(
+            audio.start + np.arange(table.num_rows) * 1e6 / audio.srate_hz, table["timestamps"].to_numpy()
+        )
+
+        dataset = pe.sensor_dataset(self.out_dir, SensorType.AUDIO).to_table()
+        self.assertEqual(
+            sum(
+                s.data().num_rows
+                for e in self.index.entries
+                for s in ptp.packet_to_pyarrow(e.read_raw()).summaries
+                if s.stype == SensorType.AUDIO
+            ),
+            dataset.num_rows,
+        )
+        self.assertSetEqual({e.station_id for e in self.index.entries}, set(dataset["station_id"].to_pylist()))
+        self.assertSetEqual({"audio"}, set(dataset["sensor"].to_pylist()))
+        self.assertIsNone(pe.sensor_dataset(self.out_dir, SensorType.IMAGE))
+
+    def test_incremental(self):
+        first = self.export()
+        second = self.export()
+        self.assertEqual(0, second.num_inputs)
+        self.assertEqual(len(self.index.entries), second.num_skipped)
+        forced = self.export(force=True)
+        self.assertEqual(first.num_files, forced.num_files)
+        self.assertEqual(first.num_rows, forced.num_rows)
+        self.assertEqual(len(self.index.entries), len(pe.read_manifest(self.out_dir)))
+
+    def test_corrupt_input(self):
+        entry = [e for e in self.index.entries if e.api_version == io.ApiVersion.API_1000][0]
+        corrupt_dir = os.path.join(self.temp_dir.name, "corrupt")
+        os.makedirs(corrupt_dir)
+        corrupt_path = os.path.join(corrupt_dir, os.path.basename(entry.full_path))
+        with open(entry.full_path, "rb") as data_in, open(corrupt_path, "wb") as data_out:
+            data_out.write(data_in.read()[:1000])
+        index = io.index_unstructured(corrupt_dir)
+        self.assertEqual(1, len(index.entries))
+
+        summaries = []
+        self.assertFalse(pe.export_parquet(index, self.out_dir, summary_out=summaries))
+        self.assertEqual(1, summaries[0].num_failed)
+        self.assertEqual(0, summaries[0].num_inputs)
+        self.assertDictEqual({}, pe.read_manifest(self.out_dir))
+
+        with open(entry.full_path, "rb") as data_in, open(corrupt_path, "wb") as data_out:
+            data_out.write(data_in.read())
+        summaries = []
+        self.assertTrue(pe.export_parquet(index, self.out_dir, summary_out=summaries))
+        self.assertEqual(1, summaries[0].num_inputs)
+        self.assertListEqual([os.path.basename(corrupt_path)], list(pe.read_manifest(self.out_dir)))
+
+    def test_jobs(self):
+        serial = self.export()
+        serial_rows = pe.sensor_dataset(self.out_dir, SensorType.LOCATION).to_table().sort_by("timestamps")
+        self.tearDown()
+        self.setUp()
+        parallel = self.export(jobs=2)
+        self.assertEqual(serial.num_files, parallel.num_files)
+        self.assertEqual(serial.num_rows, parallel.num_rows)
+        parallel_rows = pe.sensor_dataset(self.out_dir, SensorType.LOCATION).to_table().sort_by("timestamps")
+        np.testing.assert_equal(serial_rows.to_pydict(), parallel_rows.to_pydict())
@@ -6,6 +6,7 @@ import unittest
 import pyarrow as pa
 import numpy as np
 
+import redvox.api1000.proto.redvox_api_m_pb2 as api_m
 from redvox.common.sensor_data import SensorType
 from redvox.common import sensor_reader_utils as sdru
 
@@ -25,3 +26,39 @@ class SampleStatisticsTest(unittest.TestCase):
         self.assertEqual(rate, 1e2)
         self.assertEqual(interval, 1e-2)
         self.assertEqual(intvl_std, 0)
+
+
+class LocationToPyarrowTest(unittest.TestCase):
+    def test_location_to_pyarrow(self):
+        loc = api_m.RedvoxPacketM.Sensors.Location()
+        loc.timestamps.timestamps.extend([1.0, 2.0, 3.0])
+        loc.latitude_samples.values.extend([21.0, 21.1, 21.2])
+        loc.longitude_samples.values.extend([-157.0, -157.1, -157.2])
+        loc.altitude_samples.values.extend([10.0])
+        loc.location_providers.extend([api_m.RedvoxPacketM.Sensors.Location.LocationProvider.GPS])
+        table = sdru.apim_location_to_pyarrow(loc)
+        self.assertEqual(table.schema.names, sdru.LOCATION_COLUMNS)
+        self.assertEqual(table.num_rows, 3)
+        np.testing.assert_array_equal(table["latitude"].to_numpy(), [21.0, 21.1, 21.2])
+        np.testing.assert_array_equal(table["altitude"].to_numpy(), [10.0, np.nan, np.nan])
+        self.assertTrue(np.all(np.isnan(table["gps_timestamps"].to_numpy())))
+        self.assertEqual(table["location_provider"].to_pylist(), [3, 0, 0])
+
+    def test_empty_location_to_pyarrow(self):
+        table = sdru.apim_location_to_pyarrow(api_m.RedvoxPacketM.Sensors.Location())
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema.field("latitude").type, pa.float64())
+
+
+class HealthToPyarrowTest(unittest.TestCase):
+    def test_health_to_pyarrow(self):
+        metrics = api_m.RedvoxPacketM.StationInformation.StationMetrics()
+        metrics.timestamps.timestamps.extend([1.0, 2.0])
+        metrics.battery.values.extend([50.0, 49.0])
+        metrics.network_type.extend([api_m.RedvoxPacketM.StationInformation.StationMetrics.NetworkType.WIFI])
+        table = sdru.apim_health_to_pyarrow(metrics)
+        self.assertEqual(table.schema.names, sdru.STATION_HEALTH_COLUMNS)
+        np.testing.assert_array_equal(table["battery_charge_remaining"].to_numpy(), [50.0, 49.0])
+        self.assertTrue(np.all(np.isnan(table["internal_temp_c"].to_numpy())))
+        self.assertEqual(table["network_type"].to_pylist(), [2, 0])
+        self.assertEqual(table["wifi_wake_lock"].to_pylist(), [0, 0])
@@ -2,9 +2,13 @@ import unittest
 import tempfile
 import os.path
 
+import numpy as np
+
+import redvox.settings as settings
 import redvox.tests as tests
-from redvox.common.io import ReadFilter
+from redvox.common.io import ReadFilter, index_unstructured
 from redvox.common.api_reader import ApiReader
+from redvox.common.metadata_scan import stream_packet_metadata
 import redvox.common.session_model as sm
 
 
@@ -27,6 +31,7 @@ class SessionModelTest(unittest.TestCase):
         self.assertEqual(len(model.dynamic_sessions), 2)
         self.assertEqual(len(model.get_daily_dynamic_sessions()), 1)
         self.assertEqual(len(model.get_hourly_dynamic_sessions()), 1)
+        self.assertEqual(model.get_hourly_dynamic_sessions()[0].n_pkts, 3)
 
     def test_write_station_model(self):
         tmpdir = tempfile.TemporaryDirectory()
@@ -47,6 +52,101 @@ class SessionModelTest(unittest.TestCase):
         tmpdir.cleanup()
 
 
+class SessionModelMergeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = index_unstructured(tests.TEST_DATA_DIR)
+        cls.expected = sm.LocalSessionModels.create_from_stream(list(stream_packet_metadata(cls.index)))
+
+    def assert_same_values(self, expected, test):
+        """
+        merged statistics may differ from the sequential ones by rounding errors
+        """
+        if isinstance(expected, dict):
+            self.assertListEqual(list(expected.keys()), list(test.keys()))
+            for key in expected.keys():
+                self.assert_same_values(expected[key], test[key])
+        elif isinstance(expected, (list, tuple)):
+            self.assertEqual(len(expected), len(test))
+            for a, b in zip(expected, test):
+                self.assert_same_values(a, b)
+        elif isinstance(expected, float):
+            np.testing.assert_allclose(test, expected, rtol=1e-9, atol=1e-9)
+        else:
+            self.assertEqual(expected, test)
+
+    def assert_same_model(self, expected: sm.SessionModel, test: sm.SessionModel):
+        """
+        as_dict doesn't include the errors of the models
+        """
+        self.assert_same_values(expected.as_dict(), test.as_dict())
+        self.assertEqual(expected._errors.as_dict(), test._errors.as_dict())
+
+    def test_merge_single_packets(self):
+        packets = list(stream_packet_metadata(self.index))
+        result = sm.LocalSessionModels()
+        for p in packets:
+            result.merge(sm.LocalSessionModels.create_from_stream([p]))
+        self.assertEqual(len(self.expected.sessions), len(result.sessions))
+        for expected, test in zip(self.expected.sessions, result.sessions):
+            self.assert_same_model(expected, test)
+
+    def test_merge_invalid_key(self):
+        model = sm.SessionModel.from_dict(self.expected.sessions[0].as_dict())
+        model.merge(sm.SessionModel.from_dict(self.expected.sessions[1].as_dict()))
+        self.assertEqual(model.cloud_session.n_pkts, self.expected.sessions[0].cloud_session.n_pkts)
+        self.assertEqual(model._errors.get_num_errors(), 1)
+
+    def test_models_from_index(self):
+        parallelism_enabled = settings.is_parallelism_enabled()
+        try:
+            settings.set_parallelism_enabled(True)
+            result = sm.SessionModel._models_from_index(self.index, max_files_per_chunk=2)
+        finally:
+            settings.set_parallelism_enabled(parallelism_enabled)
+        self.assertListEqual(
+            [s.cloud_session.session_key() for s in self.expected.sessions],
+            [s.cloud_session.session_key() for s in result.sessions],
+        )
+        for expected, test in zip(self.expected.sessions, result.sessions):
+            self.assert_same_model(expected, test)
+
+    def test_models_from_index_one_file_per_chunk(self):
+        result = sm.SessionModel._models_from_index(self.index, max_files_per_chunk=1)
+        self.assertEqual(len(self.expected.sessions), len(result.sessions))
+        for expected, test in zip(self.expected.sessions, result.sessions):
+            self.assertGreater(test._errors.get_num_errors(), 0)
+            self.assert_same_model(expected, test)
+
+    def test_chunk_starts_without_timing(self):
+        packets = [p for p in stream_packet_metadata(self.index) if p.station_information.id == "0000000001"]
+        no_timing = type(packets[1])()
+        no_timing.CopyFrom(packets[1])
+        no_timing.timing_information.ClearField("synch_exchanges")
+        no_timing.sensors.ClearField("location")
+        no_timing.sensors.location.last_best_location.latitude_longitude_timestamp.gps = np.nan
+        with self.assertRaises(sm.RedVoxError):
+            sm.LocalSessionModels.create_from_stream([no_timing])
+        expected = sm.SessionModel.create_from_stream([packets[0], no_timing])
+        result = sm.LocalSessionModels.create_from_stream([packets[0]])
+        result.merge(sm.LocalSessionModels.create_from_stream([no_timing], require_timing=False))
+        self.assertEqual(1, len(result.sessions))
+        self.assertEqual(2, result.sessions[0].cloud_session.n_pkts)
+        self.assert_same_model(expected, result.sessions[0])
+
+    def test_read_all_from_dir_parallel(self):
+        parallelism_enabled = settings.is_parallelism_enabled()
+        try:
+            settings.set_parallelism_enabled(True)
+            result = sm.SessionModel.read_all_from_dir(tests.TEST_DATA_DIR, structured_dir=False)
+        finally:
+            settings.set_parallelism_enabled(parallelism_enabled)
+        self.assertEqual(3, len(result))
+        for test in result:
+            expected = self.expected.get_session(test.cloud_session.session_key())
+            self.assert_same_model(expected, test)
+
+
 class LocalSessionModelsTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -3,7 +3,7 @@ import contextlib
 
 import redvox.common.session_model_utils as smu
 import redvox.tests as tests
-from redvox.cloud.session_model_api import WelfordAggregator, Stats
+from redvox.cloud.session_model_api import WelfordAggregator, Stats, FirstLastBufLocation
 from redvox.common import api_reader
 from redvox.common.io import ReadFilter
 
@@ -65,6 +65,21 @@ class SessionModelUtilsFirstLastBufferTest(unittest.TestCase):
         self.assertEqual(test[2][0], 300)
         self.assertEqual(test[2][1], "invader")
 
+    def test_merge_buffers(self):
+        values = [(400, "d"), (100, "a"), (300, "c"), (500, "e"), (200, "b")]
+        expected = FirstLastBufLocation([], 2, [], 2)
+        for ts, v in values:
+            smu.add_to_fst_buffer(expected.fst, 2, ts, v)
+            smu.add_to_lst_buffer(expected.lst, 2, ts, v)
+        test = FirstLastBufLocation([], 2, [], 2)
+        other = FirstLastBufLocation([], 2, [], 2)
+        for buf, part in [(test, values[:2]), (other, values[2:])]:
+            for ts, v in part:
+                smu.add_to_fst_buffer(buf.fst, 2, ts, v)
+                smu.add_to_lst_buffer(buf.lst, 2, ts, v)
+        smu.merge_fst_lst_buffers(test, other)
+        self.assertEqual(test, expected)
+
 
 class SessionModelUtilsGetTimeSyncTest(unittest.TestCase):
     @classmethod
@@ -105,6 +120,14 @@ class SessionModelUtilsWelfordTest(unittest.TestCase):
         self.assertEqual(wf.cnt, 3)
         self.assertEqual(wf.m2, 20000.)
 
+    def test_merge_welford(self):
+        wf = smu.add_to_welford(200., smu.add_to_welford(100.))
+        other = smu.add_to_welford(400., smu.add_to_welford(300.))
+        wf = smu.merge_welford(wf, other)
+        self.assertEqual(wf.mean, 250.)
+        self.assertEqual(wf.cnt, 4)
+        self.assertEqual(wf.m2, 50000.)
+
 
 class SessionModelUtilsStatsTest(unittest.TestCase):
     def test_create_stats(self):
@@ -123,6 +146,15 @@ class SessionModelUtilsStatsTest(unittest.TestCase):
         self.assertEqual(sts.welford.cnt, 3)
         self.assertEqual(sts.welford.m2, 20000.)
 
+    def test_merge_stats(self):
+        sts = smu.add_to_stats(300., smu.add_to_stats(200.))
+        sts = smu.merge_stats(sts, smu.add_to_stats(100.))
+        self.assertEqual(sts.min, 100.)
+        self.assertEqual(sts.max, 300.)
+        self.assertEqual(sts.welford.mean, 200.)
+        self.assertEqual(sts.welford.cnt, 3)
+        self.assertEqual(sts.welford.m2, 20000.)
+
 
 class SessionModelUtilsLocationDataTest(unittest.TestCase):
     @classmethod
@@ -57,6 +57,27 @@ class StationTest(unittest.TestCase):
         loc_sensor = self.api900_station.location_sensor()
         self.assertEqual(loc_sensor.data_df().shape, (2, 13))
 
+    def test_api900_station_same_as_converted(self):
+        with contextlib.redirect_stdout(None):
+            index = api_reader.ApiReader(
+                tests.TEST_DATA_DIR,
+                False,
+                ReadFilter(extensions={".rdvxz"}, station_ids={"1637650010"}),
+            ).files_index[0]
+        converted = Station.create_from_packets(index.read_contents())
+        direct = Station.create_from_packets(index.read_contents(convert_api_900=False))
+        streamed = Station.create_from_indexes([index])
+        for station in [direct, streamed]:
+            self.assertEqual(str(converted.metadata().as_dict()), str(station.metadata().as_dict()))
+            self.assertEqual(str(converted.packet_metadata()), str(station.packet_metadata()))
+            np.testing.assert_equal(converted.start_date(), station.start_date())
+            self.assertEqual(converted.timesync_data().best_latency(), station.timesync_data().best_latency())
+            self.assertEqual(converted.get_sensors(), station.get_sensors())
+            for sensor in converted._data:
+                np.testing.assert_equal(
+                    sensor.data_df().to_numpy(), station.get_sensor_by_type(sensor.type()).data_df().to_numpy()
+                )
+
     def test_apim_station(self):
         self.assertEqual(len(self.apim_station._data), 3)
         self.assertEqual(self.apim_station.metadata().api, 1000)
@@ -152,3 +173,39 @@ class StationTest(unittest.TestCase):
             for e in events.get_stream(s).events:
                 self.assertEqual(e.name, s)
                 self.assertTrue(e.get_timestamp() >= self.apim_station.start_date())
+
+
+class StationStreamTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with contextlib.redirect_stdout(None):
+            reader = api_reader.ApiReader(
+                tests.TEST_DATA_DIR,
+                False,
+                ReadFilter(extensions={".rdvxm"}, station_ids={"0000000001"}),
+            )
+        cls.index = reader.files_index[0]
+
+    def test_stream_contents_is_lazy(self):
+        stream = self.index.stream_contents()
+        self.assertFalse(isinstance(stream, list))
+        self.assertEqual(next(stream).station_information.id, "0000000001")
+
+    def test_create_from_stream(self):
+        from_packets = Station.create_from_packets(self.index.read_contents())
+        from_stream = Station.create_from_stream(self.index.stream_contents())
+        self.assertEqual(from_packets.id(), from_stream.id())
+        self.assertEqual(from_packets.start_date(), from_stream.start_date())
+        self.assertEqual(from_packets.last_data_timestamp(), from_stream.last_data_timestamp())
+        self.assertEqual(len(from_packets.packet_metadata()), len(from_stream.packet_metadata()))
+        self.assertEqual(from_packets.timesync_data().best_latency(), from_stream.timesync_data().best_latency())
+        self.assertEqual(from_packets.get_sensors(), from_stream.get_sensors())
+        np.testing.assert_array_equal(
+            from_packets.audio_sensor().get_data_channel("microphone"),
+            from_stream.audio_sensor().get_data_channel("microphone"),
+        )
+
+    def test_create_from_indexes_temp_dir(self):
+        station = Station.create_from_indexes([self.index], use_temp_dir=True)
+        self.assertEqual(station.id(), "0000000001")
+        self.assertEqual(station.audio_sensor().sample_rate_hz(), 48000.0)
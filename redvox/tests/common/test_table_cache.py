@@ -0,0 +1,102 @@
+"""
+tests for the table cache
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pyarrow as pa
+
+import redvox.settings as settings
+from redvox.common.sensor_data import SensorData, SensorType
+from redvox.common.table_cache import TABLE_CACHE, TableCache
+
+
+class TableCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dirs = []
+        for i in range(3):
+            self.dirs.append(os.path.join(self.temp_dir.name, str(i)))
+            os.makedirs(self.dirs[-1])
+        self.table = pa.table({"timestamps": np.arange(100, dtype=float)})
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_get_put(self):
+        cache = TableCache()
+        self.assertIsNone(cache.get(self.dirs[0]))
+        cache.put(self.dirs[0], self.table, 10000)
+        self.assertTrue(cache.get(self.dirs[0]).equals(self.table))
+        self.assertEqual(cache.nbytes(), self.table.nbytes)
+        cache.invalidate(self.dirs[0])
+        self.assertIsNone(cache.get(self.dirs[0]))
+        self.assertEqual(cache.nbytes(), 0)
+
+    def test_evict_least_recently_used(self):
+        cache = TableCache()
+        max_bytes = self.table.nbytes * 2
+        cache.put(self.dirs[0], self.table, max_bytes)
+        cache.put(self.dirs[1], self.table, max_bytes)
+        cache.get(self.dirs[0])
+        cache.put(self.dirs[2], self.table, max_bytes)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(self.dirs[0]))
+        self.assertIsNone(cache.get(self.dirs[1]))
+        self.assertIsNotNone(cache.get(self.dirs[2]))
+
+    def test_too_large(self):
+        cache = TableCache()
+        cache.put(self.dirs[0], self.table, self.table.nbytes - 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_dir_changed(self):
+        cache = TableCache()
+        cache.put(self.dirs[0], self.table, 10000)
+        with open(os.path.join(self.dirs[0], "new_file"), "w") as f:
+            f.write("changed")
+        os.utime(self.dirs[0], ns=(1, 1))
+        self.assertIsNone(cache.get(self.dirs[0]))
+
+
+class SensorTableCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.max_bytes = settings.get_table_cache_max_bytes()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        TABLE_CACHE.clear()
+        self.sensor = SensorData(
+            "test",
+            pa.table({"timestamps": [1.0, 2.0, 3.0], "pressure": [4.0, 5.0, 6.0]}),
+            SensorType.PRESSURE,
+            save_data=True,
+            base_dir=self.temp_dir.name,
+        )
+
+    def tearDown(self) -> None:
+        settings.set_table_cache_max_bytes(self.max_bytes)
+        TABLE_CACHE.clear()
+        self.temp_dir.cleanup()
+
+    def test_disabled(self):
+        settings.set_table_cache_max_bytes(0)
+        self.assertEqual(self.sensor.num_samples(), 3)
+        self.assertEqual(self.sensor.first_data_timestamp(), 1.0)
+        self.assertEqual(len(TABLE_CACHE), 0)
+
+    def test_cached_reads(self):
+        settings.set_table_cache_max_bytes(2**20)
+        self.assertEqual(self.sensor.num_samples(), 3)
+        self.assertEqual(self.sensor.first_data_timestamp(), 1.0)
+        np.testing.assert_array_equal(self.sensor.get_data_channel("pressure"), [4.0, 5.0, 6.0])
+        self.assertEqual(TABLE_CACHE.misses, 1)
+        self.assertGreater(TABLE_CACHE.hits, 1)
+
+    def test_write_invalidates(self):
+        settings.set_table_cache_max_bytes(2**20)
+        self.assertEqual(self.sensor.num_samples(), 3)
+        self.sensor.write_pyarrow_table(pa.table({"timestamps": [7.0, 8.0], "pressure": [9.0, 10.0]}))
+        self.assertEqual(self.sensor.num_samples(), 2)
+        self.assertEqual(self.sensor.first_data_timestamp(), 7.0)
+        self.assertEqual(TABLE_CACHE.misses, 2)
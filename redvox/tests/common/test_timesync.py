@@ -61,3 +61,37 @@ class TimesyncTest(unittest.TestCase):
 
     def test_best_latency_timestamp(self):
         self.assertEqual(self.timesync.get_best_latency_timestamp(), 1532459236518989.)
+
+
+class TimesyncAppendTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with contextlib.redirect_stdout(None):
+            result = api_reader.ApiReader(tests.TEST_DATA_DIR, structured_dir=False,
+                                          read_filter=ReadFilter(station_ids={"1637680001"}))
+            cls.packets = result.read_files_by_id("1637680001")
+
+    def test_exchanges_in_packet_order(self):
+        exchanges = [ex for p in self.packets for ex in ts.TimeSync.exchanges_from_packet(p)]
+        timesync = ts.TimeSync().from_raw_packets(self.packets)
+        self.assertEqual(len(exchanges), 6 * timesync.num_tri_messages())
+        for i in range(6):
+            self.assertListEqual(exchanges[i::6], list(timesync.sync_exchanges()[i]))
+
+    def test_append_timesyncs(self):
+        expected = ts.TimeSync().from_raw_packets(self.packets)
+        parts = [ts.TimeSync().from_raw_packets([p]) for p in self.packets]
+        appended = parts[0]
+        appended.append_timesyncs(parts[1:])
+        self.assertEqual(appended.num_tri_messages(), expected.num_tri_messages())
+        self.assertEqual(appended.best_latency(), expected.best_latency())
+        self.assertEqual(appended.best_offset(), expected.best_offset())
+        self.assertEqual(appended.data_start_timestamp(), expected.data_start_timestamp())
+        self.assertEqual(appended.data_end_timestamp(), expected.data_end_timestamp())
+
+    def test_append_timesync_to_empty(self):
+        expected = ts.TimeSync().from_raw_packets(self.packets)
+        appended = ts.TimeSync()
+        appended.append_timesync(expected)
+        self.assertEqual(appended.num_tri_messages(), expected.num_tri_messages())
+        self.assertAlmostEqual(appended.mean_latency(), expected.mean_latency(), 2)
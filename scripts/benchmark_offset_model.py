@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Compares redvox.common.offset_model.get_binned_df against the per-bin implementation it replaced, and times building
+an OffsetModel for a long timesync series.
+
+usage: python3 benchmark_offset_model.py [num_days] [exchanges_per_minute] [repeats]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from redvox.common import offset_model as om
+
+
+def loop_binned_df(full_df: pd.DataFrame, bin_times: np.ndarray, n_samples: int) -> pd.DataFrame:
+    """
+    the per-bin implementation of get_binned_df, kept as a baseline
+    """
+    binned_df = pd.DataFrame()
+    for i in range(len(bin_times) - 1):
+        select_df = full_df[full_df["times"] < bin_times[i + 1]]
+        select_df = select_df[select_df["times"] > bin_times[i]]
+        binned_df = pd.concat([binned_df, select_df.nsmallest(n_samples, "latencies")])
+    return binned_df.sort_values(by=["times"])
+
+
+def make_series(num_days: float, exchanges_per_minute: int) -> pd.DataFrame:
+    """
+    random timesync latencies and offsets with a slowly drifting offset, starting at 2021-01-01 utc
+    """
+    rng = np.random.default_rng(0)
+    start = 1_609_459_200_000_000.0
+    num_exchanges = int(num_days * 24 * 60 * exchanges_per_minute)
+    times = np.sort(rng.uniform(start, start + num_days * 86_400e6, num_exchanges))
+    latencies = rng.gamma(2.0, 20_000.0, num_exchanges)
+    latencies[rng.random(num_exchanges) < 0.05] = np.nan
+    offsets = 1_000.0 + (times - start) * 1e-6 + rng.normal(0, 500.0, num_exchanges)
+    return pd.DataFrame(data={"times": times, "latencies": latencies, "offsets": offsets})
+
+
+def main():
+    num_days = float(sys.argv[1]) if len(sys.argv) > 1 else 7
+    exchanges_per_minute = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    full_df = make_series(num_days, exchanges_per_minute)
+    start_time = full_df["times"].iloc[0]
+    end_time = full_df["times"].iloc[-1]
+    bin_times = np.linspace(start_time, end_time, om.get_bins_per_5min(start_time, end_time) + 1)
+    print(f"{len(full_df)} exchanges in {len(bin_times) - 1} bins, best of {repeats}")
+
+    if not om.get_binned_df(full_df, bin_times, om.DEFAULT_SAMPLES).equals(
+        loop_binned_df(full_df, bin_times, om.DEFAULT_SAMPLES)
+    ):
+        raise ValueError("get_binned_df does not match the baseline")
+    new_s = min(
+        timeit.repeat(lambda: om.get_binned_df(full_df, bin_times, om.DEFAULT_SAMPLES), number=1, repeat=repeats)
+    )
+    old_s = timeit.timeit(lambda: loop_binned_df(full_df, bin_times, om.DEFAULT_SAMPLES), number=1)
+    print(f"get_binned_df: vectorized {new_s * 1e3:9.3f} ms, per-bin {old_s * 1e3:9.3f} ms, {old_s / new_s:6.1f}x")
+
+    latencies = full_df["latencies"].to_numpy()
+    offsets = full_df["offsets"].to_numpy()
+    times = full_df["times"].to_numpy()
+    model_s = min(
+        timeit.repeat(lambda: om.OffsetModel(latencies, offsets, times, start_time, end_time), number=1, repeat=repeats)
+    )
+    print(f"  OffsetModel: {model_s * 1e3:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Compares the columnar location and station health converters in redvox.common.sensor_reader_utils against the
+row-by-row implementations they replaced.
+
+usage: python3 benchmark_sensor_readers.py [num_samples] [repeats]
+"""
+
+import sys
+import timeit
+from typing import Callable
+
+import numpy as np
+import pyarrow as pa
+
+import redvox.api1000.proto.redvox_api_m_pb2 as api_m
+from redvox.common import sensor_reader_utils as sru
+
+StationMetrics = api_m.RedvoxPacketM.StationInformation.StationMetrics
+
+
+def row_location_to_pyarrow(loc: api_m.RedvoxPacketM.Sensors.Location) -> pa.Table:
+    """
+    the row-by-row location converter, kept as a baseline
+    """
+    timestamps = loc.timestamps.timestamps
+    gps_timestamps = loc.timestamps_gps.timestamps
+    samples = [
+        loc.altitude_samples.values,
+        loc.speed_samples.values,
+        loc.bearing_samples.values,
+        loc.horizontal_accuracy_samples.values,
+        loc.vertical_accuracy_samples.values,
+        loc.speed_accuracy_samples.values,
+        loc.bearing_accuracy_samples.values,
+    ]
+    loc_prov_samples = loc.location_providers
+    data_for_df = [[] for _ in sru.LOCATION_COLUMNS]
+    for i in range(len(timestamps)):
+        data_for_df[0].append(timestamps[i])
+        data_for_df[1].append(timestamps[i])
+        data_for_df[2].append(np.nan if len(gps_timestamps) <= i else gps_timestamps[i])
+        data_for_df[3].append(loc.latitude_samples.values[i])
+        data_for_df[4].append(loc.longitude_samples.values[i])
+        for j, values in enumerate(samples):
+            data_for_df[5 + j].append(np.nan if len(values) <= i else values[i])
+        data_for_df[12].append(
+            api_m.RedvoxPacketM.Sensors.Location.LocationProvider.UNKNOWN
+            if len(loc_prov_samples) <= i
+            else loc_prov_samples[i]
+        )
+    return pa.Table.from_pydict(dict(zip(sru.LOCATION_COLUMNS, data_for_df)))
+
+
+def row_health_to_pyarrow(metrics: StationMetrics) -> pa.Table:
+    """
+    the row-by-row station health converter, kept as a baseline
+    """
+    timestamps = metrics.timestamps.timestamps
+    columns = [
+        (metrics.battery.values, np.nan),
+        (metrics.battery_current.values, np.nan),
+        (metrics.temperature.values, np.nan),
+        (metrics.network_type, StationMetrics.NetworkType.UNKNOWN_NETWORK),
+        (metrics.network_strength.values, np.nan),
+        (metrics.power_state, StationMetrics.PowerState.UNKNOWN_POWER_STATE),
+        (metrics.available_ram.values, np.nan),
+        (metrics.available_disk.values, np.nan),
+        (metrics.cell_service_state, StationMetrics.CellServiceState.UNKNOWN),
+        (metrics.cpu_utilization.values, np.nan),
+        (metrics.wifi_wake_lock, StationMetrics.WifiWakeLock.NONE),
+        (metrics.screen_state, StationMetrics.ScreenState.UNKNOWN_SCREEN_STATE),
+        (metrics.screen_brightness.values, np.nan),
+    ]
+    data_for_df = [[] for _ in sru.STATION_HEALTH_COLUMNS]
+    for i in range(len(timestamps)):
+        data_for_df[0].append(timestamps[i])
+        data_for_df[1].append(timestamps[i])
+        for j, (values, default) in enumerate(columns):
+            data_for_df[2 + j].append(default if len(values) < i + 1 else values[i])
+    return pa.Table.from_pydict(dict(zip(sru.STATION_HEALTH_COLUMNS, data_for_df)))
+
+
+def make_packet(num_samples: int) -> api_m.RedvoxPacketM:
+    """
+    :param num_samples: number of location and station health samples in the packet
+    :return: a packet with location and station health data; some channels are shorter than the timestamps
+    """
+    rng = np.random.default_rng(0)
+    packet = api_m.RedvoxPacketM()
+    loc = packet.sensors.location
+    loc.timestamps.timestamps.extend(np.arange(num_samples) * 1e6)
+    loc.timestamps_gps.timestamps.extend(np.arange(num_samples) * 1e6)
+    for field in [loc.latitude_samples, loc.longitude_samples, loc.altitude_samples, loc.speed_samples]:
+        field.values.extend(rng.random(num_samples))
+    loc.horizontal_accuracy_samples.values.extend(rng.random(num_samples // 2))
+    loc.location_providers.extend([1] * num_samples)
+    metrics = packet.station_information.station_metrics
+    metrics.timestamps.timestamps.extend(np.arange(num_samples) * 1e6)
+    for field in [metrics.battery, metrics.temperature, metrics.available_ram, metrics.cpu_utilization]:
+        field.values.extend(rng.random(num_samples))
+    metrics.network_type.extend([2] * num_samples)
+    metrics.screen_state.extend([1] * (num_samples // 2))
+    return packet
+
+
+def bench(name: str, fn: Callable[[], pa.Table], baseline_fn: Callable[[], pa.Table], repeats: int):
+    """
+    check that fn and baseline_fn return the same table, then print how long each one takes
+    """
+    if not fn().to_pandas().equals(baseline_fn().to_pandas()):
+        raise ValueError(f"{name}: results do not match the baseline")
+    new_s = min(timeit.repeat(fn, number=1, repeat=repeats))
+    old_s = min(timeit.repeat(baseline_fn, number=1, repeat=repeats))
+    print(f"{name:>8}: columnar {new_s * 1e3:9.3f} ms, row-by-row {old_s * 1e3:9.3f} ms, {old_s / new_s:6.1f}x")
+
+
+def main():
+    num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    packet = make_packet(num_samples)
+    print(f"{num_samples} samples, best of {repeats}")
+    loc = packet.sensors.location
+    bench("location", lambda: sru.apim_location_to_pyarrow(loc), lambda: row_location_to_pyarrow(loc), repeats)
+    metrics = packet.station_information.station_metrics
+    bench("health", lambda: sru.apim_health_to_pyarrow(metrics), lambda: row_health_to_pyarrow(metrics), repeats)
+
+
+if __name__ == "__main__":
+    main()